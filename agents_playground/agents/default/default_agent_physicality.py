@@ -17,6 +17,7 @@ class DefaultAgentPhysicality(AgentPhysicalityLike):
     self.aabb         = aabb
     self.frustum      = frustum
     self.scale_factor = scale_factor
+    self.contacts     = []
 
   def calculate_aabb(self, agent_location: Coordinate, cell_size: Size) -> None:
     agent_half_width:float  = self.size.width  / 2.0
@@ -25,18 +26,18 @@ class DefaultAgentPhysicality(AgentPhysicalityLike):
     cell_half_height        = cell_size.height / 2.0
 
     # 1. Convert the agent's location to a canvas space.
-    agent_loc: Coordinate = agent_location.multiply(Coordinate(cell_size.width, cell_size.height))
-
     # 2. Agent's are shifted to be drawn in near the center of a grid cell, 
     # the AABB needs to be shifted as well.
-    agent_loc = agent_loc.shift(Coordinate(cell_half_width, cell_half_height))
+    center_x = agent_location.x * cell_size.width  + cell_half_width
+    center_y = agent_location.y * cell_size.height + cell_half_height
 
-    # 3. Create an AABB for the agent with the agent's location at its centroid.
-    self.aabb = AABBox2d(
-      center = Vertex2d(
-        x = agent_loc.x, 
-        y = agent_loc.y
-      ), 
-      half_width  = agent_half_width, 
-      half_height = agent_half_height
-    ) 
\ No newline at end of file
+    # 3. Position an AABB for the agent with the agent's location at its centroid.
+    # If the agent already has a 2D box, it's updated in place rather than replaced.
+    if isinstance(self.aabb, AABBox2d):
+      self.aabb.update(center_x, center_y, agent_half_width, agent_half_height)
+    else:
+      self.aabb = AABBox2d(
+        center = Vertex2d(x = center_x, y = center_y), 
+        half_width  = agent_half_width, 
+        half_height = agent_half_height
+      ) 
@@ -1,8 +1,7 @@
-from types import SimpleNamespace
 from typing import Dict, List
 from agents_playground.agents.spec.agent_spec import AgentLike
 from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
-from agents_playground.agents.spec.agent_system import AgentSystemLike, ByproductDefinition, ByproductStore
+from agents_playground.agents.spec.agent_system import AgentSystemLike, ByproductDefinition, ByproductStore, Subsystems
 from agents_playground.simulation.tag import Tag
 
 class DefaultAgentSystem(AgentSystemLike):
@@ -12,7 +11,7 @@ class DefaultAgentSystem(AgentSystemLike):
   ) -> None:
     super().__init__()
     self.name = name
-    self.subsystems = SimpleNamespace()
+    self.subsystems = Subsystems(self)
     self.byproducts_store = ByproductStore()
     self.byproducts_definitions = []
     self.internal_byproducts_definitions = []
@@ -28,7 +27,7 @@ class SystemWithByproducts(AgentSystemLike):
   ) -> None:
     super().__init__()
     self.name = name
-    self.subsystems = SimpleNamespace()
+    self.subsystems = Subsystems(self)
     self.byproducts_store = ByproductStore()
     self.byproducts_definitions = byproduct_defs
     self.internal_byproducts_definitions = internal_byproduct_defs
@@ -0,0 +1,96 @@
+"""
+Stores agents in a World.
+
+An agent's parts become components named after the AgentLike attributes.
+What the agent is capable of is recorded as components too. Each memory
+container is a component named after its key (e.g. sensory_memory) and each
+system in the agent's hierarchy is a component named after the system (e.g.
+visual_system). So a query like
+
+  world.query('position', 'physicality', 'sensory_memory', 'visual_system')
+
+only visits the agents that can see and remember what they saw.
+
+EntityAgent wraps an entity as an AgentLike, so the existing tasks and
+systems that work with agents keep working.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from agents_playground.agents.ecs.world import ComponentName, Entity, World, WorldError
+from agents_playground.agents.memory.agent_memory_model import AgentMemoryModel
+from agents_playground.agents.spec.agent_identity_spec import AgentIdentityLike
+from agents_playground.agents.spec.agent_movement_attributes import AgentMovementAttributes
+from agents_playground.agents.spec.agent_physicality_spec import AgentPhysicalityLike
+from agents_playground.agents.spec.agent_position_spec import AgentPositionLike
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.agent_state_spec import AgentStateLike
+from agents_playground.agents.spec.agent_style_spec import AgentStyleLike
+from agents_playground.agents.spec.agent_system import AgentSystemLike
+
+# The AgentLike attributes that are stored as components.
+AGENT_COMPONENTS = (
+  'agent_state',
+  'internal_systems',
+  'identity',
+  'physicality',
+  'position',
+  'movement',
+  'style',
+  'memory'
+)
+
+def agent_components(agent: AgentLike) -> Dict[ComponentName, Any]:
+  """
+  The components of an agent. Its parts, its memory containers, and its systems.
+  The containers and systems are the ones the agent has now. Spawn the agent
+  again to pick up ones that are added later.
+  """
+  components: Dict[ComponentName, Any] = {name: getattr(agent, name) for name in AGENT_COMPONENTS}
+  for name, container in agent.memory.items():
+    _add_capability(components, name, container)
+  systems = list(agent.internal_systems.subsystems.__dict__.values())
+  while systems:
+    system: AgentSystemLike = systems.pop()
+    _add_capability(components, system.name, system)
+    systems.extend(system.subsystems.__dict__.values())
+  return components
+
+def _add_capability(components: Dict[ComponentName, Any], name: ComponentName, value: Any) -> None:
+  if name in components:
+    raise WorldError(f'The agent has more than one component named {name}.')
+  components[name] = value
+
+def spawn_agent(world: World, agent: AgentLike) -> EntityAgent:
+  """Adds an agent to a world. Returns the agent, backed by the world."""
+  return EntityAgent(world, world.spawn(**agent_components(agent)))
+
+def _component(name: ComponentName) -> property:
+  def get(self: EntityAgent) -> Any:
+    return self.world.component(self.entity, name)
+
+  def set_value(self: EntityAgent, value: Any) -> None:
+    self.world.set_component(self.entity, name, value)
+  return property(get, set_value)
+
+class EntityAgent(AgentLike):
+  """An agent whose parts are components in a World."""
+  agent_state: AgentStateLike         = _component('agent_state')      # type: ignore
+  internal_systems: AgentSystemLike   = _component('internal_systems') # type: ignore
+  identity: AgentIdentityLike         = _component('identity')         # type: ignore
+  physicality: AgentPhysicalityLike   = _component('physicality')      # type: ignore
+  position: AgentPositionLike         = _component('position')         # type: ignore
+  movement: AgentMovementAttributes   = _component('movement')         # type: ignore
+  style: AgentStyleLike               = _component('style')            # type: ignore
+  memory: AgentMemoryModel            = _component('memory')           # type: ignore
+
+  def __init__(self, world: World, entity: Entity) -> None:
+    self.world = world
+    self.entity = entity
+
+  def __eq__(self, other: object) -> bool:
+    return isinstance(other, EntityAgent) and other.world is self.world and other.entity == self.entity
+
+  def __hash__(self) -> int:
+    return hash((id(self.world), self.entity))
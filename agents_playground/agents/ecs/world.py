@@ -0,0 +1,192 @@
+"""
+Archetype based entity-component storage.
+
+An entity is an integer. Its data is a set of named components. Entities with
+exactly the same component names share an archetype, a table with a column
+(a list) per component and a row per entity. Queries find the archetypes
+that have the requested components and walk their columns, so a system only
+visits the entities that have what it needs and reads each component from a
+list rather than through an object graph.
+
+Adding or removing a component moves the entity's row to another archetype.
+Removing a row moves the table's last row into its place, which keeps the
+columns packed. Don't add or remove components, or entities, while iterating
+over a query.
+"""
+from __future__ import annotations
+
+from itertools import count
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+Entity = int
+ComponentName = str
+
+class WorldError(Exception):
+  def __init__(self, *args: object) -> None:
+    super().__init__(*args)
+
+class Archetype:
+  """The table of every entity with the same set of components."""
+  def __init__(self, components: FrozenSet[ComponentName]) -> None:
+    self.components: FrozenSet[ComponentName] = components
+    self.entities: List[Entity] = []
+    self.columns: Dict[ComponentName, List[Any]] = {name: [] for name in sorted(components)}
+
+  def __len__(self) -> int:
+    return len(self.entities)
+
+  def append(self, entity: Entity, values: Dict[ComponentName, Any]) -> int:
+    """Adds a row. Returns its index."""
+    self.entities.append(entity)
+    for name, column in self.columns.items():
+      column.append(values[name])
+    return len(self.entities) - 1
+
+  def row(self, index: int) -> Dict[ComponentName, Any]:
+    return {name: column[index] for name, column in self.columns.items()}
+
+  def remove(self, index: int) -> Entity | None:
+    """
+    Removes a row by moving the last row into its place.
+
+    Returns
+      The entity that was moved into the row or None if it was the last row.
+    """
+    last = len(self.entities) - 1
+    moved: Entity | None = None
+    if index != last:
+      moved = self.entities[last]
+      self.entities[index] = moved
+      for column in self.columns.values():
+        column[index] = column[last]
+    self.entities.pop()
+    for column in self.columns.values():
+      column.pop()
+    return moved
+
+class World:
+  """
+  The entities and their components, stored by archetype.
+  """
+  def __init__(self) -> None:
+    self._ids = count()
+    self._archetypes: Dict[FrozenSet[ComponentName], Archetype] = {}
+    # Where each entity's row is.
+    self._locations: Dict[Entity, Tuple[Archetype, int]] = {}
+    # The archetypes that match a query. Cleared when an archetype is created.
+    self._matches: Dict[FrozenSet[ComponentName], List[Archetype]] = {}
+
+  def __len__(self) -> int:
+    return len(self._locations)
+
+  def __contains__(self, entity: Entity) -> bool:
+    return entity in self._locations
+
+  @property
+  def archetypes(self) -> Iterable[Archetype]:
+    return self._archetypes.values()
+
+  def spawn(self, **components: Any) -> Entity:
+    """Creates an entity with the given components."""
+    entity = next(self._ids)
+    self._insert(entity, components)
+    return entity
+
+  def despawn(self, entity: Entity) -> None:
+    """Removes an entity and all of its components."""
+    self._remove_row(entity)
+
+  def components_of(self, entity: Entity) -> Dict[ComponentName, Any]:
+    archetype, index = self._location(entity)
+    return archetype.row(index)
+
+  def has(self, entity: Entity, *names: ComponentName) -> bool:
+    archetype, _ = self._location(entity)
+    return all(name in archetype.components for name in names)
+
+  def component(self, entity: Entity, name: ComponentName) -> Any:
+    archetype, index = self._location(entity)
+    column = archetype.columns.get(name)
+    if column is None:
+      raise WorldError(f'The entity {entity} does not have the component {name}.')
+    return column[index]
+
+  def set_component(self, entity: Entity, name: ComponentName, value: Any) -> None:
+    """Sets a component's value. The component is added if the entity doesn't have it."""
+    archetype, index = self._location(entity)
+    column = archetype.columns.get(name)
+    if column is not None:
+      column[index] = value
+      return
+    components = self._remove_row(entity)
+    components[name] = value
+    self._insert(entity, components)
+
+  def remove_component(self, entity: Entity, name: ComponentName) -> None:
+    archetype, _ = self._location(entity)
+    if name not in archetype.components:
+      raise WorldError(f'The entity {entity} does not have the component {name}.')
+    components = self._remove_row(entity)
+    del components[name]
+    self._insert(entity, components)
+
+  def query(self, *names: ComponentName) -> Iterator[Tuple[Any, ...]]:
+    """
+    Finds the entities that have all of the components.
+
+    Returns
+      An (entity, component, component, ...) tuple per entity, with the
+      components in the order they were requested.
+    """
+    for entities, *columns in self.query_tables(*names):
+      yield from zip(entities, *columns)
+
+  def query_tables(self, *names: ComponentName) -> Iterator[Tuple[List[Any], ...]]:
+    """
+    Finds the archetypes that have all of the components. Intended for
+    systems that process whole columns at a time.
+
+    Returns
+      An (entities, column, column, ...) tuple per archetype, with the columns
+      in the order they were requested. The lists are the archetype's storage.
+      Don't resize them.
+    """
+    for archetype in self._matching(frozenset(names)):
+      if len(archetype) > 0:
+        yield (archetype.entities, *(archetype.columns[name] for name in names))
+
+  def count(self, *names: ComponentName) -> int:
+    """The number of entities that have all of the components."""
+    return sum(len(archetype) for archetype in self._matching(frozenset(names)))
+
+  def _matching(self, names: FrozenSet[ComponentName]) -> List[Archetype]:
+    matches = self._matches.get(names)
+    if matches is None:
+      matches = [archetype for archetype in self._archetypes.values() if names <= archetype.components]
+      self._matches[names] = matches
+    return matches
+
+  def _location(self, entity: Entity) -> Tuple[Archetype, int]:
+    location = self._locations.get(entity)
+    if location is None:
+      raise WorldError(f'The world does not have an entity {entity}.')
+    return location
+
+  def _insert(self, entity: Entity, components: Dict[ComponentName, Any]) -> None:
+    key = frozenset(components)
+    archetype = self._archetypes.get(key)
+    if archetype is None:
+      archetype = Archetype(key)
+      self._archetypes[key] = archetype
+      self._matches.clear()
+    self._locations[entity] = (archetype, archetype.append(entity, components))
+
+  def _remove_row(self, entity: Entity) -> Dict[ComponentName, Any]:
+    """Removes an entity's row. Returns its components."""
+    archetype, index = self._location(entity)
+    components = archetype.row(index)
+    moved = archetype.remove(index)
+    if moved is not None:
+      self._locations[moved] = (archetype, index)
+    del self._locations[entity]
+    return components
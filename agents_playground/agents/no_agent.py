@@ -1,5 +1,4 @@
 
-from types import SimpleNamespace
 from typing import Dict, List, Set, Tuple
 from agents_playground.agents.byproducts.sensation import Sensation
 from agents_playground.agents.default.default_agent_state import DefaultAgentState
@@ -14,8 +13,8 @@ from agents_playground.agents.spec.agent_physicality_spec import AgentPhysicalit
 from agents_playground.agents.spec.agent_position_spec import AgentPositionLike
 from agents_playground.agents.spec.agent_spec import AgentLike
 from agents_playground.agents.spec.agent_style_spec import AgentStyleLike
-from agents_playground.agents.spec.agent_system import AgentSystemLike
-from agents_playground.agents.spec.byproduct_store import ByproductStore
+from agents_playground.agents.spec.agent_system import AgentSystemLike, Subsystems
+from agents_playground.agents.spec.byproduct_store import Byproducts, ByproductStore
 from agents_playground.containers.ttl_store import TTLStore
 from agents_playground.core.types import Size
 from agents_playground.renderers.color import BasicColors
@@ -61,6 +60,7 @@ class EmptyAgentPhysicality(AgentPhysicalityLike):
     self.aabb = EmptyAABBox()
     self.scale_factor = 1.0
     self.frustum = Frustum2d.create_empty()
+    self.contacts = []
 
   def calculate_aabb(self, agent_location: Coordinate, cell_size: Size) -> None:
     return
@@ -82,7 +82,7 @@ class EmptyAgentMovementAttributes(AgentMovementAttributes):
 class EmptyAgentSystem(AgentSystemLike):
   def __init__(self) -> None:
     self.name = ''
-    self.subsystems = SimpleNamespace()
+    self.subsystems = Subsystems(self)
     self.byproducts_store = ByproductStore()
     self.byproducts_definitions = []
     self.internal_byproducts_definitions = []
@@ -90,28 +90,28 @@ class EmptyAgentSystem(AgentSystemLike):
   def _before_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: Dict[str, List],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]) -> None:
     return
   
   def _before_subsystems_processed_post_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: Dict[str, List],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]) -> None:
     return
   
   def _after_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: Dict[str, List],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]) -> None:
     return
   
   def _after_subsystems_processed_post_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: Dict[str, List],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]) -> None:
     return
 
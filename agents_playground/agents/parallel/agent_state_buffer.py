@@ -0,0 +1,147 @@
+"""
+Double buffers the parts of the agents that other agents read.
+
+When agents are transitioned one after another and read each other's live
+location, facing, and action state, an agent sees the agents before it as
+they are after this frame and the agents after it as they were before it. The
+outcome depends on the order the agents are processed in, and processing them
+in parallel is a race.
+
+An AgentStateBuffer keeps two copies of every agent's location, facing,
+action state, AABB, and frustum:
+  - The read buffer holds the state committed at the end of the last frame.
+    The other agents an agent sees are BufferedAgent views of the read buffer.
+  - The write buffer receives the state of the agents, as they are at the end
+    of the frame, when swap() is called. It then becomes the read buffer.
+
+Agents only write their own state during a frame and only read the committed
+state of the others, so any processing order, or split across threads,
+produces the same results.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, cast
+
+from agents_playground.agents.spec.agent_action_state_spec import AgentActionStateLike
+from agents_playground.agents.spec.agent_identity_spec import AgentIdentityLike
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.aabbox import AABBox2d
+from agents_playground.spatial.frustum import Frustum2d
+from agents_playground.spatial.polygon import Polygon
+from agents_playground.spatial.types import Coordinate
+from agents_playground.spatial.vector2d import Vector2d
+from agents_playground.spatial.vertex import Vertex2d
+
+class AgentStateBufferError(Exception):
+  def __init__(self, *args: object) -> None:
+    super().__init__(*args)
+
+def _copy_vertices(source: Polygon, target: Polygon) -> None:
+  """Copies the vertices of one polygon into another. The target's vertices are reused."""
+  if len(target.vertices) != len(source.vertices):
+    target.vertices = [Vertex2d(0, 0) for _ in source.vertices]
+  for source_vertex, target_vertex in zip(source.vertices, target.vertices):
+    target_vertex.coordinates = source_vertex.coordinates
+
+class CommittedAgentState:
+  """
+  An agent's row in a buffer. Has the same attribute names as the agent's
+  position, physicality, and agent state so it can stand in for all three.
+  """
+  def __init__(self) -> None:
+    self.location: Coordinate = Coordinate(0, 0)
+    self.last_location: Coordinate = Coordinate(0, 0)
+    self.facing: Vector2d = Vector2d(0, 0)
+    self.current_action_state: Optional[AgentActionStateLike] = None
+    self.aabb: AABBox2d = AABBox2d(center = Vertex2d(0, 0), half_width = 0, half_height = 0)
+    self.frustum: Frustum2d = Frustum2d()
+
+  def capture(self, agent: AgentLike) -> None:
+    """Copies the agent's current state into the row."""
+    self.location = agent.position.location
+    self.last_location = agent.position.last_location
+    facing = cast(Vector2d, agent.position.facing)
+    self.current_action_state = agent.agent_state.current_action_state
+    # The agent's facing, AABB and frustum can be updated in place, so their
+    # components are copied rather than referenced.
+    self.facing.set(facing.i, facing.j)
+    _copy_vertices(agent.physicality.aabb, self.aabb)
+    _copy_vertices(agent.physicality.frustum, self.frustum)
+
+class BufferedAgent:
+  """
+  A read only view of another agent's committed state. Supports identity,
+  position (location, last_location, facing), physicality (aabb, frustum),
+  and agent_state (current_action_state).
+  """
+  def __init__(self, buffer: AgentStateBuffer, index: int, identity: AgentIdentityLike) -> None:
+    self.identity = identity
+    self._buffer = buffer
+    self._index = index
+
+  @property
+  def position(self) -> CommittedAgentState:
+    return self._buffer.read[self._index]
+
+  @property
+  def physicality(self) -> CommittedAgentState:
+    return self._buffer.read[self._index]
+
+  @property
+  def agent_state(self) -> CommittedAgentState:
+    return self._buffer.read[self._index]
+
+class AgentStateBuffer:
+  """The read and write buffers of a group of agents."""
+  def __init__(self, agents: Iterable[AgentLike] = ()) -> None:
+    """
+    Args:
+      - agents: The agents to buffer. Their current state is committed.
+    """
+    self.agents: List[AgentLike] = []
+    self.read: List[CommittedAgentState] = []
+    self._write: List[CommittedAgentState] = []
+    self._views: Dict[Tag, BufferedAgent] = {}
+    for agent in agents:
+      self.add(agent)
+
+  def __len__(self) -> int:
+    return len(self.agents)
+
+  def __contains__(self, agent_id: Tag) -> bool:
+    return agent_id in self._views
+
+  def add(self, agent: AgentLike) -> None:
+    """Starts buffering an agent. Its current state is committed."""
+    if agent.identity.id in self._views:
+      raise AgentStateBufferError(f'The agent {agent.identity.id} is already buffered.')
+    committed = CommittedAgentState()
+    committed.capture(agent)
+    self._views[agent.identity.id] = BufferedAgent(self, len(self.agents), agent.identity)
+    self.agents.append(agent)
+    self.read.append(committed)
+    self._write.append(CommittedAgentState())
+
+  def swap(self) -> None:
+    """
+    Commits the agents' current state. Call at the end of a frame, after all
+    of the agents have been transitioned.
+    """
+    for agent, committed in zip(self.agents, self._write):
+      committed.capture(agent)
+    self.read, self._write = self._write, self.read
+
+  def view_of(self, agent_id: Tag) -> BufferedAgent:
+    """The committed state of an agent."""
+    view = self._views.get(agent_id)
+    if view is None:
+      raise AgentStateBufferError(f'The agent {agent_id} is not buffered.')
+    return view
+
+  def committed(self, other_agents: Dict[Tag, AgentLike]) -> Dict[Tag, BufferedAgent]:
+    """
+    Replaces an agent's other agents with views of their committed state.
+    Intended to be passed to AgentLike.transition_state.
+    """
+    return {agent_id: self.view_of(agent_id) for agent_id in other_agents}
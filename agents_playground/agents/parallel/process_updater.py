@@ -0,0 +1,343 @@
+"""
+Transitions agents in worker processes.
+
+Within a frame, an agent's cognition only reads the other agents, so the
+agents can be processed in parallel if they all read a frozen copy of the
+world. The ProcessAgentUpdater publishes that copy, every agent's location,
+facing, AABB, and frustum, into a multiprocessing.shared_memory block at the
+start of the frame. Each worker process owns a shard of the agents and keeps
+a replica of them. The other agents are read from the snapshot.
+
+Data ownership during transition_states:
+  - The simulation's process owns the agents. The replicas are synchronized
+    with them at the start of every frame.
+  - The snapshot is written before the workers start and only read by them.
+  - An agent's action state and the byproducts held by its root system are
+    sent to its worker with the frame and sent back when the agent has been
+    processed. The root byproducts are replaced by the ones sent back.
+  - Only the changes to an agent's memory are sent, in both directions. See
+    MemoryTracker. Memories appended to a sequence, such as new sensations,
+    are sent on their own.
+  - Anything else the agent's systems change stays with the replica.
+
+The results are merged in the order of the agents, so the outcome doesn't
+depend on which worker finishes first.
+"""
+from __future__ import annotations
+
+from array import array
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+import os
+import pickle
+import struct
+import sys
+import traceback
+from collections.abc import MutableSequence
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
+
+from agents_playground.agents.memory.agent_memory_model import AgentMemoryModel
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.agent_state_spec import AgentActionStateLike
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.aabbox import AABBox2d
+from agents_playground.spatial.frustum import Frustum2d
+from agents_playground.spatial.types import Coordinate
+from agents_playground.spatial.vector2d import Vector2d
+from agents_playground.spatial.vertex import Vertex2d
+
+# An agent's row in the snapshot: location (x, y), facing (i, j), the AABB's 4
+# vertices, the frustum's 4 vertices, and 1.0 if the frustum has vertices.
+SNAPSHOT_ROW = struct.Struct('21d')
+
+class ParallelUpdateError(Exception):
+  def __init__(self, *args: object) -> None:
+    super().__init__(*args)
+
+def write_snapshot(buffer: memoryview, index: int, agent: AgentLike) -> None:
+  """Writes an agent's row of the snapshot."""
+  location = agent.position.location
+  facing = cast(Vector2d, agent.position.facing)
+  values: List[float] = [location.x, location.y, facing.i, facing.j]
+  for vertex in agent.physicality.aabb.vertices:
+    values.extend(vertex.coordinates)
+  frustum_vertices = agent.physicality.frustum.vertices
+  if len(frustum_vertices) == 4:
+    for vertex in frustum_vertices:
+      values.extend(vertex.coordinates)
+    values.append(1.0)
+  else:
+    values.extend([0.0] * 9)
+  SNAPSHOT_ROW.pack_into(buffer, index * SNAPSHOT_ROW.size, *values)
+
+def read_snapshot(buffer: memoryview, index: int, agent: Any) -> None:
+  """Copies an agent's row of the snapshot into an agent or a SnapshotAgent."""
+  values = SNAPSHOT_ROW.unpack_from(buffer, index * SNAPSHOT_ROW.size)
+  agent.position.location = Coordinate(values[0], values[1])
+  agent.position.facing = Vector2d(values[2], values[3])
+  for corner, vertex in enumerate(agent.physicality.aabb.vertices):
+    vertex.coordinates = (values[4 + corner * 2], values[5 + corner * 2])
+  if values[20] == 1.0:
+    frustum = agent.physicality.frustum
+    if len(frustum.vertices) != 4:
+      frustum.vertices = [Vertex2d(0, 0), Vertex2d(0, 0), Vertex2d(0, 0), Vertex2d(0, 0)]
+    for corner, vertex in enumerate(frustum.vertices):
+      vertex.coordinates = (values[12 + corner * 2], values[13 + corner * 2])
+
+class SnapshotAgent:
+  """What a worker knows about an agent it doesn't own. Read from the snapshot."""
+  def __init__(self, agent_id: Tag) -> None:
+    self.identity = SimpleNamespace(id = agent_id)
+    self.position = SimpleNamespace(location = Coordinate(0, 0), facing = Vector2d(0, 0))
+    self.physicality = SimpleNamespace(
+      aabb    = AABBox2d(center = Vertex2d(0, 0), half_width = 0, half_height = 0),
+      frustum = Frustum2d()
+    )
+    self.frame: int = -1 # The last frame the agent was read.
+
+# A change to one of an agent's memory containers, by the container's name.
+#   ('extend', items): The items were appended to a sequence.
+#   ('replace', items): A sequence's items were replaced.
+#   ('container', container): Any other kind of container changed. It is sent whole.
+#   ('remove', None): The container was removed.
+MemoryDelta = Dict[str, Tuple[str, Any]]
+
+class MemoryTracker:
+  """
+  Remembers an agent's memory as the other process last saw it. Used to find
+  and apply the changes made in one process so only they have to be sent.
+
+  Sequences are compared item by item, by identity, so finding the memories
+  appended to one doesn't copy or pickle it. Other containers are compared
+  by their pickled bytes.
+  """
+  def __init__(self, memory: AgentMemoryModel) -> None:
+    self._seen: Dict[str, Any] = {}
+    for name, container in memory.data.items():
+      self._seen[name] = self._state(container.unwrap())
+
+  @staticmethod
+  def _state(storage: Any) -> Any:
+    if isinstance(storage, MutableSequence):
+      return list(storage)
+    return pickle.dumps(storage)
+
+  def changes(self, memory: AgentMemoryModel) -> MemoryDelta:
+    """Finds the changes since the memory was last seen. The memory is then seen as it is now."""
+    delta: MemoryDelta = {}
+    for name in list(self._seen):
+      if name not in memory.data:
+        delta[name] = ('remove', None)
+        del self._seen[name]
+    for name, container in memory.data.items():
+      storage = container.unwrap()
+      seen = self._seen.get(name)
+      if isinstance(storage, MutableSequence) and isinstance(seen, list):
+        if len(storage) >= len(seen) and all(item is seen_item for item, seen_item in zip(storage, seen)):
+          if len(storage) > len(seen):
+            appended = list(storage[len(seen):])
+            delta[name] = ('extend', appended)
+            seen.extend(appended)
+          continue
+        delta[name] = ('replace', list(storage))
+        self._seen[name] = list(storage)
+      else:
+        state = self._state(storage)
+        if state != seen:
+          delta[name] = ('container', container)
+          self._seen[name] = state
+    return delta
+
+  def apply(self, memory: AgentMemoryModel, delta: MemoryDelta) -> None:
+    """Applies the changes made in the other process. The memory is then seen as it is now."""
+    for name, (kind, payload) in delta.items():
+      if kind == 'remove':
+        memory.data.pop(name, None)
+        self._seen.pop(name, None)
+        continue
+      if kind == 'container':
+        memory.data[name] = payload
+      elif kind == 'extend':
+        memory.data[name].unwrap().extend(payload)
+      else:
+        memory.data[name].unwrap()[:] = payload
+      self._seen[name] = self._state(memory.data[name].unwrap())
+
+# Sent to a worker per agent: (action state name, memory changes, root byproducts, neighbor indices).
+AgentFrame = Tuple[str, MemoryDelta, Dict[str, list], array]
+# Sent back per agent: (action state name, memory changes, root byproducts).
+AgentResult = Tuple[str, MemoryDelta, Dict[str, list]]
+
+def _attach_snapshot(name: str) -> SharedMemory:
+  """Opens the snapshot in a worker. Only the simulation's process unlinks it."""
+  if sys.version_info >= (3, 13):
+    return SharedMemory(name = name, track = False)
+  snapshot = SharedMemory(name = name)
+  resource_tracker.unregister(snapshot._name, 'shared_memory') # type: ignore
+  return snapshot
+
+def _run_worker(connection: Connection, snapshot_name: str) -> None:
+  """A worker process. Transitions its shard of the agents, frame by frame."""
+  snapshot = _attach_snapshot(snapshot_name)
+  try:
+    indices, agents, action_states, agent_ids = pickle.loads(connection.recv_bytes())
+    others: List[SnapshotAgent] = [SnapshotAgent(agent_id) for agent_id in agent_ids]
+    trackers: List[MemoryTracker] = [MemoryTracker(agent.memory) for agent in agents]
+    frame_number: int = 0
+    while True:
+      frame: Optional[List[AgentFrame]] = connection.recv()
+      if frame is None:
+        break
+      try:
+        results: List[AgentResult] = []
+        for index, agent, tracker, (state_name, memory_delta, byproducts, neighbors) in zip(indices, agents, trackers, frame):
+          read_snapshot(snapshot.buf, index, agent)
+          agent.agent_state.current_action_state = action_states[state_name]
+          tracker.apply(agent.memory, memory_delta)
+          root_store = agent.internal_systems.byproducts_store
+          root_store.restore(byproducts)
+          other_agents: Dict[Tag, Any] = {}
+          for neighbor in neighbors:
+            other = others[neighbor]
+            if other.frame != frame_number:
+              read_snapshot(snapshot.buf, neighbor, other)
+              other.frame = frame_number
+            other_agents[other.identity.id] = other
+          agent.transition_state(other_agents)
+          results.append((agent.agent_state.current_action_state.name, tracker.changes(agent.memory), root_store.snapshot()))
+        connection.send(('ok', results))
+      except Exception:
+        connection.send(('error', traceback.format_exc()))
+      frame_number += 1
+  finally:
+    snapshot.close()
+
+class ProcessAgentUpdater:
+  """
+  Transitions a fixed group of agents in worker processes. Use it as a context
+  manager or call close() when done. Create a new one if agents are added to
+  or removed from the group.
+  """
+  def __init__(
+    self,
+    agents: Sequence[AgentLike],
+    action_states: Dict[str, AgentActionStateLike],
+    workers: Optional[int] = None
+  ) -> None:
+    """
+    Args:
+      - agents: The agents to transition. They're pickled and sent to the workers.
+      - action_states: Every action state the agents can be in, by name.
+        Typically the scene's agent_state_definitions.
+      - workers: The number of worker processes. Defaults to the number of CPUs.
+    """
+    self._snapshot: Optional[SharedMemory] = None
+    self._connections: List[Connection] = []
+    self._processes: List[Any] = []
+    self.agents: List[AgentLike] = list(agents)
+    self.action_states = action_states
+    self._indices: Dict[Tag, int] = {agent.identity.id: index for index, agent in enumerate(self.agents)}
+    self._trackers: List[MemoryTracker] = [MemoryTracker(agent.memory) for agent in self.agents]
+    worker_count = max(1, min(workers or os.cpu_count() or 1, len(self.agents)))
+    self._snapshot = SharedMemory(create = True, size = max(1, len(self.agents)) * SNAPSHOT_ROW.size)
+
+    # Each worker owns a contiguous range of the agents.
+    shard_size = -(-len(self.agents) // worker_count)
+    self._shards: List[range] = [
+      range(start, min(start + shard_size, len(self.agents)))
+      for start in range(0, len(self.agents), shard_size)
+    ]
+    agent_ids = [agent.identity.id for agent in self.agents]
+    context = multiprocessing.get_context('spawn')
+    for shard in self._shards:
+      connection, worker_connection = context.Pipe()
+      process = context.Process(target = _run_worker, args = (worker_connection, self._snapshot.name), daemon = True)
+      process.start()
+      worker_connection.close()
+      # The agents and the action states are pickled together so the replicas'
+      # action state selectors refer to the worker's copies of the states.
+      connection.send_bytes(pickle.dumps((list(shard), [self.agents[index] for index in shard], action_states, agent_ids)))
+      self._connections.append(connection)
+      self._processes.append(process)
+
+  def __enter__(self) -> ProcessAgentUpdater:
+    return self
+
+  def __exit__(self, *args) -> None:
+    self.close()
+
+  def __del__(self) -> None:
+    if hasattr(self, '_snapshot'):
+      self.close()
+
+  @property
+  def workers(self) -> int:
+    return len(self._processes)
+
+  def close(self) -> None:
+    """Stops the workers and releases the snapshot."""
+    for connection in self._connections:
+      try:
+        connection.send(None)
+      except (BrokenPipeError, OSError):
+        pass
+    for process in self._processes:
+      process.join(timeout = 5)
+      if process.is_alive():
+        process.terminate()
+    for connection in self._connections:
+      connection.close()
+    self._connections = []
+    self._processes = []
+    if self._snapshot is not None:
+      self._snapshot.close()
+      self._snapshot.unlink()
+      self._snapshot = None
+
+  def transition_states(self, other_agents: Sequence[Dict[Tag, AgentLike]]) -> None:
+    """
+    Moves the agents forward one tick. The same as calling transition_state
+    on each agent, except every agent sees the others as they were when the
+    frame started.
+
+    Args:
+      - other_agents: The neighbors of each agent, in the same order as the
+        agents. The neighbors must be agents in the group.
+    """
+    if self._snapshot is None:
+      raise ParallelUpdateError('The ProcessAgentUpdater has been closed.')
+    for index, agent in enumerate(self.agents):
+      write_snapshot(self._snapshot.buf, index, agent)
+
+    for shard, connection in zip(self._shards, self._connections):
+      connection.send([
+        (
+          self.agents[index].agent_state.current_action_state.name,
+          self._trackers[index].changes(self.agents[index].memory),
+          self.agents[index].internal_systems.byproducts_store.snapshot(),
+          array('i', [self._index_of(agent_id) for agent_id in other_agents[index]])
+        )
+        for index in shard
+      ])
+
+    # Every worker is waited on, in order, before anything is merged.
+    responses = [connection.recv() for connection in self._connections]
+    for status, payload in responses:
+      if status == 'error':
+        raise ParallelUpdateError(f'An agent could not be transitioned in a worker process.\n{payload}')
+
+    for shard, (_, results) in zip(self._shards, responses):
+      for index, (state_name, memory_delta, byproducts) in zip(shard, results):
+        agent = self.agents[index]
+        agent.agent_state.assign_action_state(self.action_states[state_name])
+        self._trackers[index].apply(agent.memory, memory_delta)
+        agent.internal_systems.byproducts_store.restore(byproducts)
+
+  def _index_of(self, agent_id: Tag) -> int:
+    index = self._indices.get(agent_id)
+    if index is None:
+      raise ParallelUpdateError(f'The agent {agent_id} is not one of the ProcessAgentUpdater agents.')
+    return index
@@ -0,0 +1,142 @@
+"""
+Transitions agents on a pool of threads.
+
+On a free-threaded build of CPython (3.13t and later) the threads run in
+parallel. With the GIL the results are the same, only slower, so the updater
+can be used everywhere.
+
+Data ownership during transition_states:
+  - Every agent belongs to one shard and a shard is processed by one thread.
+    The thread owns its agents' state, memory containers, systems, and
+    byproduct stores. Nothing else writes to them until the frame is done.
+  - Agents that share any of those objects, like a system instance, are put
+    in the same shard, so shared objects are never written by two threads.
+    Within a shard, agents are processed in their original order.
+  - The other agents are read only. Their lazily calculated AABBs and frustums
+    are brought up to date on the calling thread before the threads start,
+    so reading them doesn't write to them.
+  - The neighbors are found on the calling thread, so the scene's proximity
+    system and dictionaries are only read by the threads. Don't add or
+    remove agents, or move them, while transition_states is running.
+  - Agents that move or change state as part of their own transition must
+    not be read live by the others. Double buffer the scene (see
+    AgentStateBuffer) so the other agents are views of last frame's state.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import os
+import sys
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.agent_system import AgentSystemLike
+from agents_playground.simulation.tag import Tag
+
+def gil_enabled() -> bool:
+  """True unless running on a free-threaded build of CPython with the GIL disabled."""
+  is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+  return True if is_gil_enabled is None else bool(is_gil_enabled())
+
+def owned_objects(agent: AgentLike) -> Iterator[Any]:
+  """The objects an agent's transition may write to."""
+  yield agent.agent_state
+  yield agent.memory
+  yield from agent.memory.values()
+  systems: List[AgentSystemLike] = [agent.internal_systems]
+  while systems:
+    system = systems.pop()
+    yield system
+    yield system.byproducts_store
+    systems.extend(system.subsystems.__dict__.values())
+
+def partition(agents: Sequence[AgentLike], shard_count: int) -> List[List[int]]:
+  """
+  Splits agents into shards. Agents that share an owned object end up in the
+  same shard.
+
+  Returns
+    The indices of each shard's agents, in ascending order. Empty shards are dropped.
+  """
+  # Union-find over the agents, joined by the objects they share.
+  parents: List[int] = list(range(len(agents)))
+
+  def find(index: int) -> int:
+    while parents[index] != index:
+      parents[index] = parents[parents[index]]
+      index = parents[index]
+    return index
+
+  owners: Dict[int, int] = {}
+  for index, agent in enumerate(agents):
+    for owned in owned_objects(agent):
+      owner = owners.setdefault(id(owned), index)
+      if owner != index:
+        parents[find(index)] = find(owner)
+
+  groups: Dict[int, List[int]] = {}
+  for index in range(len(agents)):
+    groups.setdefault(find(index), []).append(index)
+
+  # Hand out the groups, largest first, to the smallest shard.
+  shards: List[List[int]] = [[] for _ in range(max(1, shard_count))]
+  for group in sorted(groups.values(), key = len, reverse = True):
+    min(shards, key = len).extend(group)
+  return [sorted(shard) for shard in shards if len(shard) > 0]
+
+def _transition_shard(agents: Sequence[AgentLike], other_agents: Sequence[Dict[Tag, AgentLike]], shard: List[int]) -> None:
+  for index in shard:
+    agents[index].transition_state(other_agents[index])
+
+class ThreadAgentUpdater:
+  """
+  Transitions agents on a thread pool. Use it as a context manager or call
+  shutdown() when done.
+  """
+  def __init__(self, workers: Optional[int] = None) -> None:
+    """
+    Args:
+      - workers: The number of threads. Defaults to the number of CPUs.
+    """
+    self.workers: int = max(1, workers or os.cpu_count() or 1)
+    self._executor = ThreadPoolExecutor(max_workers = self.workers, thread_name_prefix = 'agent-updater')
+    # The shards of the most recent group of agents.
+    self._partitioned: Optional[Tuple[Hashable, ...]] = None
+    self._shards: List[List[int]] = []
+
+  def __enter__(self) -> ThreadAgentUpdater:
+    return self
+
+  def __exit__(self, *args) -> None:
+    self.shutdown()
+
+  def shutdown(self) -> None:
+    self._executor.shutdown(wait = True)
+
+  def transition_states(self, agents: Sequence[AgentLike], other_agents: Sequence[Dict[Tag, AgentLike]]) -> None:
+    """
+    Moves the agents forward one tick. The same as calling transition_state
+    on each agent. The agents are partitioned again whenever a different
+    group of agents is passed in.
+
+    Args:
+      - agents: The agents to transition.
+      - other_agents: The neighbors of each agent, in the same order.
+    """
+    key = tuple(id(agent) for agent in agents)
+    if key != self._partitioned:
+      self._shards = partition(agents, self.workers)
+      self._partitioned = key
+
+    # Reading an agent's AABB or frustum recalculates it if it's dirty.
+    for agent in agents:
+      agent.physicality.aabb
+      agent.physicality.frustum
+
+    futures: List[Future] = [
+      self._executor.submit(_transition_shard, agents, other_agents, shard)
+      for shard in self._shards
+    ]
+    wait(futures)
+    for future in futures:
+      future.result()
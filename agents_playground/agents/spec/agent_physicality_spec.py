@@ -1,19 +1,76 @@
 from abc import abstractmethod
-from typing import Protocol
+from typing import List, Optional, Protocol, Tuple
 
 from agents_playground.core.types import Size
 from agents_playground.spatial.aabbox import AABBox, AABBox2d
+from agents_playground.spatial.contact import Contact
 from agents_playground.spatial.frustum import Frustum
 from agents_playground.spatial.types import Coordinate
+from agents_playground.spatial.vector import Vector
 from agents_playground.spatial.vertex import Vertex2d
 
 
 class AgentPhysicalityLike(Protocol):
-  size: Size 
+  """
+  The physical attributes of an agent.
+
+  The AABB and frustum are calculated lazily. Moving or turning an agent only
+  marks them as dirty. They are recalculated the first time they're accessed
+  after that. Agents whose AABB or frustum isn't read during a frame don't pay
+  for recalculating them.
+  """
+  size: Size
   scale_factor: float
-  aabb: AABBox 
-  frustum: Frustum
+  contacts: List[Contact] # What the agent overlapped during the current frame.
+  _aabb: AABBox
+  _frustum: Frustum
+  _pending_aabb: Optional[Tuple[Coordinate, Size]]
+  _pending_frustum: Optional[Tuple[Coordinate, Vector, Size]]
+
+  @property
+  def aabb(self) -> AABBox:
+    """The agent's axis-aligned bounding box. Recalculated if dirty."""
+    if self._pending_aabb is not None:
+      agent_location, cell_size = self._pending_aabb
+      self._pending_aabb = None
+      self.calculate_aabb(agent_location, cell_size)
+    return self._aabb
+
+  @aabb.setter
+  def aabb(self, box: AABBox) -> None:
+    self._aabb = box
+    self._pending_aabb = None
+
+  @property
+  def frustum(self) -> Frustum:
+    """The agent's view frustum. Recalculated if dirty."""
+    if self._pending_frustum is not None:
+      agent_location, facing, cell_size = self._pending_frustum
+      self._pending_frustum = None
+      self._frustum.update(agent_location, facing, cell_size)
+    return self._frustum
+
+  @frustum.setter
+  def frustum(self, frustum: Frustum) -> None:
+    self._frustum = frustum
+    self._pending_frustum = None
+
+  def invalidate_aabb(self, agent_location: Coordinate, cell_size: Size) -> None:
+    """Marks the AABB as needing to be recalculated for a new location."""
+    self._pending_aabb = (agent_location, cell_size)
+
+  def invalidate_frustum(self, agent_location: Coordinate, facing: Vector, cell_size: Size) -> None:
+    """Marks the frustum as needing to be recalculated for a new location or direction."""
+    self._pending_frustum = (agent_location, facing, cell_size)
+
+  @property
+  def is_aabb_dirty(self) -> bool:
+    return self._pending_aabb is not None
+
+  @property
+  def is_frustum_dirty(self) -> bool:
+    return self._pending_frustum is not None
 
   @abstractmethod
   def calculate_aabb(self, agent_location: Coordinate, cell_size: Size) -> None:
-    """Calculates an axis-aligned bounding box for the agent."""
\ No newline at end of file
+    """Calculates an axis-aligned bounding box for the agent."""
@@ -4,11 +4,11 @@ Experimental module for having loosely defined agents to support project extensi
 
 from __future__ import annotations
 
-from typing import Dict, List, Protocol
+from typing import Any, Collection, Dict, Hashable, List, Optional, Protocol, Sequence
 from agents_playground.agents.memory.agent_memory_model import AgentMemoryModel
 from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
 
-from agents_playground.agents.spec.agent_system import AgentSystemLike
+from agents_playground.agents.spec.agent_system import AgentSystemLike, SystemBatch, system_hierarchy
 from agents_playground.agents.spec.agent_identity_spec import AgentIdentityLike
 from agents_playground.agents.spec.agent_life_cycle_phase import AgentLifeCyclePhase
 from agents_playground.agents.spec.agent_movement_attributes import AgentMovementAttributes
@@ -32,6 +32,7 @@ class AgentLike(FrameTick, Protocol):
   movement: AgentMovementAttributes  # Attributes used for movement.
   style: AgentStyleLike              # Define's the agent's look.
   memory: AgentMemoryModel           # The memory store for the agent.
+  _characteristics: Optional[AgentCharacteristics] # The bundle agent_characteristics() reuses. Set on first use.
 
   """
   Thoughts:
@@ -64,6 +65,39 @@ class AgentLike(FrameTick, Protocol):
     self._post_state_change_process_subsystems(characteristics, other_agents)
     self._post_state_change(characteristics)
 
+  def transition_state_reduced(
+    self, 
+    other_agents: Dict[Tag, AgentLike], 
+    systems: Optional[Collection[str]] = None,
+    change_state: bool = True
+  ) -> None:
+    """
+    Moves the agent forward one tick with less work than transition_state.
+    Used for agents that are simulated at a lower level of detail.
+
+    Args:
+      - other_agents: The agents near the agent.
+      - systems: The names of the subsystems of internal_systems to process. 
+        None processes all of them.
+      - change_state: If False, the agent stays in its current action state.
+    """
+    if systems is None and change_state:
+      self.transition_state(other_agents)
+      return
+    characteristics = self.agent_characteristics()
+    self._before_state_change(characteristics)
+    if systems is None:
+      self._pre_state_change_process_subsystems(characteristics, other_agents)
+    elif len(systems) > 0:
+      self.internal_systems.process_selected(characteristics, AgentLifeCyclePhase.PRE_STATE_CHANGE, other_agents, systems)
+    if change_state:
+      self._change_state(characteristics)
+    if systems is None:
+      self._post_state_change_process_subsystems(characteristics, other_agents)
+    elif len(systems) > 0:
+      self.internal_systems.process_selected(characteristics, AgentLifeCyclePhase.POST_STATE_CHANGE, other_agents, systems)
+    self._post_state_change(characteristics)
+
   def tick(self) -> None:
     """Signifies the passing of a simulation frame."""
     self.memory.tick()
@@ -72,8 +106,21 @@ class AgentLike(FrameTick, Protocol):
     self.agent_state.transition_to_next_action(characteristics)
 
   def agent_characteristics(self) -> AgentCharacteristics:
-    """Bundles the agent characteristics."""
-    return AgentCharacteristics(
+    """
+    Bundles the agent characteristics. The bundle is reused from tick to tick 
+    until one of the agent's parts is replaced.
+    """
+    cached: AgentCharacteristics | None = getattr(self, '_characteristics', None)
+    if (
+      cached is None or
+      cached.identity is not self.identity or
+      cached.physicality is not self.physicality or
+      cached.position is not self.position or
+      cached.movement is not self.movement or
+      cached.style is not self.style or
+      cached.memory is not self.memory
+    ):
+      cached = AgentCharacteristics(
         self.identity, 
         self.physicality,
         self.position,
@@ -81,6 +128,8 @@ class AgentLike(FrameTick, Protocol):
         self.style,
         self.memory
       )
+      self._characteristics = cached
+    return cached
 
   def reset(self) -> None:
     """Reset the agent state."""
@@ -100,14 +149,14 @@ class AgentLike(FrameTick, Protocol):
     """Set the direction the agent is facing."""
     self.agent_state.require_scene_graph_update = True
     self.position.facing = direction
-    self.physicality.frustum.update(self.position.location, self.position.facing, cell_size)
+    self.physicality.invalidate_frustum(self.position.location, self.position.facing, cell_size)
 
   def move_to(self, new_location: Coordinate, cell_size: Size) -> None:
     """Update the agent's location."""
     self.agent_state.require_scene_graph_update = True
     self.position.move_to(new_location)
-    self.physicality.calculate_aabb(self.position.location, cell_size)
-    self.physicality.frustum.update(self.position.location, self.position.facing, cell_size)
+    self.physicality.invalidate_aabb(self.position.location, cell_size)
+    self.physicality.invalidate_frustum(self.position.location, self.position.facing, cell_size)
 
   def scale(self, amount: float) -> None:
     """Applies a scaling factor to the agent's size along both axes."""
@@ -151,4 +200,52 @@ class AgentLike(FrameTick, Protocol):
   
   def _post_state_change_process_subsystems(self, characteristics: AgentCharacteristics, other_agents: Dict[Tag, AgentLike]) -> None:
     """Internal hook responsible for processing the subsystems before the agents status changes."""
-    self.internal_systems.process(characteristics, AgentLifeCyclePhase.POST_STATE_CHANGE, other_agents)
\ No newline at end of file
+    self.internal_systems.process(characteristics, AgentLifeCyclePhase.POST_STATE_CHANGE, other_agents)
+
+def transition_states_batched(
+  agents: Sequence[AgentLike], 
+  other_agents: Sequence[Dict[Tag, AgentLike]],
+  scene: Any = None
+) -> None:
+  """
+  Moves a group of agents forward one tick. Each of the agents' systems 
+  processes all of the agents in one call (AgentSystemLike.process_batch) 
+  rather than the hierarchy being walked once per agent. Agents are batched 
+  with the other agents whose systems have the same hierarchy.
+
+  Unlike calling transition_state on each agent, every agent's systems are 
+  processed before any of the agents change state. AgentLike overrides of 
+  _pre_state_change_process_subsystems and _post_state_change_process_subsystems
+  are not used.
+
+  Args:
+    - agents: The agents to move forward.
+    - other_agents: The neighbors of each agent, in the same order.
+    - scene: The scene the agents are in. Passed to the systems.
+  """
+  characteristics: List[AgentCharacteristics] = [agent.agent_characteristics() for agent in agents]
+  grouped: Dict[Hashable, List[int]] = {}
+  for index, agent in enumerate(agents):
+    grouped.setdefault(system_hierarchy(agent.internal_systems), []).append(index)
+  batches: List[SystemBatch] = [
+    SystemBatch(
+      agents            = [agents[index] for index in indices],
+      systems           = [agents[index].internal_systems for index in indices],
+      characteristics   = [characteristics[index] for index in indices],
+      other_agents      = [other_agents[index] for index in indices],
+      parent_byproducts = [{} for _ in indices],
+      scene             = scene
+    )
+    for indices in grouped.values()
+  ]
+
+  for agent, agent_characteristics in zip(agents, characteristics):
+    agent._before_state_change(agent_characteristics)
+  for batch in batches:
+    batch.systems[0].process_batch(batch, AgentLifeCyclePhase.PRE_STATE_CHANGE)
+  for agent, agent_characteristics in zip(agents, characteristics):
+    agent._change_state(agent_characteristics)
+  for batch in batches:
+    batch.systems[0].process_batch(batch, AgentLifeCyclePhase.POST_STATE_CHANGE)
+  for agent, agent_characteristics in zip(agents, characteristics):
+    agent._post_state_change(agent_characteristics)
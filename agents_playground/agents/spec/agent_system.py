@@ -1,14 +1,14 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+from enum import Enum, auto
 from types import SimpleNamespace
-from typing import Any, Dict, List, Protocol
+from typing import Any, Collection, Dict, Hashable, List, NamedTuple, Optional, Protocol, Tuple
 from typing_extensions import Self
-from more_itertools import consume
 
 from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
 from agents_playground.agents.spec.agent_life_cycle_phase import AgentLifeCyclePhase
 from agents_playground.agents.spec.byproduct_definition import ByproductDefinition
-from agents_playground.agents.spec.byproduct_store import ByproductStore
+from agents_playground.agents.spec.byproduct_store import ByproductChannel, Byproducts, ByproductStore
 import agents_playground.agents.spec.agent_spec as agent_spec
 from agents_playground.simulation.tag import Tag
 
@@ -24,6 +24,195 @@ class SystemMemoryError(Exception):
   def __init__(self, *args: object) -> None:
     super().__init__(*args)
   
+class SystemBatch(NamedTuple):
+  """
+  The inputs of a system for a batch of agents. The lists are aligned by agent.
+  The systems are each agent's own instance of the system being processed.
+  """
+  agents: List[agent_spec.AgentLike]
+  systems: List[AgentSystemLike]
+  characteristics: List[AgentCharacteristics]
+  other_agents: List[Dict[Tag, agent_spec.AgentLike]]
+  parent_byproducts: List[Byproducts]
+  scene: Any # The Scene the agents are in, if any.
+
+  def for_subsystem(self, name: str) -> SystemBatch:
+    """The batch for the subsystem with the given name of the batch's systems."""
+    return self._replace(
+      systems           = [getattr(system.subsystems, name) for system in self.systems],
+      parent_byproducts = [system.byproducts_store.byproducts for system in self.systems]
+    )
+
+def system_hierarchy(system: AgentSystemLike) -> Hashable:
+  """
+  The shape of a system hierarchy. Agents whose systems have the same shape
+  can be processed in the same batch.
+  """
+  return (
+    type(system), 
+    system.name, 
+    tuple(system_hierarchy(subsystem) for subsystem in system.subsystems.__dict__.values())
+  )
+
+class PlanAction(Enum):
+  HOOK    = auto() # Call a before or after hook of a system.
+  ROUTE   = auto() # Link the byproducts of a system's subsystems into its store.
+  COLLECT = auto() # Call a system's own _collect_byproducts_from_subsystems.
+  PROCESS = auto() # Call process() on a system that orchestrates itself.
+
+# A subsystem, its store, and the (parent channel, subsystem channel) pairs 
+# of the byproducts it passes up.
+ByproductRoute = Tuple['AgentSystemLike', ByproductStore, Tuple[Tuple[ByproductChannel, ByproductChannel], ...]]
+
+class PlanStep(NamedTuple):
+  action: PlanAction
+  system: AgentSystemLike # The system whose method the step calls, or whose subsystems it routes.
+  method: str # The name of the method. It is looked up when the step is run.
+  parent_byproducts: Optional[Byproducts] # None means the byproducts passed to process().
+  routes: Tuple[ByproductRoute, ...]
+
+# The hooks that are called before and after the subsystems, by phase.
+PHASE_HOOKS: Dict[AgentLifeCyclePhase, Tuple[str, str]] = {
+  AgentLifeCyclePhase.PRE_STATE_CHANGE: (
+    '_before_subsystems_processed_pre_state_change', 
+    '_after_subsystems_processed_pre_state_change'
+  ),
+  AgentLifeCyclePhase.POST_STATE_CHANGE: (
+    '_before_subsystems_processed_post_state_change', 
+    '_after_subsystems_processed_post_state_change'
+  )
+}
+
+# A system that overrides any of these controls its own processing. It is a
+# single step in its parent's plan.
+ORCHESTRATION_METHODS: Tuple[str, ...] = (
+  'process', 
+  '_process_subsystems', 
+  '_before_subsystems_processed', 
+  '_after_subsystems_processed'
+)
+
+# Counts the calls to invalidate_execution_plans() without a system. Plans 
+# compiled before the latest call are rebuilt the next time they're used.
+_generation: int = 0
+
+def invalidate_execution_plans(system: Optional[AgentSystemLike] = None) -> None:
+  """
+  Forces execution plans to be rebuilt. Plans are rebuilt automatically when 
+  a subsystem is registered, or set on or deleted from a system's subsystems.
+  Call this after replacing one of a system's hooks.
+
+  Args:
+    - system: The system that changed. Its plans and those of the systems 
+      above it are rebuilt. If None, every system's plans are rebuilt.
+  """
+  if system is None:
+    global _generation
+    _generation += 1
+    return
+  changed: Optional[AgentSystemLike] = system
+  while changed is not None:
+    changed._plans = None
+    changed = changed._parent
+
+def _overrides(system: AgentSystemLike, method_name: str) -> bool:
+  """True if a system replaces one of AgentSystemLike's methods."""
+  return (
+    method_name in getattr(system, '__dict__', {}) or 
+    getattr(type(system), method_name, None) is not getattr(AgentSystemLike, method_name)
+  )
+
+def _orchestrates_itself(system: AgentSystemLike) -> bool:
+  for method_name in ORCHESTRATION_METHODS:
+    if _overrides(system, method_name):
+      return True
+  return False
+
+def compile_execution_plan(system: AgentSystemLike, agent_phase: AgentLifeCyclePhase) -> Optional[List[PlanStep]]:
+  """
+  Flattens a system hierarchy into the steps that do work in a phase, in the
+  order process() would do them. Hooks that aren't overridden are left out
+  and the byproducts each step is given are resolved ahead of time.
+
+  Returns
+    The steps, or None if the system controls its own processing or the
+    phase is unknown.
+  """
+  if agent_phase not in PHASE_HOOKS or _orchestrates_itself(system):
+    return None
+  steps: List[PlanStep] = []
+  _compile_system(system, agent_phase, None, steps)
+  return steps
+
+def _compile_system(
+  system: AgentSystemLike, 
+  agent_phase: AgentLifeCyclePhase,
+  parent_byproducts: Optional[Byproducts],
+  steps: List[PlanStep]
+) -> None:
+  before_hook, after_hook = PHASE_HOOKS[agent_phase]
+  if _overrides(system, before_hook):
+    steps.append(PlanStep(PlanAction.HOOK, system, before_hook, parent_byproducts, ()))
+
+  byproducts = system.byproducts_store.byproducts
+  subsystems: List[AgentSystemLike] = list(system.subsystems.__dict__.values())
+  for subsystem in subsystems:
+    if _orchestrates_itself(subsystem):
+      steps.append(PlanStep(PlanAction.PROCESS, subsystem, 'process', byproducts, ()))
+    else:
+      _compile_system(subsystem, agent_phase, byproducts, steps)
+
+  if _overrides(system, after_hook):
+    steps.append(PlanStep(PlanAction.HOOK, system, after_hook, parent_byproducts, ()))
+
+  if _overrides(system, '_collect_byproducts_from_subsystems'):
+    steps.append(PlanStep(PlanAction.COLLECT, system, '_collect_byproducts_from_subsystems', None, ()))
+  elif len(subsystems) > 0:
+    routes: List[ByproductRoute] = []
+    for subsystem in subsystems:
+      subsystem_byproducts = subsystem.byproducts_store.byproducts
+      channels = tuple(
+        (byproducts[byproduct_def.name], subsystem_byproducts[byproduct_def.name])
+        for byproduct_def in subsystem.byproducts_definitions
+        if byproduct_def.name in subsystem_byproducts
+      )
+      routes.append((subsystem, subsystem.byproducts_store, channels))
+    steps.append(PlanStep(PlanAction.ROUTE, system, '', None, tuple(routes)))
+
+def _route_byproducts(routes: Tuple[ByproductRoute, ...]) -> None:
+  """The same as _collect_byproducts_from_subsystems, with the channels looked up ahead of time."""
+  for subsystem, store, channels in routes:
+    if store.is_empty:
+      continue
+    for parent_channel, subsystem_channel in channels:
+      parent_channel.link(subsystem_channel)
+    subsystem.clear_byproducts()
+
+class Subsystems(SimpleNamespace):
+  """
+  A system's subsystems by name. Setting or deleting a subsystem rebuilds the 
+  execution plans of the system and the systems above it.
+  """
+  __slots__ = ('_owner',)
+
+  def __init__(self, owner: Optional[AgentSystemLike] = None) -> None:
+    super().__init__()
+    object.__setattr__(self, '_owner', owner)
+
+  def __setattr__(self, name: str, value: Any) -> None:
+    super().__setattr__(name, value)
+    value._parent = self._owner
+    invalidate_execution_plans(self._owner)
+
+  def __delattr__(self, name: str) -> None:
+    subsystem = getattr(self, name)
+    super().__delattr__(name)
+    subsystem._parent = None
+    invalidate_execution_plans(self._owner)
+
+  def __reduce__(self) -> Tuple[Any, ...]:
+    return (Subsystems, (self._owner,), dict(self.__dict__))
+
 class AgentSystemLike(Protocol):
   """
   An agent system is a hierarchy of systems that is scoped to the internal workings
@@ -47,6 +236,13 @@ class AgentSystemLike(Protocol):
   # Note: The byproducts_definitions and internal_byproducts_definitions must not 
   # overlap. Each byproduct may only be defined once.
   internal_byproducts_definitions: List[ByproductDefinition] 
+
+  _parent: Optional[AgentSystemLike] = None # The system this system is registered with.
+
+  # The compiled execution plans by phase, and the value of _generation when 
+  # they were compiled.
+  _plans: Optional[Dict[AgentLifeCyclePhase, Optional[List[PlanStep]]]] = None
+  _plans_compiled_at: int = -1
   
   def register_system(
     self, 
@@ -63,6 +259,8 @@ class AgentSystemLike(Protocol):
     """
     self._register_system(subsystem)
     self.byproducts_store.register_subsystem_byproducts(self.name, subsystem.name, subsystem.byproducts_definitions)
+    subsystem._parent = self
+    invalidate_execution_plans(self)
     return self 
   
   def _register_system(self,subsystem: AgentSystemLike) -> None:
@@ -82,43 +280,130 @@ class AgentSystemLike(Protocol):
     characteristics: AgentCharacteristics, 
     agent_phase: AgentLifeCyclePhase,
     other_agents: Dict[Tag, agent_spec.AgentLike],
-    parent_byproducts: dict[str, list] = {}
+    parent_byproducts: Byproducts = {}
   ) -> None:
     """Orchestrates the processing of the system.
 
+    The hierarchy is run from an execution plan that is compiled once per
+    phase (see compile_execution_plan). Hooks that do nothing aren't called.
+    The plan is rebuilt when a system is registered.
+
     Args
       - characteristics: The aspects of an agent that can be used as inputs to the system.
       - agent_phase: The specific phase the agent is currently in.
       - byproducts: A generic structure to allow collecting outputs from the various subsystems.
     """
+    plan = self._execution_plan(agent_phase)
+    if plan is None:
+      self._before_subsystems_processed(characteristics, agent_phase, parent_byproducts, other_agents)
+      self._process_subsystems(characteristics, agent_phase, other_agents)
+      self._after_subsystems_processed(characteristics, agent_phase, parent_byproducts, other_agents) 
+      self._collect_byproducts_from_subsystems()
+      return
+
+    for action, system, method, byproducts, routes in plan:
+      if action is PlanAction.HOOK:
+        getattr(system, method)(characteristics, parent_byproducts if byproducts is None else byproducts, other_agents)
+      elif action is PlanAction.ROUTE:
+        _route_byproducts(routes)
+      elif action is PlanAction.COLLECT:
+        system._collect_byproducts_from_subsystems()
+      else:
+        system.process(characteristics, agent_phase, other_agents, byproducts) # type: ignore[arg-type]
+
+  def process_selected(
+    self, 
+    characteristics: AgentCharacteristics, 
+    agent_phase: AgentLifeCyclePhase,
+    other_agents: Dict[Tag, agent_spec.AgentLike],
+    subsystem_names: Collection[str],
+    parent_byproducts: Byproducts = {}
+  ) -> None:
+    """
+    Processes the system with only some of its subsystems. The system's own 
+    hooks are still called. Used to run agents at a lower level of detail.
+
+    Args
+      - characteristics: The aspects of an agent that can be used as inputs to the system.
+      - agent_phase: The specific phase the agent is currently in.
+      - other_agents: The agents near the agent.
+      - subsystem_names: The names of the direct subsystems to process. The others are skipped.
+      - parent_byproducts: A generic structure to allow collecting outputs from the various subsystems.
+    """
     self._before_subsystems_processed(characteristics, agent_phase, parent_byproducts, other_agents)
-    self._process_subsystems(characteristics, agent_phase, other_agents)
+    byproducts = self.byproducts_store.byproducts
+    subsystem: AgentSystemLike
+    for subsystem in self.subsystems.__dict__.values():
+      if subsystem.name in subsystem_names:
+        subsystem.process(characteristics, agent_phase, other_agents, byproducts)
     self._after_subsystems_processed(characteristics, agent_phase, parent_byproducts, other_agents) 
     self._collect_byproducts_from_subsystems()
 
+  def _execution_plan(self, agent_phase: AgentLifeCyclePhase) -> Optional[List[PlanStep]]:
+    """The system's compiled plan for a phase. Compiled on first use and after any change to a hierarchy."""
+    plans = self._plans
+    if plans is None or self._plans_compiled_at != _generation:
+      plans = {}
+      self._plans = plans
+      self._plans_compiled_at = _generation
+    if agent_phase not in plans:
+      plans[agent_phase] = compile_execution_plan(self, agent_phase)
+    return plans[agent_phase]
+
+  def process_batch(self, batch: SystemBatch, agent_phase: AgentLifeCyclePhase) -> None:
+    """
+    Processes the system for a batch of agents in one call. It is called on the
+    first agent's instance of the system and all of the agents' systems must
+    have the same hierarchy.
+
+    The steps are the same as process(), but each step is done for every agent 
+    before the next one starts. By default each step calls the agents' own
+    hooks in turn. Systems can override process_batch or the _batch hooks to 
+    share work across the agents or to process them all at once.
+
+    Args
+      - batch: The agents and their instances of this system.
+      - agent_phase: The specific phase the agents are currently in.
+    """
+    self._before_subsystems_processed_batch(batch, agent_phase)
+    self._process_subsystems_batch(batch, agent_phase)
+    self._after_subsystems_processed_batch(batch, agent_phase)
+    system: AgentSystemLike
+    for system in batch.systems:
+      system._collect_byproducts_from_subsystems()
+
+  def _process_subsystems_batch(self, batch: SystemBatch, agent_phase: AgentLifeCyclePhase) -> None:
+    for name, subsystem in self.subsystems.__dict__.items():
+      subsystem.process_batch(batch.for_subsystem(name), agent_phase)
+
+  def _before_subsystems_processed_batch(self, batch: SystemBatch, agent_phase: AgentLifeCyclePhase) -> None:
+    for system, characteristics, parent_byproducts, other_agents in zip(
+      batch.systems, batch.characteristics, batch.parent_byproducts, batch.other_agents
+    ):
+      system._before_subsystems_processed(characteristics, agent_phase, parent_byproducts, other_agents)
+
+  def _after_subsystems_processed_batch(self, batch: SystemBatch, agent_phase: AgentLifeCyclePhase) -> None:
+    for system, characteristics, parent_byproducts, other_agents in zip(
+      batch.systems, batch.characteristics, batch.parent_byproducts, batch.other_agents
+    ):
+      system._after_subsystems_processed(characteristics, agent_phase, parent_byproducts, other_agents)
+
   def _process_subsystems(
     self, 
     characteristics: AgentCharacteristics, 
     agent_phase: AgentLifeCyclePhase, 
     other_agents: Dict[Tag, agent_spec.AgentLike]
   ) -> None:
-    consume(
-      map(
-        lambda subsystem: subsystem.process(
-          characteristics, 
-          agent_phase, 
-          other_agents,
-          self.byproducts_store.byproducts
-        ), 
-        self.subsystems.__dict__.values()
-      )
-    ) 
+    byproducts = self.byproducts_store.byproducts
+    subsystem: AgentSystemLike
+    for subsystem in self.subsystems.__dict__.values():
+      subsystem.process(characteristics, agent_phase, other_agents, byproducts)
 
   def _before_subsystems_processed(
     self, 
     characteristics: AgentCharacteristics, 
     agent_phase: AgentLifeCyclePhase,
-    parent_byproducts: Dict[str, List],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, agent_spec.AgentLike]
   ) -> None:
     match agent_phase:
@@ -138,7 +423,7 @@ class AgentSystemLike(Protocol):
     self, 
     characteristics: AgentCharacteristics, 
     agent_phase: AgentLifeCyclePhase,
-    parent_byproducts: Dict[str, List],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, agent_spec.AgentLike]
   ) -> None:
     match agent_phase:
@@ -165,17 +450,25 @@ class AgentSystemLike(Protocol):
     Note: We're purposefully not passing down a single store to enable systems 
     to have isolated stores. Only byproducts that they register with their parent
     are passed up. After byproducts are collected the subsystem stores are cleared.
+    The collected entries aren't copied. See ByproductChannel.
     """
     subsystem: AgentSystemLike
     byproduct_def: ByproductDefinition
 
+    byproducts = self.byproducts_store.byproducts
     for subsystem in self.subsystems.__dict__.values():
+      # Most systems produce nothing most frames. Their stores are skipped.
+      if subsystem.byproducts_store.is_empty:
+        continue
+      subsystem_byproducts = subsystem.byproducts_store.byproducts
       for byproduct_def in subsystem.byproducts_definitions:
-        byproduct = subsystem.byproducts_store.byproducts.get(byproduct_def.name, [])
-        self.byproducts_store.byproducts[byproduct_def.name].extend(byproduct)
+        # The parent links to the subsystem's entries rather than copying them.
+        byproduct = subsystem_byproducts.get(byproduct_def.name)
+        if byproduct is not None:
+          byproducts[byproduct_def.name].link(byproduct)
       subsystem.clear_byproducts()
     
-  def _push_byproducts_to_parent(self, parent_byproducts: Dict[str, List]) -> None:
+  def _push_byproducts_to_parent(self, parent_byproducts: Byproducts) -> None:
     """
     A convenience method that pushes the active system's registered byproducts to 
     the parent system. This is intended to be used in systems that cannot wait for 
@@ -185,10 +478,13 @@ class AgentSystemLike(Protocol):
     child systems.
     """
     for byproduct_def in self.byproducts_definitions:
-      byproduct = self.byproducts_store.byproducts.get(byproduct_def.name, [])
+      byproduct = self.byproducts_store.byproducts.get(byproduct_def.name)
       if byproduct_def.name in parent_byproducts:
-        self.byproducts_store.byproducts.get(byproduct_def.name)
-        parent_byproducts[byproduct_def.name].extend(byproduct)
+        parent_byproduct = parent_byproducts[byproduct_def.name]
+        if byproduct is None or byproduct.is_empty:
+          continue
+        # The active system keeps its entries. The parent links to them.
+        parent_byproduct.link(byproduct, consume = False)
       else:
         error_msg = f"""
         System Processing Error
@@ -200,7 +496,7 @@ class AgentSystemLike(Protocol):
   def _before_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: Dict[str, List], 
+    parent_byproducts: Byproducts, 
     other_agents: Dict[Tag, agent_spec.AgentLike]) -> None:
     """
     An optional hook for doing work before the agent's state changes.
@@ -210,7 +506,7 @@ class AgentSystemLike(Protocol):
   def _before_subsystems_processed_post_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: Dict[str, List], 
+    parent_byproducts: Byproducts, 
     other_agents: Dict[Tag, agent_spec.AgentLike]) -> None:
     """
     An optional hook for doing work after the agent's state changes.
@@ -220,7 +516,7 @@ class AgentSystemLike(Protocol):
   def _after_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: Dict[str, List],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, agent_spec.AgentLike]) -> None:
     """
     An optional hook for doing work before the agent's state changes.
@@ -230,7 +526,7 @@ class AgentSystemLike(Protocol):
   def _after_subsystems_processed_post_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: Dict[str, List],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, agent_spec.AgentLike]) -> None:
     """
     An optional hook for doing work after the agent's state changes.
@@ -1,5 +1,9 @@
 from typing import NamedTuple
 
+# How many entries a byproduct channel holds before the oldest are overwritten.
+DEFAULT_BYPRODUCT_CAPACITY: int = 64
+
 class ByproductDefinition(NamedTuple):
   name: str
-  type: type
\ No newline at end of file
+  type: type
+  capacity: int = DEFAULT_BYPRODUCT_CAPACITY # The size of the byproduct's ring buffers.
\ No newline at end of file
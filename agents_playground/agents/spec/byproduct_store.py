@@ -1,7 +1,6 @@
-
-from typing import Any, List
-from more_itertools import consume
-from agents_playground.agents.spec.byproduct_definition import ByproductDefinition
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from agents_playground.agents.spec.byproduct_definition import DEFAULT_BYPRODUCT_CAPACITY, ByproductDefinition
 
 class ByproductRegistrationError(Exception):
   def __init__(self, *args: object) -> None:
@@ -11,18 +10,249 @@ class ByproductStorageError(Exception):
   def __init__(self, *args: object) -> None:
     super().__init__(*args)
 
+class ByproductChannel:
+  """
+  The values of one byproduct in a system's store.
+
+  A channel is a preallocated ring buffer of entries. An entry is either a
+  value or a link to a range of another channel's entries. When a parent
+  system collects a byproduct from a subsystem, the parent links to the
+  subsystem's entries rather than copying them, and the subsystem's channel
+  is emptied by moving its start past them.
+
+  Linked entries are pinned in the subsystem's ring until every parent that
+  links to them is cleared. Pins are counted per entry, so an entry can be
+  linked by more than one parent. Pinned entries are never overwritten. If the
+  ring is full of them it grows instead.
+
+  When a channel is full of entries that aren't pinned, the oldest entry is
+  overwritten and counted in overflowed. Size the channel with
+  ByproductDefinition.capacity so that doesn't happen within a frame.
+
+  Entries are tracked with sequence numbers that only increase. An entry's
+  slot in the ring is its sequence number modulo the capacity.
+  """
+  def __init__(self, capacity: int = DEFAULT_BYPRODUCT_CAPACITY) -> None:
+    if capacity < 1:
+      raise ByproductRegistrationError(f'A byproduct channel must have a capacity of at least 1. Received {capacity}.')
+    self.capacity: int = capacity
+    self.overflowed: int = 0 # The number of entries overwritten before they were cleared.
+    self._values: List[Any] = [None] * capacity # Values, or the start of the linked range of link entries.
+    self._sources: List[Optional[ByproductChannel]] = [None] * capacity # The linked channel of link entries.
+    self._ends: List[int] = [0] * capacity # The end of the linked range of link entries.
+    self._sizes: List[int] = [0] * capacity # The number of values an entry holds.
+    self._written: int = 0 # The sequence number of the next entry.
+    self._start: int = 0   # The sequence number of the first entry that hasn't been cleared.
+    self._count: int = 0   # The number of values in the entries that haven't been cleared.
+    self._oldest: int = 0  # The sequence number of the oldest entry that is either pinned or not cleared.
+    self._pins: List[int] = [0] * capacity # The number of parent links to each entry.
+
+  def append(self, value: Any) -> None:
+    slot = self._reserve()
+    self._values[slot] = value
+    self._sources[slot] = None
+    self._sizes[slot] = 1
+    self._count += 1
+
+  def extend(self, values: Iterable[Any]) -> None:
+    """Copies the values into the channel. Use link() to avoid copying another channel."""
+    for value in values:
+      self.append(value)
+
+  def link(self, source: ByproductChannel, consume: bool = True) -> None:
+    """
+    Adds the entries of another channel without copying them.
+
+    Args:
+      - source: The channel to link to.
+      - consume: If True, the source is emptied. Its entries are kept for
+        this channel until it is cleared.
+    """
+    start, end = source._start, source._written
+    if start == end:
+      return
+    size = source._count
+    source._pin(start, end)
+    if consume:
+      source._start = end
+      source._count = 0
+      source._advance_oldest()
+    slot = self._reserve()
+    self._values[slot] = start
+    self._sources[slot] = source
+    self._ends[slot] = end
+    self._sizes[slot] = size
+    self._count += size
+
+  def clear(self) -> None:
+    """Empties the channel. Links to other channels that are no longer needed are released."""
+    if self._start == self._written:
+      return
+    # Entries a parent links to are released when the parent is cleared.
+    for sequence in range(self._start, self._written):
+      if self._pins[sequence % self.capacity] == 0:
+        self._release_link(sequence)
+    self._start = self._written
+    self._count = 0
+    self._advance_oldest()
+
+  def __iter__(self) -> Iterator[Any]:
+    return self._iterate(self._start, self._written)
+
+  def __len__(self) -> int:
+    return self._count
+
+  def __bool__(self) -> bool:
+    return self._count > 0
+
+  def __getitem__(self, index: int) -> Any:
+    if isinstance(index, slice):
+      return list(self)[index]
+    if index < 0:
+      index += self._count
+    if index < 0 or index >= self._count:
+      raise IndexError(f'Byproduct index {index} is out of range.')
+    # Whole entries are skipped by their size. Links are followed down to the value.
+    channel: ByproductChannel = self
+    sequence = self._start
+    while True:
+      slot = sequence % channel.capacity
+      size = channel._sizes[slot]
+      if index >= size:
+        index -= size
+        sequence += 1
+        continue
+      source = channel._sources[slot]
+      if source is None:
+        return channel._values[slot]
+      sequence = channel._values[slot]
+      channel = source
+
+  def __eq__(self, other: object) -> bool:
+    if isinstance(other, (ByproductChannel, list, tuple)):
+      return list(self) == list(other)
+    return False
+
+  def __repr__(self) -> str:
+    return f'{self.__class__.__name__}({list(self)}, capacity={self.capacity}, overflowed={self.overflowed})'
+
+  @property
+  def is_empty(self) -> bool:
+    """True if nothing has been added since the channel was last emptied. Doesn't follow links."""
+    return self._start == self._written
+
+  def _reserve(self) -> int:
+    """Claims the slot of the next entry. Overwrites the oldest entry if the channel is full."""
+    if self._written - self._oldest == self.capacity:
+      if self._oldest < self._start or self._pins[self._oldest % self.capacity] > 0:
+        self._grow()
+      else:
+        # The oldest entry is the first uncleared one and no parent links to it.
+        self.overflowed += 1
+        self._count -= self._sizes[self._start % self.capacity]
+        self._release_link(self._start)
+        self._start += 1
+        self._oldest = self._start
+    slot = self._written % self.capacity
+    self._written += 1
+    return slot
+
+  def _grow(self) -> None:
+    """Doubles the ring. The retained entries move to their slots in the larger ring."""
+    capacity = self.capacity * 2
+    values: List[Any] = [None] * capacity
+    sources: List[Optional[ByproductChannel]] = [None] * capacity
+    ends: List[int] = [0] * capacity
+    sizes: List[int] = [0] * capacity
+    pins: List[int] = [0] * capacity
+    for sequence in range(self._oldest, self._written):
+      old_slot, new_slot = sequence % self.capacity, sequence % capacity
+      values[new_slot] = self._values[old_slot]
+      sources[new_slot] = self._sources[old_slot]
+      ends[new_slot] = self._ends[old_slot]
+      sizes[new_slot] = self._sizes[old_slot]
+      pins[new_slot] = self._pins[old_slot]
+    self.capacity = capacity
+    self._values, self._sources, self._ends, self._sizes, self._pins = values, sources, ends, sizes, pins
+
+  def _pin(self, start: int, end: int) -> None:
+    """Called by a parent that links to the entries from start to end."""
+    for sequence in range(start, end):
+      self._pins[sequence % self.capacity] += 1
+
+  def _unpin(self, start: int, end: int) -> None:
+    """Called by a parent when it no longer links to the entries from start to end."""
+    for sequence in range(start, end):
+      slot = sequence % self.capacity
+      self._pins[slot] -= 1
+      # Cleared entries that were only kept for a parent can release their links.
+      if self._pins[slot] == 0 and sequence < self._start:
+        self._release_link(sequence)
+    self._advance_oldest()
+
+  def _advance_oldest(self) -> None:
+    """Moves the oldest retained entry past the cleared entries no parent links to."""
+    while self._oldest < self._start and self._pins[self._oldest % self.capacity] == 0:
+      self._oldest += 1
+
+  def _release_link(self, sequence: int) -> None:
+    slot = sequence % self.capacity
+    source = self._sources[slot]
+    if source is not None:
+      self._sources[slot] = None
+      source._unpin(self._values[slot], self._ends[slot])
+
+  def _iterate(self, start: int, end: int) -> Iterator[Any]:
+    # Links are followed with a stack rather than nested generators, which
+    # would allocate a generator per level of the system hierarchy.
+    channel: ByproductChannel = self
+    pending: List[Tuple[ByproductChannel, int, int]] = []
+    sequence = start
+    while True:
+      if sequence < end:
+        slot = sequence % channel.capacity
+        source = channel._sources[slot]
+        if source is None:
+          yield channel._values[slot]
+          sequence += 1
+        else:
+          pending.append((channel, sequence + 1, end))
+          end = channel._ends[slot]
+          sequence = channel._values[slot]
+          channel = source
+      elif pending:
+        channel, sequence, end = pending.pop()
+      else:
+        return
+
+# A system's byproducts by name.
+Byproducts = Dict[str, ByproductChannel]
+
 class ByproductStore:
   """
   Responsible for storing the outputs of systems.
   """
   def __init__(self) -> None:
-    self._byproducts: dict[str, list] = {}
+    self._byproducts: Byproducts = {}
     self._registered_byproducts: dict[str, ByproductDefinition] = {}
 
   @property
-  def byproducts(self) -> dict[str, list]:
+  def byproducts(self) -> Byproducts:
     return self._byproducts
 
+  @property
+  def is_empty(self) -> bool:
+    """True if none of the byproducts have entries."""
+    for channel in self._byproducts.values():
+      if not channel.is_empty:
+        return False
+    return True
+
+  @property
+  def overflowed(self) -> Dict[str, int]:
+    """The number of entries each byproduct has lost to overflowing its channel."""
+    return {name: channel.overflowed for name, channel in self._byproducts.items()}
+
   def register_system_byproducts(self, system_name: str, byproduct_defs: List[ByproductDefinition]) -> None:
     """
     Registers byproducts that can be collected.
@@ -34,8 +264,7 @@ class ByproductStore:
     byproduct_def: ByproductDefinition
     for byproduct_def in byproduct_defs:
       if not byproduct_def.name in self.byproducts:
-        self._byproducts[byproduct_def.name] = []
-        self._registered_byproducts[byproduct_def.name] = byproduct_def
+        self._add_channel(byproduct_def)
       elif (byproduct_def.name in self._registered_byproducts) and \
         (self._registered_byproducts[byproduct_def.name].type != byproduct_def.type):
         error_msg = f"""
@@ -44,9 +273,11 @@ class ByproductStore:
         byproduct store. However the byproduct was already registered there with a different type.
         """
         raise ByproductRegistrationError(error_msg)
+      else:
+        self._grow_channel(byproduct_def)
 
   def register_subsystem_byproducts(
-    self, 
+    self,
     system_name: str,
     subsystem_name: str,
     subsystem_byproducts: List[ByproductDefinition]
@@ -62,8 +293,7 @@ class ByproductStore:
     byproduct_def: ByproductDefinition
     for byproduct_def in subsystem_byproducts:
       if not byproduct_def.name in self._byproducts:
-        self._byproducts[byproduct_def.name] = []
-        self._registered_byproducts[byproduct_def.name] = byproduct_def
+        self._add_channel(byproduct_def)
       elif (byproduct_def.name in self._registered_byproducts) and \
         (self._registered_byproducts[byproduct_def.name].type != byproduct_def.type):
         error_msg = f"""
@@ -73,7 +303,19 @@ class ByproductStore:
         Byproducts may not have multiple types.
         """
         raise ByproductRegistrationError(error_msg)
-      
+      else:
+        self._grow_channel(byproduct_def)
+
+  def _add_channel(self, byproduct_def: ByproductDefinition) -> None:
+    self._byproducts[byproduct_def.name] = ByproductChannel(byproduct_def.capacity)
+    self._registered_byproducts[byproduct_def.name] = byproduct_def
+
+  def _grow_channel(self, byproduct_def: ByproductDefinition) -> None:
+    """A byproduct registered more than once gets the largest capacity it was declared with."""
+    channel = self._byproducts[byproduct_def.name]
+    if byproduct_def.capacity > channel.capacity and channel.is_empty:
+      self._byproducts[byproduct_def.name] = ByproductChannel(byproduct_def.capacity)
+
   def store(self, system_name: str, byproduct_name: str, value: Any) -> None:
     """
     Record a byproduct produced by a system.
@@ -98,10 +340,18 @@ class ByproductStore:
     """
     Empties the byproducts but keeps the registrations.
     """
-    consume(
-      map(lambda byproduct: byproduct.clear(), 
-          self._byproducts.values())
-    ) 
+    for byproduct in self._byproducts.values():
+      byproduct.clear()
+
+  def snapshot(self) -> Dict[str, List[Any]]:
+    """Copies the byproducts' values into plain lists. For sending them to another process."""
+    return {name: list(channel) for name, channel in self._byproducts.items()}
+
+  def restore(self, snapshot: Dict[str, List[Any]]) -> None:
+    """Replaces the byproducts' values with the ones in a snapshot."""
+    for name, channel in self._byproducts.items():
+      channel.clear()
+      channel.extend(snapshot.get(name, ()))
 
   def __repr__(self) -> str:
     repr = f"""
@@ -109,4 +359,4 @@ class ByproductStore:
     byproducts: {self._byproducts}
     registered byproducts: {self._registered_byproducts}
     """.strip()
-    return repr
\ No newline at end of file
+    return repr
@@ -10,6 +10,7 @@ from agents_playground.agents.memory.memory import Memory
 from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
 from agents_playground.agents.spec.agent_spec import AgentLike
 from agents_playground.agents.spec.agent_system import SystemMemoryError
+from agents_playground.agents.spec.byproduct_store import Byproducts
 from agents_playground.agents.systems.agent_auditory_system import AuditorySensation
 from agents_playground.agents.systems.agent_visual_system import VisualSensation
 from agents_playground.containers.ttl_store import TTLStore
@@ -48,7 +49,7 @@ class AgentAttentionSystem(DefaultAgentSystem):
   def _before_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: dict[str, list],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]
   ) -> None:
     """
@@ -79,7 +80,7 @@ class AgentAttentionSystem(DefaultAgentSystem):
   def _after_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: dict[str, list], 
+    parent_byproducts: Byproducts, 
     other_agents: Dict[Tag, AgentLike]
   ) -> None:
     """
@@ -13,6 +13,7 @@ from agents_playground.agents.byproducts.definitions import Stimuli
 from agents_playground.agents.default.default_agent_system import SystemWithByproducts
 from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
 from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.byproduct_store import Byproducts
 # from agents_playground.agents.spec.agent_memory_spec import Sensation
 # from agents_playground.agents.spec.agent_system import SystemProcessingError
 # from agents_playground.agents.spec.byproduct_definition import ByproductDefinition
@@ -42,7 +43,7 @@ class AgentNervousSystem(SystemWithByproducts):
   def _after_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: dict[str, list], 
+    parent_byproducts: Byproducts, 
     other_agents: Dict[Tag, AgentLike]
   ) -> None:
     # Not waiting on the parent to collect the Stimuli.
@@ -8,6 +8,7 @@ from agents_playground.agents.spec.agent_life_cycle_phase import AgentLifeCycleP
 from agents_playground.agents.spec.agent_spec import AgentLike
 from agents_playground.agents.spec.agent_system import AgentSystemLike
 from agents_playground.agents.spec.byproduct_definition import ByproductDefinition
+from agents_playground.agents.spec.byproduct_store import Byproducts
 from agents_playground.simulation.tag import Tag
 
 class OlfactorySensation(Sensation):
@@ -28,7 +29,7 @@ class AgentOlfactorySystem(SystemWithByproducts):
   def _before_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: dict[str, list],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]
   ) -> None:
     """
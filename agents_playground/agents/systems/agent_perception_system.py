@@ -1,4 +1,4 @@
-from typing import Dict
+from typing import Dict, List
 from agents_playground.agents.byproducts.definitions import Stimuli
 from agents_playground.agents.byproducts.sensation import Sensation
 from agents_playground.agents.default.default_agent_system import SystemWithByproducts
@@ -6,6 +6,7 @@ from agents_playground.agents.memory.memory import Memory
 from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
 from agents_playground.agents.spec.agent_spec import AgentLike
 from agents_playground.agents.spec.agent_system import SystemMemoryError
+from agents_playground.agents.spec.byproduct_store import Byproducts
 from agents_playground.fp.containers import FPList
 from agents_playground.simulation.tag import Tag
 
@@ -22,11 +23,14 @@ class AgentPerceptionSystem(SystemWithByproducts):
       internal_byproduct_defs = []
     )
     self._output_memory_container = output_memory_container
+    # Last frame's memories, in the order of the stimuli. A memory is reused 
+    # if its sensation is stimulated again.
+    self._memories: List[Memory] = []
 
   def _before_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: dict[str, list],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]
   ) -> None:
     """
@@ -35,9 +39,14 @@ class AgentPerceptionSystem(SystemWithByproducts):
     try:
       if Stimuli.name in parent_byproducts:  
         memory_store: FPList[Memory] = characteristics.memory[self._output_memory_container].unwrap()
+        memories = self._memories
         sensation: Sensation
-        for sensation in parent_byproducts[Stimuli.name]:
-          memory_store.append(Memory(sensation))
+        for index, sensation in enumerate(parent_byproducts[Stimuli.name]):
+          if index == len(memories):
+            memories.append(Memory(sensation))
+          elif memories[index].unwrap() is not sensation:
+            memories[index] = Memory(sensation)
+          memory_store.append(memories[index])
     except KeyError:
       error_msg = f'AgentPerceptionSystem requires the agent has a MemoryContainer named {self._output_memory_container}.'
       raise SystemMemoryError(error_msg)
\ No newline at end of file
@@ -7,6 +7,7 @@ from agents_playground.agents.memory.memory import Memory
 from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
 from agents_playground.agents.spec.agent_spec import AgentLike
 from agents_playground.agents.spec.agent_system import SystemMemoryError
+from agents_playground.agents.spec.byproduct_store import Byproducts
 from agents_playground.agents.systems.agent_visual_system import VisualSensation
 from agents_playground.containers.ttl_store import TTLStore
 from agents_playground.core.constants import TARGET_FRAMES_PER_SEC
@@ -48,7 +49,7 @@ class AgentRecognitionSystem(SystemWithByproducts):
   def _before_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: dict[str, list],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]
   ) -> None:
     """
@@ -77,11 +78,13 @@ class AgentRecognitionSystem(SystemWithByproducts):
   def _filter_visual_sensations(self, agent_memory: AgentMemoryModel) -> FPList[VisualSensation]:
     try:
       input_memories:FPList[Memory] = agent_memory[self._input_memory_container].unwrap()
-      sensed_agents: List[VisualSensation] = [
-        sense_memory.unwrap() for sense_memory in input_memories 
-        if isinstance(sense_memory.unwrap(), VisualSensation)
-      ]
-      return FPList(sensed_agents)
+      # Filled in place. Wrapping a list in an FPList would copy it.
+      sensed_agents = FPList[VisualSensation]()
+      for sense_memory in input_memories:
+        sensation = sense_memory.unwrap()
+        if isinstance(sensation, VisualSensation):
+          sensed_agents.data.append(sensation)
+      return sensed_agents
     except KeyError:
       error_msg = f'AgentRecognitionSystem requires the agent has a MemoryContainer named {self._input_memory_container}.'
       raise SystemMemoryError(error_msg)
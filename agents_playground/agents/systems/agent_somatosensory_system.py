@@ -1,5 +1,5 @@
 from types import SimpleNamespace
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from agents_playground.agents.byproducts.definitions import Stimuli
 from agents_playground.agents.byproducts.sensation import Sensation, SensationType
 from agents_playground.agents.default.default_agent_system import SystemWithByproducts
@@ -8,11 +8,17 @@ from agents_playground.agents.spec.agent_life_cycle_phase import AgentLifeCycleP
 from agents_playground.agents.spec.agent_spec import AgentLike
 from agents_playground.agents.spec.agent_system import AgentSystemLike
 from agents_playground.agents.spec.byproduct_definition import ByproductDefinition
+from agents_playground.agents.spec.byproduct_store import Byproducts
 from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.contact import Contact
 
 class SomatosensorySensation(Sensation):
-  def __init__(self) -> None:
+  def __init__(self, touching: Tuple[Contact, ...] = ()) -> None:
     self.type = SensationType.Tactile
+    self.touching: Tuple[Contact, ...] = touching
+
+  def __repr__(self) -> str:
+    return f'{self.__class__.__name__}(type={self.type}, touching={self.touching})'
 
 class AgentSomatosensorySystem(SystemWithByproducts):
   """
@@ -28,11 +34,19 @@ class AgentSomatosensorySystem(SystemWithByproducts):
   def _before_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: dict[str, list],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]
   ) -> None:
     """
     - What is the agent touching? 
     - What is their temperature? Are they hot, cold?
+
+    Contacts are found by the scene's collision system and left on the agent's 
+    physicality.
     """
-    self.byproducts_store.store(self.name, Stimuli.name, SomatosensorySensation())
+    if len(characteristics.physicality.contacts) > 0:
+      self.byproducts_store.store(
+        self.name, 
+        Stimuli.name, 
+        SomatosensorySensation(tuple(characteristics.physicality.contacts))
+      )
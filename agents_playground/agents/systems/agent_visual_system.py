@@ -1,12 +1,17 @@
 from types import SimpleNamespace
-from typing import Dict, List, Tuple
+from typing import Dict, List, NamedTuple, Optional, Tuple, cast
 
 from agents_playground.agents.byproducts.definitions import Stimuli
 from agents_playground.agents.byproducts.sensation import Sensation, SensationType
 from agents_playground.agents.default.default_agent_system import SystemWithByproducts
 from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
+from agents_playground.agents.spec.agent_life_cycle_phase import AgentLifeCyclePhase
 from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.agent_system import SystemBatch
+from agents_playground.agents.spec.byproduct_store import Byproducts
 from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.polygon import Polygon
+from agents_playground.spatial.polygon2d import SeparatingAxis, is_separated, separating_axes
 
 class VisualSensation(Sensation):
   def __init__(self, seen: Tuple[Tag, ...]) -> None:
@@ -37,6 +42,31 @@ class AgentVisualSystem(SystemWithByproducts):
       byproduct_defs          = [Stimuli], 
       internal_byproduct_defs = []
     )
+    # Reused every frame rather than creating garbage. Only the first 
+    # _seen_count entries of _seen are current.
+    self._seen: List[Tag] = []
+    self._seen_count: int = 0
+    self._last_sensation: Optional[VisualSensation] = None
+
+  def _see(self, agent_id: Tag) -> None:
+    if self._seen_count < len(self._seen):
+      self._seen[self._seen_count] = agent_id
+    else:
+      self._seen.append(agent_id)
+    self._seen_count += 1
+
+  def _store_sensation(self) -> None:
+    """
+    Stores what was seen this frame as a VisualSensation. Last frame's 
+    sensation is reused if the same agents were seen.
+    """
+    if self._seen_count == 0:
+      return
+    sensation = self._last_sensation
+    if sensation is None or not _seen_again(sensation.seen, self._seen, self._seen_count):
+      sensation = VisualSensation(tuple(self._seen[:self._seen_count]))
+      self._last_sensation = sensation
+    self.byproducts_store.store(self.name, Stimuli.name, sensation)
 
   """
   Thoughts:
@@ -53,7 +83,7 @@ class AgentVisualSystem(SystemWithByproducts):
   def _before_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: Dict[str, List],
+    parent_byproducts: Byproducts,
     other_agents: Dict[Tag, AgentLike]
   ) -> None:
     """What does the agent see?"""
@@ -61,16 +91,88 @@ class AgentVisualSystem(SystemWithByproducts):
     # Given the agent's view frustum, what can the agent see?
     # characteristics.physicality.frustum
     
-    # For the moment, let's use brute force.
-    # Just check every agent in the scene minus this one.
-    can_see_agent_ids: List[Tag] = []
+    # The other agents are this agent's neighbors, as found by the scene's 
+    # proximity system, so only nearby agents are checked.
+    self._seen_count = 0
+    frustum = characteristics.physicality.frustum
     other_agent: AgentLike
     for other_agent in other_agents.values():
-      if characteristics.physicality.frustum.intersect(other_agent.physicality.aabb):
-        can_see_agent_ids.append(other_agent.identity.id)
+      if frustum.intersect(other_agent.physicality.aabb):
+        self._see(other_agent.identity.id)
+    self._store_sensation()
 
-    if len(can_see_agent_ids) > 0:
-      self.byproducts_store.store(self.name, Stimuli.name, VisualSensation(tuple(can_see_agent_ids)))
+  def _before_subsystems_processed_batch(self, batch: SystemBatch, agent_phase: AgentLifeCyclePhase) -> None:
+    """
+    What do the agents see? 
+    
+    The shapes are converted to plain floats once per batch. Each frustum's 
+    separating axes are shared by all of its agent's neighbors and each AABB 
+    is shared by every agent it neighbors. Neighbors outside the bounding box 
+    of the frustum are rejected first, since the AABB's edges are axis aligned.
+    The results are the same as Polygon2d.intersect.
+    """
+    if agent_phase != AgentLifeCyclePhase.PRE_STATE_CHANGE:
+      super()._before_subsystems_processed_batch(batch, agent_phase)
+      return
+
+    shapes: Dict[int, Optional[PolygonShape]] = {}
+    systems = cast(List[AgentVisualSystem], batch.systems)
+    for system, characteristics, other_agents in zip(systems, batch.characteristics, batch.other_agents):
+      frustum = characteristics.physicality.frustum
+      frustum_shape = shape_of(frustum)
+      system._seen_count = 0
+      other_agent: AgentLike
+      for other_agent in other_agents.values():
+        aabb = other_agent.physicality.aabb
+        key = id(aabb)
+        if key not in shapes:
+          shapes[key] = shape_of(aabb)
+        aabb_shape = shapes[key]
+
+        if frustum_shape is None or aabb_shape is None:
+          sees_agent = frustum.intersect(aabb)
+        else:
+          frustum_bounds, aabb_bounds = frustum_shape.bounds, aabb_shape.bounds
+          sees_agent = not (
+            frustum_bounds[0] > aabb_bounds[2] or aabb_bounds[0] > frustum_bounds[2] or
+            frustum_bounds[1] > aabb_bounds[3] or aabb_bounds[1] > frustum_bounds[3] or
+            is_separated(frustum_shape.axes, aabb_shape.points) or 
+            is_separated(aabb_shape.axes, frustum_shape.points)
+          )
+        if sees_agent:
+          system._see(other_agent.identity.id)
+      system._store_sensation()
+
+def _seen_again(seen: Tuple[Tag, ...], seen_now: List[Tag], count: int) -> bool:
+  """True if the first count agents of seen_now are the ones in seen."""
+  if len(seen) != count:
+    return False
+  for index in range(count):
+    if seen[index] != seen_now[index]:
+      return False
+  return True
+
+class PolygonShape(NamedTuple):
+  points: List[Tuple[float, float]]
+  axes: List[SeparatingAxis]
+  bounds: Tuple[float, float, float, float] # (min x, min y, max x, max y)
+
+def shape_of(polygon: Polygon) -> Optional[PolygonShape]:
+  """
+  A polygon's vertices, edge axes, and bounding box. None if it isn't a 2D 
+  polygon or it has an edge with no length, like an empty AABB.
+  """
+  vertices = getattr(polygon, 'vertices', None)
+  if not isinstance(vertices, list) or len(vertices) < 3:
+    return None
+  try:
+    axes = separating_axes(polygon)
+  except ZeroDivisionError:
+    return None
+  points = [(vertex.coordinates[0], vertex.coordinates[1]) for vertex in vertices]
+  xs = [x for x, _ in points]
+  ys = [y for _, y in points]
+  return PolygonShape(points, axes, (min(xs), min(ys), max(xs), max(ys)))
 
 """
     The implementation of the life systems are each nontrivial. They should be on 
@@ -0,0 +1,108 @@
+from collections.abc import Hashable
+from typing import Any, Dict, Generic, Iterable, List, Set, TypeVar
+
+IndexedItem = TypeVar('IndexedItem')
+
+class AttributeIndexError(Exception):
+  def __init__(self, *args: object) -> None:
+    super().__init__(*args)
+
+class AttributeIndex(Generic[IndexedItem]):
+  """
+  Secondary indexes over the attributes of a collection of items, such as
+  SimpleNamespace entities. Each indexed field maps its values to the items
+  that have them. A field holding a list or tuple, like tags, is indexed by
+  each of its elements. Items without a field aren't indexed by it.
+
+  The index doesn't see changes made to an item's attributes. Remove and add
+  the item again to update it.
+  """
+  def __init__(self, fields: Iterable[str] = ()) -> None:
+    self._items: Dict[Hashable, IndexedItem] = {}
+    # field -> value -> the keys of the items with that value, in the order they were added.
+    self._indexes: Dict[str, Dict[Hashable, Dict[Hashable, None]]] = {}
+    for field in fields:
+      self.add_field(field)
+
+  def __len__(self) -> int:
+    return len(self._items)
+
+  @property
+  def fields(self) -> Set[str]:
+    return set(self._indexes.keys())
+
+  def add_field(self, field: str) -> None:
+    """Starts indexing a field. Items already in the index are indexed by it."""
+    if field in self._indexes:
+      return
+    self._indexes[field] = {}
+    for key, item in self._items.items():
+      self._index_field(field, key, item)
+
+  def add(self, key: Hashable, item: IndexedItem) -> None:
+    """Adds an item. An item already stored with the key is replaced."""
+    if key in self._items:
+      self.remove(key)
+    self._items[key] = item
+    for field in self._indexes:
+      self._index_field(field, key, item)
+
+  def remove(self, key: Hashable) -> None:
+    """Removes an item if it's in the index."""
+    if key not in self._items:
+      return
+    item = self._items.pop(key)
+    for field, index in self._indexes.items():
+      for value in self._values_of(field, item):
+        keys = index.get(value)
+        if keys is not None:
+          keys.pop(key, None)
+          if len(keys) == 0:
+            del index[value]
+
+  def clear(self) -> None:
+    self._items.clear()
+    for index in self._indexes.values():
+      index.clear()
+
+  def find(self, **criteria: Any) -> List[IndexedItem]:
+    """
+    Finds the items whose fields match all of the criteria. For list fields,
+    the list must contain the value. Criteria on indexed fields are answered
+    from the indexes, starting with the most selective. Criteria on other
+    fields are checked on the remaining items.
+
+    Returns
+      The matching items, in the order they were added.
+    """
+    indexed = [(field, value) for field, value in criteria.items() if field in self._indexes]
+    scanned = [(field, value) for field, value in criteria.items() if field not in self._indexes]
+
+    candidates: Iterable[Hashable]
+    if len(indexed) > 0:
+      buckets = [self._indexes[field].get(value, {}) for field, value in indexed]
+      buckets.sort(key = len)
+      # Buckets keep the order their items were added in.
+      candidates = [key for key in buckets[0] if all(key in bucket for bucket in buckets[1:])]
+    else:
+      candidates = self._items.keys()
+
+    found: List[IndexedItem] = []
+    for key in candidates:
+      item = self._items[key]
+      if all(value in self._values_of(field, item) for field, value in scanned):
+        found.append(item)
+    return found
+
+  def _index_field(self, field: str, key: Hashable, item: IndexedItem) -> None:
+    index = self._indexes[field]
+    for value in self._values_of(field, item):
+      if not isinstance(value, Hashable):
+        raise AttributeIndexError(f'The value of the field {field} cannot be indexed. Found {value}.')
+      index.setdefault(value, {})[key] = None
+
+  def _values_of(self, field: str, item: IndexedItem) -> Iterable[Any]:
+    if not hasattr(item, field):
+      return ()
+    value = getattr(item, field)
+    return value if isinstance(value, (list, tuple)) and not hasattr(value, '_fields') else (value,)
@@ -0,0 +1,224 @@
+"""
+Batch route finding in a pool of worker processes.
+
+Finding routes for many agents at once, for example when a crowd arrives at
+the same time, can take longer than a frame. The BatchRouter sends batches of
+(start, end) pairs to a ProcessPoolExecutor and returns a future per pair, so
+a task can check on its routes every frame instead of waiting for them.
+
+The compiled navigation mesh is sent to each worker once, when the worker
+starts. Routes are sent back as node ids and turned into locations in the
+simulation's process. When only the mesh's costs change, the connections 
+whose weights differ from the workers' graph are sent with each batch and a
+worker applies them the first time it sees the new version. The pool is only
+restarted if junctions are added or removed. Workers are spawned rather than 
+forked, since the simulation runs several threads.
+"""
+from __future__ import annotations
+
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+import multiprocessing
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from agents_playground.navigation.heuristics import NavigationHeuristic
+from agents_playground.navigation.navigation_graph import NavigationGraph, NodeId
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.navigation.navigator import NavigationResultStatus, NavigationRouteResult, Navigator
+from agents_playground.spatial.types import Coordinate
+from agents_playground.sys.logger import get_default_logger
+logger = get_default_logger()
+
+RouteRequest = Tuple[Coordinate, Coordinate]
+RouteResult = Tuple[NavigationResultStatus, NavigationRouteResult]
+NodeRoute = Optional[Tuple[NodeId, ...]]
+
+# The (connection index, weight) pairs that differ from the graph a worker started with.
+WeightChanges = Tuple[Tuple[int, float], ...]
+
+# The graph a worker process started with, the graph it routes on, and its 
+# navigator. Set by _start_worker.
+_worker_base_graph: Optional[NavigationGraph] = None
+_worker_graph: Optional[NavigationGraph] = None
+_worker_navigator: Optional[Navigator] = None
+
+def _start_worker(graph: NavigationGraph, cache_size: int, heuristic: Optional[NavigationHeuristic]) -> None:
+  global _worker_base_graph, _worker_graph, _worker_navigator
+  _worker_base_graph = graph
+  _worker_graph = graph
+  _worker_navigator = Navigator(cache_size = cache_size, heuristic = heuristic)
+
+def _update_worker_graph(version: int, weight_changes: WeightChanges) -> NavigationGraph:
+  """Runs in a worker. Applies the weight changes of a new version of the mesh."""
+  global _worker_graph
+  assert _worker_base_graph is not None
+  weights = array('d', _worker_base_graph.weights)
+  for index, weight in weight_changes:
+    weights[index] = weight
+  _worker_graph = _worker_base_graph.with_weights(weights)
+  _worker_graph.version = version
+  return _worker_graph
+
+def _find_node_routes(
+  version: int, 
+  weight_changes: WeightChanges, 
+  pairs: Sequence[Tuple[NodeId, NodeId]]
+) -> List[NodeRoute]:
+  """Runs in a worker. Finds the routes for a chunk of (start, end) node pairs."""
+  assert _worker_graph is not None and _worker_navigator is not None
+  graph = _worker_graph
+  if graph.version != version:
+    graph = _update_worker_graph(version, weight_changes)
+  cache = _worker_navigator.route_cache
+  routes: List[NodeRoute] = []
+  for start, end in pairs:
+    found, route = cache.get((version, start, end))
+    if not found:
+      nodes = _worker_navigator.find_node_route(graph, start, end)
+      route = tuple(nodes) if nodes is not None else None
+      cache.put((version, start, end), route)
+    routes.append(route)
+  return routes
+
+class BatchRouter:
+  """
+  Finds routes in worker processes. Use it as a context manager or call
+  shutdown() when done, so the workers are stopped.
+  """
+  def __init__(
+    self,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 32,
+    cache_size: int = 1024,
+    heuristic: Optional[NavigationHeuristic] = None
+  ) -> None:
+    """
+    Args:
+      - max_workers: The number of worker processes. Defaults to the number of CPUs.
+      - chunk_size: The number of routes sent to a worker at a time.
+      - cache_size: The number of routes each worker remembers.
+      - heuristic: The heuristic the workers' A* searches use. Must be picklable.
+    """
+    self.max_workers = max_workers
+    self.chunk_size = chunk_size
+    self.cache_size = cache_size
+    self.heuristic = heuristic
+    self._executor: Optional[ProcessPoolExecutor] = None
+    self._base_graph: Optional[NavigationGraph] = None # The graph the workers started with.
+    self._graph: Optional[NavigationGraph] = None # The graph the last batch was routed on.
+    self._weight_changes: WeightChanges = ()
+
+  def __enter__(self) -> BatchRouter:
+    return self
+
+  def __exit__(self, *args) -> None:
+    self.shutdown()
+
+  def __del__(self) -> None:
+    self.shutdown(wait = False)
+
+  def shutdown(self, wait: bool = True) -> None:
+    """Stops the workers. Routes that haven't started are cancelled."""
+    if self._executor is not None:
+      self._executor.shutdown(wait = wait, cancel_futures = True)
+      self._executor = None
+      self._base_graph = None
+      self._graph = None
+      self._weight_changes = ()
+
+  def _executor_for(self, graph: NavigationGraph) -> ProcessPoolExecutor:
+    if self._graph is graph and self._executor is not None:
+      return self._executor
+
+    # Graphs derived with new costs share the connections of the graph they 
+    # came from. Only their weights need to be sent to the workers.
+    base = self._base_graph
+    if self._executor is not None and base is not None and base.targets is graph.targets:
+      self._weight_changes = tuple(
+        (index, weight) 
+        for index, (base_weight, weight) in enumerate(zip(base.weights, graph.weights))
+        if base_weight != weight
+      )
+      self._graph = graph
+      return self._executor
+
+    if self._executor is not None:
+      logger.info('BatchRouter: The navigation mesh\'s junctions changed. Restarting the workers.')
+      self._executor.shutdown(wait = False)
+    self._executor = ProcessPoolExecutor(
+      max_workers = self.max_workers,
+      mp_context = multiprocessing.get_context('spawn'),
+      initializer = _start_worker,
+      initargs = (graph, self.cache_size, self.heuristic)
+    )
+    self._base_graph = graph
+    self._graph = graph
+    self._weight_changes = ()
+    return self._executor
+
+  def find_routes(self, requests: Iterable[RouteRequest], nav_mesh: NavigationMesh) -> List[Future]:
+    """
+    Starts finding a batch of routes.
+
+    Args:
+      - requests: The (starting location, desired location) pairs to route.
+      - nav_mesh: The navigation mesh to route on.
+
+    Returns
+      A future per request, in the same order. Each resolves to the same
+      (NavigationResultStatus, None | Route) tuple that Navigator.find_route
+      returns.
+    """
+    graph = nav_mesh.graph()
+    futures: List[Future] = []
+    pending: List[Tuple[Future, NodeId, NodeId]] = []
+    for starting_location, desired_location in requests:
+      start = graph.node_at(starting_location)
+      if start is None:
+        raise Exception(f'NavigationMesh does not have a junction at location {starting_location}.')
+      future: Future = Future()
+      futures.append(future)
+      end = graph.node_at(desired_location)
+      if end is None:
+        future.set_result((NavigationResultStatus.FAILURE, None))
+      else:
+        pending.append((future, start, end))
+
+    if len(pending) > 0:
+      executor = self._executor_for(graph)
+      for index in range(0, len(pending), self.chunk_size):
+        chunk = pending[index:index + self.chunk_size]
+        chunk_future = executor.submit(
+          _find_node_routes, 
+          graph.version, 
+          self._weight_changes, 
+          [(start, end) for _, start, end in chunk]
+        )
+        chunk_future.add_done_callback(
+          partial(_resolve_chunk, futures = [future for future, _, _ in chunk], graph = graph)
+        )
+    return futures
+
+def _resolve_chunk(chunk_future: Future, futures: List[Future], graph: NavigationGraph) -> None:
+  """Passes a chunk's routes, or its error, on to the futures of its requests."""
+  if chunk_future.cancelled():
+    for future in futures:
+      future.cancel()
+    return
+  error = chunk_future.exception()
+  for index, future in enumerate(futures):
+    if future.done():
+      continue # The caller cancelled the request.
+    if error is not None:
+      future.set_exception(error)
+      continue
+    route = chunk_future.result()[index]
+    if route is None:
+      future.set_result((NavigationResultStatus.FAILURE, None))
+    else:
+      future.set_result((NavigationResultStatus.SUCCESS, [graph.locations[node] for node in route]))
+
+def routes_ready(futures: Iterable[Future]) -> bool:
+  """True once every route in a batch is done. Lets a task check each frame without blocking."""
+  return all(future.done() for future in futures)
@@ -0,0 +1,284 @@
+"""
+Cooperative routing with a space-time reservation table.
+
+Agents plan one at a time. Each plan reserves the (junction, frame) slots the
+agent will occupy, and later plans route around them by taking other
+junctions or waiting in place. This is Windowed Hierarchical Cooperative A*
+(Silver, 2005). The search only looks a fixed number of frames ahead, so the
+cost of a plan is bounded no matter how long the route is. Beyond the window
+the route follows the flow field toward the goal and nothing is reserved, so
+agents should plan again before they reach the end of their window.
+
+The flow field's cost to the goal is also the search's heuristic. It ignores
+the other agents, so it never overestimates.
+
+Goal junctions are never reserved. Several agents can arrive at the same
+destination, since in the simulation they enter the building it belongs to.
+"""
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from math import ceil
+from typing import Dict, Hashable, List, NamedTuple, Optional, Set, Tuple
+
+from agents_playground.navigation.flow_field import NO_ROUTE, FlowField, FlowFieldService
+from agents_playground.navigation.navigation_graph import NavigationGraph, NodeId
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.navigation.navigator import Route
+from agents_playground.spatial.types import Coordinate
+
+Frame = int
+# A reserved slot: a junction at a frame, or a connection (from, to) at a frame.
+Slot = Tuple[NodeId, NodeId, Frame]
+
+class ReservationTable:
+  """The (junction, frame) and (connection, frame) slots the agents have claimed."""
+  def __init__(self) -> None:
+    self._slots: Dict[Slot, Hashable] = {}
+    self._by_agent: Dict[Hashable, List[Slot]] = {}
+
+  def __len__(self) -> int:
+    return len(self._slots)
+
+  def reserve_junction(self, agent_id: Hashable, node: NodeId, frame: Frame) -> None:
+    self._reserve(agent_id, (node, node, frame))
+
+  def reserve_connection(self, agent_id: Hashable, from_node: NodeId, to_node: NodeId, frame: Frame) -> None:
+    self._reserve(agent_id, (from_node, to_node, frame))
+
+  def _reserve(self, agent_id: Hashable, slot: Slot) -> None:
+    self._slots[slot] = agent_id
+    self._by_agent.setdefault(agent_id, []).append(slot)
+
+  def junction_is_free(self, node: NodeId, frame: Frame, agent_id: Hashable) -> bool:
+    """A slot is free if nobody, or the agent itself, has reserved it."""
+    holder = self._slots.get((node, node, frame))
+    return holder is None or holder == agent_id
+
+  def connection_is_free(self, from_node: NodeId, to_node: NodeId, frame: Frame, agent_id: Hashable) -> bool:
+    """Agents can't pass each other head on, so the reverse connection must be free too."""
+    holder = self._slots.get((to_node, from_node, frame))
+    return holder is None or holder == agent_id
+
+  def release(self, agent_id: Hashable) -> None:
+    """Frees every slot an agent has reserved. Called before the agent plans again."""
+    for slot in self._by_agent.pop(agent_id, []):
+      if self._slots.get(slot) == agent_id:
+        del self._slots[slot]
+
+  def release_before(self, frame: Frame) -> None:
+    """Frees the slots of frames that have passed."""
+    self._slots = {slot: agent for slot, agent in self._slots.items() if slot[2] >= frame}
+    for agent_id in list(self._by_agent):
+      slots = [slot for slot in self._by_agent[agent_id] if slot[2] >= frame]
+      if len(slots) > 0:
+        self._by_agent[agent_id] = slots
+      else:
+        del self._by_agent[agent_id]
+
+  def clear(self) -> None:
+    self._slots.clear()
+    self._by_agent.clear()
+
+class CooperativePlan(NamedTuple):
+  # The (junction location, frame) the agent is at, frame by frame, within the window.
+  steps: List[Tuple[Coordinate, Frame]]
+  # The junctions to visit, without waits. Continues past the window to the goal.
+  route: Route
+  # The number of frames the agent waits in place within the window.
+  waits: int
+  # The frames lost to other agents, compared with traveling alone. Exact
+  # when the connection costs are multiples of the speed.
+  delay: float
+  # False if the search ran out of expansions and the route ignores the other agents.
+  cooperative: bool
+
+class CongestionStats(NamedTuple):
+  plans: int
+  waits: int           # Frames spent waiting for other agents.
+  blocked_moves: int   # Moves the search rejected because a slot was reserved.
+  delay: float         # Frames lost to other agents across all plans.
+  uncooperative: int   # Plans that fell back to ignoring the other agents.
+
+class CooperativePlanner:
+  """
+  Plans routes for many agents that share a ReservationTable.
+  """
+  def __init__(
+    self,
+    window: int = 16,
+    speed: float = 1.0,
+    max_expansions: int = 4096,
+    service: Optional[FlowFieldService] = None
+  ) -> None:
+    """
+    Args:
+      - window: The number of frames each plan looks ahead and reserves.
+      - speed: Cells traveled per frame. A connection takes ceil(cost / speed) frames.
+      - max_expansions: The most search states a single plan may expand.
+      - service: The flow fields to use as the heuristic and past the window.
+    """
+    self.window = window
+    self.speed = speed
+    self.max_expansions = max_expansions
+    self.service = service if service is not None else FlowFieldService()
+    self.reservations = ReservationTable()
+    self.nodes_expanded: int = 0 # The number of states the most recent plan expanded.
+    self._plans: int = 0
+    self._waits: int = 0
+    self._blocked_moves: int = 0
+    self._delay: float = 0.0
+    self._uncooperative: int = 0
+
+  def stats(self) -> CongestionStats:
+    return CongestionStats(self._plans, self._waits, self._blocked_moves, self._delay, self._uncooperative)
+
+  def reset_stats(self) -> None:
+    self._plans = self._waits = self._blocked_moves = self._uncooperative = 0
+    self._delay = 0.0
+
+  def plan(
+    self,
+    agent_id: Hashable,
+    start: Coordinate,
+    goal: Coordinate,
+    nav_mesh: NavigationMesh,
+    frame: Frame
+  ) -> Optional[CooperativePlan]:
+    """
+    Plans an agent's route from the frame onwards and reserves its slots. Any
+    slots the agent reserved earlier are released first.
+
+    Returns
+      The plan or None if the goal can't be reached.
+    """
+    self.reservations.release(agent_id)
+    field = self.service.field_for(nav_mesh, goal)
+    graph = field.graph
+    start_node = graph.node_at(start)
+    if start_node is None:
+      raise Exception(f'NavigationMesh does not have a junction at location {start}.')
+    if field.next_hop(start_node) == NO_ROUTE:
+      return None
+
+    self._plans += 1
+    found = self._search(agent_id, graph, field, start_node, frame)
+    if found is None:
+      # Travel as if alone.
+      self._uncooperative += 1
+      route_nodes = field.route_from(start_node)
+      assert route_nodes is not None
+      return CooperativePlan([(start, frame)], [graph.locations[node] for node in route_nodes], 0, 0.0, False)
+
+    timeline, estimate = found
+    waits = 0
+    for (previous, _), (node, _) in zip(timeline, timeline[1:]):
+      if previous == node:
+        waits += 1
+    self._reserve(agent_id, graph, timeline, field.destination)
+
+    route_nodes = [node for index, (node, _) in enumerate(timeline) if index == 0 or node != timeline[index - 1][0]]
+    continuation = field.route_from(route_nodes[-1])
+    assert continuation is not None
+    route_nodes.extend(continuation[1:])
+
+    delay = estimate - self._frames_to_goal(field, start_node)
+    self._waits += waits
+    self._delay += delay
+    return CooperativePlan(
+      [(graph.locations[node], step_frame) for node, step_frame in timeline],
+      [graph.locations[node] for node in route_nodes],
+      waits,
+      delay,
+      True
+    )
+
+  def _frames_to_goal(self, field: FlowField, node: NodeId) -> float:
+    return float(field.costs[node] / self.speed)
+
+  def _frames_for(self, weight: float) -> int:
+    return max(1, ceil(weight / self.speed))
+
+  def _search(
+    self,
+    agent_id: Hashable,
+    graph: NavigationGraph,
+    field: FlowField,
+    start: NodeId,
+    frame: Frame
+  ) -> Optional[Tuple[List[Tuple[NodeId, Frame]], float]]:
+    """
+    Space-time A* from the start until the goal is reached or the window ends.
+
+    Returns
+      The (node, frame) pairs of the plan and its estimated arrival, in frames
+      from the start, or None if the search ran out of expansions or every
+      way forward is reserved.
+    """
+    goal = field.destination
+    horizon = frame + self.window
+    reservations = self.reservations
+    State = Tuple[NodeId, Frame]
+    predecessors: Dict[State, State] = {}
+    costs: Dict[State, int] = {(start, frame): 0}
+    closed: Set[State] = set()
+    open_states: List[Tuple[float, int, NodeId, Frame]] = [
+      (self._frames_to_goal(field, start), 0, start, frame)
+    ]
+    expanded: int = 0
+
+    while open_states:
+      estimate, elapsed, node, now = heappop(open_states)
+      state = (node, now)
+      if state in closed:
+        continue
+      if node == goal or now >= horizon:
+        self.nodes_expanded = expanded
+        timeline = [state]
+        while timeline[-1] in predecessors:
+          timeline.append(predecessors[timeline[-1]])
+        timeline.reverse()
+        return (timeline, estimate)
+
+      closed.add(state)
+      expanded += 1
+      if expanded > self.max_expansions:
+        self.nodes_expanded = expanded
+        return None
+
+      # Wait in place.
+      successors: List[Tuple[NodeId, Frame]] = [(node, now + 1)]
+      for neighbor, weight in graph.neighbors(node):
+        successors.append((neighbor, now + self._frames_for(weight)))
+      for next_node, arrival in successors:
+        if (next_node, arrival) in closed or field.next_hop(next_node) == NO_ROUTE:
+          continue
+        if next_node != goal and not reservations.junction_is_free(next_node, arrival, agent_id):
+          self._blocked_moves += 1
+          continue
+        if next_node != node and not all(
+          reservations.connection_is_free(node, next_node, step, agent_id) for step in range(now, arrival)
+        ):
+          self._blocked_moves += 1
+          continue
+        next_state = (next_node, arrival)
+        next_elapsed = elapsed + (arrival - now)
+        if next_elapsed < costs.get(next_state, next_elapsed + 1):
+          costs[next_state] = next_elapsed
+          predecessors[next_state] = state
+          heappush(open_states, (next_elapsed + self._frames_to_goal(field, next_node), next_elapsed, next_node, arrival))
+
+    self.nodes_expanded = expanded
+    return None
+
+  def _reserve(self, agent_id: Hashable, graph: NavigationGraph, timeline: List[Tuple[NodeId, Frame]], goal: NodeId) -> None:
+    for (node, now), (next_node, arrival) in zip(timeline, timeline[1:]):
+      if node != goal:
+        # The agent is at the junction until it leaves.
+        self.reservations.reserve_junction(agent_id, node, now)
+      if next_node != node:
+        for step in range(now, arrival):
+          self.reservations.reserve_connection(agent_id, node, next_node, step)
+    node, now = timeline[-1]
+    if node != goal:
+      self.reservations.reserve_junction(agent_id, node, now)
@@ -0,0 +1,201 @@
+"""
+Incremental route repair with D* Lite.
+
+D* Lite (Koenig and Likhachev, 2002) searches backwards from the goal and
+keeps its search state between plans. When connection costs change, only the
+junctions whose route costs depend on the changed connections are searched
+again, rather than everything a new A* search would visit. As the agent moves,
+the search's keys are adjusted by an offset (km) instead of being rebuilt.
+
+Every junction has two cost estimates to the goal: g, its settled cost, and
+rhs, the one step lookahead min(cost(u, s) + g(s)) over its neighbors s. A
+junction is queued while the two differ.
+"""
+from __future__ import annotations
+
+from array import array
+from heapq import heappop, heappush
+from math import inf
+from typing import Dict, List, Optional, Set, Tuple
+
+from agents_playground.navigation.navigation_graph import NavigationGraph, NodeId
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.navigation.navigator import Route
+from agents_playground.spatial.types import Coordinate
+from agents_playground.sys.logger import get_default_logger
+logger = get_default_logger()
+
+SearchKey = Tuple[float, float]
+
+class DStarLitePlanner:
+  """
+  Plans and repairs the route of a single agent to a single goal.
+
+  Call route() to get the current route and move_to() as the agent reaches
+  each junction. Closing or opening junctions and reweighting connections on
+  the mesh is picked up by the next call to route().
+  """
+  def __init__(self, nav_mesh: NavigationMesh, start: Coordinate, goal: Coordinate, debug: bool = False) -> None:
+    """
+    Args:
+      - nav_mesh: The navigation mesh to plan on.
+      - start: The location of the junction the agent is at.
+      - goal: The location of the junction the agent is going to.
+      - debug: If True, every repair is written to the debug log.
+    """
+    self.nav_mesh = nav_mesh
+    self.debug = debug
+    self.nodes_expanded: int = 0 # The number of nodes the most recent plan or repair expanded.
+    self._start_location = start
+    self._goal_location = goal
+    self._initialize(nav_mesh.graph())
+
+  def _initialize(self, graph: NavigationGraph) -> None:
+    start = graph.node_at(self._start_location)
+    if start is None:
+      raise Exception(f'NavigationMesh does not have a junction at location {self._start_location}.')
+    goal = graph.node_at(self._goal_location)
+    if goal is None:
+      raise Exception(f'NavigationMesh does not have a junction at location {self._goal_location}.')
+
+    self.graph = graph
+    self.version = self.nav_mesh.version
+    self.start: NodeId = start
+    self.goal: NodeId = goal
+    self._km: float = 0.0
+    self._g: array = array('d', [inf]) * len(graph)
+    self._rhs: array = array('d', [inf]) * len(graph)
+    self._open: List[Tuple[float, float, NodeId]] = []
+    self._queued: Dict[NodeId, SearchKey] = {}
+    self._rhs[goal] = 0.0
+    self._enqueue(goal)
+    self._compute_shortest_path()
+
+  @property
+  def goal_location(self) -> Coordinate:
+    return self._goal_location
+
+  def move_to(self, location: Coordinate) -> None:
+    """Records that the agent has reached a junction."""
+    self._repair()
+    node = self.graph.node_at(location)
+    if node is None:
+      raise Exception(f'NavigationMesh does not have a junction at location {location}.')
+    self._km += self.graph.distance(self.start, node)
+    self.start = node
+    self._start_location = location
+
+  def route(self) -> Optional[Route]:
+    """
+    The cheapest route from the agent's junction to the goal. The search is
+    repaired first if the mesh has changed.
+
+    Returns
+      The junction locations along the route, or None if the goal can't be reached.
+    """
+    self._repair()
+    node_route = self.node_route()
+    return [self.graph.locations[node] for node in node_route] if node_route is not None else None
+
+  def node_route(self) -> Optional[List[NodeId]]:
+    """Follows the cheapest neighbors from the start. Assumes the search is up to date."""
+    graph, g = self.graph, self._g
+    if g[self.start] == inf:
+      return None
+    route: List[NodeId] = [self.start]
+    node = self.start
+    while node != self.goal:
+      best_cost, best = inf, -1
+      for neighbor, weight in graph.neighbors(node):
+        if weight + g[neighbor] < best_cost:
+          best_cost, best = weight + g[neighbor], neighbor
+      if best == -1 or len(route) > len(graph):
+        return None
+      route.append(best)
+      node = best
+    return route
+
+  def _repair(self) -> None:
+    """Brings the search up to date with the mesh."""
+    graph = self.nav_mesh.graph()
+    if graph is self.graph:
+      return
+    changes = self.nav_mesh.cost_changes_since(self.version)
+    if changes is None:
+      # Junctions were added or removed, so the nodes have been renumbered.
+      if self.debug:
+        logger.debug('DStarLitePlanner: The mesh was rebuilt. Planning from scratch.')
+      self._initialize(graph)
+      return
+
+    # A junction's lookahead cost depends on its own connections. Closing or
+    # opening a junction also changes the connections into it.
+    self.graph = graph
+    self.version = self.nav_mesh.version
+    offsets, sources, _ = graph.reverse_topology()
+    changed: Set[NodeId] = set()
+    for toml_id in changes:
+      node = graph.node_by_toml_id(toml_id)
+      changed.add(node)
+      changed.update(sources[offsets[node]:offsets[node + 1]])
+    for node in changed:
+      self._update_vertex(node)
+    if self.debug:
+      logger.debug(f'DStarLitePlanner: Repairing the route after {len(changes)} changes.')
+    self._compute_shortest_path()
+
+  def _key(self, node: NodeId) -> SearchKey:
+    cost = min(self._g[node], self._rhs[node])
+    return (cost + self.graph.distance(self.start, node) + self._km, cost)
+
+  def _enqueue(self, node: NodeId) -> None:
+    key = self._key(node)
+    self._queued[node] = key
+    heappush(self._open, (key[0], key[1], node))
+
+  def _update_vertex(self, node: NodeId) -> None:
+    if node != self.goal:
+      best = inf
+      g = self._g
+      graph = self.graph
+      for index in range(graph.offsets[node], graph.offsets[node + 1]):
+        cost = graph.weights[index] + g[graph.targets[index]]
+        if cost < best:
+          best = cost
+      self._rhs[node] = best
+    self._queued.pop(node, None)
+    if self._g[node] != self._rhs[node]:
+      self._enqueue(node)
+
+  def _compute_shortest_path(self) -> None:
+    g, rhs, open_nodes, queued = self._g, self._rhs, self._open, self._queued
+    # Only the connections' sources are needed, and those are the same for
+    # every graph derived from the same mesh structure.
+    offsets, sources, _ = self.graph.reverse_topology()
+    expanded: int = 0
+    while open_nodes:
+      k1, k2, node = open_nodes[0]
+      if queued.get(node) != (k1, k2):
+        heappop(open_nodes) # An outdated entry.
+        continue
+      if (k1, k2) >= self._key(self.start) and rhs[self.start] == g[self.start]:
+        break
+
+      heappop(open_nodes)
+      expanded += 1
+      new_key = self._key(node)
+      if (k1, k2) < new_key:
+        # The key was computed before the agent moved.
+        queued[node] = new_key
+        heappush(open_nodes, (new_key[0], new_key[1], node))
+      elif g[node] > rhs[node]:
+        g[node] = rhs[node]
+        del queued[node]
+        for index in range(offsets[node], offsets[node + 1]):
+          self._update_vertex(sources[index])
+      else:
+        g[node] = inf
+        self._update_vertex(node)
+        for index in range(offsets[node], offsets[node + 1]):
+          self._update_vertex(sources[index])
+    self.nodes_expanded = expanded
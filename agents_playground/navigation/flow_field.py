@@ -0,0 +1,145 @@
+"""
+Flow fields for routing many agents to the same destination.
+
+A flow field is built with one reverse Dijkstra search out from a destination.
+It holds, for every junction, the next junction on the cheapest route to the
+destination. Any number of agents can then find their next hop with a single
+lookup, no matter where they start.
+"""
+from __future__ import annotations
+
+from array import array
+from collections import OrderedDict
+from heapq import heappop, heappush
+from math import inf
+from typing import List, Optional, Tuple
+
+from agents_playground.navigation.navigation_graph import NavigationGraph, NodeId
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.navigation.navigator import Navigator
+from agents_playground.spatial.types import Coordinate
+
+NO_ROUTE: int = -1
+
+class FlowField:
+  """The next hop toward a single destination from every junction."""
+  def __init__(self, graph: NavigationGraph, destination: NodeId) -> None:
+    self.graph = graph
+    self.destination = destination
+    node_count = len(graph)
+    self.costs: array = array('d', [inf]) * node_count
+    self.next_hops: array = array('i', [NO_ROUTE]) * node_count
+
+    offsets, targets, weights = graph.reverse()
+    self.costs[destination] = 0.0
+    self.next_hops[destination] = destination
+    open_nodes: List[Tuple[float, NodeId]] = [(0.0, destination)]
+    while open_nodes:
+      cost, node = heappop(open_nodes)
+      if cost > self.costs[node]:
+        continue # An outdated entry.
+      for index in range(offsets[node], offsets[node + 1]):
+        # There is a connection from previous to node.
+        previous = targets[index]
+        previous_cost = cost + weights[index]
+        if previous_cost < self.costs[previous]:
+          self.costs[previous] = previous_cost
+          self.next_hops[previous] = node
+          heappush(open_nodes, (previous_cost, previous))
+
+  def next_hop(self, node: NodeId) -> NodeId:
+    """The next junction to go to from a junction. NO_ROUTE if the destination can't be reached."""
+    return int(self.next_hops[node])
+
+  def route_from(self, start: NodeId) -> Optional[List[NodeId]]:
+    """The full route from a junction to the destination, or None if there isn't one."""
+    if self.next_hops[start] == NO_ROUTE:
+      return None
+    route: List[NodeId] = [start]
+    while route[-1] != self.destination:
+      route.append(self.next_hops[route[-1]])
+    return route
+
+class FlowFieldService:
+  """
+  Builds and caches flow fields. Fields are cached per compiled mesh and
+  destination. A mesh compiles a new graph whenever it changes, so fields are
+  rebuilt after the mesh changes.
+  """
+  def __init__(self, max_fields: int = 64) -> None:
+    """
+    Args:
+      - max_fields: The most flow fields to keep. The least recently used field is dropped first.
+    """
+    self.max_fields = max_fields
+    self.hits: int = 0
+    self.misses: int = 0
+    self._fields: OrderedDict[Tuple[NavigationGraph, NodeId], FlowField] = OrderedDict()
+
+  def __len__(self) -> int:
+    return len(self._fields)
+
+  def field_for(self, nav_mesh: NavigationMesh, destination: Coordinate) -> FlowField:
+    """Finds or builds the flow field for a destination junction."""
+    graph = nav_mesh.graph()
+    node = graph.node_at(destination)
+    if node is None:
+      raise Exception(f'NavigationMesh does not have a junction at location {destination}.')
+    return self.field_for_node(graph, node)
+
+  def field_for_node(self, graph: NavigationGraph, destination: NodeId) -> FlowField:
+    key = (graph, destination)
+    field = self._fields.get(key)
+    if field is not None:
+      self.hits += 1
+      self._fields.move_to_end(key)
+      return field
+
+    self.misses += 1
+    field = FlowField(graph, destination)
+    self._fields[key] = field
+    while len(self._fields) > self.max_fields:
+      self._fields.popitem(last = False)
+    return field
+
+  def next_hop(self, nav_mesh: NavigationMesh, location: Coordinate, destination: Coordinate) -> Optional[Coordinate]:
+    """
+    The next junction an agent at a junction should go to.
+
+    Returns
+      The location of the next junction or None if the destination can't be reached.
+    """
+    field = self.field_for(nav_mesh, destination)
+    node = field.graph.node_at(location)
+    if node is None:
+      raise Exception(f'NavigationMesh does not have a junction at location {location}.')
+    next_node = field.next_hop(node)
+    return field.graph.locations[next_node] if next_node != NO_ROUTE else None
+
+  def clear(self) -> None:
+    self._fields.clear()
+
+class FlowFieldNavigator(Navigator):
+  """
+  A Navigator that answers find_route from flow fields. Every route to the
+  same destination shares one field, so it's intended for many agents
+  traveling to a few destinations.
+  """
+  def __init__(
+    self,
+    service: Optional[FlowFieldService] = None,
+    debug: bool = False,
+    cache_size: int = 0
+  ) -> None:
+    """
+    Args:
+      - service: The flow fields to use. Share a service between navigators to share the fields.
+      - debug: Unused. Kept for parity with Navigator.
+      - cache_size: The number of routes to remember. Defaults to 0 since the fields are already cached.
+    """
+    super().__init__(debug = debug, cache_size = cache_size)
+    self.service = service if service is not None else FlowFieldService()
+
+  def find_node_route(self, graph: NavigationGraph, start: NodeId, end: NodeId) -> Optional[List[NodeId]]:
+    self.nodes_expanded = 0
+    return self.service.field_for_node(graph, end).route_from(start)
@@ -0,0 +1,151 @@
+"""
+Heuristics for the Navigator's A* search.
+
+A heuristic estimates the cost of the cheapest route between a junction and
+the route's end. To find the cheapest routes it must never overestimate that
+cost. It must also be consistent: moving to a neighbor can't lower the
+estimate by more than the cost of the move. The Navigator depends on that to
+never reopen a junction.
+"""
+from __future__ import annotations
+
+from abc import abstractmethod
+from array import array
+from heapq import heappop, heappush
+from math import inf, isinf
+from time import perf_counter
+from typing import List, Optional, Protocol, Tuple
+
+from agents_playground.navigation.navigation_graph import NavigationGraph, NodeId
+from agents_playground.sys.logger import get_default_logger
+logger = get_default_logger()
+
+class NavigationHeuristic(Protocol):
+  def prepare(self, graph: NavigationGraph) -> None:
+    """Called before every search. Heuristics that precompute data do it here when the graph changes."""
+    return
+
+  @abstractmethod
+  def estimate(self, graph: NavigationGraph, node: NodeId, end: NodeId) -> float:
+    """Estimates the cost of the cheapest route from the node to the end."""
+
+class ManhattanHeuristic(NavigationHeuristic):
+  """
+  The Manhattan distance between the two junctions. Since the cost of a
+  connection is also the Manhattan distance, this is never an overestimate.
+  """
+  def estimate(self, graph: NavigationGraph, node: NodeId, end: NodeId) -> float:
+    return float(abs(graph.xs[node] - graph.xs[end]) + abs(graph.ys[node] - graph.ys[end]))
+
+class LandmarkHeuristic(NavigationHeuristic):
+  """
+  A* with Landmarks and the Triangle inequality (ALT).
+
+  A few junctions are chosen as landmarks and the route costs to and from
+  every landmark are precomputed. For a landmark L, a junction v and the end t
+  the triangle inequality gives two lower bounds on the cost from v to t:
+    cost(L, t) - cost(L, v) and cost(v, L) - cost(t, L)
+  The estimate is the largest bound over all the landmarks, or the Manhattan
+  distance if that's larger. On meshes with detours this is much closer to the
+  true cost than the Manhattan distance alone, so far fewer junctions are
+  expanded.
+
+  Landmarks are chosen by repeatedly picking the junction farthest from the
+  landmarks picked so far, within the largest connected part of the mesh.
+  """
+  def __init__(self, landmark_count: int = 8) -> None:
+    """
+    Args:
+      - landmark_count: The number of landmarks. Memory use is 2 * landmark_count floats per junction.
+    """
+    self.landmark_count = landmark_count
+    self.landmarks: List[NodeId] = []
+    self.build_seconds: float = 0.0
+    self._graph: Optional[NavigationGraph] = None
+    self._from_landmarks: List[array] = []
+    self._to_landmarks: List[array] = []
+    self._end: Optional[NodeId] = None
+    self._end_terms: List[Tuple[array, float, array, float]] = []
+
+  def prepare(self, graph: NavigationGraph) -> None:
+    if self._graph is graph:
+      return
+    started = perf_counter()
+    self._graph = graph
+    self._end = None
+    self.landmarks.clear()
+    self._from_landmarks.clear()
+    self._to_landmarks.clear()
+    node_count = len(graph)
+    if node_count == 0:
+      return
+    reverse = graph.reverse()
+
+    # Start from the part of the mesh that the most junctions are reachable
+    # from. The first landmark is the junction farthest from it.
+    seeds = range(0, node_count, max(1, node_count // 4))
+    seed_costs = max(
+      (route_costs(graph.offsets, graph.targets, graph.weights, seed) for seed in seeds),
+      key = lambda costs: sum(1 for cost in costs if not isinf(cost))
+    )
+    landmark: NodeId = max(
+      (node for node in range(node_count) if not isinf(seed_costs[node])), 
+      key = lambda node: seed_costs[node]
+    )
+
+    # The minimum cost from any chosen landmark. Used to pick the next landmark.
+    closest: List[float] = [inf] * node_count
+    for _ in range(min(self.landmark_count, node_count)):
+      from_landmark = route_costs(graph.offsets, graph.targets, graph.weights, landmark)
+      to_landmark = route_costs(*reverse, landmark)
+      self.landmarks.append(landmark)
+      self._from_landmarks.append(from_landmark)
+      self._to_landmarks.append(to_landmark)
+
+      for node in range(node_count):
+        cost = min(from_landmark[node], to_landmark[node])
+        if cost < closest[node]:
+          closest[node] = cost
+      candidates = [node for node in range(node_count) if not isinf(closest[node]) and closest[node] > 0]
+      if len(candidates) == 0:
+        break
+      landmark = max(candidates, key = lambda node: closest[node])
+
+    self.build_seconds = perf_counter() - started
+    logger.info(f'Chose {len(self.landmarks)} navigation landmarks in {self.build_seconds:.2f}s.')
+
+  def estimate(self, graph: NavigationGraph, node: NodeId, end: NodeId) -> float:
+    if end != self._end:
+      # A search asks for many estimates to the same end.
+      self._end = end
+      self._end_terms = [
+        (from_landmark, from_landmark[end], to_landmark, to_landmark[end])
+        for from_landmark, to_landmark in zip(self._from_landmarks, self._to_landmarks)
+      ]
+
+    best = abs(graph.xs[node] - graph.xs[end]) + abs(graph.ys[node] - graph.ys[end])
+    for from_landmark, from_end, to_landmark, end_to in self._end_terms:
+      from_node = from_landmark[node]
+      if from_end != inf and from_node != inf and from_end - from_node > best:
+        best = from_end - from_node
+      node_to = to_landmark[node]
+      if node_to != inf and end_to != inf and node_to - end_to > best:
+        best = node_to - end_to
+    return float(best)
+
+def route_costs(offsets: array, targets: array, weights: array, source: NodeId) -> array:
+  """Dijkstra's algorithm. Finds the cost of the cheapest route from the source to every node."""
+  costs = array('d', [inf]) * (len(offsets) - 1)
+  costs[source] = 0.0
+  open_nodes = [(0.0, source)]
+  while open_nodes:
+    cost, node = heappop(open_nodes)
+    if cost > costs[node]:
+      continue
+    for index in range(offsets[node], offsets[node + 1]):
+      neighbor = targets[index]
+      neighbor_cost = cost + weights[index]
+      if neighbor_cost < costs[neighbor]:
+        costs[neighbor] = neighbor_cost
+        heappush(open_nodes, (neighbor_cost, neighbor))
+  return costs
@@ -0,0 +1,273 @@
+"""
+Hierarchical path finding (HPA*).
+
+The mesh is divided into square regions. A junction that has a connection
+crossing a region's border is an entrance. The abstract graph connects the
+entrances with the original border crossing connections, plus connections
+between the entrances of each region, weighted by the cheapest route between
+them that stays inside the region.
+
+A route is planned on the abstract graph, which is much smaller than the mesh,
+and then each step through a region is refined into junctions by a search that
+is limited to that region. Every entrance is kept, so the routes are as short
+as the ones flat A* finds.
+"""
+from __future__ import annotations
+
+from array import array
+from heapq import heappop, heappush
+from math import floor, inf
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+from agents_playground.navigation.heuristics import NavigationHeuristic
+from agents_playground.navigation.navigation_graph import NavigationGraph, NodeId
+from agents_playground.navigation.navigator import Navigator
+from agents_playground.sys.logger import get_default_logger
+logger = get_default_logger()
+
+# Abstract graph connections: node -> [(neighbor, cost, is_intra_region)]
+AbstractEdges = Dict[NodeId, List[Tuple[NodeId, float, bool]]]
+
+class NavigationHierarchy:
+  """The regions, entrances and abstract graph for a compiled navigation mesh."""
+  def __init__(self, graph: NavigationGraph, region_size: float) -> None:
+    """
+    Args:
+      - graph: The compiled navigation mesh.
+      - region_size: The width and height of a region, in cells.
+    """
+    started = perf_counter()
+    self.graph = graph
+    self.region_size = region_size
+    node_count = len(graph)
+
+    region_ids: Dict[Tuple[int, int], int] = {}
+    self.region_of: array = array('i', [0]) * node_count
+    for node in range(node_count):
+      key = (floor(graph.xs[node] / region_size), floor(graph.ys[node] / region_size))
+      self.region_of[node] = region_ids.setdefault(key, len(region_ids))
+    self.region_count = len(region_ids)
+
+    # The reverse connections are needed to search backwards from a route's end.
+    self.reverse_offsets, self.reverse_targets, self.reverse_weights = graph.reverse()
+
+    self.edges: AbstractEdges = {}
+    self._refined: Dict[Tuple[NodeId, NodeId], List[NodeId]] = {}
+    self.entrances_by_region: Dict[int, List[NodeId]] = {}
+    for node in range(node_count):
+      for index in range(graph.offsets[node], graph.offsets[node + 1]):
+        target = graph.targets[index]
+        if self.region_of[node] != self.region_of[target]:
+          self._add_entrance(node)
+          self._add_entrance(target)
+          self.edges[node].append((target, graph.weights[index], False))
+
+    # Connect the entrances of each region. A connection is left out if the 
+    # route it stands for passes through another entrance, since the two 
+    # connections to and from that entrance already cover it.
+    for region, entrances in self.entrances_by_region.items():
+      for entrance in entrances:
+        costs, predecessors = self.search_region(entrance, region)
+        for other in entrances:
+          if other == entrance or other not in costs:
+            continue
+          step = predecessors[other]
+          while step != entrance and step not in self.edges:
+            step = predecessors[step]
+          if step == entrance:
+            self.edges[entrance].append((other, costs[other], True))
+
+    self.build_seconds = perf_counter() - started
+
+  def _add_entrance(self, node: NodeId) -> None:
+    if node not in self.edges:
+      self.edges[node] = []
+      self.entrances_by_region.setdefault(self.region_of[node], []).append(node)
+
+  def search_region(
+    self,
+    source: NodeId,
+    region: int,
+    target: Optional[NodeId] = None,
+    reverse: bool = False
+  ) -> Tuple[Dict[NodeId, float], Dict[NodeId, NodeId]]:
+    """
+    Dijkstra's algorithm limited to a single region.
+
+    Args:
+      - source: Where to start.
+      - region: The region the search may not leave.
+      - target: If provided, the search stops once the target is reached.
+      - reverse: If True, connections are followed backwards. The costs are then to the source.
+
+    Returns
+      The (cost, predecessor) of the nodes reached.
+    """
+    if reverse:
+      offsets, targets, weights = self.reverse_offsets, self.reverse_targets, self.reverse_weights
+    else:
+      offsets, targets, weights = self.graph.offsets, self.graph.targets, self.graph.weights
+    region_of = self.region_of
+
+    costs: Dict[NodeId, float] = {source: 0.0}
+    predecessors: Dict[NodeId, NodeId] = {}
+    closed: Dict[NodeId, float] = {}
+    open_nodes: List[Tuple[float, NodeId]] = [(0.0, source)]
+    while open_nodes:
+      cost, node = heappop(open_nodes)
+      if node in closed:
+        continue
+      closed[node] = cost
+      if node == target:
+        break
+      for index in range(offsets[node], offsets[node + 1]):
+        neighbor = targets[index]
+        if region_of[neighbor] != region or neighbor in closed:
+          continue
+        neighbor_cost = cost + weights[index]
+        if neighbor_cost < costs.get(neighbor, inf):
+          costs[neighbor] = neighbor_cost
+          predecessors[neighbor] = node
+          heappush(open_nodes, (neighbor_cost, neighbor))
+    return closed, predecessors
+
+  def refine(self, start: NodeId, end: NodeId) -> List[NodeId]:
+    """
+    Expands a step between two nodes in the same region into the junctions 
+    along it. Steps between entrances are remembered, since they're shared by
+    many routes.
+    """
+    key = (start, end)
+    if key in self._refined:
+      return self._refined[key]
+
+    _, predecessors = self.search_region(start, self.region_of[start], target = end)
+    route = [end]
+    while route[-1] != start:
+      route.append(predecessors[route[-1]])
+    route.reverse()
+    if start in self.edges and end in self.edges:
+      self._refined[key] = route
+    return route
+
+class HierarchicalNavigator(Navigator):
+  """
+  A Navigator that plans on a hierarchy of regions (HPA*) rather than on the
+  full mesh. The hierarchy is built the first time a mesh is used and again
+  whenever the mesh changes.
+  """
+  def __init__(
+    self, 
+    region_size: float = 16, 
+    debug: bool = False, 
+    cache_size: int = 1024,
+    heuristic: Optional[NavigationHeuristic] = None
+  ) -> None:
+    """
+    Args:
+      - region_size: The width and height of the regions, in cells.
+      - debug: If True, every step of every abstract search is written to the debug log.
+      - cache_size: The number of routes to remember. Set to 0 to disable the cache.
+      - heuristic: Guides the search over the abstract graph. Defaults to the Manhattan distance.
+    """
+    super().__init__(debug = debug, cache_size = cache_size, heuristic = heuristic)
+    self.region_size = region_size
+    self._hierarchy: Optional[NavigationHierarchy] = None
+
+  def hierarchy_for(self, graph: NavigationGraph) -> NavigationHierarchy:
+    if self._hierarchy is None or self._hierarchy.graph is not graph:
+      self._hierarchy = NavigationHierarchy(graph, self.region_size)
+      logger.info(
+        f'Built a navigation hierarchy with {self._hierarchy.region_count} regions and '
+        f'{len(self._hierarchy.edges)} entrances in {self._hierarchy.build_seconds:.2f}s.'
+      )
+    return self._hierarchy
+
+  def find_node_route(self, graph: NavigationGraph, start: NodeId, end: NodeId) -> Optional[List[NodeId]]:
+    if start == end:
+      self.nodes_expanded = 0
+      return [start]
+
+    hierarchy = self.hierarchy_for(graph)
+    self.heuristic.prepare(graph)
+    start_region = hierarchy.region_of[start]
+    end_region = hierarchy.region_of[end]
+
+    # Connect the start and end to the entrances of their regions.
+    start_costs, _ = hierarchy.search_region(start, start_region)
+    start_edges = [
+      (entrance, start_costs[entrance], True)
+      for entrance in hierarchy.entrances_by_region.get(start_region, [])
+      if entrance in start_costs and entrance != start
+    ]
+    if start_region == end_region and end in start_costs:
+      start_edges.append((end, start_costs[end], True))
+    end_costs, _ = hierarchy.search_region(end, end_region, reverse = True)
+    to_end: Dict[NodeId, float] = {
+      entrance: end_costs[entrance]
+      for entrance in hierarchy.entrances_by_region.get(end_region, [])
+      if entrance in end_costs and entrance != end
+    }
+
+    abstract_route = self._search_abstract(hierarchy, start, end, start_edges, to_end)
+    if abstract_route is None:
+      return None
+
+    route: List[NodeId] = [start]
+    for current, next in zip(abstract_route, abstract_route[1:]):
+      if hierarchy.region_of[current] == hierarchy.region_of[next]:
+        route.extend(hierarchy.refine(current, next)[1:])
+      else:
+        route.append(next)
+    return route
+
+  def _search_abstract(
+    self,
+    hierarchy: NavigationHierarchy,
+    start: NodeId,
+    end: NodeId,
+    start_edges: List[Tuple[NodeId, float, bool]],
+    to_end: Dict[NodeId, float]
+  ) -> Optional[List[NodeId]]:
+    """A* over the entrances, with the start and end temporarily connected to them."""
+    graph = hierarchy.graph
+    costs: Dict[NodeId, float] = {start: 0.0}
+    predecessors: Dict[NodeId, NodeId] = {}
+    closed = set()
+    open_nodes: List[Tuple[float, NodeId]] = [(self._estimate(graph, start, end), start)]
+    expanded: int = 0
+
+    while open_nodes:
+      _, node = heappop(open_nodes)
+      if node in closed:
+        continue
+      if node == end:
+        self.nodes_expanded = expanded
+        route = [end]
+        while route[-1] != start:
+          route.append(predecessors[route[-1]])
+        route.reverse()
+        return route
+
+      closed.add(node)
+      expanded += 1
+      if self.debug:
+        logger.debug(f'HierarchicalNavigator: Expanding {graph.toml_ids[node]} with cost {costs[node]}.')
+
+      edges = hierarchy.edges.get(node, [])
+      if node == start:
+        edges = start_edges + edges
+      if node in to_end:
+        edges = edges + [(end, to_end[node], True)]
+      for neighbor, edge_cost, _ in edges:
+        if neighbor in closed:
+          continue
+        cost = costs[node] + edge_cost
+        if cost < costs.get(neighbor, inf):
+          costs[neighbor] = cost
+          predecessors[neighbor] = node
+          heappush(open_nodes, (cost + self._estimate(graph, neighbor, end), neighbor))
+
+    self.nodes_expanded = expanded
+    return None
@@ -0,0 +1,80 @@
+"""
+Procedurally generated navigation meshes. Used for testing and benchmarking
+path finding on meshes larger than the ones defined in scene files.
+"""
+from __future__ import annotations
+
+import random
+from itertools import accumulate
+from types import SimpleNamespace
+from typing import List, Optional
+
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.spatial.types import Coordinate
+
+def grid_junction_id(column: int, row: int) -> str:
+  return f'j-{column}-{row}'
+
+def generate_grid_mesh(
+  columns: int,
+  rows: int,
+  max_gap: int = 1,
+  closed_ratio: float = 0.0,
+  one_way_ratio: float = 0.0,
+  seed: Optional[int] = None
+) -> NavigationMesh:
+  """
+  Builds a mesh of junctions laid out on an irregular grid. Each junction is
+  connected to the junctions next to it horizontally and vertically.
+
+  Args:
+    - columns: The number of junctions along the x axis.
+    - rows: The number of junctions along the y axis.
+    - max_gap: The gap between neighboring columns (and rows) is a random number of cells in [1, max_gap].
+    - closed_ratio: The fraction of connections that are left out in both directions.
+    - one_way_ratio: The fraction of the remaining connections that only go one way.
+    - seed: Seeds the random number generator for reproducible meshes.
+
+  Returns
+    A new navigation mesh. Junction IDs have the form j-<column>-<row>.
+  """
+  rng = random.Random(seed)
+  xs: List[int] = list(accumulate(rng.randint(1, max_gap) for _ in range(columns)))
+  ys: List[int] = list(accumulate(rng.randint(1, max_gap) for _ in range(rows)))
+  connections: dict[str, List[str]] = {
+    grid_junction_id(column, row): []
+    for row in range(rows)
+    for column in range(columns)
+  }
+
+  def connect(first: str, second: str) -> None:
+    if rng.random() < closed_ratio:
+      return
+    if rng.random() < one_way_ratio:
+      if rng.random() < 0.5:
+        connections[first].append(second)
+      else:
+        connections[second].append(first)
+    else:
+      connections[first].append(second)
+      connections[second].append(first)
+
+  for row in range(rows):
+    for column in range(columns):
+      if column + 1 < columns:
+        connect(grid_junction_id(column, row), grid_junction_id(column + 1, row))
+      if row + 1 < rows:
+        connect(grid_junction_id(column, row), grid_junction_id(column, row + 1))
+
+  mesh = NavigationMesh()
+  for row in range(rows):
+    for column in range(columns):
+      toml_id = grid_junction_id(column, row)
+      mesh.add_junction(
+        SimpleNamespace(
+          toml_id     = toml_id,
+          location    = Coordinate(xs[column], ys[row]),
+          connects_to = connections[toml_id]
+        )
+      )
+  return mesh
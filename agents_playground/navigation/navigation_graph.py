@@ -0,0 +1,191 @@
+"""
+A compact, read only form of a navigation mesh for path finding.
+
+Junctions are numbered 0..n-1 in the order they were added to the mesh. The
+connections are stored in compressed sparse row form. The neighbors of node i
+are targets[offsets[i]:offsets[i+1]] and the cost of moving to each of them is
+in the same slice of weights.
+
+The connections of closed junctions, in and out, cost infinity. They're kept so
+that graphs that only differ by cost share the same layout. A graph with new
+costs is derived from the previous one by copying its weights and updating the
+connections of the changed junctions.
+"""
+from __future__ import annotations
+
+from array import array
+from copy import copy
+from hashlib import sha256
+from math import inf
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.types import Coordinate
+
+NodeId = int
+
+# The (offsets, sources, edge indices) of the reversed connections. The
+# connections into node i come from sources[offsets[i]:offsets[i+1]] and 
+# edge_indices holds their positions in targets and weights.
+ReverseTopology = Tuple[array, array, array]
+
+class NavigationGraph:
+  def __init__(
+    self, 
+    junctions: Iterable, 
+    closed: Optional[Set[Tag]] = None,
+    costs: Optional[Mapping[Tuple[Tag, Tag], float]] = None
+  ) -> None:
+    """
+    Compile the junctions of a navigation mesh.
+
+    Args:
+      - junctions: The mesh's junctions. Each must have a toml_id, location and connects_to.
+      - closed: The TOML IDs of closed junctions. Their connections cost infinity.
+      - costs: Connection costs by (from, to) TOML IDs. Other connections cost their length.
+    """
+    junction_list = list(junctions)
+    self.version: int = 0 # The version of the mesh the graph was compiled from.
+    self.toml_ids: List[Tag] = [junction.toml_id for junction in junction_list]
+    self.locations: List[Coordinate] = [junction.location for junction in junction_list]
+    self._ids: Dict[Tag, NodeId] = {toml_id: node for node, toml_id in enumerate(self.toml_ids)}
+    self._location_index: Dict[Coordinate, NodeId] = {
+      location: node for node, location in enumerate(self.locations)
+    }
+    self.xs: array = array('d', (location.x for location in self.locations))
+    self.ys: array = array('d', (location.y for location in self.locations))
+
+    self._fingerprint: Optional[str] = None
+    self._reverse: Optional[Tuple[array, array, array]] = None
+    self._reverse_topology: Optional[ReverseTopology] = None
+    self.offsets: array = array('i', [0])
+    self.targets: array = array('i')
+    for junction in junction_list:
+      for toml_id in junction.connects_to:
+        if toml_id not in self._ids:
+          raise Exception(f'NavigationMesh does not have a junction with TOML ID = {toml_id}.')
+        self.targets.append(self._ids[toml_id])
+      self.offsets.append(len(self.targets))
+
+    self.weights: array = array('d', [0.0]) * len(self.targets)
+    closed = closed if closed is not None else set()
+    costs = costs if costs is not None else {}
+    for node in range(len(self.toml_ids)):
+      self._weigh_connections(node, closed, costs)
+
+  def _weigh_connections(self, node: NodeId, closed: Set[Tag], costs: Mapping[Tuple[Tag, Tag], float]) -> None:
+    """Sets the cost of every connection out of a node."""
+    toml_id = self.toml_ids[node]
+    for index in range(self.offsets[node], self.offsets[node + 1]):
+      target = self.targets[index]
+      target_id = self.toml_ids[target]
+      if toml_id in closed or target_id in closed:
+        self.weights[index] = inf
+      else:
+        cost = costs.get((toml_id, target_id))
+        self.weights[index] = cost if cost is not None else self.distance(node, target)
+
+  def with_changed_costs(
+    self, 
+    toml_ids: Iterable[Tag], 
+    closed: Set[Tag], 
+    costs: Mapping[Tuple[Tag, Tag], float]
+  ) -> NavigationGraph:
+    """
+    Derives a graph with new connection costs. Only the connections into and
+    out of the changed junctions are weighed again. Everything but the weights
+    is shared with this graph.
+
+    Args:
+      - toml_ids: The junctions that were closed, opened or had a connection reweighted.
+      - closed: The TOML IDs of all the closed junctions.
+      - costs: All the connection costs that differ from their length.
+    """
+    graph = self.with_weights(array('d', self.weights))
+    reverse_offsets, sources, _ = self.reverse_topology()
+    changed: Set[NodeId] = set()
+    for toml_id in toml_ids:
+      node = self._ids[toml_id]
+      changed.add(node)
+      changed.update(sources[reverse_offsets[node]:reverse_offsets[node + 1]])
+    for node in changed:
+      graph._weigh_connections(node, closed, costs)
+    return graph
+
+  def with_weights(self, weights: array) -> NavigationGraph:
+    """Derives a graph with different connection costs. Everything but the weights is shared with this graph."""
+    graph = copy(self)
+    graph.weights = weights
+    graph._fingerprint = None
+    graph._reverse = None
+    return graph
+
+  def __len__(self) -> int:
+    return len(self.toml_ids)
+
+  @property
+  def edge_count(self) -> int:
+    return len(self.targets)
+
+  def node_by_toml_id(self, toml_id: Tag) -> NodeId:
+    return self._ids[toml_id]
+
+  def node_at(self, location: Coordinate) -> Optional[NodeId]:
+    """Finds the node at a location or None if there isn't a junction there."""
+    return self._location_index.get(location)
+
+  def neighbors(self, node: NodeId) -> Iterator[Tuple[NodeId, float]]:
+    """Yields the (neighbor, cost) pairs of a node. Closed connections are skipped."""
+    for index in range(self.offsets[node], self.offsets[node + 1]):
+      if self.weights[index] != inf:
+        yield (self.targets[index], self.weights[index])
+
+  def distance(self, first: NodeId, second: NodeId) -> float:
+    """The Manhattan distance between two nodes. Never overestimates the route cost."""
+    return float(abs(self.xs[first] - self.xs[second]) + abs(self.ys[first] - self.ys[second]))
+
+  def reverse_topology(self) -> ReverseTopology:
+    """The connections into every node. Built once and shared by graphs derived from this one."""
+    if self._reverse_topology is None:
+      self._reverse_topology = reverse_topology(self)
+    return self._reverse_topology
+
+  def reverse(self) -> Tuple[array, array, array]:
+    """The (offsets, targets, weights) arrays with every connection reversed. Built once."""
+    if self._reverse is None:
+      offsets, sources, edge_indices = self.reverse_topology()
+      self._reverse = (offsets, sources, array('d', map(self.weights.__getitem__, edge_indices)))
+    return self._reverse
+
+  def fingerprint(self) -> str:
+    """A hash of the junctions and their connections. Equal graphs have equal fingerprints."""
+    if self._fingerprint is None:
+      digest = sha256()
+      digest.update(repr(self.toml_ids).encode())
+      digest.update(self.xs.tobytes())
+      digest.update(self.ys.tobytes())
+      digest.update(self.offsets.tobytes())
+      digest.update(self.targets.tobytes())
+      digest.update(self.weights.tobytes())
+      self._fingerprint = digest.hexdigest()[:32]
+    return self._fingerprint
+
+def reverse_topology(graph: NavigationGraph) -> ReverseTopology:
+  """Builds the CSR arrays of the graph's connections reversed."""
+  node_count = len(graph)
+  counts = [0] * (node_count + 1)
+  for target in graph.targets:
+    counts[target + 1] += 1
+  for node in range(node_count):
+    counts[node + 1] += counts[node]
+  offsets = array('i', counts)
+  sources = array('i', [0]) * len(graph.targets)
+  edge_indices = array('i', [0]) * len(graph.targets)
+  fill = list(counts[:-1])
+  for node in range(node_count):
+    for index in range(graph.offsets[node], graph.offsets[node + 1]):
+      target = graph.targets[index]
+      sources[fill[target]] = node
+      edge_indices[fill[target]] = index
+      fill[target] += 1
+  return offsets, sources, edge_indices
@@ -1,18 +1,49 @@
 from argparse import Namespace
+from collections import deque
+from itertools import count
 from types import SimpleNamespace
-from typing import Dict, ValuesView
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple, ValuesView
 
+from agents_playground.containers.attribute_index import AttributeIndex
+from agents_playground.navigation.navigation_graph import NavigationGraph
 from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.kd_tree import KDTree
 from agents_playground.spatial.types import Coordinate
 from agents_playground.sys.logger import get_default_logger
 logger = get_default_logger()
 
 Junction = SimpleNamespace
 
+# Mesh versions are drawn from a shared counter so no two meshes, or two states
+# of the same mesh, ever have the same version.
+_mesh_versions = count(1)
+
+# Junctions are always indexed by the type of entity they belong to and their tags.
+JUNCTION_INDEX_FIELDS = ('entity_type', 'tags')
+
+# The number of cost changes a mesh remembers for incremental planners.
+COST_CHANGE_HISTORY: int = 4096
+
 class NavigationMesh:
   def __init__(self) -> None:
     self._junctions: Dict[Tag, Junction] = dict()
     self._junction_location_index: Dict[Coordinate, Tag] = dict()
+    self._version: int = next(_mesh_versions)
+    self._graph: Optional[NavigationGraph] = None
+    self._junction_index: Optional[KDTree[Junction]] = None
+    self._junction_attributes: AttributeIndex[Junction] = AttributeIndex(JUNCTION_INDEX_FIELDS)
+
+    # Dynamic costs. Closed junctions can't be entered or left. Reweighted 
+    # connections cost the given amount instead of their length.
+    self._closed_junctions: Set[Tag] = set()
+    self._connection_costs: Dict[Tuple[Tag, Tag], float] = dict()
+
+    # The (version, junction) pairs of the cost changes made since the
+    # junctions were last added or removed. Every change after the history's
+    # start version is remembered.
+    self._history_start: int = self._version
+    self._cost_changes: Deque[Tuple[int, Tag]] = deque(maxlen = COST_CHANGE_HISTORY)
+    self._pending_cost_changes: List[Tag] = []
 
   def __del__(self) -> None:
     logger.info('NavigationMesh is deleted.')
@@ -20,6 +51,109 @@ class NavigationMesh:
   def purge(self) -> None:
     self._junctions.clear()
     self._junction_location_index.clear()
+    self._junction_attributes.clear()
+    self._closed_junctions.clear()
+    self._connection_costs.clear()
+    self._structure_changed()
+
+  @property
+  def version(self) -> int:
+    """Changes every time the mesh changes. Unique across all meshes."""
+    return self._version
+
+  def graph(self) -> NavigationGraph:
+    """The mesh compiled for path finding. Rebuilt after the mesh changes."""
+    if self._graph is None:
+      self._graph = NavigationGraph(
+        self._junctions.values(), 
+        closed = self._closed_junctions, 
+        costs = self._connection_costs
+      )
+      self._graph.version = self._version
+    elif len(self._pending_cost_changes) > 0:
+      self._graph = self._graph.with_changed_costs(
+        self._pending_cost_changes, 
+        self._closed_junctions, 
+        self._connection_costs
+      )
+      self._graph.version = self._version
+    self._pending_cost_changes.clear()
+    return self._graph
+
+  def _changed(self) -> None:
+    self._version = next(_mesh_versions)
+
+  def _structure_changed(self) -> None:
+    self._changed()
+    self._graph = None
+    self._junction_index = None
+    self._history_start = self._version
+    self._cost_changes.clear()
+
+  def _costs_changed(self, toml_id: Tag) -> None:
+    """Only the costs changed, so the compiled graph can be updated rather than rebuilt."""
+    self._changed()
+    self._pending_cost_changes.append(toml_id)
+    if len(self._cost_changes) == self._cost_changes.maxlen:
+      self._history_start = self._cost_changes[0][0]
+    self._cost_changes.append((self._version, toml_id))
+
+  def cost_changes_since(self, version: int) -> Optional[List[Tag]]:
+    """
+    Finds the junctions whose connection costs changed after a version of the
+    mesh. Junctions are numbered the same way in the compiled graphs of all 
+    the versions in between.
+
+    Returns
+      The TOML IDs of the changed junctions, or None if junctions were added or 
+      removed since the version or the changes are too old to be remembered.
+    """
+    if version < self._history_start:
+      return None
+    return [toml_id for change_version, toml_id in self._cost_changes if change_version > version]
+
+  def close_junction(self, toml_id: Tag) -> None:
+    """Blocks a junction. Routes can't pass through, start at or end at it until it's opened."""
+    self.get_junction_by_toml_id(toml_id)
+    if toml_id not in self._closed_junctions:
+      self._closed_junctions.add(toml_id)
+      self._costs_changed(toml_id)
+
+  def open_junction(self, toml_id: Tag) -> None:
+    """Unblocks a closed junction."""
+    if toml_id in self._closed_junctions:
+      self._closed_junctions.remove(toml_id)
+      self._costs_changed(toml_id)
+
+  def is_junction_closed(self, toml_id: Tag) -> bool:
+    return toml_id in self._closed_junctions
+
+  def reweight_connection(self, from_toml_id: Tag, to_toml_id: Tag, cost: Optional[float]) -> None:
+    """
+    Changes the cost of moving along a connection.
+
+    Args:
+      - from_toml_id: The junction the connection starts at.
+      - to_toml_id: The junction the connection goes to.
+      - cost: The new cost or None to restore the default cost, the distance 
+        between the junctions. A cost can't be less than the distance, since 
+        the Navigator's heuristics depend on that.
+    """
+    start = self.get_junction_by_toml_id(from_toml_id)
+    end = self.get_junction_by_toml_id(to_toml_id)
+    if to_toml_id not in start.connects_to:
+      raise Exception(f'The junction {from_toml_id} does not connect to {to_toml_id}.')
+    key = (from_toml_id, to_toml_id)
+    if cost is None:
+      if key not in self._connection_costs:
+        return
+      del self._connection_costs[key]
+    else:
+      distance = start.location.find_distance(end.location)
+      if cost < distance:
+        raise Exception(f'The cost of the connection from {from_toml_id} to {to_toml_id} cannot be less than {distance}.')
+      self._connection_costs[key] = cost
+    self._costs_changed(from_toml_id)
 
   def add_junction(self, junction: Junction) -> None:
     if junction.toml_id in self._junctions:
@@ -27,6 +161,8 @@ class NavigationMesh:
     else:
       self._junctions[junction.toml_id] = junction
       self._junction_location_index[junction.location] = junction.toml_id
+      self._junction_attributes.add(junction.toml_id, junction)
+      self._structure_changed()
 
   def junctions(self) -> ValuesView:
     return self._junctions.values()
@@ -42,4 +178,44 @@ class NavigationMesh:
       toml_id = self._junction_location_index[location]
       return self.get_junction_by_toml_id(toml_id)
     else:
-      raise Exception(f'NavigationMesh does not have a junction at location {location}.')
\ No newline at end of file
+      raise Exception(f'NavigationMesh does not have a junction at location {location}.')
+
+  def index_fields(self, fields: Iterable[str]) -> None:
+    """Indexes the junctions by additional fields, such as entity_id."""
+    for field in fields:
+      self._junction_attributes.add_field(field)
+
+  def find(self, **criteria: Any) -> List[Junction]:
+    """
+    Finds the junctions whose fields match all of the criteria. Junctions are
+    indexed by entity_type, tags and the fields passed to index_fields.
+
+    Example
+      nav_mesh.find(entity_type = 'factories', entity_id = 1)
+    """
+    return self._junction_attributes.find(**criteria)
+
+  def junction_index(self) -> KDTree[Junction]:
+    """A spatial index of the junctions' locations. Rebuilt after junctions are added or removed."""
+    if self._junction_index is None:
+      self._junction_index = KDTree((junction.location, junction) for junction in self._junctions.values())
+    return self._junction_index
+
+  def nearest_junction(self, point: Coordinate, include_closed: bool = True) -> Optional[Junction]:
+    """
+    Finds the junction closest to a location that may be off the mesh.
+
+    Args:
+      - point: The location to search from.
+      - include_closed: If False, closed junctions are skipped.
+
+    Returns
+      The closest junction or None if the mesh doesn't have any.
+    """
+    accept = None if include_closed else (lambda junction: junction.toml_id not in self._closed_junctions)
+    found = self.junction_index().nearest(point, accept = accept)
+    return found[0] if found is not None else None
+
+  def junctions_within(self, point: Coordinate, radius: float) -> List[Junction]:
+    """Finds the junctions within a distance of a location, closest first."""
+    return self.junction_index().within(point, radius)
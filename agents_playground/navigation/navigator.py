@@ -1,66 +1,60 @@
 from __future__ import annotations
+from array import array
 from enum import Enum
-from typing import List, Optional, Set, Tuple, Union
-
-from agents_playground.core.priority_queue import PriorityQueue
-from agents_playground.navigation.navigation_mesh import Junction, NavigationMesh
-from agents_playground.navigation.waypoint import Waypoint, NavigationCost
+from heapq import heappop, heappush
+from math import inf
+from typing import List, Optional, Tuple, Union
+
+from agents_playground.navigation.heuristics import ManhattanHeuristic, NavigationHeuristic
+from agents_playground.navigation.navigation_graph import NavigationGraph, NodeId
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.navigation.route_cache import RouteCache, RouteCacheKey
 from agents_playground.spatial.types import Coordinate
 from agents_playground.sys.logger import get_default_logger
 logger = get_default_logger()
   
 Route = List[Coordinate]
 
-def build_path(endpoint: Waypoint) -> Route:
-  """
-  Given a Waypoint, builds a path following the waypoint's parent pointers.
-  Note: Will fail if there is a loop.
-
-  Returns
-  A path instance.
-  """
-  points : Route = []
-
-  current: Optional[Waypoint] = endpoint
-  while current != None:
-    points.append(getattr(current,'point'))
-    current = getattr(current,'predecessor')
-
-  points.reverse()
-  return points
-
 class NavigationResultStatus(Enum):
   SUCCESS = True
   FAILURE = False
 
 NavigationRouteResult = Union[None, Route]
-RouteAction = str
   
 class Navigator:
-  def __init__(self) -> None:
-    pass
-
-  def __del__(self) -> None:
-    logger.info('Navigator destroyed.')
-  
-  # TODO: Make this method cache-able
   """
-  Debugging
-  The issue: Sometimes a path can be found sometimes it cannot for the same destination.
-
-  Possible Issues:
-  1. I think the issue is the graph can have loops. This can cause a node to need to 
-  be inspected multiple times, but perhaps the node is rejected the first time as
-  part of a bad path.
+  Finds the shortest routes through a navigation mesh with A*.
 
-  2. There is no way to turn around on the apartment street.
-  3. The north bound street has multiple cycles.
-  3. Issue with the Waypoint data structure. The fact that it can only have one predecessor may be the issue.
-
-  Possible Solutions
-  - Need to get more nuanced with how visited_locations is used.
+  The search runs on the mesh's compiled NavigationGraph. Nodes are integers,
+  the open set is a binary heap and outdated heap entries are skipped when
+  they're popped rather than removed (lazy deletion). The cost of moving
+  between two junctions is the Manhattan distance between them. The default 
+  heuristic is also the Manhattan distance. Heuristics must be consistent, so 
+  a node never needs to be reopened once it's closed.
 
+  Routes are cached by the mesh's version and the start and end junctions.
+  Changing the mesh changes its version, so outdated routes aren't reused.
   """
+  def __init__(
+    self, 
+    debug: bool = False, 
+    cache_size: int = 1024, 
+    heuristic: Optional[NavigationHeuristic] = None
+  ) -> None:
+    """
+    Args:
+      - debug: If True, every step of every search is written to the debug log.
+      - cache_size: The number of routes to remember. Set to 0 to disable the cache.
+      - heuristic: Estimates the remaining cost of a route. Defaults to the Manhattan distance.
+    """
+    self.debug = debug
+    self.heuristic: NavigationHeuristic = heuristic if heuristic is not None else ManhattanHeuristic()
+    self.nodes_expanded: int = 0 # The number of nodes the most recent search closed.
+    self.route_cache = RouteCache(cache_size)
+
+  def __del__(self) -> None:
+    logger.info('Navigator destroyed.')
+  
   def find_route(
     self, 
     starting_location: Coordinate, 
@@ -76,78 +70,87 @@ class Navigator:
     Returns
       Returns a tuple of the form (NavigationResultStatus, None | Route).
     """
-    # print(f'Attempting to route from {starting_location} to {desired_location}')
-    debug_order_evaluated: List[RouteAction] = []
-    visited_locations: Set[Coordinate] = set()
-    possible_steps: PriorityQueue = PriorityQueue()
-
-    starting_point = Waypoint(starting_location, None)
-    starting_point.cost_from_start = 0
-    starting_point.cost_to_target = starting_point.point.find_distance(desired_location)
-    possible_steps.push(starting_point, starting_point, starting_point.total_cost())
-
-    debug_routing_pass: int = 0
-    debug_order_evaluated.append(f'\nRouting to {desired_location}')
-    while len(possible_steps) > 0:
-      _ignore_cost: float
-      current_location: Waypoint
-      _ignore_data: Optional[dict]
-      _ignore_cost, current_location, _ignore_data = possible_steps.pop() 
-
-      debug_routing_pass += 1
-      # print(f'Routing pass: {debug_routing_pass}')
-      if current_location.point == desired_location:
-        return (NavigationResultStatus.SUCCESS, build_path(current_location))
-      else:
-        debug_order_evaluated.append(f'\n{debug_routing_pass} {current_location.point} != {desired_location}')
-        visited_locations.add(current_location.point)
-        # Find the corresponding junction in the navigation mesh for the current location.
-        current_junction: Junction = nav_mesh.get_junction_by_location(current_location.point)
-        debug_order_evaluated.append(f'\n {debug_routing_pass} Current Junction {current_junction.toml_id} -> {current_junction.connects_to}')
-  
-        if(current_junction is None):
-          raise Exception(f'\nJunction could not be fond for location ({current_location.point.x},{current_location.point.y}).')
-
-        # Explore the locations that can be reached in the navigation mesh at the current junction.
-        for neighbor_location_toml_id in current_junction.connects_to:
-          # Find the neighbor's junction and mapped location.
-          neighbor_junction: Junction = nav_mesh.get_junction_by_toml_id(neighbor_location_toml_id)
-          neighbor: Waypoint = Waypoint(neighbor_junction.location, current_location)
-
-          debug_order_evaluated.append(f'\n\t{debug_routing_pass} Evaluating neighbor {neighbor_junction.toml_id}')
+    graph: NavigationGraph = nav_mesh.graph()
+    start: Optional[NodeId] = graph.node_at(starting_location)
+    if start is None:
+      raise Exception(f'NavigationMesh does not have a junction at location {starting_location}.')
+
+    end: Optional[NodeId] = graph.node_at(desired_location)
+    if end is None:
+      self.nodes_expanded = 0
+      return (NavigationResultStatus.FAILURE, None)
+
+    cache_key: RouteCacheKey = (nav_mesh.version, start, end)
+    found, nodes = self.route_cache.get(cache_key)
+    if not found:
+      route_nodes = self.find_node_route(graph, start, end)
+      nodes = tuple(route_nodes) if route_nodes is not None else None
+      self.route_cache.put(cache_key, nodes)
+
+    if nodes is None:
+      return (NavigationResultStatus.FAILURE, None)
+    return (NavigationResultStatus.SUCCESS, [graph.locations[node] for node in nodes])
+
+  def find_node_route(self, graph: NavigationGraph, start: NodeId, end: NodeId) -> Optional[List[NodeId]]:
+    """
+    Finds the cheapest route between two nodes in a compiled navigation mesh.
 
-          # Ignore the location if that's where we just came from
-          # This shouldn't happen in the nav mesh, but could if there accidental two node loops.
-          if (current_location.predecessor is not None) and (neighbor.point == current_location.predecessor.point):
-            debug_order_evaluated.append(f'\n\t{debug_routing_pass} Ignoring {neighbor_junction.toml_id}. Just came from there.')
+    Returns
+      The nodes along the route, including the start and end, or None if the 
+      end can't be reached.
+    """
+    self.heuristic.prepare(graph)
+    node_count = len(graph)
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    cost_from_start: List[float] = [inf] * node_count
+    predecessors: array = array('i', [-1]) * node_count
+    closed = bytearray(node_count)
+    expanded: int = 0
+
+    cost_from_start[start] = 0.0
+    open_nodes: List[Tuple[float, NodeId]] = [(self._estimate(graph, start, end), start)]
+
+    try:
+      while open_nodes:
+        _, node = heappop(open_nodes)
+        if closed[node]:
+          continue # An outdated entry. The node was already reached more cheaply.
+
+        if node == end:
+          return unwind_route(predecessors, end)
+
+        closed[node] = 1
+        expanded += 1
+        node_cost = cost_from_start[node]
+        if self.debug:
+          logger.debug(f'Navigator: Expanding {graph.toml_ids[node]} with cost {node_cost}.')
+
+        for index in range(offsets[node], offsets[node + 1]):
+          neighbor = targets[index]
+          if closed[neighbor]:
             continue
-
-          cost_to_add_step_to_path: NavigationCost = current_location.total_cost() + current_location.point.find_distance(neighbor.point)
-          neighbor.cost_from_start = cost_to_add_step_to_path
-          neighbor.cost_to_target = neighbor.point.find_distance(desired_location)
-
-          # We could have visited this location before from a different path. 
-          # If that's the case, then remove it from the visited set or possible queue.
-          if (neighbor.point in visited_locations) and (cost_to_add_step_to_path < starting_point.point.find_distance(neighbor.point)) :
-            debug_order_evaluated.append(f'\n\t{debug_routing_pass} Removing {neighbor_junction.toml_id} from visited locations to enable reconsidering it.')
-            visited_locations.remove(neighbor.point)
-
-          if (neighbor in possible_steps) and (cost_to_add_step_to_path < starting_point.point.find_distance(neighbor.point)):
-            debug_order_evaluated.append(f'\n\t{debug_routing_pass} Removing {neighbor_junction.toml_id} from possible_steps to enable reconsidering it.')
-            possible_steps.remove(neighbor) 
-          
-          if (neighbor not in possible_steps) and (neighbor.point not in visited_locations):
-            debug_order_evaluated.append(f'\n\t{debug_routing_pass} Adding {neighbor_junction.toml_id} to possible_steps.')
-            possible_steps.push(neighbor, neighbor, neighbor.total_cost())
-
-          debug_order_evaluated.append('\n')
-    else:
-      debug_order_evaluated.append(f'\n{debug_routing_pass} The possible_steps queue is empty.\n')
-      debug_order_evaluated.append(possible_steps.__str__())
-      debug_order_evaluated.append("\nVisited Locations:\n")
-      debug_order_evaluated.append(visited_locations.__str__())
-  
-    with open('debug_navigation.txt', "w") as f:
-      f.writelines(debug_order_evaluated)
-
-    return (NavigationResultStatus.FAILURE, None)
\ No newline at end of file
+          cost = node_cost + weights[index]
+          if cost < cost_from_start[neighbor]:
+            cost_from_start[neighbor] = cost
+            predecessors[neighbor] = node
+            heappush(open_nodes, (cost + self._estimate(graph, neighbor, end), neighbor))
+
+      if self.debug:
+        logger.debug(f'Navigator: No route from {graph.toml_ids[start]} to {graph.toml_ids[end]}.')
+      return None
+    finally:
+      self.nodes_expanded = expanded
+
+  def _estimate(self, graph: NavigationGraph, node: NodeId, end: NodeId) -> float:
+    """The heuristic. An estimate of the cost between a node and the end of the route."""
+    return self.heuristic.estimate(graph, node, end)
+
+def unwind_route(predecessors: array, end: NodeId) -> List[NodeId]:
+  """Follows the predecessor links from the end of a route back to its start."""
+  route: List[NodeId] = [end]
+  node = predecessors[end]
+  while node != -1:
+    route.append(node)
+    node = predecessors[node]
+  route.reverse()
+  return route
@@ -0,0 +1,203 @@
+"""
+All pairs routing with a precomputed next hop table.
+
+For every pair of junctions (start, end) the table stores the junction to move
+to next when traveling from start to end. Finding a route is a walk through
+the table, with no searching. The table takes n^2 32 bit integers, so it's
+intended for meshes of up to a few thousand junctions.
+
+Building the table runs Dijkstra's algorithm from every junction. That can be
+slow, so tables can be saved to disk and memory mapped when a scene is loaded
+again. Saved tables are named by the mesh's fingerprint.
+"""
+from __future__ import annotations
+
+from array import array
+from heapq import heappop, heappush
+from math import inf
+import mmap
+import os
+from pathlib import Path
+import struct
+from time import perf_counter
+from typing import List, Optional, Union
+
+from agents_playground.navigation.navigation_graph import NavigationGraph, NodeId
+from agents_playground.navigation.navigator import Navigator
+from agents_playground.sys.logger import get_default_logger
+logger = get_default_logger()
+
+NO_ROUTE: int = -1
+
+# The file header: a format marker followed by the number of junctions.
+_FILE_MAGIC: bytes = b'NHT1'
+_FILE_HEADER = struct.Struct('<4sI')
+
+class NextHopTableError(Exception):
+  def __init__(self, *args: object) -> None:
+    super().__init__(*args)
+
+class NextHopTable:
+  """
+  An n by n table of int32 node ids. Row i holds the next hop from node i to
+  every other node. NO_ROUTE marks unreachable nodes.
+  """
+  def __init__(
+    self,
+    node_count: int,
+    hops: Union[array, memoryview],
+    fingerprint: str,
+    build_seconds: float = 0.0
+  ) -> None:
+    if len(hops) != node_count * node_count:
+      raise NextHopTableError(f'A next hop table for {node_count} nodes must have {node_count * node_count} entries. Found {len(hops)}.')
+    self.node_count = node_count
+    self.fingerprint = fingerprint
+    self.build_seconds = build_seconds
+    self._hops = hops
+    self._mapped: Optional[mmap.mmap] = None
+
+  @staticmethod
+  def build(graph: NavigationGraph) -> NextHopTable:
+    """Runs Dijkstra's algorithm from every node of the graph."""
+    started = perf_counter()
+    node_count = len(graph)
+    hops = array('i', [NO_ROUTE]) * (node_count * node_count)
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+
+    for source in range(node_count):
+      row = source * node_count
+      costs: List[float] = [inf] * node_count
+      first_hops: List[int] = [NO_ROUTE] * node_count
+      costs[source] = 0.0
+      first_hops[source] = source
+      open_nodes = [(0.0, source)]
+      while open_nodes:
+        cost, node = heappop(open_nodes)
+        if cost > costs[node]:
+          continue # An outdated entry.
+        hops[row + node] = first_hops[node]
+        for index in range(offsets[node], offsets[node + 1]):
+          neighbor = targets[index]
+          neighbor_cost = cost + weights[index]
+          if neighbor_cost < costs[neighbor]:
+            costs[neighbor] = neighbor_cost
+            first_hops[neighbor] = neighbor if node == source else first_hops[node]
+            heappush(open_nodes, (neighbor_cost, neighbor))
+
+    table = NextHopTable(node_count, hops, graph.fingerprint(), perf_counter() - started)
+    logger.info(f'Built a next hop table for {node_count} junctions in {table.build_seconds:.2f}s using {table.nbytes} bytes.')
+    return table
+
+  @staticmethod
+  def load_or_build(graph: NavigationGraph, directory: Union[str, Path]) -> NextHopTable:
+    """
+    Memory maps the graph's saved table from a directory. If there isn't one,
+    the table is built and saved there.
+    """
+    path = NextHopTable.path_for(graph.fingerprint(), directory)
+    if path.exists():
+      return NextHopTable.load(path, graph.fingerprint())
+    table = NextHopTable.build(graph)
+    table.save(path)
+    return table
+
+  @staticmethod
+  def path_for(fingerprint: str, directory: Union[str, Path]) -> Path:
+    return Path(directory) / f'next_hops_{fingerprint}.bin'
+
+  @staticmethod
+  def load(path: Union[str, Path], fingerprint: str) -> NextHopTable:
+    """Memory maps a saved table. The table's pages are read as they're used."""
+    with open(path, 'rb') as file:
+      mapped = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+    magic, node_count = _FILE_HEADER.unpack_from(mapped, 0)
+    if magic != _FILE_MAGIC:
+      mapped.close()
+      raise NextHopTableError(f'The file {path} is not a next hop table.')
+    hops = memoryview(mapped)[_FILE_HEADER.size:].cast('i')
+    table = NextHopTable(node_count, hops, fingerprint)
+    table._mapped = mapped
+    return table
+
+  def save(self, path: Union[str, Path]) -> None:
+    """Writes the table to a file. The file is written to a temporary name first."""
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as file:
+      file.write(_FILE_HEADER.pack(_FILE_MAGIC, self.node_count))
+      file.write(self._hops if isinstance(self._hops, array) else array('i', self._hops))
+    os.replace(temp_path, path)
+
+  def close(self) -> None:
+    """Releases the memory map if the table was loaded from disk."""
+    if self._mapped is not None:
+      self._hops.release() # type: ignore
+      self._mapped.close()
+      self._mapped = None
+
+  @property
+  def nbytes(self) -> int:
+    """The memory used by the table."""
+    return self.node_count * self.node_count * 4
+
+  def next_hop(self, start: NodeId, end: NodeId) -> NodeId:
+    return self._hops[start * self.node_count + end]
+
+  def route(self, start: NodeId, end: NodeId) -> Optional[List[NodeId]]:
+    """
+    Walks the table from the start to the end.
+
+    Returns
+      The nodes along the route, including the start and end, or None if the
+      end can't be reached.
+    """
+    hops, node_count = self._hops, self.node_count
+    route: List[NodeId] = [start]
+    node = start
+    while node != end:
+      node = hops[node * node_count + end]
+      if node == NO_ROUTE or len(route) > node_count:
+        return None
+      route.append(node)
+    return route
+
+class NextHopNavigator(Navigator):
+  """
+  A Navigator that looks routes up in a next hop table instead of searching.
+
+  The table is built, or loaded from table_directory, the first time a mesh
+  is used and again whenever the mesh changes.
+  """
+  def __init__(
+    self,
+    table_directory: Optional[Union[str, Path]] = None,
+    debug: bool = False,
+    cache_size: int = 0
+  ) -> None:
+    """
+    Args:
+      - table_directory: Where to save and load tables. If None, tables are only kept in memory.
+      - debug: If True, table builds and loads are written to the debug log.
+      - cache_size: The number of routes to remember. The table is already a cache, so it defaults to 0.
+    """
+    super().__init__(debug = debug, cache_size = cache_size)
+    self._table_directory = table_directory
+    self._graph: Optional[NavigationGraph] = None
+    self._table: Optional[NextHopTable] = None
+
+  def table_for(self, graph: NavigationGraph) -> NextHopTable:
+    if self._table is None or self._graph is not graph:
+      if self._table is not None:
+        self._table.close()
+      if self._table_directory is None:
+        self._table = NextHopTable.build(graph)
+      else:
+        self._table = NextHopTable.load_or_build(graph, self._table_directory)
+      self._graph = graph
+      if self.debug:
+        logger.debug(f'NextHopNavigator: Using table {self._table.fingerprint} ({self._table.nbytes} bytes).')
+    return self._table
+
+  def find_node_route(self, graph: NavigationGraph, start: NodeId, end: NodeId) -> Optional[List[NodeId]]:
+    self.nodes_expanded = 0
+    return self.table_for(graph).route(start, end)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from agents_playground.navigation.navigation_graph import NodeId
+
+# (mesh version, start node, end node)
+RouteCacheKey = Tuple[int, NodeId, NodeId]
+
+# The nodes along a route or None if there isn't a route.
+CachedRoute = Optional[Tuple[NodeId, ...]]
+
+class RouteCache:
+  """
+  A bounded, least recently used cache of routes.
+
+  Routes are keyed by the version of the mesh they were found on. When a mesh
+  changes its version changes, so routes found on the old mesh are never
+  returned. They age out of the cache like any other unused entry.
+  """
+  def __init__(self, max_size: int = 1024) -> None:
+    """
+    Args:
+      - max_size: The most routes to store. A size of 0 disables caching.
+    """
+    self.max_size = max_size
+    self.hits: int = 0
+    self.misses: int = 0
+    self._routes: OrderedDict[RouteCacheKey, CachedRoute] = OrderedDict()
+
+  def __len__(self) -> int:
+    return len(self._routes)
+
+  def __contains__(self, key: RouteCacheKey) -> bool:
+    return key in self._routes
+
+  def get(self, key: RouteCacheKey) -> Tuple[bool, CachedRoute]:
+    """
+    Look up a route.
+
+    Returns
+      A tuple of the form (found, route). A cached failure is (True, None).
+    """
+    if key in self._routes:
+      self.hits += 1
+      self._routes.move_to_end(key)
+      return (True, self._routes[key])
+    self.misses += 1
+    return (False, None)
+
+  def put(self, key: RouteCacheKey, route: CachedRoute) -> None:
+    if self.max_size <= 0:
+      return
+    self._routes[key] = route
+    self._routes.move_to_end(key)
+    while len(self._routes) > self.max_size:
+      self._routes.popitem(last = False)
+
+  def clear(self) -> None:
+    self._routes.clear()
+
+  def reset_stats(self) -> None:
+    self.hits = 0
+    self.misses = 0
+
+  def hit_rate(self) -> float:
+    lookups = self.hits + self.misses
+    return self.hits / lookups if lookups > 0 else 0.0
+
+  def __repr__(self) -> str:
+    return f'{self.__class__.__name__}(size={len(self)}, max_size={self.max_size}, hits={self.hits}, misses={self.misses})'
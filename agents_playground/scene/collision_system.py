@@ -0,0 +1,155 @@
+"""
+Detects and optionally resolves overlapping agents.
+
+Agents are tested against each other using a spatial grid that is rebuilt
+every frame and against the scene's static entities using the scene's
+bounding volume hierarchy (scene.query). Nothing is compared pairwise, so the
+cost grows with the number of agents rather than the number of agent pairs.
+
+Every agent's contacts for the frame are stored on its physicality, where the
+somatosensory system picks them up as tactile sensations.
+"""
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.core.types import Size
+from agents_playground.scene.scene import Scene
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.bvh import Bounds2d
+from agents_playground.spatial.contact import Contact, ContactType
+from agents_playground.spatial.spatial_grid import SpatialGrid
+from agents_playground.spatial.types import Coordinate
+from agents_playground.spatial.vector2d import Vector2d
+
+def penetration(agent_bounds: Bounds2d, other_bounds: Bounds2d) -> Optional[Tuple[Vector2d, float]]:
+  """
+  Finds the minimum translation that separates two overlapping boxes.
+
+  Returns
+    The axis-aligned direction to move the first box and the distance to move it
+    or None if the boxes do not overlap. Touching edges are not an overlap.
+  """
+  overlap_x = min(agent_bounds.max_x, other_bounds.max_x) - max(agent_bounds.min_x, other_bounds.min_x)
+  overlap_y = min(agent_bounds.max_y, other_bounds.max_y) - max(agent_bounds.min_y, other_bounds.min_y)
+  if overlap_x <= 0 or overlap_y <= 0:
+    return None
+
+  if overlap_x <= overlap_y:
+    agent_center = agent_bounds.min_x + agent_bounds.max_x
+    other_center = other_bounds.min_x + other_bounds.max_x
+    return (Vector2d(-1 if agent_center < other_center else 1, 0), overlap_x)
+  else:
+    agent_center = agent_bounds.min_y + agent_bounds.max_y
+    other_center = other_bounds.min_y + other_bounds.max_y
+    return (Vector2d(0, -1 if agent_center < other_center else 1), overlap_y)
+
+class CollisionSystem:
+  """
+  A scene wide system that finds overlapping agents once per frame.
+  """
+  def __init__(
+    self,
+    solid_entities: Iterable[str] = (),
+    grid_cell_size: Optional[Size] = None,
+    resolve: bool = False
+  ) -> None:
+    """
+    Args:
+      - solid_entities: The names of the entity groupings agents can collide with
+        (e.g. buildings). Entities in other groupings (e.g. streets) are ignored.
+      - grid_cell_size: The size of the broad phase grid cells in canvas space.
+        Defaults to the scene's cell size.
+      - resolve: If True, overlapping agents are pushed apart after detection.
+    """
+    self._solid_entities: Set[str] = set(solid_entities)
+    self._grid_cell_size = grid_cell_size
+    self._resolve = resolve
+    self._grid: Optional[SpatialGrid[Tag]] = None
+
+  def process(self, scene: Scene) -> List[Tuple[Tag, Contact]]:
+    """
+    Runs collision detection, and resolution if enabled, for a frame.
+
+    Returns
+      Every (agent ID, contact) pair that was found.
+    """
+    contacts = self.detect(scene)
+    if self._resolve:
+      self.resolve(scene, contacts)
+    return contacts
+
+  def detect(self, scene: Scene) -> List[Tuple[Tag, Contact]]:
+    """
+    Finds all of the overlaps between agents and between agents and the solid
+    entities. Each agent's physicality.contacts is replaced with its contacts.
+    """
+    grid = self._prepare_grid(scene)
+    found: List[Tuple[Tag, Contact]] = []
+
+    agent: AgentLike
+    for agent_id, agent in scene.agents.items():
+      agent.physicality.contacts.clear()
+      grid.insert(agent_id, Bounds2d.from_aabb(agent.physicality.aabb))
+
+    for first_id, second_id in grid.candidate_pairs():
+      separation = penetration(grid.bounds_of(first_id), grid.bounds_of(second_id))
+      if separation is None:
+        continue
+      normal, depth = separation
+      first_contact  = Contact(ContactType.Agent, second_id, normal, depth)
+      second_contact = Contact(ContactType.Agent, first_id, Vector2d(-normal.i, -normal.j), depth)
+      scene.agents[first_id].physicality.contacts.append(first_contact)
+      scene.agents[second_id].physicality.contacts.append(second_contact)
+      found.append((first_id, first_contact))
+      found.append((second_id, second_contact))
+
+    if len(self._solid_entities) > 0:
+      for agent_id, agent in scene.agents.items():
+        agent_bounds = grid.bounds_of(agent_id)
+        entity: SimpleNamespace
+        for entity in scene.query.overlap_aabb(agent.physicality.aabb):
+          if getattr(entity, 'entity_grouping', None) not in self._solid_entities:
+            continue
+          entity_bounds = scene.query.bounds_of(entity)
+          if entity_bounds is None:
+            continue
+          separation = penetration(agent_bounds, entity_bounds)
+          if separation is None:
+            continue
+          contact = Contact(ContactType.Entity, entity, separation[0], separation[1])
+          agent.physicality.contacts.append(contact)
+          found.append((agent_id, contact))
+    return found
+
+  def resolve(self, scene: Scene, contacts: List[Tuple[Tag, Contact]]) -> None:
+    """
+    Pushes overlapping agents apart. Two agents each move half of the overlap.
+    An agent overlapping an entity moves the full overlap since entities don't move.
+    Each agent only moves once per frame, along the sum of its separations.
+    """
+    displacements: Dict[Tag, List[float]] = {}
+    for agent_id, contact in contacts:
+      share = contact.depth / 2.0 if contact.type == ContactType.Agent else contact.depth
+      displacement = displacements.setdefault(agent_id, [0.0, 0.0])
+      displacement[0] += contact.normal.i * share
+      displacement[1] += contact.normal.j * share
+
+    cell_size: Size = scene.cell_size
+    for agent_id, (dx, dy) in displacements.items():
+      agent = scene.agents[agent_id]
+      location = agent.position.location
+      agent.move_to(
+        Coordinate(location.x + dx / cell_size.width, location.y + dy / cell_size.height),
+        cell_size
+      )
+
+  def _prepare_grid(self, scene: Scene) -> SpatialGrid[Tag]:
+    if self._grid is None:
+      grid_cell_size = self._grid_cell_size if self._grid_cell_size is not None else scene.cell_size
+      self._grid = SpatialGrid(grid_cell_size.width, grid_cell_size.height)
+    else:
+      self._grid.clear()
+    return self._grid
@@ -0,0 +1,201 @@
+"""
+Simulates the agents far from where the user is looking in less detail.
+
+An LODPolicy sorts the scene's agents into tiers by how far they are from the
+nearest focus region, such as the camera's view of the canvas or a region of
+interest. A tier sets which of an agent's systems run and how often:
+  - full: Every system, every frame.
+  - reduced: Every system, every few frames.
+  - movement only: No systems. The agent still changes action state, which
+    drives its movement.
+  - frozen: Nothing. The agent keeps its last state.
+
+Tiers are assigned once per frame, before any agent is transitioned, from
+where the agents were at the start of the frame. Agents in a tier that runs
+every few frames are staggered by the order the policy first saw them in, so
+the same agents run on the same frames every time the simulation is run, and
+agents joining or leaving the scene don't move the others' frames. Agents in
+the full tier are processed exactly as they would be without a policy.
+
+The time spent transitioning the agents of each tier is recorded in costs.
+"""
+from __future__ import annotations
+
+from math import inf, sqrt
+from time import perf_counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.bvh import Bounds2d
+
+class LevelOfDetailError(Exception):
+  def __init__(self, *args: object) -> None:
+    super().__init__(*args)
+
+class LODTier(NamedTuple):
+  name: str
+  max_distance: float # How far, in canvas space, an agent can be from the focus and be in the tier.
+  systems: Optional[Tuple[str, ...]] = None # The internal systems' subsystems to run. None runs them all.
+  interval: int = 1 # Agents in the tier are transitioned every interval frames. 0 freezes them.
+  change_state: bool = True # If False, the agents stay in their current action state.
+
+  @property
+  def is_full(self) -> bool:
+    """True if the tier's agents are transitioned every frame with all of their systems."""
+    return self.systems is None and self.interval == 1 and self.change_state
+
+def standard_tiers(full: float, reduced: float, movement_only: float, reduced_interval: int = 4) -> List[LODTier]:
+  """
+  The full, reduced, movement only, and frozen tiers.
+
+  Args:
+    - full: The distance within which agents are simulated in full.
+    - reduced: The distance within which agents run all of their systems every reduced_interval frames.
+    - movement_only: The distance within which agents only change state. Agents further away are frozen.
+    - reduced_interval: How often agents in the reduced tier are transitioned.
+  """
+  return [
+    LODTier('full', full),
+    LODTier('reduced', reduced, interval = reduced_interval),
+    LODTier('movement_only', movement_only, systems = ()),
+    LODTier('frozen', inf, interval = 0)
+  ]
+
+class LODTierCost:
+  """What a tier's agents have cost since the costs were last reset."""
+  def __init__(self) -> None:
+    self.agents: int = 0 # The number of agents in the tier on the last frame.
+    self.updates: int = 0 # The number of agent transitions.
+    self.seconds: float = 0.0 # The time spent on the transitions.
+
+  @property
+  def seconds_per_update(self) -> float:
+    return self.seconds / self.updates if self.updates > 0 else 0.0
+
+  def __repr__(self) -> str:
+    return f'{self.__class__.__name__}(agents={self.agents}, updates={self.updates}, seconds={self.seconds:.6f})'
+
+class LODPolicy:
+  """Assigns agents to tiers and transitions them the way their tier says."""
+  def __init__(self, tiers: Iterable[LODTier], focus: Iterable[Bounds2d] = ()) -> None:
+    """
+    Args:
+      - tiers: The tiers. An agent is in the first tier, by max_distance, that
+        it is close enough to be in. Agents further away than every tier's
+        max_distance are in the last one.
+      - focus: The regions the user is looking at, in canvas space. See focus_on.
+    """
+    self.tiers: List[LODTier] = sorted(tiers, key = lambda tier: tier.max_distance)
+    if len(self.tiers) == 0:
+      raise LevelOfDetailError('A level of detail policy must have at least one tier.')
+    names = [tier.name for tier in self.tiers]
+    if len(set(names)) != len(names):
+      raise LevelOfDetailError(f'The level of detail tiers must have unique names. Received {names}.')
+    for tier in self.tiers:
+      if tier.interval < 0:
+        raise LevelOfDetailError(f'The tier {tier.name} has a negative interval {tier.interval}.')
+    self.focus: List[Bounds2d] = list(focus)
+    self.frame: int = 0
+    self.costs: Dict[str, LODTierCost] = {tier.name: LODTierCost() for tier in self.tiers}
+    self._tiers_of: Dict[Tag, LODTier] = {}
+    self._stagger: Dict[Tag, int] = {} # Each agent's offset, from when the policy first saw it.
+    self._next_stagger: int = 0
+    self._assigned_frame: Optional[int] = None
+
+  def focus_on(self, *regions: Bounds2d) -> None:
+    """
+    Sets the regions the user is looking at. Typically the part of the canvas
+    the camera can see. Pass a region with no area to focus on a point. With
+    no focus, every agent is in the first tier.
+    """
+    self.focus = list(regions)
+    self._assigned_frame = None
+
+  def distance_to_focus(self, agent: AgentLike) -> float:
+    """How far the center of the agent's AABB is from the nearest focus region. 0 if it is in one."""
+    if len(self.focus) == 0:
+      return 0.0
+    center = Bounds2d.from_aabb(agent.physicality.aabb).center()
+    nearest = inf
+    for region in self.focus:
+      dx = max(region.min_x - center.x, 0.0, center.x - region.max_x)
+      dy = max(region.min_y - center.y, 0.0, center.y - region.max_y)
+      nearest = min(nearest, sqrt(dx * dx + dy * dy))
+    return nearest
+
+  def tier_for(self, distance: float) -> LODTier:
+    for tier in self.tiers:
+      if distance <= tier.max_distance:
+        return tier
+    return self.tiers[-1]
+
+  def assign(self, agents: Dict[Tag, AgentLike]) -> None:
+    """
+    Assigns the agents to tiers. Only the first call each frame does anything,
+    so agents that move during the frame keep their tier until the next one.
+    """
+    if self._assigned_frame == self.frame:
+      return
+    self._assigned_frame = self.frame
+    self._tiers_of.clear()
+    for cost in self.costs.values():
+      cost.agents = 0
+    for agent_id, agent in agents.items():
+      tier = self.tier_for(self.distance_to_focus(agent))
+      self._tiers_of[agent_id] = tier
+      if agent_id not in self._stagger:
+        self._stagger[agent_id] = self._next_stagger
+        self._next_stagger += 1
+      self.costs[tier.name].agents += 1
+    if len(self._stagger) > len(agents):
+      for agent_id in [agent_id for agent_id in self._stagger if agent_id not in agents]:
+        del self._stagger[agent_id]
+
+  def tier_of(self, agent_id: Tag) -> LODTier:
+    """The tier an agent was assigned to this frame."""
+    tier = self._tiers_of.get(agent_id)
+    if tier is None:
+      raise LevelOfDetailError(f'The agent {agent_id} has not been assigned a level of detail tier.')
+    return tier
+
+  def is_due(self, agent_id: Tag) -> bool:
+    """True if the agent is transitioned this frame."""
+    tier = self.tier_of(agent_id)
+    if tier.interval == 0:
+      return False
+    return (self.frame + self._stagger[agent_id]) % tier.interval == 0
+
+  def transition(self, agent: AgentLike, other_agents: Dict[Tag, AgentLike]) -> None:
+    """Transitions an agent the way its tier says, if it is due this frame."""
+    if not self.is_due(agent.identity.id):
+      return
+    tier = self._tiers_of[agent.identity.id]
+    started = perf_counter()
+    agent.transition_state_reduced(other_agents, tier.systems, tier.change_state)
+    self.record(tier, 1, perf_counter() - started)
+
+  def record(self, tier: LODTier, updates: int, seconds: float) -> None:
+    """Adds transitions that were run outside of transition() to a tier's costs."""
+    cost = self.costs[tier.name]
+    cost.updates += updates
+    cost.seconds += seconds
+
+  def advance(self) -> None:
+    """Called at the end of a frame."""
+    self.frame += 1
+
+  def reset_costs(self) -> None:
+    for cost in self.costs.values():
+      cost.updates = 0
+      cost.seconds = 0.0
+
+  def report(self) -> str:
+    """A table of the costs of each tier."""
+    lines = [f'{"tier":<16}{"agents":>8}{"updates":>10}{"seconds":>12}{"us/update":>12}']
+    for tier in self.tiers:
+      cost = self.costs[tier.name]
+      lines.append(
+        f'{tier.name:<16}{cost.agents:>8}{cost.updates:>10}{cost.seconds:>12.6f}{cost.seconds_per_update * 1_000_000:>12.2f}'
+      )
+    return '\n'.join(lines)
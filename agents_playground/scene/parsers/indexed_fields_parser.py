@@ -0,0 +1,20 @@
+from types import SimpleNamespace
+
+from agents_playground.scene.parsers.scene_parser import SceneParser
+from agents_playground.scene.scene import Scene
+
+class IndexedFieldsParser(SceneParser):
+  """
+  Declares the TOML fields that entities and nav mesh junctions are indexed by.
+  For example:
+    [scene]
+    indexed_fields = ['entity_id']
+  
+  This runs before the entities and junctions are parsed, so they're indexed
+  as they're added.
+  """
+  def is_fit(self, scene_data:SimpleNamespace) -> bool:
+    return hasattr(scene_data.scene, 'indexed_fields')
+
+  def process(self, scene_data:SimpleNamespace, scene: Scene) -> None:
+    scene.index_fields(scene_data.scene.indexed_fields)
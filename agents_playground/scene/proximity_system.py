@@ -0,0 +1,107 @@
+"""
+Finds the agents that are near each other.
+
+Rather than every sense (sight, hearing, touch, ...) searching all of the
+scene's agents, the neighbors of every agent are found once per frame and
+shared. The result is the other_agents mapping that is passed down the agent's
+system hierarchy by AgentLike.transition_state.
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import agents_playground.agents.spec.agent_spec as agent_spec
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.bvh import Bounds2d
+from agents_playground.spatial.spatial_grid import SpatialGrid
+
+class ProximitySystemError(Exception):
+  def __init__(self, *args: object) -> None:
+    super().__init__(*args)
+
+class ProximitySystem:
+  """
+  Maintains each agent's neighbor list. The lists are calculated on the first
+  request after invalidate() is called. The scene invalidates them at the end
+  of every frame.
+  """
+  def __init__(self, max_radius: Optional[float] = None) -> None:
+    """
+    Args:
+      - max_radius: How far away, in canvas space, another agent can be and still
+        be a neighbor. Distances are measured between the centers of the agents'
+        AABBs. If None, every other agent in the scene is a neighbor.
+    """
+    self.max_radius = max_radius
+    self._neighbors: Dict[Tag, Dict[Tag, agent_spec.AgentLike]] = {}
+    self._stale: bool = True
+
+  @property
+  def max_radius(self) -> Optional[float]:
+    return self._max_radius
+
+  @max_radius.setter
+  def max_radius(self, radius: Optional[float]) -> None:
+    if radius is not None and radius <= 0:
+      raise ProximitySystemError(f'The proximity radius must be positive. Received {radius}.')
+    self._max_radius = radius
+    self._stale = True
+
+  def invalidate(self) -> None:
+    """Flags that the neighbor lists must be recalculated before they're used again."""
+    self._stale = True
+
+  def purge(self) -> None:
+    self._neighbors.clear()
+    self._stale = True
+
+  def neighbors_of(
+    self,
+    agent_id: Tag,
+    agents: Dict[Tag, agent_spec.AgentLike]
+  ) -> Dict[Tag, agent_spec.AgentLike]:
+    """
+    Finds the agents near an agent. The agent is not included.
+
+    Args:
+      - agent_id: The agent to find the neighbors of.
+      - agents: All of the scene's agents.
+
+    Returns
+      The neighbors, keyed by their IDs. Treat it as read only. It is shared
+      until the next time the neighbors are calculated.
+    """
+    if self._max_radius is None:
+      # Every other agent is a neighbor. Building every agent's list up front 
+      # would be quadratic, so only the agents that ask get one.
+      return {other_id: other for other_id, other in agents.items() if other_id != agent_id}
+    if self._stale:
+      self.update(agents)
+    return self._neighbors.get(agent_id, {})
+
+  def update(self, agents: Dict[Tag, agent_spec.AgentLike]) -> None:
+    """Recalculates the neighbors of every agent."""
+    self._neighbors.clear()
+    self._stale = False
+
+    if self._max_radius is None:
+      return
+
+    radius = self._max_radius
+    radius_squared = radius * radius
+    grid: SpatialGrid[Tag] = SpatialGrid(radius, radius)
+    centers: Dict[Tag, tuple[float, float]] = {}
+    for agent_id, agent in agents.items():
+      center = Bounds2d.from_aabb(agent.physicality.aabb).center()
+      centers[agent_id] = (center.x, center.y)
+      grid.insert(agent_id, Bounds2d(center.x, center.y, center.x, center.y))
+
+    for agent_id, (x, y) in centers.items():
+      neighbors: Dict[Tag, agent_spec.AgentLike] = {}
+      for other_id in grid.query(Bounds2d(x - radius, y - radius, x + radius, y + radius)):
+        if other_id == agent_id:
+          continue
+        other_x, other_y = centers[other_id]
+        if (other_x - x) ** 2 + (other_y - y) ** 2 <= radius_squared:
+          neighbors[other_id] = agents[other_id]
+      self._neighbors[agent_id] = neighbors
@@ -1,13 +1,19 @@
 from dataclasses import dataclass
+from time import perf_counter
 from types import SimpleNamespace
-from typing import Any, Dict, Iterator,  ValuesView, cast
+from typing import Any, Dict, Iterable, Iterator, List, Optional, ValuesView, cast
 from agents_playground.agents.spec.agent_action_selector_spec import AgentActionSelector
 from agents_playground.agents.spec.agent_action_state_spec import AgentActionStateLike
 
-from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.parallel.agent_state_buffer import AgentStateBuffer
+from agents_playground.agents.spec.agent_spec import AgentLike, transition_states_batched
 from agents_playground.agents.spec.tick import Tick
+from agents_playground.containers.attribute_index import AttributeIndex
 from agents_playground.core.types import Size
 from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.scene.level_of_detail import LODPolicy
+from agents_playground.scene.proximity_system import ProximitySystem
+from agents_playground.scene.scene_query import SceneQuery
 from agents_playground.scene.parsers.types import (
   AgentStateName, 
   AgentStateTransitionMapName, 
@@ -22,6 +28,9 @@ logger = get_default_logger()
 
 EntityGrouping = Dict[Tag, SimpleNamespace]
 
+# Entities are always indexed by their grouping (their type) and tags.
+ENTITY_INDEX_FIELDS = ('entity_grouping', 'tags')
+
 @dataclass
 class Scene(Tick):
   _cell_size: Size
@@ -30,6 +39,12 @@ class Scene(Tick):
   _entities: Dict[str, EntityGrouping]
   _layers: Dict[Tag, RenderLayer]
   _nav_mesh: NavigationMesh
+  _query: SceneQuery
+  _proximity: ProximitySystem
+  _entity_index: AttributeIndex[SimpleNamespace]
+  _indexed_fields: List[str]
+  _agent_buffer: Optional[AgentStateBuffer]
+  _lod: Optional[LODPolicy]
   canvas_size: Size
   agents: Dict[Tag, AgentLike]
   paths: Dict[Tag, InterpolatedPath]
@@ -43,6 +58,12 @@ class Scene(Tick):
     self._entities = dict()
     self._layers = dict()
     self._nav_mesh = NavigationMesh()
+    self._query = SceneQuery(self._entities)
+    self._proximity = ProximitySystem()
+    self._entity_index = AttributeIndex(ENTITY_INDEX_FIELDS)
+    self._indexed_fields = []
+    self._agent_buffer = None
+    self._lod = None
 
   def __del__(self) -> None:
     logger.info('Scene is deleted.')
@@ -55,11 +76,20 @@ class Scene(Tick):
     self._entities.clear()
     self._layers.clear()
     self._nav_mesh.purge()
+    self._query.purge()
+    self._proximity.purge()
+    self._entity_index = AttributeIndex(ENTITY_INDEX_FIELDS)
+    self._indexed_fields = []
+    self._agent_buffer = None
+    self._lod = None
     self.agents.clear()
     self.paths.clear()
 
   def add_agent(self, agent: AgentLike) -> None:
     self.agents[agent.identity.id] = agent
+    self._proximity.invalidate()
+    if self._agent_buffer is not None:
+      self._agent_buffer.add(agent)
 
   def add_path(self, path: InterpolatedPath) -> None:
     self.paths[path.id] = path
@@ -69,6 +99,11 @@ class Scene(Tick):
     agent: AgentLike
     for agent in self.agents.values():
       agent.tick()
+    if self._agent_buffer is not None:
+      self._agent_buffer.swap()
+    if self._lod is not None:
+      self._lod.advance()
+    self._proximity.invalidate()
 
   @property
   def cell_size(self) -> Size: 
@@ -79,6 +114,7 @@ class Scene(Tick):
     self._cell_size = size
     self._cell_center_x_offset = self._cell_size.width/2.0
     self._cell_center_y_offset = self._cell_size.height/2.0
+    self._query.use_cell_size(size)
 
   @property
   def cell_center_x_offset(self) -> float:
@@ -99,12 +135,150 @@ class Scene(Tick):
   @nav_mesh.setter
   def nav_mesh(self, mesh: NavigationMesh) -> None:
     self._nav_mesh = mesh
+    self._nav_mesh.index_fields(self._indexed_fields)
+
+  @property
+  def query(self) -> SceneQuery:
+    """Spatial queries (raycast, overlap_aabb, sweep_aabb) against the static entities."""
+    return self._query
+
+  @property
+  def proximity(self) -> ProximitySystem:
+    """Tracks which agents are near each other. Set proximity.max_radius to limit the neighborhoods."""
+    return self._proximity
+
+  @property
+  def double_buffered(self) -> bool:
+    """
+    If True, agents see each other as they were at the end of the last frame,
+    so the order agents are transitioned in doesn't change the outcome.
+    See AgentStateBuffer.
+    """
+    return self._agent_buffer is not None
+
+  @double_buffered.setter
+  def double_buffered(self, enabled: bool) -> None:
+    if enabled and self._agent_buffer is None:
+      self._agent_buffer = AgentStateBuffer(self.agents.values())
+    elif not enabled:
+      self._agent_buffer = None
+
+  @property
+  def agent_buffer(self) -> Optional[AgentStateBuffer]:
+    """The agents' committed state when the scene is double buffered."""
+    return self._agent_buffer
+
+  @property
+  def lod(self) -> Optional[LODPolicy]:
+    """
+    Simulates agents far from the focus in less detail. None simulates every 
+    agent in full. Combine with double_buffered so that when the agents of 
+    other tiers are transitioned doesn't change what an agent sees.
+    See LODPolicy.
+    """
+    return self._lod
+
+  @lod.setter
+  def lod(self, policy: Optional[LODPolicy]) -> None:
+    self._lod = policy
+
+  def neighbors_of(self, agent_id: Tag) -> Dict[Tag, AgentLike]:
+    """
+    Finds the other agents near an agent. The neighbors of all agents are 
+    calculated once per frame and shared by all of the agent's systems.
+    Intended to be passed to AgentLike.transition_state. If the scene is double
+    buffered, the neighbors are views of their committed state.
+    """
+    neighbors = self._proximity.neighbors_of(agent_id, self.agents)
+    if self._agent_buffer is not None:
+      return self._agent_buffer.committed(neighbors) # type: ignore
+    return neighbors
+
+  def transition_agents(self, agents: Optional[Iterable[AgentLike]] = None, batched: bool = False) -> None:
+    """
+    Moves agents forward one tick, with each agent's neighbors as its other agents.
+
+    Args:
+      - agents: The agents to transition. Defaults to all of the scene's agents.
+      - batched: If True, each system processes all of the agents in one call. 
+        See transition_states_batched. Otherwise transition_state is called on 
+        each agent in turn.
+
+    If the scene has a level of detail policy, each agent is transitioned the 
+    way its tier says. With batched, the agents of the full tiers are batched.
+    """
+    selected: List[AgentLike] = list(self.agents.values()) if agents is None else list(agents)
+    if self._lod is not None:
+      self._transition_agents_by_tier(self._lod, selected, batched)
+    elif batched:
+      transition_states_batched(
+        selected, 
+        [self.neighbors_of(agent.identity.id) for agent in selected], 
+        self
+      )
+    else:
+      for agent in selected:
+        agent.transition_state(self.neighbors_of(agent.identity.id))
+
+  def _transition_agents_by_tier(self, lod: LODPolicy, agents: List[AgentLike], batched: bool) -> None:
+    lod.assign(self.agents)
+    full: Dict[str, List[AgentLike]] = {}
+    for agent in agents:
+      tier = lod.tier_of(agent.identity.id)
+      if batched and tier.is_full:
+        full.setdefault(tier.name, []).append(agent)
+      else:
+        lod.transition(agent, self.neighbors_of(agent.identity.id))
+
+    for tier_agents in full.values():
+      tier = lod.tier_of(tier_agents[0].identity.id)
+      started = perf_counter()
+      transition_states_batched(
+        tier_agents, 
+        [self.neighbors_of(agent.identity.id) for agent in tier_agents], 
+        self
+      )
+      lod.record(tier, len(tier_agents), perf_counter() - started)
 
   def add_entity(self, grouping_name: str, entity: SimpleNamespace) -> None:
     if grouping_name not in self._entities:
       self._entities[grouping_name] = dict()
     entity.entity_grouping = grouping_name
     self._entities[grouping_name][entity.toml_id] = entity
+    self._entity_index.add((grouping_name, entity.toml_id), entity)
+    self._query.invalidate()
+
+  def remove_entity(self, grouping_name: str, entity_id: Any) -> None:
+    entity = self.get_entity(grouping_name, entity_id)
+    del self._entities[grouping_name][entity.toml_id]
+    self._entity_index.remove((grouping_name, entity.toml_id))
+    self._query.invalidate()
+
+  def index_fields(self, fields: Iterable[str]) -> None:
+    """
+    Indexes the entities and nav mesh junctions by additional fields. Entities 
+    and junctions that were already added are indexed as well.
+    """
+    for field in fields:
+      if field not in self._indexed_fields:
+        self._indexed_fields.append(field)
+      self._entity_index.add_field(field)
+    self._nav_mesh.index_fields(self._indexed_fields)
+
+  def find(self, **criteria: Any) -> List[SimpleNamespace]:
+    """
+    Finds the entities whose fields match all of the criteria. Entities are
+    indexed by entity_grouping, tags and the fields passed to index_fields.
+    Criteria on other fields are checked one entity at a time.
+
+    Example
+      scene.find(entity_grouping = 'factories', tags = 'open')
+    """
+    return self._entity_index.find(**criteria)
+
+  def find_junctions(self, **criteria: Any) -> List[SimpleNamespace]:
+    """Finds the nav mesh junctions whose fields match all of the criteria."""
+    return self._nav_mesh.find(**criteria)
 
   def get_entity(self, grouping_name: str, entity_id: Any) -> SimpleNamespace:
     if grouping_name in self._entities:
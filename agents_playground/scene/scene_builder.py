@@ -17,6 +17,7 @@ from agents_playground.scene.parsers.default_agent_states_parser import(
 from agents_playground.scene.parsers.paths_parser import PathsParser
 from agents_playground.scene.parsers.tasks_parser import TasksParser
 from agents_playground.scene.parsers.entities_parser import EntitiesParser
+from agents_playground.scene.parsers.indexed_fields_parser import IndexedFieldsParser
 from agents_playground.scene.parsers.nav_mesh_junction_parser import NavMeshJunctionParser
 from agents_playground.scene.parsers.agents_parser import AgentsParser
 from agents_playground.scene.parsers.scene_layers_parser import SceneLayersParser
@@ -56,6 +57,7 @@ class SceneBuilder:
     self._systems_map = systems_map
     
     self._parsers: List[SceneParser] = [
+      IndexedFieldsParser(),
       CellSizeParser(),
       CanvasSizeParser(),
       SceneLayersParser(id_generator, render_map),
@@ -84,4 +86,13 @@ class SceneBuilder:
     for parser in self._parsers:
       parser.parse(scene_data, scene) 
 
+    # The entities are static, so index them once the scene is loaded.
+    if len(scene.entities) > 0:
+      scene.query.build(scene.cell_size)
+
+    # Build the junction index up front so the first nearest junction query
+    # doesn't stall a frame.
+    if len(scene.nav_mesh.junctions()) > 0:
+      scene.nav_mesh.junction_index()
+
     return scene
\ No newline at end of file
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from math import inf
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from agents_playground.core.types import Size
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.aabbox import AABBox
+from agents_playground.spatial.bvh import (
+  BoundingVolumeHierarchy,
+  Bounds2d,
+  RaycastHit,
+  SweepHit
+)
+from agents_playground.spatial.types import Coordinate
+from agents_playground.spatial.vector import Vector
+
+EntityGrouping = Dict[Tag, SimpleNamespace]
+
+def entity_bounds(entity: SimpleNamespace, cell_size: Size) -> Optional[Bounds2d]:
+  """
+  Finds the canvas space bounds of a static entity.
+
+  Two entity shapes are supported.
+  - Rectangles: Entities with a location, width and height in grid cells.
+    The location is the upper left corner.
+  - Segments: Entities with a start and end in grid cells (e.g. streets).
+    The start and end are the center line and the optional lanes field is the
+    width in cells.
+
+  Returns
+    The bounds of the entity or None if the entity's shape can't be determined.
+  """
+  if hasattr(entity, 'location') and hasattr(entity, 'width') and hasattr(entity, 'height'):
+    min_x = entity.location[0] * cell_size.width
+    min_y = entity.location[1] * cell_size.height
+    return Bounds2d(
+      min_x,
+      min_y,
+      min_x + entity.width * cell_size.width,
+      min_y + entity.height * cell_size.height
+    )
+  elif hasattr(entity, 'start') and hasattr(entity, 'end'):
+    half_thickness_x = getattr(entity, 'lanes', 1) * cell_size.width / 2.0
+    half_thickness_y = getattr(entity, 'lanes', 1) * cell_size.height / 2.0
+    start_x, start_y = entity.start[0] * cell_size.width, entity.start[1] * cell_size.height
+    end_x, end_y = entity.end[0] * cell_size.width, entity.end[1] * cell_size.height
+    return Bounds2d(
+      min(start_x, end_x) - half_thickness_x,
+      min(start_y, end_y) - half_thickness_y,
+      max(start_x, end_x) + half_thickness_x,
+      max(start_y, end_y) + half_thickness_y
+    )
+  return None
+
+class SceneQuery:
+  """
+  Spatial queries against a scene's static entities.
+
+  The entities are indexed in a bounding volume hierarchy that is built when
+  the scene is loaded. All queries are in canvas space. If entities are added
+  after the scene is loaded, or the scene's cell size changes, the hierarchy
+  is rebuilt on the next query.
+  """
+  def __init__(self, entities: Dict[str, EntityGrouping]) -> None:
+    self._entities = entities
+    self._cell_size: Optional[Size] = None
+    self._bvh: BoundingVolumeHierarchy[SimpleNamespace] = BoundingVolumeHierarchy()
+    self._stale: bool = False
+
+  def build(self, cell_size: Size) -> None:
+    """Index all of the scene's entities that have a known shape."""
+    self._cell_size = cell_size
+    indexed_entities = []
+    for entity_grouping in self._entities.values():
+      for entity in entity_grouping.values():
+        bounds = entity_bounds(entity, cell_size)
+        if bounds is not None:
+          indexed_entities.append((bounds, entity))
+    self._bvh = BoundingVolumeHierarchy(indexed_entities)
+    self._stale = False
+
+  def use_cell_size(self, cell_size: Size) -> None:
+    """Sets the size of the scene's grid cells. The index is rebuilt with it before the next query."""
+    self._cell_size = cell_size
+    self._stale = True
+
+  def invalidate(self) -> None:
+    """Flags that the index needs to be rebuilt before the next query."""
+    self._stale = True
+
+  def purge(self) -> None:
+    self._bvh = BoundingVolumeHierarchy()
+    self._cell_size = None
+    self._stale = False
+
+  def bounds_of(self, entity: SimpleNamespace) -> Optional[Bounds2d]:
+    """The canvas space bounds of an entity or None if the index hasn't been built."""
+    if self._cell_size is None:
+      return None
+    return entity_bounds(entity, self._cell_size)
+
+  def __len__(self) -> int:
+    """The number of entities that are indexed."""
+    self._refresh()
+    return len(self._bvh)
+
+  def raycast(
+    self,
+    origin: Coordinate,
+    direction: Vector,
+    max_distance: float = inf
+  ) -> List[RaycastHit[SimpleNamespace]]:
+    """
+    Finds the entities a ray passes through.
+
+    Args:
+      - origin: Where the ray starts in canvas space.
+      - direction: The direction of the ray.
+      - max_distance: How far the ray travels in canvas space.
+
+    Returns
+      The hits, ordered closest first.
+    """
+    self._refresh()
+    return self._bvh.raycast(origin, direction, max_distance)
+
+  def overlap_aabb(self, aabb: AABBox) -> List[SimpleNamespace]:
+    """Finds the entities that overlap an axis-aligned bounding box."""
+    self._refresh()
+    return self._bvh.overlap(Bounds2d.from_aabb(aabb))
+
+  def sweep_aabb(self, aabb: AABBox, displacement: Vector) -> List[SweepHit[SimpleNamespace]]:
+    """
+    Finds the entities an axis-aligned bounding box touches as it moves.
+
+    Args:
+      - aabb: The box at its starting location.
+      - displacement: The movement to apply to the box.
+
+    Returns
+      The hits, ordered by the fraction of the displacement at which they occur.
+    """
+    self._refresh()
+    return self._bvh.sweep(Bounds2d.from_aabb(aabb), displacement)
+
+  def _refresh(self) -> None:
+    if self._stale and self._cell_size is not None:
+      self.build(self._cell_size)
@@ -40,12 +40,15 @@ class AABBox2d(AABBox, Polygon2d):
   V0      V1
   """
   def __init__(self, center: Vertex, half_width: float, half_height: float) -> None:
-    self.vertices = [
-      Vertex2d(x = center.coordinates[0] - half_width , y = center.coordinates[1] + half_height), # V0
-      Vertex2d(x = center.coordinates[0] + half_width , y = center.coordinates[1] + half_height), # V1
-      Vertex2d(x = center.coordinates[0] + half_width , y = center.coordinates[1] - half_height), # V2
-      Vertex2d(x = center.coordinates[0] - half_width , y = center.coordinates[1] - half_height)  # V3
-    ]
+    self.vertices = [Vertex2d(0, 0), Vertex2d(0, 0), Vertex2d(0, 0), Vertex2d(0, 0)]
+    self.update(center.coordinates[0], center.coordinates[1], half_width, half_height)
+
+  def update(self, center_x: float, center_y: float, half_width: float, half_height: float) -> None:
+    """Move and resize the box in place. The existing vertices are reused."""
+    self.vertices[0].coordinates = (center_x - half_width, center_y + half_height) # V0
+    self.vertices[1].coordinates = (center_x + half_width, center_y + half_height) # V1
+    self.vertices[2].coordinates = (center_x + half_width, center_y - half_height) # V2
+    self.vertices[3].coordinates = (center_x - half_width, center_y - half_height) # V3
 
   @property
   def min(self) -> Vertex:
@@ -0,0 +1,302 @@
+"""
+A bounding volume hierarchy (BVH) for static 2D geometry.
+
+The hierarchy is built once from a collection of (bounds, item) pairs and then
+supports logarithmic time overlap, ray cast and swept box queries. It is
+intended for things that don't move, like the buildings, parks and streets
+defined as scene entities.
+"""
+from __future__ import annotations
+
+from math import inf
+from typing import Generic, Iterable, List, NamedTuple, Optional, Tuple, TypeVar, cast
+
+from agents_playground.spatial.aabbox import AABBox
+from agents_playground.spatial.types import Coordinate
+from agents_playground.spatial.vector import Vector
+from agents_playground.spatial.vector2d import Vector2d
+
+BVHItem = TypeVar('BVHItem')
+
+# The maximum number of items that are stored in a single leaf node.
+DEFAULT_MAX_LEAF_SIZE: int = 4
+
+class Bounds2d(NamedTuple):
+  """An axis-aligned rectangle defined by its smallest and largest corners."""
+  min_x: float
+  min_y: float
+  max_x: float
+  max_y: float
+
+  @staticmethod
+  def from_aabb(aabb: AABBox) -> Bounds2d:
+    """Create a Bounds2d from the min and max vertices of an AABBox."""
+    return Bounds2d(
+      aabb.min.coordinates[0],
+      aabb.min.coordinates[1],
+      aabb.max.coordinates[0],
+      aabb.max.coordinates[1]
+    )
+
+  def overlaps(self, other: Bounds2d) -> bool:
+    """Determines if two bounds overlap. Touching edges count as overlapping."""
+    return not (
+      self.min_x > other.max_x or other.min_x > self.max_x or
+      self.min_y > other.max_y or other.min_y > self.max_y
+    )
+
+  def union(self, other: Bounds2d) -> Bounds2d:
+    """Returns the smallest bounds that contains both bounds."""
+    return Bounds2d(
+      min(self.min_x, other.min_x),
+      min(self.min_y, other.min_y),
+      max(self.max_x, other.max_x),
+      max(self.max_y, other.max_y)
+    )
+
+  def expand(self, half_width: float, half_height: float) -> Bounds2d:
+    """Grows the bounds by the provided amounts on each side."""
+    return Bounds2d(
+      self.min_x - half_width,
+      self.min_y - half_height,
+      self.max_x + half_width,
+      self.max_y + half_height
+    )
+
+  def center(self) -> Coordinate:
+    return Coordinate((self.min_x + self.max_x) / 2.0, (self.min_y + self.max_y) / 2.0)
+
+class RaycastHit(NamedTuple, Generic[BVHItem]):
+  """The result of a ray intersecting an item in the hierarchy."""
+  item: BVHItem
+  distance: float   # The distance along the ray to the first point of contact.
+  point: Coordinate # The first point of contact.
+
+class SweepHit(NamedTuple, Generic[BVHItem]):
+  """The result of a swept box touching an item in the hierarchy."""
+  item: BVHItem
+  time: float # The fraction [0, 1] of the displacement at which the contact happens.
+
+class BVHNode(Generic[BVHItem]):
+  """
+  A node in the hierarchy. Internal nodes have a left and right child.
+  Leaf nodes have one or more items.
+  """
+  def __init__(
+    self,
+    bounds: Bounds2d,
+    items: List[Tuple[Bounds2d, BVHItem]] | None = None,
+    left: BVHNode[BVHItem] | None = None,
+    right: BVHNode[BVHItem] | None = None
+  ) -> None:
+    self.bounds = bounds
+    self.items  = items
+    self.left   = left
+    self.right  = right
+
+  def is_leaf(self) -> bool:
+    return self.items is not None
+
+class BoundingVolumeHierarchy(Generic[BVHItem]):
+  """
+  A binary tree of bounding boxes built top down by splitting on the median
+  centroid along the longest axis.
+  """
+  def __init__(
+    self,
+    items: Iterable[Tuple[Bounds2d, BVHItem]] = (),
+    max_leaf_size: int = DEFAULT_MAX_LEAF_SIZE
+  ) -> None:
+    """
+    Build a hierarchy.
+
+    Args:
+      - items: The (bounds, item) pairs to index.
+      - max_leaf_size: The maximum number of items stored in a leaf node.
+    """
+    self._max_leaf_size = max(1, max_leaf_size)
+    entries = list(items)
+    self._size: int = len(entries)
+    self._root: Optional[BVHNode[BVHItem]] = self._build(entries) if entries else None
+
+  def __len__(self) -> int:
+    return self._size
+
+  @property
+  def root(self) -> Optional[BVHNode[BVHItem]]:
+    return self._root
+
+  def depth(self) -> int:
+    """Calculates the height of the tree. An empty tree has a depth of 0."""
+    def _depth(node: Optional[BVHNode[BVHItem]]) -> int:
+      if node is None:
+        return 0
+      return 1 if node.is_leaf() else 1 + max(_depth(node.left), _depth(node.right))
+    return _depth(self._root)
+
+  def overlap(self, bounds: Bounds2d) -> List[BVHItem]:
+    """Finds all of the items whose bounds overlap the provided bounds."""
+    results: List[BVHItem] = []
+    if self._root is None:
+      return results
+
+    stack: List[BVHNode[BVHItem]] = [self._root]
+    while stack:
+      node = stack.pop()
+      if not node.bounds.overlaps(bounds):
+        continue
+      if node.items is not None:
+        for item_bounds, item in node.items:
+          if item_bounds.overlaps(bounds):
+            results.append(item)
+      else:
+        stack.append(node.left) # type: ignore
+        stack.append(node.right) # type: ignore
+    return results
+
+  def raycast(
+    self,
+    origin: Coordinate,
+    direction: Vector,
+    max_distance: float = inf
+  ) -> List[RaycastHit[BVHItem]]:
+    """
+    Finds all of the items a ray passes through.
+
+    Args:
+      - origin: Where the ray starts.
+      - direction: The direction the ray travels in. It does not need to be normalized.
+      - max_distance: How far the ray travels.
+
+    Returns
+      The hits ordered by distance, closest first.
+    """
+    hits: List[RaycastHit[BVHItem]] = []
+    if self._root is None:
+      return hits
+
+    dir_2d = cast(Vector2d, direction)
+    length = dir_2d.length()
+    if length == 0:
+      return hits
+    dx = dir_2d.i / length
+    dy = dir_2d.j / length
+
+    stack: List[BVHNode[BVHItem]] = [self._root]
+    while stack:
+      node = stack.pop()
+      if _ray_box_entry(origin.x, origin.y, dx, dy, node.bounds, max_distance) is None:
+        continue
+      if node.items is not None:
+        for item_bounds, item in node.items:
+          t = _ray_box_entry(origin.x, origin.y, dx, dy, item_bounds, max_distance)
+          if t is not None:
+            hits.append(RaycastHit(item, t, Coordinate(origin.x + dx * t, origin.y + dy * t)))
+      else:
+        stack.append(node.left) # type: ignore
+        stack.append(node.right) # type: ignore
+
+    hits.sort(key = lambda hit: hit.distance)
+    return hits
+
+  def sweep(self, bounds: Bounds2d, displacement: Vector) -> List[SweepHit[BVHItem]]:
+    """
+    Finds all of the items a box touches while moving along a displacement.
+
+    The moving box is reduced to its center point and the items are grown by
+    the box's half extents (a Minkowski sum). This reduces the problem to ray
+    casting against the grown boxes.
+
+    Args:
+      - bounds: The box at the start of the movement.
+      - displacement: How far and in which direction the box moves.
+
+    Returns
+      The hits ordered by time of impact, earliest first.
+    """
+    hits: List[SweepHit[BVHItem]] = []
+    if self._root is None:
+      return hits
+
+    disp = cast(Vector2d, displacement)
+    half_width  = (bounds.max_x - bounds.min_x) / 2.0
+    half_height = (bounds.max_y - bounds.min_y) / 2.0
+    center: Coordinate = bounds.center()
+
+    stack: List[BVHNode[BVHItem]] = [self._root]
+    while stack:
+      node = stack.pop()
+      grown = node.bounds.expand(half_width, half_height)
+      if _ray_box_entry(center.x, center.y, disp.i, disp.j, grown, 1.0) is None:
+        continue
+      if node.items is not None:
+        for item_bounds, item in node.items:
+          t = _ray_box_entry(
+            center.x, center.y, disp.i, disp.j,
+            item_bounds.expand(half_width, half_height), 1.0
+          )
+          if t is not None:
+            hits.append(SweepHit(item, t))
+      else:
+        stack.append(node.left) # type: ignore
+        stack.append(node.right) # type: ignore
+
+    hits.sort(key = lambda hit: hit.time)
+    return hits
+
+  def _build(self, entries: List[Tuple[Bounds2d, BVHItem]]) -> BVHNode[BVHItem]:
+    bounds = entries[0][0]
+    for item_bounds, _ in entries[1:]:
+      bounds = bounds.union(item_bounds)
+
+    if len(entries) <= self._max_leaf_size:
+      return BVHNode(bounds, items = entries)
+
+    # Split on the longest axis of the centroids' extent.
+    centers = [item_bounds.center() for item_bounds, _ in entries]
+    xs = [c.x for c in centers]
+    ys = [c.y for c in centers]
+    axis = 0 if (max(xs) - min(xs)) >= (max(ys) - min(ys)) else 1
+    order = sorted(range(len(entries)), key = lambda index: centers[index][axis])
+    middle = len(order) // 2
+    left  = self._build([entries[index] for index in order[:middle]])
+    right = self._build([entries[index] for index in order[middle:]])
+    return BVHNode(bounds, left = left, right = right)
+
+def _ray_box_entry(
+  origin_x: float,
+  origin_y: float,
+  dir_x: float,
+  dir_y: float,
+  box: Bounds2d,
+  max_t: float
+) -> Optional[float]:
+  """
+  The slab test for a ray against an axis-aligned box.
+  See: Real-Time Rendering 3rd Edition by Akenine-Mooler, Haines, Hoffman
+
+  Returns
+    The parametric distance t in [0, max_t] at which the ray enters the box or
+    None if it misses. If the ray starts inside the box, 0 is returned.
+  """
+  t_near: float = 0.0
+  t_far: float = max_t
+
+  for origin, direction, low, high in (
+    (origin_x, dir_x, box.min_x, box.max_x),
+    (origin_y, dir_y, box.min_y, box.max_y)
+  ):
+    if direction == 0:
+      # The ray is parallel to the slab. It must start between the planes.
+      if origin < low or origin > high:
+        return None
+      continue
+    t1 = (low - origin) / direction
+    t2 = (high - origin) / direction
+    if t1 > t2:
+      t1, t2 = t2, t1
+    t_near = max(t_near, t1)
+    t_far = min(t_far, t2)
+    if t_near > t_far:
+      return None
+  return t_near
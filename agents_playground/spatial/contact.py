@@ -0,0 +1,15 @@
+from enum import Enum, auto
+from typing import Any, NamedTuple
+
+from agents_playground.spatial.vector2d import Vector2d
+
+class ContactType(Enum):
+  Agent = auto()
+  Entity = auto()
+
+class Contact(NamedTuple):
+  """An overlap between an agent and something else."""
+  type: ContactType
+  other: Any        # The other agent's ID or the entity.
+  normal: Vector2d  # The axis to push the agent along to separate them.
+  depth: float      # How far the two overlap along the normal, in canvas space.
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from math import cos, tan, radians
-from typing import List, Protocol, Tuple
+from math import cos, sin, tan, radians
+from typing import List, Protocol, Tuple, cast
 from agents_playground.core.types import Size
 from agents_playground.spatial.polygon import Polygon
 from agents_playground.spatial.polygon2d import Polygon2d
-from agents_playground.spatial.triangle import Triangle2d
 
 from agents_playground.spatial.types import Coordinate, Degrees, Line2d
 from agents_playground.spatial.vector import Vector
@@ -81,6 +80,13 @@ class Frustum2d(Frustum, Polygon2d):
     self.field_of_view     = field_of_view
     self.vertices: List[Vertex] = []
 
+    # The trig values for half the field of view. These only change if the 
+    # field of view changes so they're cached rather than calculated per update.
+    self._cached_fov: Degrees | None = None
+    self._cos_theta: float = 1.0
+    self._sin_theta: float = 0.0
+    self._tan_theta: float = 0.0
+
   @staticmethod
   def create_empty() -> Frustum2d:
     return Frustum2d()
@@ -92,39 +98,48 @@ class Frustum2d(Frustum, Polygon2d):
       - location: Where the right and left sides intersect. 
         In a traditional View Frustum this is the location of the camera. 
       - direction: The direction vector of the frustum. From the location, where the frustum is pointing.
+
+    The frustum is the union of two isosceles triangles (see Triangle2d.create_isosceles_triangle)
+    that share the agent's location as their apex. Rather than build the triangles,
+    the vertices are calculated directly and written into the existing vertex 
+    buffer.
     """
-    cell_half_width  = cell_size.width  / 2.0
-    cell_half_height = cell_size.height / 2.0
-    
-    # Convert the agent's location from grid cells to canvas coordinates.
-    canvas_loc: Coordinate = grid_location.multiply(Coordinate(cell_size.width, cell_size.height))
+    if self._cached_fov != self.field_of_view:
+      theta = radians(self.field_of_view/2.0)
+      self._cos_theta = cos(theta)
+      self._sin_theta = sin(theta)
+      self._tan_theta = tan(theta)
+      self._cached_fov = self.field_of_view
+
+    if len(self.vertices) != 4:
+      self.vertices = [Vertex2d(0, 0), Vertex2d(0, 0), Vertex2d(0, 0), Vertex2d(0, 0)]
 
+    # Convert the agent's location from grid cells to canvas coordinates.
     # Agent's are shifted to be drawn at the center of a grid cell, 
     # the frustum's origin should be there as well.
-    agent_loc: Coordinate = canvas_loc.shift(Coordinate(cell_half_width, cell_half_height))
-    triangle_loc = Vertex2d(x = agent_loc.x, y = agent_loc.y)
-    small_triangle = Triangle2d.create_isosceles_triangle(
-      angle     = self.field_of_view, 
-      height    = self.near_plane_depth, 
-      location  = triangle_loc, 
-      direction = direction
-    )
-
-    large_triangle = Triangle2d.create_isosceles_triangle(
-      angle     = self.field_of_view, 
-      height    = self.depth_of_field, 
-      location  = triangle_loc, 
-      direction = direction
-    )
-
-    self.vertices = [
-      # Near Plane
-      small_triangle.vertices[2], #P0
-      small_triangle.vertices[1], #P1 
-      # Far Plane
-      large_triangle.vertices[1], #P3
-      large_triangle.vertices[2]  #P4
-    ]
+    agent_x = grid_location.x * cell_size.width  + cell_size.width  / 2.0
+    agent_y = grid_location.y * cell_size.height + cell_size.height / 2.0
+
+    # The unit vector of the direction, rotated by theta and -theta.
+    dir_2d = cast(Vector2d, direction)
+    dir_length = dir_2d.length()
+    unit_i = dir_2d.i / dir_length
+    unit_j = dir_2d.j / dir_length
+    left_i  = unit_i * self._cos_theta - unit_j * self._sin_theta
+    left_j  = unit_i * self._sin_theta + unit_j * self._cos_theta
+    right_i = unit_i * self._cos_theta + unit_j * self._sin_theta
+    right_j = unit_j * self._cos_theta - unit_i * self._sin_theta
+
+    # The length of the two identical sides of each triangle.
+    near_side = self.near_plane_depth * self._tan_theta
+    far_side  = self.depth_of_field * self._tan_theta
+
+    # Near Plane
+    self.vertices[0].coordinates = (agent_x + right_i * near_side, agent_y + right_j * near_side) # P0
+    self.vertices[1].coordinates = (agent_x + left_i  * near_side, agent_y + left_j  * near_side) # P1
+    # Far Plane
+    self.vertices[2].coordinates = (agent_x + left_i  * far_side,  agent_y + left_j  * far_side)  # P3
+    self.vertices[3].coordinates = (agent_x + right_i * far_side,  agent_y + right_j * far_side)  # P4
   
 """
 There are a few intersection tests that are going to be required.
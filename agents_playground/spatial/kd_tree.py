@@ -0,0 +1,128 @@
+"""
+A 2D k-d tree for nearest point queries.
+
+The tree is built once from a collection of (location, item) pairs and stored
+implicitly. The points are reordered so that each node's point is the median
+of its range along the node's split axis, with the points before it on one
+side and the points after it on the other. No node objects are allocated.
+"""
+from __future__ import annotations
+
+from math import hypot, inf
+from typing import Callable, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+from agents_playground.spatial.types import Coordinate
+
+KDItem = TypeVar('KDItem')
+
+# Ranges with this many points or fewer are scanned rather than split.
+DEFAULT_MAX_LEAF_SIZE: int = 8
+
+class KDTree(Generic[KDItem]):
+  def __init__(
+    self,
+    items: Iterable[Tuple[Coordinate, KDItem]] = (),
+    max_leaf_size: int = DEFAULT_MAX_LEAF_SIZE
+  ) -> None:
+    """
+    Build a tree.
+
+    Args:
+      - items: The (location, item) pairs to index.
+      - max_leaf_size: The largest range of points that is scanned instead of split.
+    """
+    self._max_leaf_size = max(1, max_leaf_size)
+    entries = list(items)
+    # The split axis of the node whose point is at each position. 0 is x, 1 is y.
+    self._axes: bytearray = bytearray(len(entries))
+    self._build(entries, 0, len(entries))
+    self._xs: List[float] = [location.x for location, _ in entries]
+    self._ys: List[float] = [location.y for location, _ in entries]
+    self._items: List[KDItem] = [item for _, item in entries]
+
+  def __len__(self) -> int:
+    return len(self._items)
+
+  def _build(self, entries: List[Tuple[Coordinate, KDItem]], lo: int, hi: int) -> None:
+    if hi - lo <= self._max_leaf_size:
+      return
+    xs = [entries[index][0].x for index in range(lo, hi)]
+    ys = [entries[index][0].y for index in range(lo, hi)]
+    axis = 0 if max(xs) - min(xs) >= max(ys) - min(ys) else 1
+    entries[lo:hi] = sorted(entries[lo:hi], key = lambda entry: entry[0][axis])
+    mid = (lo + hi) // 2
+    self._axes[mid] = axis
+    self._build(entries, lo, mid)
+    self._build(entries, mid + 1, hi)
+
+  def nearest(
+    self,
+    point: Coordinate,
+    max_distance: float = inf,
+    accept: Optional[Callable[[KDItem], bool]] = None
+  ) -> Optional[Tuple[KDItem, float]]:
+    """
+    Finds the closest item to a point.
+
+    Args:
+      - point: Where to search from.
+      - max_distance: Items farther away than this are ignored.
+      - accept: If provided, only items it returns True for are considered.
+
+    Returns
+      The (item, Euclidean distance) of the closest item, or None if there isn't one.
+    """
+    best: List = [None, max_distance]
+    self._nearest(point.x, point.y, 0, len(self._items), best, accept)
+    return (best[0], best[1]) if best[0] is not None else None
+
+  def _nearest(self, x: float, y: float, lo: int, hi: int, best: List, accept) -> None:
+    xs, ys, items = self._xs, self._ys, self._items
+    if hi - lo <= self._max_leaf_size:
+      for index in range(lo, hi):
+        distance = hypot(xs[index] - x, ys[index] - y)
+        if distance <= best[1] and (best[0] is None or distance < best[1]) and (accept is None or accept(items[index])):
+          best[0], best[1] = items[index], distance
+      return
+
+    mid = (lo + hi) // 2
+    offset = (x - xs[mid]) if self._axes[mid] == 0 else (y - ys[mid])
+    near, far = ((lo, mid), (mid + 1, hi)) if offset < 0 else ((mid + 1, hi), (lo, mid))
+    self._nearest(x, y, near[0], near[1], best, accept)
+    distance = hypot(xs[mid] - x, ys[mid] - y)
+    if distance <= best[1] and (best[0] is None or distance < best[1]) and (accept is None or accept(items[mid])):
+      best[0], best[1] = items[mid], distance
+    if abs(offset) <= best[1]:
+      self._nearest(x, y, far[0], far[1], best, accept)
+
+  def within(self, point: Coordinate, radius: float) -> List[KDItem]:
+    """
+    Finds every item within a Euclidean distance of a point.
+
+    Returns
+      The items, closest first.
+    """
+    xs, ys, items = self._xs, self._ys, self._items
+    x, y = point.x, point.y
+    found: List[Tuple[float, int]] = []
+    stack: List[Tuple[int, int]] = [(0, len(items))]
+    while stack:
+      lo, hi = stack.pop()
+      if hi - lo <= self._max_leaf_size:
+        for index in range(lo, hi):
+          distance = hypot(xs[index] - x, ys[index] - y)
+          if distance <= radius:
+            found.append((distance, index))
+        continue
+
+      mid = (lo + hi) // 2
+      offset = (x - xs[mid]) if self._axes[mid] == 0 else (y - ys[mid])
+      distance = hypot(xs[mid] - x, ys[mid] - y)
+      if distance <= radius:
+        found.append((distance, mid))
+      if offset - radius <= 0:
+        stack.append((lo, mid))
+      if offset + radius >= 0:
+        stack.append((mid + 1, hi))
+    found.sort()
+    return [items[index] for _, index in found]
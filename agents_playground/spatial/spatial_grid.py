@@ -0,0 +1,110 @@
+"""
+A uniform grid for the broad phase of collision detection between things that
+move every frame.
+
+Unlike the bounding volume hierarchy, the grid is cheap to rebuild. The
+expected usage is to clear it and re-insert everything once per frame.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from math import floor
+from typing import DefaultDict, Dict, Generic, Hashable, Iterator, List, Set, Tuple, TypeVar
+
+from agents_playground.spatial.bvh import Bounds2d
+
+GridItem = TypeVar('GridItem', bound = Hashable)
+GridCell = Tuple[int, int]
+CellRange = Tuple[int, int, int, int] # min_cx, min_cy, max_cx, max_cy
+
+class SpatialGridError(Exception):
+  def __init__(self, *args: object) -> None:
+    super().__init__(*args)
+
+class SpatialGrid(Generic[GridItem]):
+  """
+  Buckets items by the grid cells their bounds overlap.
+
+  An item that spans multiple cells is stored in each of them.
+  """
+  def __init__(self, cell_width: float, cell_height: float) -> None:
+    """
+    Create an empty grid.
+
+    Args:
+      - cell_width: The width of a grid cell. Should be around the size of the largest item.
+      - cell_height: The height of a grid cell. Should be around the size of the largest item.
+    """
+    if cell_width <= 0 or cell_height <= 0:
+      raise SpatialGridError(f'The spatial grid cells must have a positive size. Received {cell_width}x{cell_height}.')
+    self._cell_width  = cell_width
+    self._cell_height = cell_height
+    self._cells: DefaultDict[GridCell, List[GridItem]] = defaultdict(list)
+    self._bounds: Dict[GridItem, Bounds2d] = {}
+    self._ranges: Dict[GridItem, CellRange] = {}
+
+  def __len__(self) -> int:
+    return len(self._bounds)
+
+  def __contains__(self, item: GridItem) -> bool:
+    return item in self._bounds
+
+  def clear(self) -> None:
+    self._cells.clear()
+    self._bounds.clear()
+    self._ranges.clear()
+
+  def bounds_of(self, item: GridItem) -> Bounds2d:
+    return self._bounds[item]
+
+  def insert(self, item: GridItem, bounds: Bounds2d) -> None:
+    """Adds an item to every cell its bounds overlap."""
+    if item in self._bounds:
+      raise SpatialGridError(f'The item {item} is already in the spatial grid.')
+    cell_range = self._cell_range(bounds)
+    self._bounds[item] = bounds
+    self._ranges[item] = cell_range
+    min_cx, min_cy, max_cx, max_cy = cell_range
+    for cx in range(min_cx, max_cx + 1):
+      for cy in range(min_cy, max_cy + 1):
+        self._cells[(cx, cy)].append(item)
+
+  def query(self, bounds: Bounds2d) -> Set[GridItem]:
+    """Finds the items whose bounds overlap the provided bounds."""
+    found: Set[GridItem] = set()
+    min_cx, min_cy, max_cx, max_cy = self._cell_range(bounds)
+    for cx in range(min_cx, max_cx + 1):
+      for cy in range(min_cy, max_cy + 1):
+        for item in self._cells.get((cx, cy), ()):
+          if item not in found and self._bounds[item].overlaps(bounds):
+            found.add(item)
+    return found
+
+  def candidate_pairs(self) -> Iterator[Tuple[GridItem, GridItem]]:
+    """
+    Finds every pair of items whose bounds overlap. Each pair is reported once.
+
+    Items that share several cells are only considered in the first cell they
+    share. That avoids tracking which pairs have already been reported.
+    """
+    for (cx, cy), items in self._cells.items():
+      count = len(items)
+      for first_index in range(count):
+        first = items[first_index]
+        first_range = self._ranges[first]
+        first_bounds = self._bounds[first]
+        for second_index in range(first_index + 1, count):
+          second = items[second_index]
+          second_range = self._ranges[second]
+          if max(first_range[0], second_range[0]) != cx or max(first_range[1], second_range[1]) != cy:
+            continue
+          if first_bounds.overlaps(self._bounds[second]):
+            yield (first, second)
+
+  def _cell_range(self, bounds: Bounds2d) -> CellRange:
+    return (
+      floor(bounds.min_x / self._cell_width),
+      floor(bounds.min_y / self._cell_height),
+      floor(bounds.max_x / self._cell_width),
+      floor(bounds.max_y / self._cell_height)
+    )
@@ -10,6 +10,7 @@ class Vector(Protocol):
   """
   Represents the contract for a vector.
   """
+  __slots__ = ()
 
   @staticmethod
   @abstractmethod
@@ -22,6 +23,10 @@ class Vector(Protocol):
   def scale(self, scalar: float) -> Vector:
     """Scale a vector by a scalar"""
 
+  @abstractmethod
+  def scale_into(self, scalar: float, out: Vector) -> Vector:
+    """Scale a vector by a scalar and write the result into the out vector."""
+
   @abstractmethod
   def to_point(self, vector_origin: Coordinate) -> Coordinate:
     """Returns a point that is on the vector at the end of the vector.
@@ -55,6 +60,10 @@ class Vector(Protocol):
       A new vector created by applying the rotation.
     """
 
+  @abstractmethod
+  def rotate_into(self, angle: Radians, out: Vector) -> Vector:
+    """Rotate a vector by an angle and write the result into the out vector."""
+
   @abstractmethod
   def unit(self) -> Vector:
     """Returns the unit vector as a new vector."""
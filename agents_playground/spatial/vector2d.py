@@ -10,7 +10,12 @@ from agents_playground.spatial.vertex import Vertex, Vertex2d
 class Vector2d(Vector):
   """
   Represents a 2-dimensional vector.
+
+  The *_into methods write their result into a provided vector rather than 
+  allocating a new one. They're intended for hot paths that run per agent,
+  per frame.
   """
+  __slots__ = ('_i', '_j')
 
   def __init__(self, i: float, j: float) -> None:
     super().__init__()
@@ -40,9 +45,27 @@ class Vector2d(Vector):
     """Create a new vector from two points"""
     return Vector2d(end_point.x - start_point.x, end_point.y - start_point.y)
 
+  def set(self, i: float, j: float) -> Vector2d:
+    """Overwrite the components of the vector in place."""
+    self._i = i
+    self._j = j
+    return self
+
   def scale(self, scalar: float) -> Vector:
     """Scale a vector by a scalar"""
     return Vector2d(self._i * scalar, self._j * scalar)
+  
+  def scale_into(self, scalar: float, out: Vector) -> Vector:
+    """Scale a vector by a scalar and store the result in the out vector.
+    
+    Args
+      - scalar: The amount to scale by.
+      - out: The vector to write the result to. It may be this vector.
+
+    Returns
+      The out vector.
+    """
+    return cast(Vector2d, out).set(self._i * scalar, self._j * scalar)
 
   def to_point(self, vector_origin: Coordinate) -> Coordinate:
     """Returns a point that is on the vector at the end of the vector.
@@ -77,9 +100,27 @@ class Vector2d(Vector):
     Returns
       A new vector created by applying the rotation.
     """
+    cos_angle = math.cos(angle)
+    sin_angle = math.sin(angle)
     return Vector2d(
-      self._i * math.cos(angle) - self._j * math.sin(angle), 
-      self._i * math.sin(angle) + self._j * math.cos(angle))
+      self._i * cos_angle - self._j * sin_angle, 
+      self._i * sin_angle + self._j * cos_angle)
+  
+  def rotate_into(self, angle: Radians, out: Vector) -> Vector:
+    """Rotate the vector by an angle and store the result in the out vector.
+    
+    Args
+      - angle: The angle to rotate by provided in Radians.
+      - out: The vector to write the result to. It may be this vector.
+
+    Returns
+      The out vector.
+    """
+    cos_angle = math.cos(angle)
+    sin_angle = math.sin(angle)
+    return cast(Vector2d, out).set(
+      self._i * cos_angle - self._j * sin_angle, 
+      self._i * sin_angle + self._j * cos_angle)
 
   def unit(self) -> Vector:
     """Returns the unit vector as a new vector."""
@@ -7,11 +7,18 @@ class Vertex(Protocol):
   Vertices are always specified in canvas space. Not Grid Coordinates.
   Coordinates are stored in traditional alphabetic order (x, y, z,...).
   """
+  __slots__ = ('coordinates',)
   coordinates: Tuple[float, ...]
 
 class Vertex2d(Vertex):
   """
   A two dimensional vertex.
   """
+  __slots__ = ()
+
   def __init__(self, x: float, y: float) -> None:
-    self.coordinates: Tuple[float, ...] = (x, y)
\ No newline at end of file
+    self.coordinates: Tuple[float, ...] = (x, y)
+
+  def set(self, x: float, y: float) -> None:
+    """Move the vertex in place."""
+    self.coordinates = (x, y)
\ No newline at end of file
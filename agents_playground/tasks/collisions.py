@@ -0,0 +1,37 @@
+"""
+Module containing coroutines related to agent collisions.
+"""
+from typing import Generator
+
+from agents_playground.core.task_scheduler import ScheduleTraps
+from agents_playground.scene.collision_system import CollisionSystem
+from agents_playground.sys.logger import get_default_logger
+
+logger = get_default_logger()
+
+def detect_collisions(*args, **kwargs) -> Generator:
+  """A task that runs collision detection for all of the scene's agents every frame.
+
+  Should be scheduled before the tasks that transition the agents' states so
+  the agents can sense what they're touching on the same frame.
+
+  Args:
+    - scene: The scene to take action on.
+    - solid_entities: Optional. The entity groupings agents can collide with.
+    - resolve: Optional. If True, overlapping agents are pushed apart. Defaults to False.
+  """
+  logger.info('detect_collisions: Starting task.')
+  scene = kwargs['scene']
+  collisions = CollisionSystem(
+    solid_entities = kwargs.get('solid_entities', ()),
+    resolve = kwargs.get('resolve', False)
+  )
+
+  try:
+    while True:
+      collisions.process(scene)
+      yield ScheduleTraps.NEXT_FRAME
+  except GeneratorExit:
+    logger.info('Task: detect_collisions - GeneratorExit')
+  finally:
+    logger.info('Task: detect_collisions - Task Completed')
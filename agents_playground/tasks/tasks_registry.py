@@ -1,8 +1,11 @@
 from typing import Callable, Dict, Final
 
+from agents_playground.tasks.collisions import detect_collisions
+
 TASKS_REGISTRY: Final[Dict[str,Callable]] = {
+  'detect_collisions': detect_collisions,
   # 'agent_pacing': am.agent_pacing,
   # 'agents_spinning' : am.agents_spinning,
   # 'agent_random_navigation' : am.agent_random_navigation,
   # 'generate_agents': ga.generate_agents
-}
\ No newline at end of file
+}
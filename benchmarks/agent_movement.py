@@ -0,0 +1,108 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/agent_movement.py
+
+"""
+Measures the per-agent cost of moving an agent.
+
+AgentLike.move_to and AgentLike.face recalculate the agent's AABB and view 
+frustum. This compares the current in place implementation against the 
+original approach of building a new AABBox2d and two Triangle2d instances
+(along with their vectors and vertices) on every call. The deferred rows show 
+the cost when the AABB and frustum are only marked dirty and, for the second 
+row, read back every frame.
+"""
+from __future__ import annotations
+
+import random
+from statistics import mean
+import timeit
+import tracemalloc
+from typing import Callable, List
+
+from agents_playground.agents.default.default_agent_physicality import DefaultAgentPhysicality
+from agents_playground.core.types import Size
+from agents_playground.spatial.aabbox import AABBox2d, EmptyAABBox
+from agents_playground.spatial.direction import Direction
+from agents_playground.spatial.frustum import Frustum2d
+from agents_playground.spatial.triangle import Triangle2d
+from agents_playground.spatial.types import Coordinate
+from agents_playground.spatial.vector import Vector
+from agents_playground.spatial.vector2d import Vector2d
+from agents_playground.spatial.vertex import Vertex2d
+
+AGENTS: int = 1000
+REPEAT: int = 5
+CELL_SIZE = Size(20, 20)
+DIRECTIONS: List[Vector] = [Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST, Vector2d(1, 1)]
+
+def allocating_move_to(physicality: DefaultAgentPhysicality, location: Coordinate, facing: Vector) -> None:
+  """The original implementation. Everything is rebuilt on every call."""
+  agent_loc = location.multiply(Coordinate(CELL_SIZE.width, CELL_SIZE.height))
+  agent_loc = agent_loc.shift(Coordinate(CELL_SIZE.width / 2.0, CELL_SIZE.height / 2.0))
+  physicality.aabb = AABBox2d(
+    center      = Vertex2d(x = agent_loc.x, y = agent_loc.y), 
+    half_width  = physicality.size.width / 2.0, 
+    half_height = physicality.size.height / 2.0
+  )
+
+  frustum = physicality.frustum
+  triangle_loc = Vertex2d(x = agent_loc.x, y = agent_loc.y)
+  small = Triangle2d.create_isosceles_triangle(frustum.field_of_view, frustum.near_plane_depth, triangle_loc, facing)
+  large = Triangle2d.create_isosceles_triangle(frustum.field_of_view, frustum.depth_of_field, triangle_loc, facing)
+  frustum.vertices = [small.vertices[2], small.vertices[1], large.vertices[1], large.vertices[2]]
+
+def in_place_move_to(physicality: DefaultAgentPhysicality, location: Coordinate, facing: Vector) -> None:
+  """The current implementation. The AABB and frustum buffers are reused."""
+  physicality.calculate_aabb(location, CELL_SIZE)
+  physicality.frustum.update(location, facing, CELL_SIZE)
+
+def deferred_move_to(physicality: DefaultAgentPhysicality, location: Coordinate, facing: Vector) -> None:
+  """What AgentLike.move_to does. The AABB and frustum are only marked dirty."""
+  physicality.invalidate_aabb(location, CELL_SIZE)
+  physicality.invalidate_frustum(location, facing, CELL_SIZE)
+
+def deferred_move_to_and_read(physicality: DefaultAgentPhysicality, location: Coordinate, facing: Vector) -> None:
+  """The deferred path when something reads the agent's AABB and frustum every frame."""
+  deferred_move_to(physicality, location, facing)
+  physicality.aabb
+  physicality.frustum
+
+def create_agents() -> List[DefaultAgentPhysicality]:
+  return [
+    DefaultAgentPhysicality(size = Size(15, 15), aabb = EmptyAABBox(), frustum = Frustum2d())
+    for _ in range(AGENTS)
+  ]
+
+def benchmark(label: str, move_to: Callable) -> None:
+  agents = create_agents()
+  locations = [Coordinate(random.randint(0, 100), random.randint(0, 100)) for _ in range(AGENTS)]
+  facings = [random.choice(DIRECTIONS) for _ in range(AGENTS)]
+
+  def frame() -> None:
+    for physicality, location, facing in zip(agents, locations, facings):
+      move_to(physicality, location, facing)
+
+  frame() # Warm up so the buffers exist.
+  timings = timeit.repeat(frame, number = 10, repeat = REPEAT)
+  per_agent_us = mean(timings) / (10 * AGENTS) * 1_000_000
+
+  tracemalloc.start()
+  before, _ = tracemalloc.get_traced_memory()
+  snapshot_before = tracemalloc.take_snapshot()
+  frame()
+  snapshot_after = tracemalloc.take_snapshot()
+  tracemalloc.stop()
+  allocated_blocks = sum(
+    max(stat.count_diff, 0) 
+    for stat in snapshot_after.compare_to(snapshot_before, 'lineno')
+  )
+
+  print(f'{label:<14} {per_agent_us:>10.3f} us/agent {allocated_blocks / AGENTS:>10.2f} live blocks/agent')
+
+if __name__ == '__main__':
+  random.seed(7)
+  print(f'move_to over {AGENTS} agents')
+  benchmark('allocating', allocating_move_to)
+  benchmark('in place', in_place_move_to)
+  benchmark('deferred', deferred_move_to)
+  benchmark('deferred+read', deferred_move_to_and_read)
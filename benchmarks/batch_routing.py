@@ -0,0 +1,39 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/batch_routing.py
+
+"""
+Compares finding a burst of routes serially on the simulation thread with
+sending them to a BatchRouter. Reports the time the simulation thread is
+blocked and the time until every route is ready. The workers are started
+before timing, as they would be after the first batch of a simulation.
+"""
+import random
+from concurrent.futures import wait
+from time import perf_counter
+
+from agents_playground.navigation.batch_router import BatchRouter
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigator import Navigator
+
+if __name__ == '__main__':
+  mesh = generate_grid_mesh(100, 100, max_gap = 2, closed_ratio = 0.1, seed = 1)
+  junctions = [junction.location for junction in mesh.junctions()]
+  print(f'{"routes":>7} {"serial ms":>10} {"blocked ms":>11} {"ready ms":>9}')
+  with BatchRouter() as router:
+    wait(router.find_routes([(junctions[0], junctions[1])], mesh))
+    for route_count in (100, 1000):
+      rng = random.Random(route_count)
+      requests = [(rng.choice(junctions), rng.choice(junctions)) for _ in range(route_count)]
+
+      started = perf_counter()
+      navigator = Navigator(cache_size = 0)
+      for start, end in requests:
+        navigator.find_route(start, end, mesh)
+      serial_ms = (perf_counter() - started) * 1000
+
+      started = perf_counter()
+      futures = router.find_routes(requests, mesh)
+      blocked_ms = (perf_counter() - started) * 1000
+      wait(futures)
+      ready_ms = (perf_counter() - started) * 1000
+      print(f'{route_count:>7} {serial_ms:>10.1f} {blocked_ms:>11.1f} {ready_ms:>9.1f}')
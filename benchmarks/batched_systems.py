@@ -0,0 +1,68 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/batched_systems.py
+
+"""
+Measures the frame cost of transitioning every agent in a scene, per agent and
+batched.
+
+Every agent has a nervous system (with sight) and a perception system. The
+per agent rows call AgentLike.transition_state on each agent, which walks the
+agent's system hierarchy once per agent. The batched rows use
+Scene.transition_agents(batched = True), where each system processes all of
+the agents in one call. The neighbors are found once, before timing, since
+both approaches share them.
+"""
+import random
+from statistics import mean
+import timeit
+from typing import List
+
+from agents_playground.agents.memory.agent_memory_model import AgentMemoryModel
+from agents_playground.agents.memory.memory import Memory
+from agents_playground.agents.memory.memory_container import MemoryContainer
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.containers.ttl_store import TTLStore
+from agents_playground.fp.containers import FPList
+from agents_playground.scene.scene import Scene
+from agents_playground.spatial.types import Coordinate
+from tests.agents.perceptive_agents import CELL_SIZE, DIRECTIONS, create_agent_scene, perceptive_systems
+
+AGENTS_PER_CELL: float = 0.25
+FRAMES: int = 3
+REPEAT: int = 3
+
+def create_memory() -> AgentMemoryModel:
+  return AgentMemoryModel(
+    sensory_memory   = MemoryContainer(FPList[Memory]()),
+    working_memory   = MemoryContainer(TTLStore[Memory]()),
+    long_term_memory = MemoryContainer(FPList[Memory]())
+  )
+
+def create_scene(agent_count: int) -> Scene:
+  side = int((agent_count / AGENTS_PER_CELL) ** 0.5)
+  return create_agent_scene(
+    locations    = [Coordinate(random.randint(0, side), random.randint(0, side)) for _ in range(agent_count)],
+    systems      = perceptive_systems,
+    max_radius   = 5 * CELL_SIZE.width,
+    agent_memory = create_memory,
+    facings      = [random.choice(DIRECTIONS) for _ in range(agent_count)]
+  )
+
+def run_frames(scene: Scene, batched: bool) -> None:
+  agents: List[AgentLike] = list(scene.agents.values())
+  for _ in range(FRAMES):
+    scene.transition_agents(agents, batched = batched)
+    for agent in agents:
+      agent.internal_systems.clear_byproducts()
+      agent.memory['sensory_memory'].unwrap().clear()
+
+if __name__ == '__main__':
+  random.seed(7)
+  print(f'{"agents":>8} {"per agent ms/frame":>20} {"batched ms/frame":>18} {"speedup":>9}')
+  for agent_count in (1_000, 10_000):
+    scene = create_scene(agent_count)
+    for agent in scene.agents.values():
+      scene.neighbors_of(agent.identity.id)
+    per_agent = mean(timeit.repeat(lambda: run_frames(scene, False), number = 1, repeat = REPEAT)) / FRAMES
+    batched = mean(timeit.repeat(lambda: run_frames(scene, True), number = 1, repeat = REPEAT)) / FRAMES
+    print(f'{agent_count:>8} {per_agent * 1000:>20.2f} {batched * 1000:>18.2f} {per_agent / batched:>8.2f}x')
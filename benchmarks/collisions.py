@@ -0,0 +1,42 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/collisions.py
+
+"""
+Measures the frame cost of agent collision detection as the number of agents 
+grows. The agents are spread over a grid sized to keep the density constant.
+"""
+import random
+from statistics import mean
+from types import SimpleNamespace
+import timeit
+
+from agents_playground.agents.default.default_agent_physicality import DefaultAgentPhysicality
+from agents_playground.core.types import Size
+from agents_playground.scene.collision_system import CollisionSystem
+from agents_playground.scene.scene import Scene
+from agents_playground.spatial.aabbox import EmptyAABBox
+from agents_playground.spatial.frustum import Frustum2d
+from agents_playground.spatial.types import Coordinate
+
+CELL_SIZE = Size(20, 20)
+AGENTS_PER_CELL: float = 0.25
+
+def create_scene(agent_count: int) -> Scene:
+  scene = Scene()
+  scene.cell_size = CELL_SIZE
+  side = int((agent_count / AGENTS_PER_CELL) ** 0.5)
+  for id in range(agent_count):
+    physicality = DefaultAgentPhysicality(size = Size(15, 15), aabb = EmptyAABBox(), frustum = Frustum2d())
+    physicality.calculate_aabb(Coordinate(random.uniform(0, side), random.uniform(0, side)), CELL_SIZE)
+    scene.agents[id] = SimpleNamespace(physicality = physicality)  # type: ignore
+  return scene
+
+if __name__ == '__main__':
+  random.seed(3)
+  print(f'{"agents":>8} {"ms/frame":>10} {"contacts":>10}')
+  for agent_count in (100, 1_000, 5_000, 10_000):
+    scene = create_scene(agent_count)
+    collisions = CollisionSystem()
+    contacts = len(collisions.detect(scene))
+    timings = timeit.repeat(lambda: collisions.detect(scene), number = 5, repeat = 3)
+    print(f'{agent_count:>8} {mean(timings) / 5 * 1000:>10.2f} {contacts:>10}')
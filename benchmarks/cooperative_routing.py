@@ -0,0 +1,56 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/cooperative_routing.py
+
+"""
+Routes hundreds of agents to a few shared destinations, first independently
+and then with the cooperative planner. Independent routes are checked for 
+agents that occupy the same junction in the same frame. The cooperative 
+planner's congestion is reported as waits and delay instead.
+"""
+import random
+from collections import Counter
+from time import perf_counter
+
+from agents_playground.navigation.cooperative_planner import CooperativePlanner
+from agents_playground.navigation.flow_field import FlowFieldService
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+
+DESTINATIONS: int = 6
+
+def independent_overlaps(service: FlowFieldService, mesh, trips) -> int:
+  """Agents that share a (junction, frame) with another agent, excluding destinations."""
+  occupied: Counter = Counter()
+  for start, goal in trips:
+    field = service.field_for(mesh, goal)
+    graph = field.graph
+    node, frame = graph.node_at(start), 0
+    while node != field.destination:
+      occupied[(node, frame)] += 1
+      next_node = field.next_hop(node)
+      frame += int(graph.distance(node, next_node))
+      node = next_node
+  return sum(count - 1 for count in occupied.values() if count > 1)
+
+if __name__ == '__main__':
+  print(f'{"junctions":>10} {"agents":>7} {"overlaps":>9} {"ms/plan":>8} {"waits":>6} {"delay":>6} {"blocked":>8} {"fallback":>9}')
+  for side, agent_count in ((30, 100), (30, 300), (60, 500)):
+    mesh = generate_grid_mesh(side, side, closed_ratio = 0.1, seed = side)
+    junctions = [junction.location for junction in mesh.junctions()]
+    rng = random.Random(agent_count)
+    destinations = rng.sample(junctions, DESTINATIONS)
+    starts = rng.sample([location for location in junctions if location not in destinations], agent_count)
+    service = FlowFieldService()
+    trips = [(start, rng.choice(destinations)) for start in starts]
+    trips = [(start, goal) for start, goal in trips if service.next_hop(mesh, start, goal) is not None]
+
+    planner = CooperativePlanner(window = 16, service = service)
+    started = perf_counter()
+    for agent_id, (start, goal) in enumerate(trips):
+      planner.plan(agent_id, start, goal, mesh, frame = 0)
+    ms_per_plan = (perf_counter() - started) * 1000 / len(trips)
+
+    stats = planner.stats()
+    print(
+      f'{side * side:>10} {len(trips):>7} {independent_overlaps(service, mesh, trips):>9} {ms_per_plan:>8.2f} '
+      f'{stats.waits:>6} {stats.delay:>6.0f} {stats.blocked_moves:>8} {stats.uncooperative:>9}'
+    )
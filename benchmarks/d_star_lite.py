@@ -0,0 +1,51 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/d_star_lite.py
+
+"""
+An agent walks across a generated mesh while junctions ahead of it are closed.
+Compares repairing its route with D* Lite against searching again with A*
+after every closure. The mesh is compiled outside the timings, since both 
+approaches need it.
+"""
+import random
+from time import perf_counter
+
+from agents_playground.navigation.d_star_lite import DStarLitePlanner
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigator import Navigator
+
+CLOSURES: int = 20
+
+if __name__ == '__main__':
+  print(f'{"junctions":>10} {"a* nodes":>10} {"a* ms":>8} {"d* nodes":>10} {"d* ms":>8}')
+  for side in (50, 100):
+    mesh = generate_grid_mesh(side, side, max_gap = 2, closed_ratio = 0.1, seed = side)
+    rng = random.Random(side)
+    start = mesh.get_junction_by_toml_id('j-0-0').location
+    goal = mesh.get_junction_by_toml_id(f'j-{side - 1}-{side - 1}').location
+    planner = DStarLitePlanner(mesh, start, goal)
+    navigator = Navigator(cache_size = 0)
+    a_star_ms = d_star_ms = 0.0
+    a_star_nodes = d_star_nodes = 0
+
+    location = start
+    for _ in range(CLOSURES):
+      route = planner.route()
+      if route is None or len(route) < 4:
+        break
+      location = route[1]
+      planner.move_to(location)
+      mesh.close_junction(mesh.get_junction_by_location(route[rng.randrange(2, min(len(route) - 1, 8))]).toml_id)
+      graph = mesh.graph()
+
+      started = perf_counter()
+      planner.route()
+      d_star_ms += (perf_counter() - started) * 1000
+      d_star_nodes += planner.nodes_expanded
+
+      started = perf_counter()
+      navigator.find_node_route(graph, graph.node_at(location), graph.node_at(goal))
+      a_star_ms += (perf_counter() - started) * 1000
+      a_star_nodes += navigator.nodes_expanded
+
+    print(f'{side * side:>10} {a_star_nodes / CLOSURES:>10.0f} {a_star_ms / CLOSURES:>8.2f} {d_star_nodes / CLOSURES:>10.0f} {d_star_ms / CLOSURES:>8.2f}')
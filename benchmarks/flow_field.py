@@ -0,0 +1,34 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/flow_field.py
+
+"""
+Compares routing many agents to a few shared destinations with per agent A*
+against shared flow fields. The flow field time includes building the fields.
+"""
+import random
+from time import perf_counter
+
+from agents_playground.navigation.flow_field import FlowFieldNavigator
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigator import Navigator
+
+DESTINATIONS: int = 4
+
+def measure(navigator: Navigator, graph, pairs) -> float:
+  started = perf_counter()
+  for start, end in pairs:
+    navigator.find_node_route(graph, start, end)
+  return (perf_counter() - started) * 1000
+
+if __name__ == '__main__':
+  print(f'{"junctions":>10} {"agents":>8} {"a* ms":>10} {"field ms":>10} {"speedup":>8}')
+  for side in (50, 100):
+    mesh = generate_grid_mesh(side, side, max_gap = 3, closed_ratio = 0.2, seed = side)
+    graph = mesh.graph()
+    rng = random.Random(side)
+    destinations = [rng.randrange(len(graph)) for _ in range(DESTINATIONS)]
+    for agent_count in (100, 1000):
+      pairs = [(rng.randrange(len(graph)), rng.choice(destinations)) for _ in range(agent_count)]
+      a_star_ms = measure(Navigator(cache_size = 0), graph, pairs)
+      field_ms = measure(FlowFieldNavigator(), graph, pairs)
+      print(f'{len(graph):>10} {agent_count:>8} {a_star_ms:>10.1f} {field_ms:>10.1f} {a_star_ms / field_ms:>8.1f}x')
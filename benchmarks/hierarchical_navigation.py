@@ -0,0 +1,43 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/hierarchical_navigation.py
+
+"""
+Compares flat A* with hierarchical path finding (HPA*) on generated meshes
+of increasing size. Routes are between random junctions and are not cached.
+"""
+import random
+from statistics import mean
+from time import perf_counter
+
+from agents_playground.navigation.hierarchical_navigator import HierarchicalNavigator
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigator import Navigator
+
+ROUTES: int = 50
+REGION_SIZE: int = 24
+
+def time_routes(navigator: Navigator, graph, pairs) -> tuple[float, float]:
+  durations = []
+  expanded = []
+  for start, end in pairs:
+    started = perf_counter()
+    navigator.find_node_route(graph, start, end)
+    durations.append(perf_counter() - started)
+    expanded.append(navigator.nodes_expanded)
+  return (mean(durations) * 1000, mean(expanded))
+
+if __name__ == '__main__':
+  print(f'{"junctions":>10} {"build s":>8} {"A* ms":>8} {"A* nodes":>9} {"HPA* ms":>8} {"HPA* nodes":>10}')
+  for side in (50, 100, 200, 300):
+    mesh = generate_grid_mesh(side, side, max_gap = 2, closed_ratio = 0.35, seed = side)
+    graph = mesh.graph()
+    rng = random.Random(side)
+    pairs = [(rng.randrange(len(graph)), rng.randrange(len(graph))) for _ in range(ROUTES)]
+
+    flat = Navigator(cache_size = 0)
+    hierarchical = HierarchicalNavigator(region_size = REGION_SIZE, cache_size = 0)
+    hierarchy = hierarchical.hierarchy_for(graph)
+
+    flat_ms, flat_expanded = time_routes(flat, graph, pairs)
+    hpa_ms, hpa_expanded = time_routes(hierarchical, graph, pairs)
+    print(f'{len(graph):>10} {hierarchy.build_seconds:>8.2f} {flat_ms:>8.2f} {flat_expanded:>9.0f} {hpa_ms:>8.2f} {hpa_expanded:>10.0f}')
@@ -0,0 +1,44 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/landmark_heuristic.py
+
+"""
+Compares the Manhattan and landmark (ALT) heuristics on generated meshes with 
+many closed connections, so routes have to detour. Reports the junctions 
+expanded and the time per route.
+"""
+import random
+from statistics import mean
+from time import perf_counter
+
+from agents_playground.navigation.heuristics import LandmarkHeuristic
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigator import Navigator
+
+ROUTES: int = 100
+
+def measure(navigator: Navigator, graph, pairs) -> tuple[float, float]:
+  durations = []
+  expanded = []
+  for start, end in pairs:
+    started = perf_counter()
+    navigator.find_node_route(graph, start, end)
+    durations.append(perf_counter() - started)
+    expanded.append(navigator.nodes_expanded)
+  return (mean(durations) * 1000, mean(expanded))
+
+if __name__ == '__main__':
+  print(f'{"junctions":>10} {"landmarks":>10} {"prep s":>8} {"nodes":>8} {"ms":>8} {"reduction":>10}')
+  for side in (50, 100):
+    mesh = generate_grid_mesh(side, side, max_gap = 3, closed_ratio = 0.4, seed = side)
+    graph = mesh.graph()
+    rng = random.Random(side)
+    pairs = [(rng.randrange(len(graph)), rng.randrange(len(graph))) for _ in range(ROUTES)]
+
+    base_ms, base_expanded = measure(Navigator(cache_size = 0), graph, pairs)
+    print(f'{len(graph):>10} {"manhattan":>10} {0:>8.2f} {base_expanded:>8.0f} {base_ms:>8.2f} {"":>10}')
+    for landmark_count in (4, 8, 16):
+      heuristic = LandmarkHeuristic(landmark_count)
+      heuristic.prepare(graph)
+      ms, expanded = measure(Navigator(cache_size = 0, heuristic = heuristic), graph, pairs)
+      reduction = 1 - expanded / base_expanded
+      print(f'{len(graph):>10} {landmark_count:>10} {heuristic.build_seconds:>8.2f} {expanded:>8.0f} {ms:>8.2f} {reduction:>10.0%}')
@@ -0,0 +1,60 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/level_of_detail.py
+
+"""
+Measures what a level of detail policy saves when most of the agents are far
+from the camera.
+
+The agents are spread over a large canvas and the camera sees one corner of
+it. Every agent runs the nervous and perception systems. The first row runs
+every agent in full. The second uses the standard tiers and prints the cost
+of each tier.
+"""
+from __future__ import annotations
+
+import random
+from time import perf_counter
+from typing import Optional
+
+from agents_playground.scene.level_of_detail import LODPolicy, standard_tiers
+from agents_playground.scene.scene import Scene
+from agents_playground.spatial.bvh import Bounds2d
+from agents_playground.spatial.types import Coordinate
+from tests.agents.perceptive_agents import CELL_SIZE, DIRECTIONS, create_agent_scene, perceptive_systems, sensory_memory
+
+AGENTS: int = 2000
+FRAMES: int = 20
+GRID_CELLS: int = 200
+CAMERA = Bounds2d(0, 0, 800, 600)
+
+def create_scene(seed: int) -> Scene:
+  rng = random.Random(seed)
+  return create_agent_scene(
+    locations    = [Coordinate(rng.randint(0, GRID_CELLS), rng.randint(0, GRID_CELLS)) for _ in range(AGENTS)],
+    systems      = perceptive_systems,
+    max_radius   = 5 * CELL_SIZE.width,
+    agent_memory = sensory_memory,
+    facings      = [rng.choice(DIRECTIONS) for _ in range(AGENTS)]
+  )
+
+def benchmark(label: str, lod: Optional[LODPolicy]) -> float:
+  scene = create_scene(seed = 11)
+  scene.lod = lod
+  started = perf_counter()
+  for _ in range(FRAMES):
+    scene.transition_agents()
+    for agent in scene.agents.values():
+      agent.internal_systems.clear_byproducts()
+      agent.memory['sensory_memory'].unwrap().clear()
+    scene.tick()
+  per_frame_ms = (perf_counter() - started) / FRAMES * 1000
+  print(f'{label:<8} {per_frame_ms:>10.2f} ms/frame')
+  return per_frame_ms
+
+if __name__ == '__main__':
+  print(f'{AGENTS} agents on a {GRID_CELLS}x{GRID_CELLS} grid, camera at {CAMERA}')
+  full = benchmark('full', None)
+  policy = LODPolicy(standard_tiers(full = 200, reduced = 800, movement_only = 2000), focus = [CAMERA])
+  tiered = benchmark('lod', policy)
+  print(f'speed up {full / tiered:.2f}x')
+  print(policy.report())
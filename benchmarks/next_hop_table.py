@@ -0,0 +1,36 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/next_hop_table.py
+
+"""
+Reports the build time and memory of next hop tables for generated meshes of 
+increasing size, and the cost of a route lookup compared to A*. Use it to 
+decide if precomputing routes is worth it for a scene.
+"""
+import random
+from statistics import mean
+import timeit
+
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.next_hop_table import NextHopTable
+from agents_playground.navigation.navigator import Navigator
+
+ROUTES: int = 200
+
+if __name__ == '__main__':
+  print(f'{"junctions":>10} {"build s":>10} {"table MB":>10} {"A* us":>10} {"lookup us":>10}')
+  for side in (10, 20, 30, 40):
+    mesh = generate_grid_mesh(side, side, max_gap = 4, closed_ratio = 0.1, seed = side)
+    graph = mesh.graph()
+    table = NextHopTable.build(graph)
+
+    rng = random.Random(side)
+    pairs = [(rng.randrange(len(graph)), rng.randrange(len(graph))) for _ in range(ROUTES)]
+    navigator = Navigator(cache_size = 0)
+    a_star_us = mean(timeit.repeat(
+      lambda: [navigator.find_node_route(graph, start, end) for start, end in pairs], number = 1, repeat = 3
+    )) / ROUTES * 1_000_000
+    lookup_us = mean(timeit.repeat(
+      lambda: [table.route(start, end) for start, end in pairs], number = 1, repeat = 3
+    )) / ROUTES * 1_000_000
+
+    print(f'{len(graph):>10} {table.build_seconds:>10.2f} {table.nbytes / 1_000_000:>10.2f} {a_star_us:>10.1f} {lookup_us:>10.1f}')
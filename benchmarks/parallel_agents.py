@@ -0,0 +1,79 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/parallel_agents.py
+
+"""
+Measures the frame cost of transitioning every agent in a scene serially
+and with a ProcessAgentUpdater.
+
+Every agent has a nervous system (with sight) and a perception system. The
+serial rows call AgentLike.transition_state on each agent. The parallel rows
+publish the world snapshot into shared memory and fan the agents out to
+worker processes. The thread rows run the agents on a thread pool, which
+only runs in parallel on a free-threaded build of CPython. Speedups need more
+than one CPU. The number of CPUs and whether the GIL is enabled are printed
+with the results.
+"""
+import os
+import random
+from statistics import mean
+import timeit
+from typing import Dict, List
+
+from agents_playground.agents.parallel.process_updater import ProcessAgentUpdater
+from agents_playground.agents.parallel.thread_updater import ThreadAgentUpdater, gil_enabled
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.scene.scene import Scene
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.types import Coordinate
+from tests.agents.perceptive_agents import CELL_SIZE, DIRECTIONS, create_agent_scene, perceptive_systems, sensory_memory
+
+AGENTS_PER_CELL: float = 0.25
+FRAMES: int = 3
+
+def create_scene(agent_count: int) -> Scene:
+  side = int((agent_count / AGENTS_PER_CELL) ** 0.5)
+  return create_agent_scene(
+    locations    = [Coordinate(random.randint(0, side), random.randint(0, side)) for _ in range(agent_count)],
+    systems      = perceptive_systems,
+    max_radius   = 5 * CELL_SIZE.width,
+    agent_memory = sensory_memory,
+    facings      = [random.choice(DIRECTIONS) for _ in range(agent_count)]
+  )
+
+def clear(agents: List[AgentLike]) -> None:
+  for agent in agents:
+    agent.internal_systems.clear_byproducts()
+    agent.memory['sensory_memory'].unwrap().clear()
+
+def serial_frame(agents: List[AgentLike], neighbors: List[Dict[Tag, AgentLike]]) -> None:
+  for agent, other_agents in zip(agents, neighbors):
+    agent.transition_state(other_agents)
+  clear(agents)
+
+def parallel_frame(updater: ProcessAgentUpdater, neighbors: List[Dict[Tag, AgentLike]]) -> None:
+  updater.transition_states(neighbors)
+  clear(updater.agents)
+
+def thread_frame(updater: ThreadAgentUpdater, agents: List[AgentLike], neighbors: List[Dict[Tag, AgentLike]]) -> None:
+  updater.transition_states(agents, neighbors)
+  clear(agents)
+
+if __name__ == '__main__':
+  random.seed(7)
+  print(f'CPUs: {os.cpu_count()}, GIL enabled: {gil_enabled()}')
+  print(f'{"agents":>8} {"workers":>10} {"ms/frame":>10} {"speedup":>9}')
+  for agent_count in (1_000, 4_000):
+    scene = create_scene(agent_count)
+    agents: List[AgentLike] = list(scene.agents.values())
+    neighbors = [scene.neighbors_of(agent.identity.id) for agent in agents]
+    serial = min(timeit.repeat(lambda: serial_frame(agents, neighbors), number = 1, repeat = FRAMES))
+    print(f'{agent_count:>8} {"serial":>10} {serial * 1000:>10.2f} {1:>8.2f}x')
+    for workers in (1, 2, 4, 8):
+      with ProcessAgentUpdater(agents, scene.agent_state_definitions, workers = workers) as updater:
+        parallel_frame(updater, neighbors) # The workers' first frame includes their start up.
+        parallel = min(timeit.repeat(lambda: parallel_frame(updater, neighbors), number = 1, repeat = FRAMES))
+      print(f'{agent_count:>8} {f"{workers} procs":>10} {parallel * 1000:>10.2f} {serial / parallel:>8.2f}x')
+    for workers in (2, 4, 8):
+      with ThreadAgentUpdater(workers = workers) as threads:
+        threaded = min(timeit.repeat(lambda: thread_frame(threads, agents, neighbors), number = 1, repeat = FRAMES))
+      print(f'{agent_count:>8} {f"{workers} threads":>10} {threaded * 1000:>10.2f} {serial / threaded:>8.2f}x')
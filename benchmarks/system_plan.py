@@ -0,0 +1,80 @@
+# Run With:
+# PYTHONPATH=. poetry run python ./benchmarks/system_plan.py
+
+"""
+Measures the cost of processing an agent's system hierarchy.
+
+The interpreted rows walk the hierarchy the original way. Every system's
+process() dispatches on the phase, calls its before and after hooks whether
+they do anything or not, and looks up each subsystem's byproducts. The planned
+rows run the flat execution plan compiled by compile_execution_plan.
+
+The hierarchies are a root with a tree of systems below it. Only the leaves
+produce byproducts, which is what the default systems look like.
+"""
+from __future__ import annotations
+
+from statistics import mean
+import timeit
+from typing import Dict, List, Optional
+
+from agents_playground.agents.default.default_agent_system import DefaultAgentSystem, SystemWithByproducts
+from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
+from agents_playground.agents.spec.agent_life_cycle_phase import AgentLifeCyclePhase
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.agent_system import AgentSystemLike, PlanStep
+from agents_playground.agents.spec.byproduct_definition import ByproductDefinition
+from agents_playground.agents.spec.byproduct_store import Byproducts
+from agents_playground.simulation.tag import Tag
+
+REPEAT: int = 5
+TICKS: int = 2000
+
+class InterpretedSystem(DefaultAgentSystem):
+  """A system that is never compiled."""
+  def _execution_plan(self, agent_phase: AgentLifeCyclePhase) -> Optional[List[PlanStep]]:
+    return None
+
+class LeafSystem(SystemWithByproducts):
+  def __init__(self, name: str) -> None:
+    super().__init__(name, [ByproductDefinition('ticks', int)])
+
+  def _before_subsystems_processed_pre_state_change(
+    self,
+    characteristics: AgentCharacteristics,
+    parent_byproducts: Byproducts,
+    other_agents: Dict[Tag, AgentLike]
+  ) -> None:
+    self.byproducts_store.store(self.name, 'ticks', 1)
+
+class InterpretedLeafSystem(LeafSystem):
+  def _execution_plan(self, agent_phase: AgentLifeCyclePhase) -> Optional[List[PlanStep]]:
+    return None
+
+def create_hierarchy(depth: int, fan_out: int, interpreted: bool, name: str = 'root') -> AgentSystemLike:
+  if depth == 0:
+    return InterpretedLeafSystem(name) if interpreted else LeafSystem(name)
+  system = InterpretedSystem(name) if interpreted else DefaultAgentSystem(name)
+  for index in range(fan_out):
+    system.register_system(create_hierarchy(depth - 1, fan_out, interpreted, f'{name}_{index}'))
+  return system
+
+def benchmark(label: str, depth: int, fan_out: int, interpreted: bool) -> float:
+  root_system = create_hierarchy(depth, fan_out, interpreted)
+
+  def tick() -> None:
+    for _ in range(TICKS):
+      root_system.process(None, AgentLifeCyclePhase.PRE_STATE_CHANGE, {}, {}) # type: ignore
+      root_system.process(None, AgentLifeCyclePhase.POST_STATE_CHANGE, {}, {}) # type: ignore
+      root_system.clear_byproducts()
+
+  tick() # Warm up so the plans are compiled.
+  per_tick_us = mean(timeit.repeat(tick, number = 1, repeat = REPEAT)) / TICKS * 1_000_000
+  print(f'{label:<12} depth={depth} fan_out={fan_out} {per_tick_us:>10.2f} us/tick')
+  return per_tick_us
+
+if __name__ == '__main__':
+  for depth, fan_out in ((1, 2), (2, 2), (3, 3)):
+    interpreted = benchmark('interpreted', depth, fan_out, interpreted = True)
+    planned = benchmark('planned', depth, fan_out, interpreted = False)
+    print(f'{"speed up":<12} {interpreted / planned:.2f}x')
@@ -5,18 +5,21 @@ from __future__ import annotations
 from types import SimpleNamespace
 
 import dearpygui.dearpygui as dpg
-from functools import lru_cache
 import itertools
 import random
-from typing import Generator, List, Tuple, cast
+from concurrent.futures import Future
+from typing import Dict, Generator, List, Optional, Tuple, cast
 
 from agents_playground.agents.spec.agent_spec import AgentLike
 from agents_playground.project.extensions import register_task
 from agents_playground.core.task_scheduler import ScheduleTraps
+from agents_playground.navigation.batch_router import BatchRouter
+from agents_playground.navigation.flow_field import FlowFieldNavigator
 from agents_playground.navigation.navigation_mesh import Junction, NavigationMesh
 from agents_playground.navigation.navigator import NavigationResultStatus, Navigator, Route, NavigationRouteResult
 from agents_playground.paths.linear_path import LinearPath
 from agents_playground.scene.scene import Scene
+from agents_playground.simulation.tag import Tag
 from agents_playground.spatial.types import Coordinate
 from agents_playground.spatial.vector2d import Vector2d
 
@@ -43,8 +46,14 @@ def agent_random_navigation(*args, **kwargs) -> Generator:
   logger.info('agent_random_navigation: Starting task.')
   scene: Scene = kwargs['scene']   
   walking_speed_range: List[float] = kwargs['speed_range']   
-  navigator: Navigator = Navigator()
-  find_route_with_cache = lru_cache(maxsize=1156)(navigator.find_route)
+  # Agents converge on a handful of destinations. With use_flow_fields, the 
+  # routes to each destination come from a single shared flow field.
+  navigator: Navigator = FlowFieldNavigator() if kwargs.get('use_flow_fields', False) else Navigator(cache_size = 1156)
+  # With use_batch_routing, routes are found in worker processes so agents 
+  # that arrive together don't stall the frame.
+  router: Optional[BatchRouter] = BatchRouter() if kwargs.get('use_batch_routing', False) else None
+  pending_routes: Dict[Tag, Optional[Future]] = {}
+  routing_requests: List[AgentLike] = []
 
   try:
     while True:
@@ -92,41 +101,27 @@ def agent_random_navigation(*args, **kwargs) -> Generator:
             2. We should we track which route an agent is on?
             """
             # print('Agent is routing.')
+            if router is not None:
+              # Routes are found in the background. The agent stays in the 
+              # routing state until its route is ready.
+              agent_id = agent.identity.id
+              if agent_id not in pending_routes:
+                pending_routes[agent_id] = None
+                routing_requests.append(agent)
+              elif pending_routes[agent_id] is not None and pending_routes[agent_id].done():
+                start_route(agent, *pending_routes.pop(agent_id).result(), walking_speed_range)
+              continue
+
             result_status: NavigationResultStatus
             possible_route: NavigationRouteResult
             
-            # print(find_route_with_cache.cache_info())
-            result_status, possible_route = find_route_with_cache(
+            # print(navigator.route_cache)
+            result_status, possible_route = navigator.find_route(
               agent.position.location, 
               agent.position.desired_location, 
               scene.nav_mesh
             )
-            
-            if result_status == NavigationResultStatus.SUCCESS:
-              # target_junction: Junction = scene.nav_mesh.get_junction_by_location(agent.desired_location)
-              # print(f'A route was found between {agent.location} and {target_junction.toml_id}.')
-              # Let's just stick this on the agent for the moment.
-              # Some other options are to have it bound in this coroutine or on the Scene instance.
-              # Convert the list of Waypoints to a LinearPath object.
-              # To do that I need to convert List[Point(x,y)] to (x,y, xx, yy, xxx, yyy...)
-              route: Route = cast(Route, possible_route)
-              control_points = tuple(itertools.chain.from_iterable(route))
-              agent.movement.active_route = LinearPath(
-                dpg.generate_uuid(), 
-                control_points, 
-                line_segment_renderer, 
-                False
-              )
-              agent.movement.active_path_segment = 1
-              agent.movement.walking_speed = random.triangular(
-                low = walking_speed_range[0], 
-                high = walking_speed_range[1]
-              )
-              agent.movement.active_t = 0 # In the range of [0,1]
-              agent.agent_state.transition_to_next_action(agent.agent_characteristics())
-            else:
-              print(f'A route could not be found between {agent.position.location} and {agent.position.desired_location}.')
-              raise Exception('Agent Navigation Failure')
+            start_route(agent, result_status, possible_route, walking_speed_range)
           case AgentStateNames.TRAVELING_STATE.name if agent.position.location != agent.position.desired_location:
             # print('An agent is traveling.')
             travel(agent, scene)
@@ -146,12 +141,53 @@ def agent_random_navigation(*args, **kwargs) -> Generator:
             # Nothing to do...
             print('Unexpected Agent state.')
             pass
+
+      if len(routing_requests) > 0:
+        # Everything that started routing this frame is sent as one batch.
+        futures = router.find_routes(
+          [(agent.position.location, agent.position.desired_location) for agent in routing_requests],
+          scene.nav_mesh
+        )
+        for agent, future in zip(routing_requests, futures):
+          pending_routes[agent.identity.id] = future
+        routing_requests.clear()
       yield ScheduleTraps.NEXT_FRAME
   except GeneratorExit:
     logger.info('Task: agent_random_navigation - GeneratorExit')
   finally:
+    if router is not None:
+      router.shutdown(wait = False)
     logger.info('Task: agent_random_navigation - Task Completed')
 
+def start_route(
+  agent: AgentLike, 
+  result_status: NavigationResultStatus, 
+  possible_route: NavigationRouteResult, 
+  walking_speed_range: List[float]
+) -> None:
+  """Puts an agent on its new route and starts it traveling."""
+  if result_status == NavigationResultStatus.SUCCESS:
+    # Convert the list of Waypoints to a LinearPath object.
+    # To do that I need to convert List[Point(x,y)] to (x,y, xx, yy, xxx, yyy...)
+    route: Route = cast(Route, possible_route)
+    control_points = tuple(itertools.chain.from_iterable(route))
+    agent.movement.active_route = LinearPath(
+      dpg.generate_uuid(), 
+      control_points, 
+      line_segment_renderer, 
+      False
+    )
+    agent.movement.active_path_segment = 1
+    agent.movement.walking_speed = random.triangular(
+      low = walking_speed_range[0], 
+      high = walking_speed_range[1]
+    )
+    agent.movement.active_t = 0 # In the range of [0,1]
+    agent.agent_state.transition_to_next_action(agent.agent_characteristics())
+  else:
+    print(f'A route could not be found between {agent.position.location} and {agent.position.desired_location}.')
+    raise Exception('Agent Navigation Failure')
+
 import random
       
 def select_specific_location(scene: Scene, current_location: Coordinate, nav_mesh: NavigationMesh) -> Coordinate:
@@ -173,9 +209,10 @@ def select_next_location(scene: Scene, current_location: Coordinate, nav_mesh: N
     location_selected = random_location.location != current_location
 
   # 2. Find the entrance junction for the location on the navigation mesh.
-  filter_method = lambda j: j.entity_id == random_location.toml_id and 'entrance' in j.toml_id
+  location_junctions = nav_mesh.find(entity_type = random_location_group, entity_id = random_location.toml_id)
+  filter_method = lambda j: 'entrance' in j.toml_id
 
-  location_entrance_junction: Junction = next(filter(filter_method, nav_mesh.junctions())) # raises StopIteration if no match
+  location_entrance_junction: Junction = next(filter(filter_method, location_junctions)) # raises StopIteration if no match
 
   return cast(Coordinate, location_entrance_junction.location)
 
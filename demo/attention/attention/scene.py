@@ -260,7 +260,7 @@ def agent_navigation(*args, **kwargs) -> Generator:
         movement.move(agent, scene)
       except FindNextState:
         movement.reset(agent)
-        other_agents = find_other_agents(scene, agent_id)
+        other_agents = scene.neighbors_of(agent_id)
         deselect_agents(seen_agents)
         seen_agents.clear()
         agent.memory['sensory_memory'].unwrap().clear()
@@ -319,14 +319,6 @@ def deselect_agents(seen_agents: List[AgentLike]):
       previously_seen_agent.style.fill_color
     )
 
-def find_other_agents(scene: Scene, agent_id: Tag) -> Dict[Tag, AgentLike]:
-  other_agents: Dict[Tag, AgentLike] = {
-    id: agent 
-    for id, agent in scene.agents.items()
-    if id != agent_id
-  }
-  return other_agents
-
 @register_renderer(label='render_agents_with_labels')
 def render_agents_with_labels(**data) -> None:
   context: SimulationContext = data['context']
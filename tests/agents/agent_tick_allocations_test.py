@@ -0,0 +1,77 @@
+import tracemalloc
+from typing import List
+
+from agents_playground.agents.memory.agent_memory_model import AgentMemoryModel
+from agents_playground.agents.memory.memory import Memory
+from agents_playground.agents.memory.memory_container import MemoryContainer
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.fp.containers import FPList
+from tests.agents.perceptive_agents import create_perceptive_agents, neighbors
+
+# The most memory a single agent's tick may have allocated at once, in bytes,
+# once the agents are in a steady state.
+MAX_BYTES_PER_AGENT_TICK = 2048
+
+def create_agents(count: int, seed: int) -> List[AgentLike]:
+  return create_perceptive_agents(count, seed)[0]
+
+def end_frame(agents: List[AgentLike]) -> None:
+  for agent in agents:
+    agent.internal_systems.clear_byproducts()
+    agent.memory['sensory_memory'].unwrap().clear()
+
+class TestAgentTickAllocations:
+  def test_steady_state_ticks_allocate_a_bounded_amount_per_agent(self) -> None:
+    agents = create_agents(100, seed = 8)
+    other_agents = neighbors(agents)
+    for _ in range(3):
+      for agent, others in zip(agents, other_agents):
+        agent.transition_state(others)
+      end_frame(agents)
+
+    tracemalloc.start()
+    try:
+      before = tracemalloc.take_snapshot()
+      peaks: List[int] = []
+      for _ in range(5):
+        for agent, others in zip(agents, other_agents):
+          current, _ = tracemalloc.get_traced_memory()
+          tracemalloc.reset_peak()
+          agent.transition_state(others)
+          peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        end_frame(agents)
+      after = tracemalloc.take_snapshot()
+    finally:
+      tracemalloc.stop()
+
+    package_only = [tracemalloc.Filter(True, '*agents_playground*')]
+    retained = sum(
+      max(0, difference.count_diff)
+      for difference in after.filter_traces(package_only).compare_to(before.filter_traces(package_only), 'lineno')
+    )
+    assert max(peaks) <= MAX_BYTES_PER_AGENT_TICK
+    assert retained == 0
+
+  def test_characteristics_are_reused_until_a_part_is_replaced(self) -> None:
+    agent = create_agents(1, seed = 1)[0]
+    characteristics = agent.agent_characteristics()
+    assert agent.agent_characteristics() is characteristics
+
+    agent.memory = AgentMemoryModel(sensory_memory = MemoryContainer(FPList[Memory]()))
+    replaced = agent.agent_characteristics()
+    assert replaced is not characteristics
+    assert replaced.memory is agent.memory
+
+  def test_sensations_are_reused_while_the_same_agents_are_seen(self) -> None:
+    agents = create_agents(30, seed = 2)
+    other_agents = neighbors(agents)
+    remembered: List[List[Memory]] = []
+    for _ in range(2):
+      for agent, others in zip(agents, other_agents):
+        agent.transition_state(others)
+      remembered.append([memory for agent in agents for memory in agent.memory['sensory_memory'].unwrap()])
+      end_frame(agents)
+
+    assert len(remembered[0]) > 0
+    assert len(remembered[0]) == len(remembered[1])
+    assert all(first is second for first, second in zip(remembered[0], remembered[1]))
@@ -13,7 +13,7 @@ from agents_playground.agents.memory.agent_memory_model import AgentMemoryModel
 from agents_playground.agents.memory.memory import Memory
 from agents_playground.agents.memory.memory_container import MemoryContainer
 from agents_playground.agents.no_agent import NoAgent
-from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.agent_spec import AgentLike, transition_states_batched
 from agents_playground.agents.systems.agent_nervous_system import AgentNervousSystem
 from agents_playground.agents.systems.agent_perception_system import AgentPerceptionSystem
 from agents_playground.agents.systems.agent_visual_system import VisualSensation
@@ -68,6 +68,13 @@ class TestAgentPerception:
     assert VisualSensation(seen=tuple([no_agent.identity.id])) in perceptive_agent.memory['sensory_memory']
     assert len(perceptive_agent.memory['sensory_memory']) > 0
 
+  def test_agent_sees_something_when_batched(self, perceptive_agent: AgentLike) -> None:
+    no_agent = NoAgent()
+
+    transition_states_batched([perceptive_agent], [{0:no_agent}])
+
+    assert VisualSensation(seen=tuple([no_agent.identity.id])) in perceptive_agent.memory['sensory_memory']
+
   @pytest.mark.skip(reason='Hearing system is not implemented yet.')
   def test_agent_hears_something(self, mocker: MockerFixture, perceptive_agent: AgentLike) -> None:
     # Confirm that the visual system is in place.
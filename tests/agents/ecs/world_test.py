@@ -0,0 +1,118 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from agents_playground.agents.default.default_agent import DefaultAgent
+from agents_playground.agents.default.default_agent_system import DefaultAgentSystem
+from agents_playground.agents.ecs.agent_entity import EntityAgent, spawn_agent
+from agents_playground.agents.ecs.world import World, WorldError
+from agents_playground.agents.memory.agent_memory_model import AgentMemoryModel
+from agents_playground.agents.memory.memory import Memory
+from agents_playground.agents.memory.memory_container import MemoryContainer
+from agents_playground.agents.no_agent import NoAgent
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.systems.agent_nervous_system import AgentNervousSystem
+from agents_playground.agents.systems.agent_perception_system import AgentPerceptionSystem
+from agents_playground.agents.systems.agent_visual_system import VisualSensation
+from agents_playground.fp.containers import FPList
+
+def create_agent(mocker: MockerFixture, perceptive: bool) -> AgentLike:
+  root_system = DefaultAgentSystem('root_system')
+  memory = AgentMemoryModel()
+  if perceptive:
+    root_system.register_system(AgentNervousSystem())
+    root_system.register_system(AgentPerceptionSystem())
+    memory.add('sensory_memory', MemoryContainer(FPList[Memory]()))
+  return DefaultAgent(
+    initial_state    = mocker.Mock(),
+    style            = mocker.Mock(),
+    identity         = mocker.Mock(),
+    physicality      = mocker.Mock(),
+    position         = mocker.Mock(),
+    movement         = mocker.Mock(),
+    agent_memory     = memory,
+    internal_systems = root_system
+  )
+
+class TestWorld:
+  def test_queries_only_visit_entities_with_the_components(self) -> None:
+    world = World()
+    a = world.spawn(position = 1, frustum = 'a')
+    b = world.spawn(position = 2)
+    c = world.spawn(position = 3, frustum = 'c', memory = 'c')
+
+    assert sorted(world.query('position', 'frustum')) == [(a, 1, 'a'), (c, 3, 'c')]
+    assert sorted(world.query('frustum', 'position')) == [(a, 'a', 1), (c, 'c', 3)]
+    assert sorted(world.query('position')) == [(a, 1), (b, 2), (c, 3)]
+    assert world.count('memory') == 1
+    assert list(world.query('size')) == []
+
+  def test_query_tables_are_the_archetype_columns(self) -> None:
+    world = World()
+    for index in range(5):
+      world.spawn(position = index, frustum = -index)
+
+    tables = list(world.query_tables('position', 'frustum'))
+    assert len(tables) == 1
+    entities, positions, frustums = tables[0]
+    assert len(entities) == 5
+    assert positions == [0, 1, 2, 3, 4]
+    assert frustums == [0, -1, -2, -3, -4]
+
+  def test_adding_and_removing_components_moves_the_entity(self) -> None:
+    world = World()
+    entity = world.spawn(position = 1)
+    world.set_component(entity, 'frustum', 'f')
+    assert world.has(entity, 'position', 'frustum')
+    assert list(world.query('frustum')) == [(entity, 'f')]
+
+    world.set_component(entity, 'frustum', 'g')
+    assert world.component(entity, 'frustum') == 'g'
+
+    world.remove_component(entity, 'frustum')
+    assert not world.has(entity, 'frustum')
+    assert world.components_of(entity) == {'position': 1}
+    with pytest.raises(WorldError):
+      world.component(entity, 'frustum')
+    with pytest.raises(WorldError):
+      world.remove_component(entity, 'frustum')
+
+  def test_despawning_keeps_the_other_rows(self) -> None:
+    world = World()
+    entities = [world.spawn(position = index) for index in range(4)]
+    world.despawn(entities[1])
+
+    assert entities[1] not in world
+    assert len(world) == 3
+    for index in (0, 2, 3):
+      assert world.component(entities[index], 'position') == index
+    with pytest.raises(WorldError):
+      world.despawn(entities[1])
+
+class TestEntityAgent:
+  def test_capabilities_are_components(self, mocker: MockerFixture) -> None:
+    world = World()
+    perceptive = spawn_agent(world, create_agent(mocker, perceptive = True))
+    spawn_agent(world, create_agent(mocker, perceptive = False))
+
+    seeing = list(world.query('position', 'physicality', 'sensory_memory', 'visual_system'))
+    assert [row[0] for row in seeing] == [perceptive.entity]
+    assert world.count('position') == 2
+
+  def test_entity_agents_work_like_agents(self, mocker: MockerFixture) -> None:
+    world = World()
+    agent = spawn_agent(world, create_agent(mocker, perceptive = True))
+    no_agent = NoAgent()
+
+    agent.transition_state({0: no_agent})
+
+    assert VisualSensation(seen=tuple([no_agent.identity.id])) in agent.memory['sensory_memory']
+    assert agent == EntityAgent(world, agent.entity)
+
+  def test_setting_a_part_updates_the_component(self, mocker: MockerFixture) -> None:
+    world = World()
+    agent = spawn_agent(world, create_agent(mocker, perceptive = False))
+    position = mocker.Mock()
+
+    agent.position = position
+
+    assert world.component(agent.entity, 'position') is position
@@ -0,0 +1,147 @@
+import random
+from typing import Callable, Dict, List
+
+import pytest
+
+from agents_playground.agents.default.default_agent_system import DefaultAgentSystem
+from agents_playground.agents.default.named_agent_state import NamedAgentActionState
+from agents_playground.agents.parallel.agent_state_buffer import AgentStateBuffer, AgentStateBufferError
+from agents_playground.agents.parallel.thread_updater import ThreadAgentUpdater
+from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.byproduct_store import Byproducts
+from agents_playground.scene.scene import Scene
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.types import Coordinate
+from tests.agents.perceptive_agents import CELL_SIZE, create_agent_scene
+
+class FlockingSystem(DefaultAgentSystem):
+  """Moves the agent toward its neighbors. Walking neighbors pull harder."""
+  def __init__(self) -> None:
+    super().__init__('flocking_system')
+
+  def _before_subsystems_processed_pre_state_change(
+    self,
+    characteristics: AgentCharacteristics,
+    parent_byproducts: Byproducts,
+    other_agents: Dict[Tag, AgentLike]
+  ) -> None:
+    if len(other_agents) == 0:
+      return
+    location = characteristics.position.location
+    pull_x = sum(other.position.location.x - location.x for other in other_agents.values())
+    pull_y = sum(other.position.location.y - location.y for other in other_agents.values())
+    walking = sum(1 for other in other_agents.values() if other.agent_state.current_action_state.name == 'walking')
+    step = 1 + walking % 2
+    new_location = Coordinate(location.x + step * ((pull_x > 0) - (pull_x < 0)), location.y + step * ((pull_y > 0) - (pull_y < 0)))
+    characteristics.position.move_to(new_location)
+    characteristics.physicality.invalidate_aabb(new_location, CELL_SIZE)
+    characteristics.physicality.invalidate_frustum(new_location, characteristics.position.facing, CELL_SIZE)
+
+def create_scene(count: int, seed: int) -> Scene:
+  rng = random.Random(seed)
+  return create_agent_scene(
+    locations      = [Coordinate(rng.randint(0, 15), rng.randint(0, 15)) for _ in range(count)],
+    systems        = lambda: [FlockingSystem()],
+    max_radius     = 4 * CELL_SIZE.width,
+    initial_states = [rng.choice(['idle', 'walking']) for _ in range(count)]
+  )
+
+def outcome(scene: Scene) -> List[tuple]:
+  return [
+    (agent.position.location, agent.agent_state.current_action_state.name)
+    for agent in scene.agents.values()
+  ]
+
+def run(scene: Scene, frame: Callable[[Scene], None], frames: int = 4) -> List[tuple]:
+  for _ in range(frames):
+    frame(scene)
+    scene.tick()
+  return outcome(scene)
+
+class TestAgentStateBuffer:
+  def test_other_agents_see_the_committed_state(self) -> None:
+    scene = create_scene(2, seed = 1)
+    first, second = scene.agents.values()
+    buffer = AgentStateBuffer(scene.agents.values())
+    committed_location = first.position.location
+    committed_state = first.agent_state.current_action_state
+
+    first.move_to(Coordinate(40, 40), CELL_SIZE)
+    first.agent_state.assign_action_state(NamedAgentActionState('resting'))
+    view = buffer.committed({first.identity.id: first})[first.identity.id]
+
+    assert view.identity is first.identity
+    assert view.position.location == committed_location
+    assert view.agent_state.current_action_state is committed_state
+    assert view.physicality.aabb.vertices[0].coordinates != first.physicality.aabb.vertices[0].coordinates
+
+    buffer.swap()
+    assert view.position.location == Coordinate(40, 40)
+    assert view.agent_state.current_action_state.name == 'resting'
+    assert view.physicality.aabb.vertices[0].coordinates == first.physicality.aabb.vertices[0].coordinates
+    assert buffer.view_of(second.identity.id).position.location == second.position.location
+
+  def test_facing_updated_in_place_is_not_committed_until_the_swap(self) -> None:
+    scene = create_scene(1, seed = 1)
+    agent = next(iter(scene.agents.values()))
+    buffer = AgentStateBuffer([agent])
+    buffer.swap()
+    view = buffer.view_of(agent.identity.id)
+    facing = agent.position.facing
+    committed = (facing.i, facing.j)
+
+    facing.set(-facing.i + 1, -facing.j + 1)
+    assert view.position.facing is not facing
+    assert (view.position.facing.i, view.position.facing.j) == committed
+
+    buffer.swap()
+    assert (view.position.facing.i, view.position.facing.j) == (facing.i, facing.j)
+
+  def test_agents_must_be_buffered_once(self) -> None:
+    scene = create_scene(1, seed = 1)
+    agent = next(iter(scene.agents.values()))
+    buffer = AgentStateBuffer([agent])
+    with pytest.raises(AgentStateBufferError):
+      buffer.add(agent)
+    with pytest.raises(AgentStateBufferError):
+      buffer.view_of('missing')
+
+  def test_update_order_does_not_change_the_outcome(self) -> None:
+    def forward(scene: Scene) -> None:
+      scene.transition_agents()
+
+    def backward(scene: Scene) -> None:
+      scene.transition_agents(reversed(list(scene.agents.values())))
+
+    def threaded(scene: Scene) -> None:
+      agents = list(scene.agents.values())
+      with ThreadAgentUpdater(workers = 4) as updater:
+        updater.transition_states(agents, [scene.neighbors_of(agent.identity.id) for agent in agents])
+
+    outcomes = []
+    for frame in (forward, backward, threaded):
+      scene = create_scene(60, seed = 3)
+      scene.double_buffered = True
+      outcomes.append(run(scene, frame))
+
+    assert outcomes[0] == outcomes[1] == outcomes[2]
+
+  def test_without_double_buffering_the_order_matters(self) -> None:
+    forward = run(create_scene(60, seed = 3), lambda scene: scene.transition_agents())
+    backward = run(create_scene(60, seed = 3), lambda scene: scene.transition_agents(reversed(list(scene.agents.values()))))
+    assert forward != backward
+
+  def test_agents_added_to_a_double_buffered_scene_are_buffered(self) -> None:
+    scene = create_scene(2, seed = 4)
+    scene.double_buffered = True
+    for agent in create_scene(1, seed = 5).agents.values():
+      agent.identity.id = 'late'
+      scene.add_agent(agent)
+
+    assert scene.agent_buffer is not None
+    assert len(scene.agent_buffer) == 3
+    assert 'late' in scene.agent_buffer
+
+    scene.double_buffered = False
+    assert scene.agent_buffer is None
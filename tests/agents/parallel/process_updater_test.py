@@ -0,0 +1,77 @@
+from typing import Dict, List, Tuple
+
+import pytest
+
+from agents_playground.agents.memory.agent_memory_model import AgentMemoryModel
+from agents_playground.agents.memory.memory import Memory
+from agents_playground.agents.memory.memory_container import MemoryContainer
+from agents_playground.agents.parallel.process_updater import MemoryTracker, ParallelUpdateError, ProcessAgentUpdater
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.agent_state_spec import AgentActionStateLike
+from agents_playground.fp.containers import FPList
+from tests.agents.perceptive_agents import create_perceptive_agents, neighbors, outcome
+
+def create_agents(count: int, seed: int) -> Tuple[List[AgentLike], Dict[str, AgentActionStateLike]]:
+  return create_perceptive_agents(count, seed, state_names = ('idle', 'walking', 'resting'), random_states = True)
+
+class TestProcessAgentUpdater:
+  def test_matches_serial_transitions(self) -> None:
+    serial_agents, _ = create_agents(40, seed = 5)
+    parallel_agents, states = create_agents(40, seed = 5)
+
+    with ProcessAgentUpdater(parallel_agents, states, workers = 2) as updater:
+      assert updater.workers == 2
+      for _ in range(3):
+        for agent, other_agents in zip(serial_agents, neighbors(serial_agents)):
+          agent.transition_state(other_agents)
+        updater.transition_states(neighbors(parallel_agents))
+        assert outcome(parallel_agents) == outcome(serial_agents)
+
+  def test_neighbors_must_be_in_the_group(self) -> None:
+    agents, states = create_agents(2, seed = 1)
+    outsiders, _ = create_agents(3, seed = 1)
+    with ProcessAgentUpdater(agents, states, workers = 1) as updater:
+      with pytest.raises(ParallelUpdateError):
+        updater.transition_states([{outsiders[2].identity.id: outsiders[2]}, {}])
+
+  def test_memory_cleared_between_frames_stays_in_sync(self) -> None:
+    serial_agents, _ = create_agents(20, seed = 6)
+    parallel_agents, states = create_agents(20, seed = 6)
+
+    with ProcessAgentUpdater(parallel_agents, states, workers = 2) as updater:
+      for _ in range(3):
+        for agent, other_agents in zip(serial_agents, neighbors(serial_agents)):
+          agent.transition_state(other_agents)
+        updater.transition_states(neighbors(parallel_agents))
+        assert outcome(parallel_agents) == outcome(serial_agents)
+        for agent in serial_agents + parallel_agents:
+          agent.memory['sensory_memory'].unwrap().clear()
+          agent.internal_systems.clear_byproducts()
+
+class TestMemoryTracker:
+  def test_only_the_changes_are_found(self) -> None:
+    memory = AgentMemoryModel(sensory_memory = MemoryContainer(FPList[Memory]()))
+    replica = AgentMemoryModel(sensory_memory = MemoryContainer(FPList[Memory]()))
+    tracker, replica_tracker = MemoryTracker(memory), MemoryTracker(replica)
+    assert tracker.changes(memory) == {}
+
+    sensations = memory['sensory_memory'].unwrap()
+    sensations.extend(['saw agent 1', 'heard agent 2'])
+    assert tracker.changes(memory) == {'sensory_memory': ('extend', ['saw agent 1', 'heard agent 2'])}
+    sensations.append('saw agent 3')
+    delta = tracker.changes(memory)
+    assert delta == {'sensory_memory': ('extend', ['saw agent 3'])}
+
+    sensations.clear()
+    assert tracker.changes(memory) == {'sensory_memory': ('replace', [])}
+
+    memory.add('working_memory', MemoryContainer(FPList[Memory](['plan'])))
+    delta = tracker.changes(memory)
+    assert list(delta) == ['working_memory'] and delta['working_memory'][0] == 'container'
+    replica_tracker.apply(replica, delta)
+    assert list(replica['working_memory'].unwrap()) == ['plan']
+    assert replica_tracker.changes(replica) == {}
+
+    del memory.data['working_memory']
+    replica_tracker.apply(replica, tracker.changes(memory))
+    assert 'working_memory' not in replica.data
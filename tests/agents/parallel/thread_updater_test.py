@@ -0,0 +1,66 @@
+import random
+import sys
+from typing import List
+
+import pytest
+from pytest_mock import MockerFixture
+
+from agents_playground.agents.default.default_agent_system import DefaultAgentSystem
+from agents_playground.agents.parallel.thread_updater import ThreadAgentUpdater, partition
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.spatial.types import Coordinate
+from tests.agents.perceptive_agents import CELL_SIZE, DIRECTIONS, create_perceptive_agents, neighbors, outcome
+
+def create_agents(count: int, seed: int) -> List[AgentLike]:
+  return create_perceptive_agents(count, seed, spread = 30, random_states = True)[0]
+
+def move(agents: List[AgentLike], rng: random.Random) -> None:
+  """Moves and turns the agents between frames. Their AABBs and frustums become dirty."""
+  for agent in agents:
+    location = agent.position.location
+    agent.move_to(Coordinate(location.x + rng.randint(-1, 1), location.y + rng.randint(-1, 1)), CELL_SIZE)
+    agent.face(rng.choice(DIRECTIONS), CELL_SIZE)
+
+class TestThreadAgentUpdater:
+  def test_stress_matches_serial_transitions(self) -> None:
+    serial_agents = create_agents(300, seed = 9)
+    threaded_agents = create_agents(300, seed = 9)
+    serial_moves, threaded_moves = random.Random(4), random.Random(4)
+
+    # Switch threads as often as possible to shake out races.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+      with ThreadAgentUpdater(workers = 8) as updater:
+        for _ in range(5):
+          move(serial_agents, serial_moves)
+          move(threaded_agents, threaded_moves)
+          for agent, other_agents in zip(serial_agents, neighbors(serial_agents)):
+            agent.transition_state(other_agents)
+          updater.transition_states(threaded_agents, neighbors(threaded_agents))
+          assert outcome(threaded_agents) == outcome(serial_agents)
+          for agent in serial_agents + threaded_agents:
+            agent.internal_systems.clear_byproducts()
+            agent.memory['sensory_memory'].unwrap().clear()
+    finally:
+      sys.setswitchinterval(switch_interval)
+
+  def test_agents_that_share_systems_share_a_shard(self) -> None:
+    agents = create_agents(6, seed = 2)
+    shared_system = DefaultAgentSystem('shared')
+    agents[1].internal_systems = shared_system
+    agents[4].internal_systems = shared_system
+
+    shards = partition(agents, 3)
+
+    assert sorted(index for shard in shards for index in shard) == list(range(6))
+    assert any(1 in shard and 4 in shard for shard in shards)
+    assert all(shard == sorted(shard) for shard in shards)
+
+  def test_errors_are_raised_on_the_calling_thread(self, mocker: MockerFixture) -> None:
+    agents = create_agents(4, seed = 3)
+    agents[2].internal_systems.process = mocker.Mock(side_effect = RuntimeError('broken system'))
+
+    with ThreadAgentUpdater(workers = 2) as updater:
+      with pytest.raises(RuntimeError, match = 'broken system'):
+        updater.transition_states(agents, neighbors(agents))
@@ -0,0 +1,176 @@
+"""
+Builds default agents, and scenes of them, for the tests and benchmarks that
+compare different ways of transitioning agents. The perceptive agents see and
+remember each other.
+"""
+import itertools
+import random
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from agents_playground.agents.default.default_agent import DefaultAgent
+from agents_playground.agents.default.default_agent_identity import DefaultAgentIdentity
+from agents_playground.agents.default.default_agent_movement_attributes import DefaultAgentMovementAttributes
+from agents_playground.agents.default.default_agent_physicality import DefaultAgentPhysicality
+from agents_playground.agents.default.default_agent_position import DefaultAgentPosition
+from agents_playground.agents.default.default_agent_state import DefaultAgentState
+from agents_playground.agents.default.default_agent_style import DefaultAgentStyle
+from agents_playground.agents.default.default_agent_system import DefaultAgentSystem
+from agents_playground.agents.default.map_agent_action_selector import MapAgentActionSelector
+from agents_playground.agents.default.named_agent_state import NamedAgentActionState
+from agents_playground.agents.memory.agent_memory_model import AgentMemoryModel
+from agents_playground.agents.memory.memory import Memory
+from agents_playground.agents.memory.memory_container import MemoryContainer
+from agents_playground.agents.spec.agent_action_selector_spec import AgentActionSelector
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.agent_state_spec import AgentActionStateLike
+from agents_playground.agents.spec.agent_system import AgentSystemLike
+from agents_playground.agents.systems.agent_nervous_system import AgentNervousSystem
+from agents_playground.agents.systems.agent_perception_system import AgentPerceptionSystem
+from agents_playground.core.types import Size
+from agents_playground.fp.containers import FPList
+from agents_playground.scene.proximity_system import ProximitySystem
+from agents_playground.scene.scene import Scene
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.aabbox import EmptyAABBox
+from agents_playground.spatial.direction import Direction
+from agents_playground.spatial.frustum import Frustum2d
+from agents_playground.spatial.types import Coordinate
+
+CELL_SIZE = Size(20, 20)
+DIRECTIONS = [Direction.NORTH, Direction.EAST, Direction.SOUTH, Direction.WEST]
+
+def create_states(state_names: Sequence[str]) -> Tuple[Dict[str, AgentActionStateLike], AgentActionSelector]:
+  """Action states with the given names and a selector that cycles through them in order."""
+  states: Dict[str, AgentActionStateLike] = {name: NamedAgentActionState(name) for name in state_names}
+  ordered = [states[name] for name in state_names]
+  selector = MapAgentActionSelector({state: ordered[(index + 1) % len(ordered)] for index, state in enumerate(ordered)})
+  return states, selector
+
+def perceptive_systems() -> List[AgentSystemLike]:
+  """The nervous system (with sight) and the perception system."""
+  return [AgentNervousSystem(), AgentPerceptionSystem()]
+
+def sensory_memory() -> AgentMemoryModel:
+  return AgentMemoryModel(sensory_memory = MemoryContainer(FPList[Memory]()))
+
+def create_agent(
+  ids: Iterator[int],
+  location: Coordinate,
+  systems: Iterable[AgentSystemLike],
+  initial_state: AgentActionStateLike,
+  selector: AgentActionSelector,
+  agent_memory: Optional[AgentMemoryModel] = None,
+  facing: Optional[Direction] = None
+) -> AgentLike:
+  """
+  Creates a default agent.
+
+  Args:
+    - ids: Where the agent's id comes from.
+    - location: The agent's cell.
+    - systems: The systems to register with the agent's root system.
+    - initial_state: The agent's action state.
+    - selector: Picks the agent's next action state.
+    - agent_memory: The agent's memory. Defaults to an empty memory model.
+    - facing: The direction the agent faces. If None, the agent keeps its default facing.
+  """
+  root_system = DefaultAgentSystem('root_system')
+  for system in systems:
+    root_system.register_system(system)
+  agent = DefaultAgent(
+    initial_state    = DefaultAgentState(initial_state, selector),
+    style            = DefaultAgentStyle(),
+    identity         = DefaultAgentIdentity(lambda: next(ids)),
+    physicality      = DefaultAgentPhysicality(size = Size(15, 15), aabb = EmptyAABBox(), frustum = Frustum2d()),
+    position         = DefaultAgentPosition(Direction.EAST, location, location, location),
+    movement         = DefaultAgentMovementAttributes(),
+    agent_memory     = AgentMemoryModel() if agent_memory is None else agent_memory,
+    internal_systems = root_system
+  )
+  agent.move_to(location, CELL_SIZE)
+  if facing is not None:
+    agent.face(facing, CELL_SIZE)
+  return agent
+
+def create_agent_scene(
+  locations: Iterable[Coordinate],
+  systems: Callable[[], Iterable[AgentSystemLike]],
+  max_radius: float,
+  state_names: Sequence[str] = ('idle', 'walking'),
+  initial_states: Optional[Iterable[str]] = None,
+  agent_memory: Callable[[], AgentMemoryModel] = AgentMemoryModel,
+  facings: Optional[Iterable[Direction]] = None
+) -> Scene:
+  """
+  Creates a scene with an agent at each location.
+
+  Args:
+    - locations: The agents' cells.
+    - systems: Creates the systems of one agent.
+    - max_radius: How far, in canvas space, the agents' neighbors can be.
+    - state_names: The action states. Agents cycle through them in order.
+    - initial_states: The name of each agent's first state. Defaults to the first state.
+    - agent_memory: Creates the memory of one agent.
+    - facings: The direction each agent faces. Defaults to their default facing.
+  """
+  scene = Scene()
+  scene.cell_size = CELL_SIZE
+  scene.proximity.max_radius = max_radius
+  states, selector = create_states(state_names)
+  scene.agent_state_definitions = states
+  ids = itertools.count()
+  names: Iterable[Optional[str]] = itertools.repeat(None) if initial_states is None else initial_states
+  directions: Iterable[Optional[Direction]] = itertools.repeat(None) if facings is None else facings
+  for location, name, facing in zip(locations, names, directions):
+    initial_state = states[state_names[0] if name is None else name]
+    scene.add_agent(create_agent(ids, location, systems(), initial_state, selector, agent_memory(), facing))
+  return scene
+
+def create_perceptive_agents(
+  count: int,
+  seed: int,
+  state_names: Sequence[str] = ('idle', 'walking'),
+  spread: int = 20,
+  random_states: bool = False
+) -> Tuple[List[AgentLike], Dict[str, AgentActionStateLike]]:
+  """
+  Creates agents with the nervous and perception systems and a sensory memory.
+
+  Args:
+    - count: The number of agents.
+    - seed: Seeds where the agents are, which way they face and what state they start in.
+    - state_names: The action states. Agents cycle through them in order.
+    - spread: The agents are placed on cells 0 to spread along each axis.
+    - random_states: If True, each agent starts in a random state. Otherwise in the first one.
+
+  Returns
+    The agents and their action states by name.
+  """
+  rng = random.Random(seed)
+  states, selector = create_states(state_names)
+  ordered = [states[name] for name in state_names]
+  ids = itertools.count()
+  agents: List[AgentLike] = []
+  for _ in range(count):
+    initial_state = rng.choice(ordered) if random_states else ordered[0]
+    location = Coordinate(rng.randint(0, spread), rng.randint(0, spread))
+    facing = rng.choice(DIRECTIONS)
+    agents.append(create_agent(ids, location, perceptive_systems(), initial_state, selector, sensory_memory(), facing))
+  return agents, states
+
+def neighbors(agents: List[AgentLike]) -> List[Dict[Tag, AgentLike]]:
+  """The other agents within 5 cells of each agent."""
+  proximity = ProximitySystem(max_radius = 5 * CELL_SIZE.width)
+  by_id = {agent.identity.id: agent for agent in agents}
+  return [proximity.neighbors_of(agent.identity.id, by_id) for agent in agents]
+
+def outcome(agents: List[AgentLike]) -> List[tuple]:
+  """Everything a transition changes about the agents, in a comparable form."""
+  return [
+    (
+      agent.agent_state.current_action_state.name,
+      [repr(memory) for memory in agent.memory['sensory_memory'].unwrap()],
+      {name: [repr(value) for value in values] for name, values in agent.internal_systems.byproducts_store.byproducts.items()}
+    )
+    for agent in agents
+  ]
@@ -1,7 +1,9 @@
+from pytest_mock import MockerFixture
 
 from agents_playground.agents.default.default_agent_physicality import DefaultAgentPhysicality
 from agents_playground.core.types import Size
 from agents_playground.spatial.aabbox import EmptyAABBox
+from agents_playground.spatial.direction import Direction
 from agents_playground.spatial.frustum import Frustum2d
 from agents_playground.spatial.types import Coordinate
 from agents_playground.spatial.vertex import Vertex2d
@@ -22,4 +24,32 @@ class TestPhysicalAgents:
     )
     
     assert physicality.aabb.min.coordinates == Vertex2d(-1, 2).coordinates
-    assert physicality.aabb.max.coordinates == Vertex2d(11, 8).coordinates
\ No newline at end of file
+    assert physicality.aabb.max.coordinates == Vertex2d(11, 8).coordinates
+
+  def test_aabb_and_frustum_are_calculated_on_access(self, mocker: MockerFixture) -> None:
+    frustum = Frustum2d()
+    physicality = DefaultAgentPhysicality(
+      size = Size(12, 6),
+      aabb = EmptyAABBox(),
+      frustum = frustum
+    )
+    mocker.spy(physicality, 'calculate_aabb')
+    mocker.spy(frustum, 'update')
+
+    physicality.invalidate_aabb(Coordinate(0,0), Size(10, 10))
+    physicality.invalidate_aabb(Coordinate(1,1), Size(10, 10))
+    physicality.invalidate_frustum(Coordinate(1,1), Direction.EAST, Size(10, 10))
+    physicality.invalidate_frustum(Coordinate(1,1), Direction.NORTH, Size(10, 10))
+    assert physicality.is_aabb_dirty
+    assert physicality.is_frustum_dirty
+    physicality.calculate_aabb.assert_not_called() # type: ignore
+    frustum.update.assert_not_called() # type: ignore
+
+    assert physicality.aabb.min.coordinates == Vertex2d(9, 12).coordinates
+    assert physicality.aabb.max.coordinates == Vertex2d(21, 18).coordinates
+    physicality.frustum
+    physicality.frustum
+    assert not physicality.is_aabb_dirty
+    assert not physicality.is_frustum_dirty
+    physicality.calculate_aabb.assert_called_once() # type: ignore
+    frustum.update.assert_called_once_with(Coordinate(1,1), Direction.NORTH, Size(10, 10)) # type: ignore
@@ -57,13 +57,15 @@ class TestProjectSpecificAgents:
 
     assert not agent.agent_scene_graph_changed
     agent.position.move_to.assert_not_called()
-    agent.physicality.calculate_aabb.assert_not_called()
+    agent.physicality.invalidate_aabb.assert_not_called()
 
     agent.move_to(new_location = Coordinate(14, 22), cell_size = Size(10, 10))
 
     assert agent.agent_scene_graph_changed
     agent.position.move_to.assert_called_once()
-    agent.physicality.calculate_aabb.assert_called_once()
+    agent.physicality.invalidate_aabb.assert_called_once()
+    agent.physicality.invalidate_frustum.assert_called_once()
+    agent.physicality.calculate_aabb.assert_not_called()
 
   def test_changing_to_next_state(self, mocker: MockerFixture) -> None:
     agent = DefaultAgent(
@@ -7,9 +7,18 @@ from pytest_mock import MockerFixture
 from agents_playground.agents.default.default_agent_system import DefaultAgentSystem, SystemWithByproducts
 from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
 from agents_playground.agents.spec.agent_life_cycle_phase import AgentLifeCyclePhase
-from agents_playground.agents.spec.agent_spec import AgentLike
-from agents_playground.agents.spec.agent_system import AgentSystemLike, SystemRegistrationError
+from agents_playground.agents.default.default_agent import DefaultAgent
+from agents_playground.agents.spec.agent_spec import AgentLike, transition_states_batched
+from agents_playground.agents.spec.agent_system import (
+  AgentSystemLike, 
+  PlanAction, 
+  SystemBatch, 
+  SystemRegistrationError, 
+  compile_execution_plan,
+  invalidate_execution_plans
+)
 from agents_playground.agents.spec.byproduct_definition import ByproductDefinition
+from agents_playground.agents.spec.byproduct_store import Byproducts
 
 class FakeByproduct:
   ...
@@ -23,7 +32,7 @@ class IntegerSystem(SystemWithByproducts):
   def _before_subsystems_processed_pre_state_change(
     self, 
     characteristics: AgentCharacteristics, 
-    parent_byproducts: dict[str, list],
+    parent_byproducts: Byproducts,
     other_agents: List[AgentLike]
   ) -> None:
     self.byproducts_store.store(self.name, 'integers', self.value)
@@ -35,6 +44,28 @@ def create_mock_system(sys_name:str, mocker: MockerFixture) -> AgentSystemLike:
   system._collect_byproducts_from_subsystems = mocker.Mock()
   return system
 
+def create_integer_hierarchy(values: List[int]) -> AgentSystemLike:
+  """A root system with a chain of integer systems below it."""
+  root_system = DefaultAgentSystem('root-system')
+  parent: AgentSystemLike = root_system
+  for value in values:
+    subsystem = IntegerSystem(f'subsystem_{value}', value)
+    parent.register_system(subsystem)
+    parent = subsystem
+  return root_system
+
+def create_agent(internal_systems: AgentSystemLike, mocker: MockerFixture) -> AgentLike:
+  return DefaultAgent(
+    initial_state    = mocker.Mock(),
+    style            = mocker.Mock(),
+    identity         = mocker.Mock(),
+    physicality      = mocker.Mock(),
+    position         = mocker.Mock(),
+    movement         = mocker.Mock(),
+    agent_memory     = mocker.Mock(),
+    internal_systems = internal_systems
+  )
+
 class TestAgentSystem:
   def test_registering_subsystems(self, mocker: MockerFixture) -> None:
     root_system = DefaultAgentSystem('root-system')
@@ -188,4 +219,136 @@ class TestAgentSystem:
     root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
     second_pass = root_system.byproducts_store.byproducts['integers']
     assert len(second_pass) == 4
-    assert second_pass == [1, 2, 3, 4]
\ No newline at end of file
+    assert second_pass == [1, 2, 3, 4]
+
+class TestBatchedSystemProcessing:
+  def test_each_agents_systems_are_processed_once(self, mocker: MockerFixture) -> None:
+    systems: List[AgentSystemLike] = []
+    subsystems: List[AgentSystemLike] = []
+    for _ in range(3):
+      root_system = create_mock_system('root-system', mocker)
+      subsystem = create_mock_system('subsystem_a', mocker)
+      root_system.register_system(subsystem)
+      systems.append(root_system)
+      subsystems.append(subsystem)
+
+    batch = SystemBatch(
+      agents            = [mocker.Mock() for _ in systems],
+      systems           = systems,
+      characteristics   = [mocker.Mock() for _ in systems],
+      other_agents      = [{} for _ in systems],
+      parent_byproducts = [{} for _ in systems],
+      scene             = None
+    )
+    systems[0].process_batch(batch, AgentLifeCyclePhase.PRE_STATE_CHANGE)
+
+    for system in systems + subsystems:
+      system._before_subsystems_processed.assert_called_once()
+      system._after_subsystems_processed.assert_called_once()
+      system._collect_byproducts_from_subsystems.assert_called_once()
+    for index, subsystem in enumerate(subsystems):
+      assert subsystem._before_subsystems_processed.call_args.args[0] is batch.characteristics[index]
+
+  def test_batched_matches_per_agent_processing(self, mocker: MockerFixture) -> None:
+    serial_agents = [create_agent(create_integer_hierarchy([1, 2, 3]), mocker) for _ in range(4)]
+    batched_agents = [create_agent(create_integer_hierarchy([1, 2, 3]), mocker) for _ in range(4)]
+
+    for agent in serial_agents:
+      agent.transition_state({})
+    transition_states_batched(batched_agents, [{} for _ in batched_agents])
+
+    for serial, batched in zip(serial_agents, batched_agents):
+      # The integers are collected in both phases.
+      assert serial.internal_systems.byproducts_store.byproducts['integers'] == [1, 2, 3]
+      assert batched.internal_systems.byproducts_store.byproducts['integers'] == [1, 2, 3]
+      batched.agent_state.transition_to_next_action.assert_called_once()
+
+  def test_agents_with_different_systems_are_batched_separately(self, mocker: MockerFixture) -> None:
+    short_agent = create_agent(create_integer_hierarchy([1]), mocker)
+    long_agent = create_agent(create_integer_hierarchy([4, 5]), mocker)
+
+    transition_states_batched([short_agent, long_agent], [{}, {}])
+
+    assert short_agent.internal_systems.byproducts_store.byproducts['integers'] == [1]
+    assert long_agent.internal_systems.byproducts_store.byproducts['integers'] == [4, 5]
+
+class TestExecutionPlans:
+  def test_hooks_that_are_not_overridden_are_left_out(self) -> None:
+    root_system = create_integer_hierarchy([1, 2])
+    plan = compile_execution_plan(root_system, AgentLifeCyclePhase.PRE_STATE_CHANGE)
+
+    assert plan is not None
+    assert [step.action for step in plan] == [
+      PlanAction.HOOK, PlanAction.HOOK, PlanAction.ROUTE, PlanAction.ROUTE
+    ]
+    # Only the routing is left in the post state change phase.
+    post_plan = compile_execution_plan(root_system, AgentLifeCyclePhase.POST_STATE_CHANGE)
+    assert [step.action for step in post_plan] == [PlanAction.ROUTE, PlanAction.ROUTE] # type: ignore
+
+  def test_plans_are_rebuilt_when_a_system_is_registered(self, mocker: MockerFixture) -> None:
+    root_system = create_integer_hierarchy([1, 2])
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+    assert root_system.byproducts_store.byproducts['integers'] == [1, 2]
+    root_system.clear_byproducts()
+
+    root_system.register_system(IntegerSystem('late_subsystem', 3))
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+    assert root_system.byproducts_store.byproducts['integers'] == [1, 2, 3]
+
+  def test_plans_are_rebuilt_when_a_subsystem_is_set_directly(self, mocker: MockerFixture) -> None:
+    root_system = create_integer_hierarchy([1, 2])
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+    root_system.clear_byproducts()
+
+    root_system.subsystems.late_subsystem = IntegerSystem('late_subsystem', 3)
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+    assert root_system.byproducts_store.byproducts['integers'] == [1, 2, 3]
+    root_system.clear_byproducts()
+
+    del root_system.subsystems.late_subsystem
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+    assert root_system.byproducts_store.byproducts['integers'] == [1, 2]
+
+  def test_other_hierarchies_keep_their_plans(self, mocker: MockerFixture) -> None:
+    root_system = create_integer_hierarchy([1, 2])
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+    plans = root_system._plans
+
+    other_system = create_integer_hierarchy([3])
+    other_system.register_system(IntegerSystem('late_subsystem', 4))
+    other_system.subsystems.subsystem_3.register_system(IntegerSystem('nested_subsystem', 5))
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+    assert root_system._plans is plans
+
+    root_system.subsystems.subsystem_1.subsystems.subsystem_2.register_system(IntegerSystem('leaf', 6))
+    assert root_system._plans is None
+
+  def test_hooks_replaced_on_a_system_are_called_after_invalidating(self, mocker: MockerFixture) -> None:
+    root_system = create_integer_hierarchy([1, 2])
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+    root_system.clear_byproducts()
+
+    child = root_system.subsystems.subsystem_1
+    after_hook = mocker.spy(child, '_after_subsystems_processed_pre_state_change')
+    child._before_subsystems_processed_pre_state_change = mocker.Mock()
+    invalidate_execution_plans(child)
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+
+    after_hook.assert_called_once()
+    child._before_subsystems_processed_pre_state_change.assert_called_once()
+    assert root_system.byproducts_store.byproducts['integers'] == [2]
+
+  def test_systems_that_orchestrate_themselves_are_processed_whole(self, mocker: MockerFixture) -> None:
+    root_system = DefaultAgentSystem('root-system')
+    mocked_subsystem = create_mock_system('mocked_subsystem', mocker)
+    root_system.register_system(IntegerSystem('subsystem_a', 1))
+    root_system.register_system(mocked_subsystem)
+
+    plan = compile_execution_plan(root_system, AgentLifeCyclePhase.PRE_STATE_CHANGE)
+    assert PlanAction.PROCESS in [step.action for step in plan] # type: ignore
+    assert compile_execution_plan(mocked_subsystem, AgentLifeCyclePhase.PRE_STATE_CHANGE) is None
+
+    root_system.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, [])
+    mocked_subsystem._before_subsystems_processed.assert_called_once()
+    mocked_subsystem._collect_byproducts_from_subsystems.assert_called_once()
+    assert root_system.byproducts_store.byproducts['integers'] == [1]
@@ -2,7 +2,8 @@ import pytest
 from pytest_mock import MockerFixture
 from agents_playground.agents.default.default_agent_system import DefaultAgentSystem, SystemWithByproducts
 from agents_playground.agents.spec.byproduct_definition import ByproductDefinition
-from agents_playground.agents.spec.byproduct_store import ByproductRegistrationError, ByproductStore
+from agents_playground.agents.spec.agent_life_cycle_phase import AgentLifeCyclePhase
+from agents_playground.agents.spec.byproduct_store import ByproductChannel, ByproductRegistrationError, ByproductStore
 
 
 class FakeByproduct:
@@ -43,4 +44,143 @@ class TestByproductStore:
     system = DefaultAgentSystem('the-system')
 
     with pytest.raises(ByproductRegistrationError):
-      subsystem = SystemWithByproducts('the-subsystem', byproducts_to_register)
\ No newline at end of file
+      subsystem = SystemWithByproducts('the-subsystem', byproducts_to_register)
+
+  def test_capacity_is_declared_by_the_definition(self) -> None:
+    store = ByproductStore()
+    store.register_system_byproducts('system', [ByproductDefinition('a', int, capacity = 4), ByproductDefinition('b', int)])
+    store.register_system_byproducts('other-system', [ByproductDefinition('a', int, capacity = 16)])
+
+    assert store.byproducts['a'].capacity == 16
+    assert store.byproducts['b'].capacity == 64
+
+  def test_snapshot_and_restore(self) -> None:
+    store = ByproductStore()
+    store.register_system_byproducts('system', [ByproductDefinition('a', int)])
+    store.store('system', 'a', 1)
+    store.store('system', 'a', 2)
+
+    other = ByproductStore()
+    other.register_system_byproducts('system', [ByproductDefinition('a', int)])
+    other.store('system', 'a', 7)
+    other.restore(store.snapshot())
+
+    assert store.snapshot() == {'a': [1, 2]}
+    assert other.byproducts['a'] == [1, 2]
+
+class TestByproductChannel:
+  def test_overflow_overwrites_the_oldest_entries(self) -> None:
+    channel = ByproductChannel(capacity = 3)
+    channel.extend([1, 2, 3, 4, 5])
+
+    assert channel == [3, 4, 5]
+    assert len(channel) == 3
+    assert channel.overflowed == 2
+
+  def test_linked_entries_are_not_copied(self) -> None:
+    child, parent = ByproductChannel(capacity = 4), ByproductChannel(capacity = 4)
+    value = object()
+    child.append(value)
+    parent.append('own')
+    parent.link(child)
+
+    assert child.is_empty
+    assert parent == ['own', value]
+    assert parent[1] is value
+    assert child._values.count(value) == 1 and value not in parent._values
+
+  def test_linked_entries_survive_the_child_being_reused(self) -> None:
+    child, parent = ByproductChannel(capacity = 4), ByproductChannel(capacity = 8)
+    child.extend([1, 2])
+    parent.link(child)
+    child.clear()
+    child.extend([3, 4])
+    parent.link(child)
+
+    assert parent == [1, 2, 3, 4]
+    assert child.overflowed == 0
+
+  def test_linked_entries_are_not_overwritten(self) -> None:
+    child, parent = ByproductChannel(capacity = 2), ByproductChannel()
+    child.extend([1, 2])
+    parent.link(child)
+    child.append(3)
+
+    assert child.overflowed == 0
+    assert child.capacity == 4
+    assert parent == [1, 2]
+    assert child == [3]
+
+  def test_entries_a_parent_no_longer_links_to_are_overwritten(self) -> None:
+    child, parent = ByproductChannel(capacity = 2), ByproductChannel()
+    child.extend([1, 2])
+    parent.link(child, consume = False)
+    parent.clear()
+    child.extend([3, 4])
+
+    assert child.capacity == 2
+    assert child.overflowed == 2
+    assert child == [3, 4]
+
+  def test_entries_linked_by_more_than_one_parent_are_kept_for_each(self) -> None:
+    c0, c1, c2, c3 = [ByproductChannel() for _ in range(4)]
+    c3.append('v1')
+    c2.link(c3, consume = False)
+    c1.link(c2, consume = False)
+    c0.link(c1)
+    c1.link(c2)
+    c1.clear()
+
+    assert c0 == ['v1']
+    assert c1 == [] and c2 == [] and c3 == ['v1']
+
+  def test_entries_are_indexed_through_links(self) -> None:
+    grandchild, child, parent = ByproductChannel(), ByproductChannel(), ByproductChannel()
+    grandchild.extend([2, 3])
+    child.append(1)
+    child.link(grandchild)
+    child.append(4)
+    parent.link(child)
+    parent.append(5)
+
+    assert len(parent) == 5
+    assert [parent[index] for index in range(-5, 5)] == [1, 2, 3, 4, 5] * 2
+    assert parent[1:3] == [2, 3]
+    with pytest.raises(IndexError):
+      parent[5]
+
+  def test_clearing_the_parent_releases_the_child(self) -> None:
+    grandchild, child, parent = ByproductChannel(capacity = 2), ByproductChannel(capacity = 2), ByproductChannel()
+    for frame in range(5):
+      grandchild.extend([frame, frame])
+      child.link(grandchild)
+      parent.link(child)
+      assert parent == [frame, frame]
+      parent.clear()
+
+    assert grandchild.overflowed == 0
+    assert child.overflowed == 0
+
+  def test_pushing_keeps_the_entries_in_the_child(self) -> None:
+    child, parent = ByproductChannel(), ByproductChannel()
+    child.append(1)
+    parent.link(child, consume = False)
+
+    assert child == [1]
+    assert parent == [1]
+
+  def test_empty_subsystems_are_not_collected(self, mocker: MockerFixture) -> None:
+    root = DefaultAgentSystem('root')
+    system = root
+    for depth in range(10):
+      subsystem = SystemWithByproducts(f'system_{depth}', [ByproductDefinition('a', int)])
+      subsystem.clear_byproducts = mocker.Mock()
+      system.register_system(subsystem)
+      system = subsystem
+
+    root.process(mocker.Mock(), AgentLifeCyclePhase.PRE_STATE_CHANGE, {})
+
+    system = root
+    for depth in range(10):
+      system = getattr(system.subsystems, f'system_{depth}')
+      system.clear_byproducts.assert_not_called()
@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agents_playground.containers.attribute_index import AttributeIndex, AttributeIndexError
+
+class TestAttributeIndex:
+  def test_finding_items(self) -> None:
+    index = AttributeIndex(['kind', 'tags'])
+    index.add('a', SimpleNamespace(name = 'a', kind = 'school', tags = ['red'], size = 2))
+    index.add('b', SimpleNamespace(name = 'b', kind = 'park', tags = ['red', 'big'], size = 3))
+    index.add('c', SimpleNamespace(name = 'c', kind = 'park', size = 2))
+    names = lambda items: [item.name for item in items]
+
+    assert names(index.find(kind = 'park')) == ['b', 'c']
+    assert names(index.find(tags = 'red')) == ['a', 'b']
+    assert names(index.find(kind = 'park', tags = 'red')) == ['b']
+    assert names(index.find(kind = 'park', size = 2)) == ['c']
+    assert names(index.find(size = 2)) == ['a', 'c']
+    assert index.find(kind = 'mall') == []
+
+  def test_items_can_be_removed_and_replaced(self) -> None:
+    index = AttributeIndex(['kind'])
+    index.add(1, SimpleNamespace(kind = 'school'))
+    index.add(2, SimpleNamespace(kind = 'school'))
+    index.remove(1)
+    index.remove(7)
+    assert len(index.find(kind = 'school')) == 1
+    index.add(2, SimpleNamespace(kind = 'park'))
+    assert index.find(kind = 'school') == []
+    assert len(index) == 1
+
+  def test_fields_added_later_index_existing_items(self) -> None:
+    index = AttributeIndex()
+    index.add(1, SimpleNamespace(district = 'north'))
+    index.add_field('district')
+    assert index.fields == {'district'}
+    assert len(index.find(district = 'north')) == 1
+
+  def test_unhashable_values(self) -> None:
+    index = AttributeIndex(['shape'])
+    with pytest.raises(AttributeIndexError):
+      index.add(1, SimpleNamespace(shape = {'w': 1}))
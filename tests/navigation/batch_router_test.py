@@ -0,0 +1,51 @@
+import random
+from concurrent.futures import wait
+
+import pytest
+
+from agents_playground.navigation.batch_router import BatchRouter, routes_ready
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigator import NavigationResultStatus, Navigator
+from agents_playground.spatial.types import Coordinate
+
+class TestBatchRouter:
+  def test_batches_match_the_navigator(self) -> None:
+    mesh = generate_grid_mesh(10, 10, max_gap = 3, closed_ratio = 0.2, one_way_ratio = 0.2, seed = 8)
+    junctions = [junction.location for junction in mesh.junctions()]
+    rng = random.Random(8)
+    requests = [(rng.choice(junctions), rng.choice(junctions)) for _ in range(50)]
+    navigator = Navigator(cache_size = 0)
+
+    with BatchRouter(max_workers = 2, chunk_size = 8) as router:
+      futures = router.find_routes(requests, mesh)
+      wait(futures, timeout = 30)
+      assert routes_ready(futures)
+      for (start, end), future in zip(requests, futures):
+        assert future.result() == navigator.find_route(start, end, mesh)
+
+  def test_the_workers_follow_mesh_changes(self) -> None:
+    mesh = generate_grid_mesh(3, 1, seed = 1)
+    start = mesh.get_junction_by_toml_id('j-0-0').location
+    end = mesh.get_junction_by_toml_id('j-2-0').location
+    with BatchRouter(max_workers = 1) as router:
+      first, = router.find_routes([(start, end)], mesh)
+      assert first.result(timeout = 30)[0] == NavigationResultStatus.SUCCESS
+      executor = router._executor
+      mesh.close_junction('j-1-0')
+      second, = router.find_routes([(start, end)], mesh)
+      assert second.result(timeout = 30) == (NavigationResultStatus.FAILURE, None)
+      mesh.open_junction('j-1-0')
+      third, = router.find_routes([(start, end)], mesh)
+      assert third.result(timeout = 30) == first.result()
+      # Cost changes are sent to the running workers.
+      assert router._executor is executor
+
+  def test_requests_off_the_mesh(self) -> None:
+    mesh = generate_grid_mesh(3, 3, seed = 1)
+    location = mesh.get_junction_by_toml_id('j-0-0').location
+    router = BatchRouter(max_workers = 1)
+    missing_end, = router.find_routes([(location, Coordinate(-5, -5))], mesh)
+    assert missing_end.result() == (NavigationResultStatus.FAILURE, None)
+    with pytest.raises(Exception):
+      router.find_routes([(Coordinate(-5, -5), location)], mesh)
+    router.shutdown()
@@ -0,0 +1,111 @@
+import random
+from collections import Counter
+from types import SimpleNamespace
+from typing import Dict, List
+
+from agents_playground.navigation.cooperative_planner import CooperativePlan, CooperativePlanner, ReservationTable
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.spatial.types import Coordinate
+
+def line_mesh(length: int) -> NavigationMesh:
+  mesh = NavigationMesh()
+  for index in range(length):
+    neighbors = [f'j-{other}' for other in (index - 1, index + 1) if 0 <= other < length]
+    mesh.add_junction(SimpleNamespace(toml_id = f'j-{index}', location = Coordinate(index, 0), connects_to = neighbors))
+  return mesh
+
+def assert_no_conflicts(plans: Dict[int, CooperativePlan], goals: Dict[int, Coordinate]) -> None:
+  occupied: Counter = Counter()
+  moves = set()
+  for agent_id, plan in plans.items():
+    for (location, frame), (next_location, next_frame) in zip(plan.steps, plan.steps[1:]):
+      assert next_frame > frame
+      if location != next_location:
+        assert location.find_distance(next_location) == next_frame - frame
+        moves.add((location, next_location, frame))
+    for location, frame in plan.steps:
+      if location != goals[agent_id]:
+        occupied[(location, frame)] += 1
+  assert all(count == 1 for count in occupied.values())
+  assert not any((end, start, frame) in moves for start, end, frame in moves)
+
+class TestCooperativePlanner:
+  def test_agents_pass_each_other_without_colliding(self) -> None:
+    mesh = line_mesh(5)
+    mesh.get_junction_by_toml_id('j-2').connects_to.append('side')
+    mesh.add_junction(SimpleNamespace(toml_id = 'side', location = Coordinate(2, 1), connects_to = ['j-2']))
+    planner = CooperativePlanner(window = 10)
+    goals = {1: Coordinate(4, 0), 2: Coordinate(0, 0)}
+    plans = {
+      1: planner.plan(1, Coordinate(0, 0), goals[1], mesh, frame = 0),
+      2: planner.plan(2, Coordinate(4, 0), goals[2], mesh, frame = 0)
+    }
+    assert_no_conflicts(plans, goals)
+    assert plans[1].delay == 0
+    assert plans[2].delay > 0
+    assert planner.stats().blocked_moves > 0
+
+  def test_many_agents_share_a_mesh(self) -> None:
+    mesh = generate_grid_mesh(12, 12, closed_ratio = 0.1, seed = 3)
+    junctions = list(mesh.junctions())
+    rng = random.Random(3)
+    destinations = [junction.location for junction in rng.sample(junctions, 4)]
+    starts = rng.sample([junction.location for junction in junctions if junction.location not in destinations], 60)
+    planner = CooperativePlanner(window = 12)
+    plans: Dict[int, CooperativePlan] = {}
+    goals: Dict[int, Coordinate] = {}
+    for agent_id, start in enumerate(starts):
+      goals[agent_id] = rng.choice(destinations)
+      plan = planner.plan(agent_id, start, goals[agent_id], mesh, frame = 0)
+      if plan is not None:
+        assert plan.route[0] == start
+        assert plan.route[-1] == goals[agent_id]
+        plans[agent_id] = plan
+
+    # Agents that were boxed in by earlier plans fall back to traveling alone.
+    cooperative = {agent_id: plan for agent_id, plan in plans.items() if plan.cooperative}
+    assert_no_conflicts(cooperative, goals)
+    stats = planner.stats()
+    assert stats.plans == len(plans)
+    assert stats.waits == sum(plan.waits for plan in plans.values())
+    assert stats.uncooperative == len(plans) - len(cooperative) <= len(plans) // 10
+
+  def test_replanning_releases_the_previous_plan(self) -> None:
+    mesh = line_mesh(4)
+    planner = CooperativePlanner(window = 4)
+    planner.plan('a', Coordinate(0, 0), Coordinate(3, 0), mesh, frame = 0)
+    reserved = len(planner.reservations)
+    planner.plan('a', Coordinate(1, 0), Coordinate(3, 0), mesh, frame = 1)
+    assert 0 < len(planner.reservations) < reserved
+
+    planner.reservations.release_before(10)
+    assert len(planner.reservations) == 0
+
+  def test_plans_are_bounded(self) -> None:
+    mesh = generate_grid_mesh(20, 20, seed = 1)
+    planner = CooperativePlanner(window = 30, max_expansions = 10)
+    plan = planner.plan(0, Coordinate(1, 1), Coordinate(20, 20), mesh, frame = 0)
+    assert plan is not None
+    assert not plan.cooperative
+    assert planner.nodes_expanded == 11
+    assert plan.route[-1] == Coordinate(20, 20)
+    assert planner.stats().uncooperative == 1
+
+  def test_unreachable_goals(self) -> None:
+    mesh = line_mesh(3)
+    mesh.close_junction('j-1')
+    assert CooperativePlanner().plan(0, Coordinate(0, 0), Coordinate(2, 0), mesh, frame = 0) is None
+
+class TestReservationTable:
+  def test_agents_can_use_their_own_slots(self) -> None:
+    table = ReservationTable()
+    table.reserve_junction('a', 1, 5)
+    table.reserve_connection('a', 1, 2, 5)
+    assert table.junction_is_free(1, 5, 'a')
+    assert not table.junction_is_free(1, 5, 'b')
+    assert table.junction_is_free(1, 6, 'b')
+    assert not table.connection_is_free(2, 1, 5, 'b')
+    assert table.connection_is_free(1, 2, 5, 'b')
+    table.release('a')
+    assert len(table) == 0
@@ -0,0 +1,146 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from agents_playground.navigation.d_star_lite import DStarLitePlanner
+from agents_playground.navigation.heuristics import route_costs
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigation_graph import NavigationGraph
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.navigation.navigator import NavigationResultStatus, Navigator
+from agents_playground.spatial.types import Coordinate
+
+def cheapest_cost(mesh: NavigationMesh, start: Coordinate, end: Coordinate) -> float:
+  graph = mesh.graph()
+  return route_costs(graph.offsets, graph.targets, graph.weights, graph.node_at(start))[graph.node_at(end)]
+
+def planned_cost(mesh: NavigationMesh, route) -> float:
+  graph = mesh.graph()
+  nodes = [graph.node_at(location) for location in route]
+  return sum(dict(graph.neighbors(a))[b] for a, b in zip(nodes, nodes[1:]))
+
+class TestDynamicNavigationMesh:
+  def test_closed_junctions_are_avoided(self) -> None:
+    mesh = generate_grid_mesh(3, 1, seed = 1)
+    start = mesh.get_junction_by_toml_id('j-0-0').location
+    end = mesh.get_junction_by_toml_id('j-2-0').location
+    version = mesh.version
+
+    mesh.close_junction('j-1-0')
+    assert mesh.version != version
+    assert mesh.is_junction_closed('j-1-0')
+    assert Navigator().find_route(start, end, mesh)[0] == NavigationResultStatus.FAILURE
+
+    mesh.open_junction('j-1-0')
+    assert Navigator().find_route(start, end, mesh)[0] == NavigationResultStatus.SUCCESS
+    assert mesh.cost_changes_since(version) == ['j-1-0', 'j-1-0']
+
+  def test_reweighting_connections(self) -> None:
+    mesh = generate_grid_mesh(2, 2, seed = 1)
+    mesh.reweight_connection('j-0-0', 'j-1-0', 10)
+    graph = mesh.graph()
+    assert dict(graph.neighbors(graph.node_by_toml_id('j-0-0')))[graph.node_by_toml_id('j-1-0')] == 10
+
+    mesh.reweight_connection('j-0-0', 'j-1-0', None)
+    graph = mesh.graph()
+    assert dict(graph.neighbors(graph.node_by_toml_id('j-0-0')))[graph.node_by_toml_id('j-1-0')] == 1
+
+    with pytest.raises(Exception):
+      mesh.reweight_connection('j-0-0', 'j-1-0', 0.5)
+    with pytest.raises(Exception):
+      mesh.reweight_connection('j-0-0', 'j-1-1', 5)
+
+  def test_updated_graphs_match_compiled_graphs(self) -> None:
+    mesh = generate_grid_mesh(8, 8, max_gap = 2, one_way_ratio = 0.3, seed = 4)
+    mesh.graph()
+    mesh.close_junction('j-3-3')
+    mesh.reweight_connection('j-0-0', mesh.get_junction_by_toml_id('j-0-0').connects_to[0], 7)
+    mesh.close_junction('j-5-1')
+    mesh.open_junction('j-3-3')
+    updated = mesh.graph()
+    compiled = NavigationGraph(mesh.junctions(), closed = {'j-5-1'}, costs = mesh._connection_costs)
+    assert updated.weights == compiled.weights
+    assert updated.reverse() == compiled.reverse()
+    assert updated.fingerprint() == compiled.fingerprint()
+
+  def test_adding_junctions_resets_the_cost_history(self) -> None:
+    mesh = generate_grid_mesh(2, 2, seed = 1)
+    version = mesh.version
+    mesh.close_junction('j-1-1')
+    mesh.add_junction(SimpleNamespace(toml_id = 'island', location = Coordinate(9, 9), connects_to = []))
+    assert mesh.cost_changes_since(version) is None
+    assert mesh.cost_changes_since(mesh.version) == []
+
+class TestDStarLitePlanner:
+  @pytest.mark.parametrize('seed', [1, 2, 3])
+  def test_repaired_routes_match_new_searches(self, seed: int) -> None:
+    mesh = generate_grid_mesh(12, 12, max_gap = 3, closed_ratio = 0.1, one_way_ratio = 0.2, seed = seed)
+    junctions = list(mesh.junctions())
+    rng = random.Random(seed)
+    start, goal = rng.sample(junctions, 2)
+    planner = DStarLitePlanner(mesh, start.location, goal.location)
+    location = start.location
+
+    for step in range(30):
+      route = planner.route()
+      expected = cheapest_cost(mesh, location, goal.location)
+      if route is None:
+        assert expected == float('inf')
+        mesh.open_junction(rng.choice(junctions).toml_id)
+        continue
+      assert route[0] == location
+      assert route[-1] == goal.location
+      assert planned_cost(mesh, route) == expected
+
+      # Take a step, then change the mesh ahead of the agent.
+      if len(route) > 1:
+        location = route[1]
+        planner.move_to(location)
+      changed = rng.choice(junctions)
+      if step % 3 == 0 and changed.location not in (location, goal.location):
+        mesh.close_junction(changed.toml_id)
+      elif len(changed.connects_to) > 0:
+        to_toml_id = rng.choice(changed.connects_to)
+        distance = changed.location.find_distance(mesh.get_junction_by_toml_id(to_toml_id).location)
+        mesh.reweight_connection(changed.toml_id, to_toml_id, distance * rng.choice([1, 3, 10]))
+
+  def test_repairs_expand_fewer_nodes_than_planning_again(self) -> None:
+    mesh = generate_grid_mesh(30, 30, seed = 5)
+    start = mesh.get_junction_by_toml_id('j-0-0').location
+    goal = mesh.get_junction_by_toml_id('j-29-29').location
+    planner = DStarLitePlanner(mesh, start, goal)
+    route = planner.route()
+    first_plan = planner.nodes_expanded
+
+    # Block the route just ahead of the agent.
+    mesh.close_junction(mesh.get_junction_by_location(route[2]).toml_id)
+    repaired = planner.route()
+    assert repaired is not None
+    assert route[2] not in repaired
+    assert planned_cost(mesh, repaired) == cheapest_cost(mesh, start, goal)
+    assert planner.nodes_expanded < first_plan
+
+  def test_adding_junctions_plans_from_scratch(self) -> None:
+    mesh = generate_grid_mesh(3, 3, seed = 1)
+    start = mesh.get_junction_by_toml_id('j-0-0')
+    goal = mesh.get_junction_by_toml_id('j-2-2')
+    planner = DStarLitePlanner(mesh, start.location, goal.location)
+    assert len(planner.route()) == 5
+
+    mesh.add_junction(SimpleNamespace(toml_id = 'shortcut', location = Coordinate(5, 5), connects_to = [goal.toml_id]))
+    start.connects_to.append('shortcut')
+    mesh.close_junction('j-1-0')
+    assert planned_cost(mesh, planner.route()) == cheapest_cost(mesh, start.location, goal.location)
+
+  def test_unreachable_goals(self) -> None:
+    mesh = generate_grid_mesh(3, 1, seed = 1)
+    planner = DStarLitePlanner(
+      mesh, 
+      mesh.get_junction_by_toml_id('j-0-0').location, 
+      mesh.get_junction_by_toml_id('j-2-0').location
+    )
+    mesh.close_junction('j-1-0')
+    assert planner.route() is None
+    mesh.open_junction('j-1-0')
+    assert len(planner.route()) == 3
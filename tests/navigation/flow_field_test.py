@@ -0,0 +1,57 @@
+import random
+from types import SimpleNamespace
+
+from agents_playground.navigation.flow_field import NO_ROUTE, FlowFieldNavigator, FlowFieldService
+from agents_playground.navigation.heuristics import route_costs
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigator import NavigationResultStatus, Navigator
+from agents_playground.spatial.types import Coordinate
+
+class TestFlowField:
+  def test_next_hops_follow_cheapest_routes(self) -> None:
+    mesh = generate_grid_mesh(12, 12, max_gap = 4, closed_ratio = 0.25, one_way_ratio = 0.3, seed = 6)
+    graph = mesh.graph()
+    destination = 17
+    field = FlowFieldService().field_for(mesh, graph.locations[destination])
+
+    for start in range(len(graph)):
+      costs = route_costs(graph.offsets, graph.targets, graph.weights, start)
+      assert field.costs[start] == costs[destination]
+      route = field.route_from(start)
+      if costs[destination] == float('inf'):
+        assert field.next_hop(start) == NO_ROUTE
+        assert route is None
+      else:
+        assert route is not None
+        assert sum(graph.distance(a, b) for a, b in zip(route, route[1:])) == costs[destination]
+
+  def test_fields_are_shared_per_destination(self) -> None:
+    mesh = generate_grid_mesh(10, 10, max_gap = 2, closed_ratio = 0.1, seed = 2)
+    junctions = list(mesh.junctions())
+    destinations = [junction.location for junction in junctions[:3]]
+    navigator = FlowFieldNavigator()
+    a_star = Navigator(cache_size = 0)
+    rng = random.Random(2)
+
+    for agent in range(120):
+      start = rng.choice(junctions).location
+      end = rng.choice(destinations)
+      status, route = navigator.find_route(start, end, mesh)
+      expected_status, expected_route = a_star.find_route(start, end, mesh)
+      assert status == expected_status
+      if status == NavigationResultStatus.SUCCESS:
+        cost = lambda route: sum(a.find_distance(b) for a, b in zip(route, route[1:]))
+        assert cost(route) == cost(expected_route)
+
+    assert navigator.service.misses == 3
+    assert navigator.service.hits == 117
+
+  def test_fields_are_rebuilt_after_the_mesh_changes(self) -> None:
+    mesh = generate_grid_mesh(3, 3, seed = 1)
+    service = FlowFieldService()
+    destination = mesh.get_junction_by_toml_id('j-2-2').location
+    assert service.next_hop(mesh, destination, destination) == destination
+
+    mesh.add_junction(SimpleNamespace(toml_id = 'island', location = Coordinate(50, 50), connects_to = []))
+    assert service.next_hop(mesh, Coordinate(50, 50), destination) is None
+    assert service.misses == 2
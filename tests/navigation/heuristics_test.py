@@ -0,0 +1,43 @@
+import random
+
+from agents_playground.navigation.heuristics import LandmarkHeuristic, ManhattanHeuristic, route_costs
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigator import Navigator
+
+class TestLandmarkHeuristic:
+  def test_estimates_never_exceed_the_route_cost(self) -> None:
+    mesh = generate_grid_mesh(15, 15, max_gap = 4, closed_ratio = 0.3, one_way_ratio = 0.3, seed = 8)
+    graph = mesh.graph()
+    landmarks = LandmarkHeuristic(landmark_count = 4)
+    landmarks.prepare(graph)
+    assert len(landmarks.landmarks) == 4
+    assert len(set(landmarks.landmarks)) == 4
+
+    rng = random.Random(8)
+    for start in rng.sample(range(len(graph)), 20):
+      costs = route_costs(graph.offsets, graph.targets, graph.weights, start)
+      for end in range(len(graph)):
+        estimate = landmarks.estimate(graph, start, end)
+        assert estimate <= costs[end]
+        assert estimate >= ManhattanHeuristic().estimate(graph, start, end)
+
+  def test_fewer_nodes_are_expanded(self) -> None:
+    mesh = generate_grid_mesh(30, 30, max_gap = 2, closed_ratio = 0.35, seed = 3)
+    graph = mesh.graph()
+    manhattan = Navigator(cache_size = 0)
+    alt = Navigator(cache_size = 0, heuristic = LandmarkHeuristic(landmark_count = 8))
+
+    rng = random.Random(3)
+    manhattan_expanded = alt_expanded = 0
+    for _ in range(50):
+      start, end = rng.randrange(len(graph)), rng.randrange(len(graph))
+      expected = manhattan.find_node_route(graph, start, end)
+      route = alt.find_node_route(graph, start, end)
+      assert (expected is None) == (route is None)
+      if route is not None:
+        cost = lambda nodes: sum(graph.distance(a, b) for a, b in zip(nodes, nodes[1:]))
+        assert cost(route) == cost(expected)
+      manhattan_expanded += manhattan.nodes_expanded
+      alt_expanded += alt.nodes_expanded
+
+    assert alt_expanded < manhattan_expanded
@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from agents_playground.navigation.hierarchical_navigator import HierarchicalNavigator
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.navigation.navigator import NavigationResultStatus, Navigator
+
+def route_cost(mesh: NavigationMesh, route) -> float:
+  """Walks the route, verifying every step follows a connection in the mesh."""
+  cost: float = 0
+  for current, next in zip(route, route[1:]):
+    junction = mesh.get_junction_by_location(current)
+    assert mesh.get_junction_by_location(next).toml_id in junction.connects_to
+    cost += current.find_distance(next)
+  return cost
+
+class TestHierarchicalNavigator:
+  @pytest.mark.parametrize('seed', [1, 2, 3])
+  def test_routes_match_flat_a_star(self, seed: int) -> None:
+    mesh = generate_grid_mesh(20, 20, max_gap = 3, closed_ratio = 0.25, one_way_ratio = 0.3, seed = seed)
+    junctions = list(mesh.junctions())
+    rng = random.Random(seed)
+    a_star = Navigator(cache_size = 0)
+    hierarchical = HierarchicalNavigator(region_size = 8, cache_size = 0)
+
+    for _ in range(100):
+      start, end = rng.choice(junctions), rng.choice(junctions)
+      expected_status, expected_route = a_star.find_route(start.location, end.location, mesh)
+      status, route = hierarchical.find_route(start.location, end.location, mesh)
+      assert status == expected_status
+      if status == NavigationResultStatus.SUCCESS:
+        assert route[0] == start.location and route[-1] == end.location # type: ignore
+        assert route_cost(mesh, route) == route_cost(mesh, expected_route)
+
+  def test_the_abstract_graph_is_smaller(self) -> None:
+    mesh = generate_grid_mesh(32, 32, seed = 5)
+    navigator = HierarchicalNavigator(region_size = 8)
+    hierarchy = navigator.hierarchy_for(mesh.graph())
+    # Junctions are at x, y in [1, 32], so the regions are [0, 8), [8, 16), ... [32, 40).
+    assert hierarchy.region_count == 25
+    assert len(hierarchy.edges) < len(mesh.graph()) / 2
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.spatial.types import Coordinate
+
+class TestNavigationMeshJunctionIndex:
+  def test_nearest_junction(self) -> None:
+    mesh = generate_grid_mesh(5, 5, seed = 1)
+    assert mesh.nearest_junction(Coordinate(2.2, 3.1)).toml_id == 'j-1-2'
+    assert mesh.nearest_junction(Coordinate(-40, -40)).toml_id == 'j-0-0'
+
+    mesh.close_junction('j-1-2')
+    assert mesh.nearest_junction(Coordinate(2.2, 3.1)).toml_id == 'j-1-2'
+    assert mesh.nearest_junction(Coordinate(2.2, 3.1), include_closed = False).toml_id == 'j-2-2'
+
+  def test_junctions_within(self) -> None:
+    mesh = generate_grid_mesh(5, 5, seed = 1)
+    found = mesh.junctions_within(Coordinate(3, 3), 1)
+    assert [junction.toml_id for junction in found][0] == 'j-2-2'
+    assert {junction.toml_id for junction in found} == {'j-2-2', 'j-1-2', 'j-3-2', 'j-2-1', 'j-2-3'}
+
+  def test_the_index_follows_new_junctions(self) -> None:
+    mesh = generate_grid_mesh(2, 2, seed = 1)
+    assert mesh.nearest_junction(Coordinate(50, 50)).toml_id == 'j-1-1'
+    mesh.add_junction(SimpleNamespace(toml_id = 'far', location = Coordinate(40, 40), connects_to = []))
+    assert mesh.nearest_junction(Coordinate(50, 50)).toml_id == 'far'
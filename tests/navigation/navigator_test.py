@@ -0,0 +1,138 @@
+from math import inf
+import random
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigation_mesh import NavigationMesh
+from agents_playground.navigation.navigator import NavigationResultStatus, Navigator
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.types import Coordinate
+
+def brute_force_costs(mesh: NavigationMesh, start: Tag) -> Dict[Tag, float]:
+  """Dijkstra's algorithm without a heap. Scans every junction for the closest one."""
+  costs: Dict[Tag, float] = {junction.toml_id: inf for junction in mesh.junctions()}
+  costs[start] = 0
+  done = set()
+  while len(done) < len(costs):
+    current = min((id for id in costs if id not in done), key = lambda id: costs[id])
+    if costs[current] == inf:
+      break
+    done.add(current)
+    junction = mesh.get_junction_by_toml_id(current)
+    for neighbor_id in junction.connects_to:
+      neighbor = mesh.get_junction_by_toml_id(neighbor_id)
+      costs[neighbor_id] = min(costs[neighbor_id], costs[current] + junction.location.find_distance(neighbor.location))
+  return costs
+
+def route_cost(mesh: NavigationMesh, route: List[Coordinate]) -> float:
+  """Walks the route, verifying every step follows a connection in the mesh."""
+  cost: float = 0
+  for current, next in zip(route, route[1:]):
+    junction = mesh.get_junction_by_location(current)
+    assert mesh.get_junction_by_location(next).toml_id in junction.connects_to
+    cost += current.find_distance(next)
+  return cost
+
+class TestNavigator:
+  @pytest.mark.parametrize('seed', [1, 2, 3, 4])
+  def test_routes_are_optimal(self, seed: int) -> None:
+    mesh = generate_grid_mesh(12, 9, max_gap = 6, closed_ratio = 0.2, one_way_ratio = 0.3, seed = seed)
+    junctions = list(mesh.junctions())
+    rng = random.Random(seed)
+    navigator = Navigator()
+
+    for _ in range(10):
+      start = rng.choice(junctions)
+      expected_costs = brute_force_costs(mesh, start.toml_id)
+      for end in rng.sample(junctions, 10):
+        status, route = navigator.find_route(start.location, end.location, mesh)
+        if expected_costs[end.toml_id] == inf:
+          assert status == NavigationResultStatus.FAILURE
+          assert route is None
+        else:
+          assert status == NavigationResultStatus.SUCCESS
+          assert route is not None
+          assert route[0] == start.location
+          assert route[-1] == end.location
+          assert route_cost(mesh, route) == expected_costs[end.toml_id]
+
+  def test_route_to_the_start(self) -> None:
+    mesh = generate_grid_mesh(3, 3, seed = 1)
+    location = mesh.get_junction_by_toml_id('j-1-1').location
+    assert Navigator().find_route(location, location, mesh) == (NavigationResultStatus.SUCCESS, [location])
+
+  def test_starting_off_the_mesh(self) -> None:
+    mesh = generate_grid_mesh(3, 3, seed = 1)
+    with pytest.raises(Exception):
+      Navigator().find_route(Coordinate(-10, -10), mesh.get_junction_by_toml_id('j-1-1').location, mesh)
+
+  def test_failing_does_not_write_files(self, tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    mesh = NavigationMesh()
+    mesh.add_junction(SimpleNamespace(toml_id = 'a', location = Coordinate(0, 0), connects_to = []))
+    mesh.add_junction(SimpleNamespace(toml_id = 'b', location = Coordinate(1, 0), connects_to = ['a']))
+
+    status, route = Navigator().find_route(Coordinate(0, 0), Coordinate(1, 0), mesh)
+    assert status == NavigationResultStatus.FAILURE
+    assert route is None
+    assert list(tmp_path.iterdir()) == []
+
+  def test_the_compiled_mesh_is_rebuilt_after_changes(self) -> None:
+    mesh = NavigationMesh()
+    mesh.add_junction(SimpleNamespace(toml_id = 'a', location = Coordinate(0, 0), connects_to = []))
+    assert Navigator().find_route(Coordinate(0, 0), Coordinate(1, 0), mesh)[0] == NavigationResultStatus.FAILURE
+
+    mesh.get_junction_by_toml_id('a').connects_to.append('b')
+    mesh.add_junction(SimpleNamespace(toml_id = 'b', location = Coordinate(1, 0), connects_to = []))
+    assert Navigator().find_route(Coordinate(0, 0), Coordinate(1, 0), mesh)[0] == NavigationResultStatus.SUCCESS
+
+class TestNavigatorRouteCache:
+  def test_repeated_routes_are_cached(self) -> None:
+    mesh = generate_grid_mesh(10, 10, max_gap = 3, closed_ratio = 0.1, seed = 7)
+    junctions = list(mesh.junctions())
+    destinations = junctions[:5]
+    rng = random.Random(7)
+    starts = rng.sample(junctions, 20)
+    navigator = Navigator(cache_size = 256)
+
+    for _ in range(10):
+      for start in starts:
+        end = rng.choice(destinations)
+        navigator.find_route(start.location, end.location, mesh)
+
+    assert navigator.route_cache.misses <= len(starts) * len(destinations)
+    assert navigator.route_cache.hits + navigator.route_cache.misses == 200
+    assert navigator.route_cache.hit_rate() >= 0.5
+
+  def test_cached_routes_match_uncached_routes(self) -> None:
+    mesh = generate_grid_mesh(6, 6, max_gap = 4, seed = 3)
+    start = mesh.get_junction_by_toml_id('j-0-0').location
+    end = mesh.get_junction_by_toml_id('j-5-5').location
+    navigator = Navigator()
+    first = navigator.find_route(start, end, mesh)
+    second = navigator.find_route(start, end, mesh)
+    assert first == second == Navigator(cache_size = 0).find_route(start, end, mesh)
+    assert navigator.route_cache.hits == 1
+
+  def test_changing_the_mesh_invalidates_routes(self) -> None:
+    mesh = NavigationMesh()
+    mesh.add_junction(SimpleNamespace(toml_id = 'a', location = Coordinate(0, 0), connects_to = ['c']))
+    mesh.add_junction(SimpleNamespace(toml_id = 'c', location = Coordinate(5, 5), connects_to = []))
+    navigator = Navigator()
+    assert navigator.find_route(Coordinate(0, 0), Coordinate(5, 5), mesh)[1] == [Coordinate(0, 0), Coordinate(5, 5)]
+
+    mesh.get_junction_by_toml_id('a').connects_to = ['b']
+    mesh.add_junction(SimpleNamespace(toml_id = 'b', location = Coordinate(0, 5), connects_to = ['c']))
+    assert navigator.find_route(Coordinate(0, 0), Coordinate(5, 5), mesh)[1] == [Coordinate(0, 0), Coordinate(0, 5), Coordinate(5, 5)]
+    assert navigator.route_cache.hits == 0
+
+  def test_the_cache_is_bounded(self) -> None:
+    mesh = generate_grid_mesh(5, 5, seed = 2)
+    junctions = list(mesh.junctions())
+    navigator = Navigator(cache_size = 4)
+    for end in junctions:
+      navigator.find_route(junctions[0].location, end.location, mesh)
+    assert len(navigator.route_cache) == 4
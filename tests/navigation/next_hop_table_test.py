@@ -0,0 +1,52 @@
+from pathlib import Path
+import random
+from types import SimpleNamespace
+
+from agents_playground.navigation.mesh_generators import generate_grid_mesh
+from agents_playground.navigation.navigator import NavigationResultStatus, Navigator
+from agents_playground.navigation.next_hop_table import NextHopNavigator, NextHopTable
+from agents_playground.spatial.types import Coordinate
+
+def route_cost(route) -> float:
+  return sum(current.find_distance(next) for current, next in zip(route, route[1:]))
+
+class TestNextHopTable:
+  def test_routes_match_a_star(self) -> None:
+    mesh = generate_grid_mesh(10, 8, max_gap = 5, closed_ratio = 0.2, one_way_ratio = 0.3, seed = 9)
+    junctions = list(mesh.junctions())
+    rng = random.Random(9)
+    a_star = Navigator(cache_size = 0)
+    next_hops = NextHopNavigator()
+
+    for _ in range(200):
+      start, end = rng.choice(junctions), rng.choice(junctions)
+      expected_status, expected_route = a_star.find_route(start.location, end.location, mesh)
+      status, route = next_hops.find_route(start.location, end.location, mesh)
+      assert status == expected_status
+      if status == NavigationResultStatus.SUCCESS:
+        assert route[0] == start.location and route[-1] == end.location # type: ignore
+        assert route_cost(route) == route_cost(expected_route)
+
+  def test_saving_and_loading(self, tmp_path: Path) -> None:
+    mesh = generate_grid_mesh(6, 6, max_gap = 3, closed_ratio = 0.2, seed = 4)
+    graph = mesh.graph()
+    built = NextHopTable.load_or_build(graph, tmp_path)
+    assert NextHopTable.path_for(graph.fingerprint(), tmp_path).exists()
+    assert built.nbytes == 36 * 36 * 4
+
+    loaded = NextHopTable.load_or_build(graph, tmp_path)
+    for start in range(len(graph)):
+      for end in range(len(graph)):
+        assert loaded.next_hop(start, end) == built.next_hop(start, end)
+    loaded.close()
+
+  def test_the_table_follows_mesh_changes(self, tmp_path: Path) -> None:
+    mesh = generate_grid_mesh(4, 4, seed = 1)
+    navigator = NextHopNavigator(table_directory = tmp_path)
+    start = mesh.get_junction_by_toml_id('j-0-0').location
+    end = mesh.get_junction_by_toml_id('j-3-3').location
+    assert navigator.find_route(start, end, mesh)[0] == NavigationResultStatus.SUCCESS
+
+    mesh.add_junction(SimpleNamespace(toml_id = 'island', location = Coordinate(100, 100), connects_to = []))
+    assert navigator.find_route(start, Coordinate(100, 100), mesh)[0] == NavigationResultStatus.FAILURE
+    assert len(list(tmp_path.iterdir())) == 2
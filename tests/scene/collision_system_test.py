@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+from pytest_mock import MockFixture
+
+from agents_playground.agents.default.default_agent import DefaultAgent
+from agents_playground.agents.default.default_agent_physicality import DefaultAgentPhysicality
+from agents_playground.agents.default.default_agent_position import DefaultAgentPosition
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.core.types import Size
+from agents_playground.scene.collision_system import CollisionSystem
+from agents_playground.scene.scene import Scene
+from agents_playground.spatial.aabbox import EmptyAABBox
+from agents_playground.spatial.contact import ContactType
+from agents_playground.spatial.direction import Direction
+from agents_playground.spatial.frustum import Frustum2d
+from agents_playground.spatial.types import Coordinate
+
+def create_agent(mocker: MockFixture, id: int, location: Coordinate, cell_size: Size) -> AgentLike:
+  agent = DefaultAgent(
+    initial_state    = mocker.Mock(),
+    style            = mocker.Mock(),
+    identity         = mocker.Mock(id = id),
+    physicality      = DefaultAgentPhysicality(size = Size(8, 8), aabb = EmptyAABBox(), frustum = Frustum2d()),
+    position         = DefaultAgentPosition(Direction.EAST, location, location, location),
+    movement         = mocker.Mock(),
+    agent_memory     = mocker.Mock(),
+    internal_systems = mocker.Mock()
+  )
+  agent.move_to(location, cell_size)
+  return agent
+
+def create_scene(mocker: MockFixture, locations: list[Coordinate]) -> Scene:
+  scene = Scene()
+  scene.cell_size = Size(10, 10)
+  scene.add_entity('buildings', SimpleNamespace(toml_id = 1, location = [0, 0], width = 2, height = 2))
+  scene.add_entity('streets', SimpleNamespace(toml_id = 2, start = [0, 5], end = [20, 5], lanes = 2))
+  scene.query.build(scene.cell_size)
+  for index, location in enumerate(locations):
+    scene.add_agent(create_agent(mocker, index, location, scene.cell_size))
+  return scene
+
+class TestCollisionSystem:
+  def test_agents_touching_agents(self, mocker: MockFixture) -> None:
+    # Agents 0 and 1 are 4 units apart but each is 8 units wide.
+    scene = create_scene(mocker, [Coordinate(10, 10), Coordinate(10.4, 10), Coordinate(15, 15)])
+    contacts = CollisionSystem().detect(scene)
+
+    assert len(contacts) == 2
+    first, second, loner = scene.agents[0], scene.agents[1], scene.agents[2]
+    assert [c.other for c in first.physicality.contacts] == [1]
+    assert [c.other for c in second.physicality.contacts] == [0]
+    assert loner.physicality.contacts == []
+    assert first.physicality.contacts[0].normal.i == -1
+    assert second.physicality.contacts[0].normal.i == 1
+    assert first.physicality.contacts[0].depth == 4
+
+  def test_only_solid_entities_are_touched(self, mocker: MockFixture) -> None:
+    # The first agent is in the building's lower right cell. The second is on the street.
+    scene = create_scene(mocker, [Coordinate(1, 1), Coordinate(8, 5)])
+    CollisionSystem(solid_entities = ['buildings']).detect(scene)
+
+    contacts = scene.agents[0].physicality.contacts
+    assert len(contacts) == 1
+    assert contacts[0].type == ContactType.Entity
+    assert contacts[0].other.toml_id == 1
+    assert scene.agents[1].physicality.contacts == []
+
+  def test_resolving_separates_agents(self, mocker: MockFixture) -> None:
+    scene = create_scene(mocker, [Coordinate(10, 10), Coordinate(10.4, 10)])
+    collisions = CollisionSystem(resolve = True)
+    collisions.process(scene)
+
+    # Each agent moves half of the 4 unit overlap, which is 0.2 cells.
+    assert scene.agents[0].position.location.x == 9.8
+    assert scene.agents[1].position.location.x == 10.6
+    assert collisions.detect(scene) == []
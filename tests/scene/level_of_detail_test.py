@@ -0,0 +1,157 @@
+from typing import Dict, List
+
+import pytest
+
+from agents_playground.agents.default.default_agent_system import SystemWithByproducts
+from agents_playground.agents.spec.agent_characteristics import AgentCharacteristics
+from agents_playground.agents.spec.agent_spec import AgentLike
+from agents_playground.agents.spec.byproduct_definition import ByproductDefinition
+from agents_playground.agents.spec.byproduct_store import Byproducts
+from agents_playground.scene.level_of_detail import LevelOfDetailError, LODPolicy, LODTier, standard_tiers
+from agents_playground.scene.scene import Scene
+from agents_playground.simulation.tag import Tag
+from agents_playground.spatial.bvh import Bounds2d
+from agents_playground.spatial.types import Coordinate
+from tests.agents.perceptive_agents import CELL_SIZE, create_agent_scene
+
+# The agents' AABBs are centered at x = 20 * cell + 10.
+CELLS = [0, 1, 4, 5, 12, 13, 30, 31]
+
+class CountingSystem(SystemWithByproducts):
+  """Records the number of neighbors the agent has every time it runs."""
+  def __init__(self, name: str) -> None:
+    super().__init__(name, [ByproductDefinition('counts', str)])
+
+  def _before_subsystems_processed_pre_state_change(
+    self,
+    characteristics: AgentCharacteristics,
+    parent_byproducts: Byproducts,
+    other_agents: Dict[Tag, AgentLike]
+  ) -> None:
+    self.byproducts_store.store(self.name, 'counts', f'{self.name}:{len(other_agents)}')
+
+def create_scene(cells: List[int] = CELLS) -> Scene:
+  return create_agent_scene(
+    locations  = [Coordinate(cell, 0) for cell in cells],
+    systems    = lambda: [CountingSystem('sensing'), CountingSystem('thinking')],
+    max_radius = 2 * CELL_SIZE.width
+  )
+
+def create_policy() -> LODPolicy:
+  return LODPolicy(standard_tiers(full = 50, reduced = 150, movement_only = 300), focus = [Bounds2d(0, 0, 0, 0)])
+
+def outcome(scene: Scene) -> List[tuple]:
+  return [
+    (
+      agent.identity.id,
+      agent.agent_state.current_action_state.name,
+      list(agent.internal_systems.byproducts_store.byproducts['counts'])
+    )
+    for agent in scene.agents.values()
+  ]
+
+def run(scene: Scene, frames: int, batched: bool = False) -> List[tuple]:
+  for _ in range(frames):
+    scene.transition_agents(batched = batched)
+    scene.tick()
+  return outcome(scene)
+
+class TestLevelOfDetail:
+  def test_agents_are_assigned_tiers_by_distance_to_the_focus(self) -> None:
+    scene = create_scene()
+    scene.lod = create_policy()
+    scene.lod.assign(scene.agents)
+
+    tiers = [scene.lod.tier_of(agent_id).name for agent_id in scene.agents]
+    assert tiers == ['full', 'full', 'reduced', 'reduced', 'movement_only', 'movement_only', 'frozen', 'frozen']
+    assert {name: cost.agents for name, cost in scene.lod.costs.items()} == {
+      'full': 2, 'reduced': 2, 'movement_only': 2, 'frozen': 2
+    }
+
+  def test_agents_in_a_focus_region_are_zero_distance_from_it(self) -> None:
+    scene = create_scene([2, 20])
+    policy = create_policy()
+    policy.focus_on(Bounds2d(0, 0, 100, 100), Bounds2d(400, 0, 500, 10))
+    near, far = scene.agents.values()
+
+    assert policy.distance_to_focus(near) == 0
+    assert policy.distance_to_focus(far) == 0
+
+    policy.focus_on()
+    assert policy.tier_for(policy.distance_to_focus(far)).name == 'full'
+
+  def test_tiers_control_which_systems_run_and_how_often(self) -> None:
+    scene = create_scene()
+    scene.lod = create_policy()
+    states = [agent.agent_state.current_action_state.name for agent in scene.agents.values()]
+    assert states == ['idle'] * len(CELLS)
+
+    results = run(scene, frames = 4)
+
+    full, reduced, movement_only, frozen = results[0:2], results[2:4], results[4:6], results[6:8]
+    assert all(len(counts) == 8 for _, _, counts in full)
+    # Reduced agents run once every 4 frames, on different frames.
+    assert all(len(counts) == 2 for _, _, counts in reduced)
+    assert all(state == 'walking' for _, state, _ in reduced)
+    # Movement only agents change state without running any systems.
+    assert all(state == 'idle' and counts == [] for _, state, counts in movement_only)
+    assert all(state == 'idle' and counts == [] for _, state, counts in frozen)
+    assert scene.lod.costs['full'].updates == 8
+    assert scene.lod.costs['reduced'].updates == 2
+    assert scene.lod.costs['movement_only'].updates == 8
+    assert scene.lod.costs['frozen'].updates == 0
+    assert 'movement_only' in scene.lod.report()
+
+  def test_agents_keep_their_frames_when_other_agents_leave(self) -> None:
+    scene = create_scene()
+    policy = create_policy()
+    agents = dict(scene.agents)
+    reduced_ids = list(agents)[2:4]
+
+    def schedule(frames: int) -> List[List[bool]]:
+      due = []
+      for _ in range(frames):
+        policy.assign(agents)
+        due.append([policy.is_due(agent_id) for agent_id in reduced_ids])
+        policy.advance()
+      return due
+
+    before = schedule(4)
+    departed = next(iter(agents))
+    del agents[departed]
+
+    assert schedule(4) == before
+    assert departed not in policy._stagger
+
+  def test_tiers_can_run_some_of_the_systems(self) -> None:
+    scene = create_scene([0, 1])
+    scene.lod = LODPolicy([LODTier('sensing_only', 100, systems = ('sensing',))])
+
+    results = run(scene, frames = 1)
+
+    assert [counts for _, _, counts in results] == [['sensing:1'], ['sensing:1']]
+
+  def test_full_tier_agents_match_a_scene_without_a_policy(self) -> None:
+    scene = create_scene()
+    expected = run(scene, frames = 5)
+
+    for batched in (False, True):
+      lod_scene = create_scene()
+      lod_scene.lod = create_policy()
+      assert run(lod_scene, frames = 5, batched = batched)[0:2] == expected[0:2]
+
+    repeated = create_scene()
+    repeated.lod = create_policy()
+    lod_scene = create_scene()
+    lod_scene.lod = create_policy()
+    assert run(repeated, frames = 5) == run(lod_scene, frames = 5)
+
+  def test_invalid_policies_are_rejected(self) -> None:
+    with pytest.raises(LevelOfDetailError):
+      LODPolicy([])
+    with pytest.raises(LevelOfDetailError):
+      LODPolicy([LODTier('full', 10), LODTier('full', 20)])
+    with pytest.raises(LevelOfDetailError):
+      LODPolicy([LODTier('full', 10, interval = -1)])
+    with pytest.raises(LevelOfDetailError):
+      create_policy().tier_of('missing')
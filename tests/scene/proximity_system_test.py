@@ -0,0 +1,61 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from agents_playground.scene.proximity_system import ProximitySystem, ProximitySystemError
+from agents_playground.scene.scene import Scene
+from agents_playground.spatial.aabbox import AABBox2d
+from agents_playground.spatial.vertex import Vertex2d
+
+def create_agent(id: int, x: float, y: float) -> SimpleNamespace:
+  return SimpleNamespace(
+    identity = SimpleNamespace(id = id),
+    location = (x, y),
+    physicality = SimpleNamespace(aabb = AABBox2d(Vertex2d(x, y), 5, 5)),
+    tick = lambda: None
+  )
+
+class TestProximitySystem:
+  def test_radius_must_be_positive(self) -> None:
+    with pytest.raises(ProximitySystemError):
+      ProximitySystem(max_radius = 0)
+
+  def test_without_a_radius_everyone_is_a_neighbor(self) -> None:
+    agents = {id: create_agent(id, id * 1000, 0) for id in range(4)}
+    proximity = ProximitySystem()
+    assert list(proximity.neighbors_of(2, agents).keys()) == [0, 1, 3] # type: ignore
+
+  def test_without_a_radius_only_requested_neighbors_are_built(self) -> None:
+    agents = {id: create_agent(id, id * 1000, 0) for id in range(100)}
+    proximity = ProximitySystem()
+    proximity.update(agents) # type: ignore
+    assert proximity._neighbors == {}
+    assert len(proximity.neighbors_of(5, agents)) == 99 # type: ignore
+    assert proximity._neighbors == {}
+
+  def test_neighbors_match_brute_force(self) -> None:
+    rng = random.Random(5)
+    agents = {id: create_agent(id, rng.uniform(0, 500), rng.uniform(0, 500)) for id in range(200)}
+    proximity = ProximitySystem(max_radius = 40)
+
+    for id, agent in agents.items():
+      x, y = agent.location
+      expected = {
+        other_id for other_id, other in agents.items()
+        if other_id != id and (other.location[0] - x) ** 2 + (other.location[1] - y) ** 2 <= 40 ** 2
+      }
+      assert set(proximity.neighbors_of(id, agents).keys()) == expected # type: ignore
+
+  def test_neighbors_are_calculated_once_per_frame(self) -> None:
+    scene = Scene()
+    scene.proximity.max_radius = 20
+    scene.add_agent(create_agent(1, 0, 0)) # type: ignore
+    scene.add_agent(create_agent(2, 10, 0)) # type: ignore
+    assert list(scene.neighbors_of(1).keys()) == [2]
+
+    # Moving an agent away doesn't change the neighbors until the next frame.
+    scene.agents[2].physicality.aabb = AABBox2d(Vertex2d(100, 0), 5, 5)
+    assert list(scene.neighbors_of(1).keys()) == [2]
+    scene.tick()
+    assert list(scene.neighbors_of(1).keys()) == []
@@ -143,4 +143,36 @@ class TestSceneBuilder:
     scene_data = SimpleNamespace(scene=SimpleNamespace(cell_size=[1,2], entities=SimpleNamespace(circles=circles)))
     scene: Scene = sb.build(scene_data)
 
-    assert scene.get_entity('circles', 44).toml_id == 44
\ No newline at end of file
+    assert scene.get_entity('circles', 44).toml_id == 44
+
+  def test_indexing_entities_and_junctions(self, mocker: MockFixture) -> None:
+    render_map = {'do_nothing_render': mocker.Mock()}
+    entities_map = {'do_nothing_update_method': mocker.Mock()}
+    sb = SceneBuilder(id_generator=mocker.Mock(), task_scheduler=mocker.Mock(), pre_sim_scheduler=mocker.Mock(), render_map=render_map, entities_map=entities_map)
+    factories = [
+      SimpleNamespace(id = 1, location = [1, 1], tags = ['open', 'loud']),
+      SimpleNamespace(id = 2, location = [5, 1], tags = ['closed'], district = 'north')
+    ]
+    parks = [SimpleNamespace(id = 1, location = [9, 9], district = 'north')]
+    junctions = [
+      SimpleNamespace(id = 'factory-exit', location = [1, 2], connects_to = [], entity_id = 1, entity_type = 'factories'),
+      SimpleNamespace(id = 'factory-entrance', location = [1, 3], connects_to = [], entity_id = 1, entity_type = 'factories'),
+      SimpleNamespace(id = 'park-entrance', location = [9, 8], connects_to = [], entity_id = 1, entity_type = 'parks')
+    ]
+    scene_data = SimpleNamespace(scene = SimpleNamespace(
+      cell_size = [1, 2], 
+      indexed_fields = ['entity_id', 'district'],
+      entities = SimpleNamespace(factories = factories, parks = parks),
+      nav_mesh = SimpleNamespace(junctions = junctions)
+    ))
+    scene: Scene = sb.build(scene_data)
+
+    assert [entity.toml_id for entity in scene.find(entity_grouping = 'factories')] == [1, 2]
+    assert [entity.toml_id for entity in scene.find(tags = 'open')] == [1]
+    assert [entity.entity_grouping for entity in scene.find(district = 'north')] == ['factories', 'parks']
+    assert [junction.toml_id for junction in scene.find_junctions(entity_type = 'factories', entity_id = 1)] == ['factory-exit', 'factory-entrance']
+
+    scene.remove_entity('factories', 2)
+    assert [entity.entity_grouping for entity in scene.find(district = 'north')] == ['parks']
+    scene.add_entity('parks', SimpleNamespace(toml_id = 2, district = 'south', tags = ['open']))
+    assert [entity.entity_grouping for entity in scene.find(tags = 'open')] == ['factories', 'parks']
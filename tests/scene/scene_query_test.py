@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+from pytest_mock import MockFixture
+
+from agents_playground.scene.scene import Scene
+from agents_playground.scene.scene_builder import SceneBuilder
+from agents_playground.spatial.aabbox import AABBox2d
+from agents_playground.spatial.types import Coordinate
+from agents_playground.spatial.vector2d import Vector2d
+from agents_playground.spatial.vertex import Vertex2d
+
+def build_town(mocker: MockFixture) -> Scene:
+  render_map = {'do_nothing_render': mocker.Mock()}
+  entities_map = {'do_nothing_update_method': mocker.Mock()}
+  sb = SceneBuilder(
+    id_generator      = mocker.Mock(), 
+    task_scheduler    = mocker.Mock(),
+    pre_sim_scheduler = mocker.Mock(),
+    render_map        = render_map,
+    entities_map      = entities_map
+  )
+  buildings = [
+    SimpleNamespace(id = 1, location = [0, 0], width = 4, height = 2),
+    SimpleNamespace(id = 2, location = [10, 0], width = 2, height = 2)
+  ]
+  streets = [
+    SimpleNamespace(id = 3, start = [0, 5], end = [20, 5], lanes = 2)
+  ]
+  signs = [
+    SimpleNamespace(id = 4, title = 'No location so it is not indexed.')
+  ]
+  scene_data = SimpleNamespace(
+    scene = SimpleNamespace(
+      cell_size = [10, 10], 
+      entities  = SimpleNamespace(buildings = buildings, streets = streets, signs = signs)
+    )
+  )
+  return sb.build(scene_data)
+
+class TestSceneQuery:
+  def test_entities_are_indexed_at_load(self, mocker: MockFixture) -> None:
+    scene = build_town(mocker)
+    assert len(scene.query) == 3
+
+  def test_overlap_aabb(self, mocker: MockFixture) -> None:
+    scene = build_town(mocker)
+    box = AABBox2d(center = Vertex2d(x = 20, y = 10), half_width = 5, half_height = 5)
+    assert [entity.toml_id for entity in scene.query.overlap_aabb(box)] == [1]
+
+    on_the_street = AABBox2d(center = Vertex2d(x = 150, y = 50), half_width = 2, half_height = 2)
+    assert [entity.toml_id for entity in scene.query.overlap_aabb(on_the_street)] == [3]
+
+  def test_raycast(self, mocker: MockFixture) -> None:
+    scene = build_town(mocker)
+    hits = scene.query.raycast(Coordinate(-10, 10), Vector2d(1, 0))
+    assert [hit.item.toml_id for hit in hits] == [1, 2]
+    assert hits[0].distance == 10
+
+  def test_sweep_aabb(self, mocker: MockFixture) -> None:
+    scene = build_town(mocker)
+    box = AABBox2d(center = Vertex2d(x = 60, y = 10), half_width = 5, half_height = 5)
+    hits = scene.query.sweep_aabb(box, Vector2d(0, 40))
+    assert [hit.item.toml_id for hit in hits] == [3]
+    # The box bottom (y=15) reaches the street edge (y=40) after moving 25 of the 40 units.
+    assert hits[0].time == 0.625
+
+  def test_index_is_rebuilt_when_entities_are_added(self, mocker: MockFixture) -> None:
+    scene = build_town(mocker)
+    scene.add_entity('buildings', SimpleNamespace(toml_id = 5, location = [30, 30], width = 1, height = 1))
+    box = AABBox2d(center = Vertex2d(x = 305, y = 305), half_width = 1, half_height = 1)
+    assert [entity.toml_id for entity in scene.query.overlap_aabb(box)] == [5]
+
+  def test_entities_added_to_a_scene_loaded_without_any_are_indexed(self, mocker: MockFixture) -> None:
+    sb = SceneBuilder(
+      id_generator      = mocker.Mock(), 
+      task_scheduler    = mocker.Mock(),
+      pre_sim_scheduler = mocker.Mock(),
+      render_map        = {},
+      entities_map      = {}
+    )
+    scene = sb.build(SimpleNamespace(scene = SimpleNamespace(cell_size = [10, 10])))
+    assert len(scene.query) == 0
+
+    scene.add_entity('buildings', SimpleNamespace(toml_id = 1, location = [3, 3], width = 1, height = 1))
+    box = AABBox2d(center = Vertex2d(x = 35, y = 35), half_width = 1, half_height = 1)
+    assert [entity.toml_id for entity in scene.query.overlap_aabb(box)] == [1]
+    assert len(scene.query) == 1
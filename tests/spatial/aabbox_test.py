@@ -48,4 +48,13 @@ class TestAABBox:
     assert not box_a.intersect(up)
     assert not box_a.intersect(upper_left)
     assert not box_a.intersect(left)
-    assert not box_a.intersect(lower_left)
\ No newline at end of file
+    assert not box_a.intersect(lower_left)
+
+class TestAABBox2dUpdate:
+  def test_update_in_place(self) -> None:
+    box = AABBox2d(center = Vertex2d(0, 0), half_width = 1, half_height = 2)
+    vertices = list(box.vertices)
+    box.update(center_x = 10, center_y = 20, half_width = 3, half_height = 4)
+    assert all(before is after for before, after in zip(vertices, box.vertices))
+    assert box.min.coordinates == (7, 16)
+    assert box.max.coordinates == (13, 24)
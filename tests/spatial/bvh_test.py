@@ -0,0 +1,79 @@
+from math import isclose
+
+from agents_playground.spatial.bvh import BoundingVolumeHierarchy, Bounds2d
+from agents_playground.spatial.types import Coordinate
+from agents_playground.spatial.vector2d import Vector2d
+
+def grid_of_boxes(rows: int, columns: int) -> BoundingVolumeHierarchy[int]:
+  """Builds a hierarchy of 10x10 boxes separated by a gap of 10."""
+  items = []
+  for row in range(rows):
+    for column in range(columns):
+      min_x = column * 20
+      min_y = row * 20
+      items.append((Bounds2d(min_x, min_y, min_x + 10, min_y + 10), row * columns + column))
+  return BoundingVolumeHierarchy(items)
+
+class TestBoundingVolumeHierarchy:
+  def test_empty_hierarchy(self) -> None:
+    bvh: BoundingVolumeHierarchy[int] = BoundingVolumeHierarchy()
+    assert len(bvh) == 0
+    assert bvh.depth() == 0
+    assert bvh.overlap(Bounds2d(0, 0, 100, 100)) == []
+    assert bvh.raycast(Coordinate(0, 0), Vector2d(1, 0)) == []
+    assert bvh.sweep(Bounds2d(0, 0, 1, 1), Vector2d(10, 0)) == []
+
+  def test_tree_is_balanced(self) -> None:
+    bvh = grid_of_boxes(rows = 16, columns = 16)
+    assert len(bvh) == 256
+    # 256 items with 4 items per leaf is 64 leaves. That's 7 levels when balanced.
+    assert bvh.depth() == 7
+
+  def test_overlap(self) -> None:
+    bvh = grid_of_boxes(rows = 10, columns = 10)
+    assert sorted(bvh.overlap(Bounds2d(0, 0, 5, 5))) == [0]
+    assert sorted(bvh.overlap(Bounds2d(12, 12, 18, 18))) == [], 'The query is in the gap between boxes.'
+    assert sorted(bvh.overlap(Bounds2d(5, 5, 25, 25))) == [0, 1, 10, 11]
+    assert len(bvh.overlap(Bounds2d(-100, -100, 1000, 1000))) == 100
+
+  def test_overlap_matches_brute_force(self) -> None:
+    bvh = grid_of_boxes(rows = 12, columns = 12)
+    query = Bounds2d(33, 47, 121, 95)
+    expected = [
+      row * 12 + column 
+      for row in range(12) 
+      for column in range(12) 
+      if Bounds2d(column * 20, row * 20, column * 20 + 10, row * 20 + 10).overlaps(query)
+    ]
+    assert sorted(bvh.overlap(query)) == expected
+
+  def test_raycast_orders_hits_by_distance(self) -> None:
+    bvh = grid_of_boxes(rows = 1, columns = 5)
+    hits = bvh.raycast(Coordinate(-10, 5), Vector2d(1, 0))
+    assert [hit.item for hit in hits] == [0, 1, 2, 3, 4]
+    assert isclose(hits[0].distance, 10)
+    assert hits[1].point == Coordinate(20, 5)
+
+  def test_raycast_respects_max_distance(self) -> None:
+    bvh = grid_of_boxes(rows = 1, columns = 5)
+    hits = bvh.raycast(Coordinate(-10, 5), Vector2d(2, 0), max_distance = 35)
+    assert [hit.item for hit in hits] == [0, 1]
+
+  def test_raycast_misses(self) -> None:
+    bvh = grid_of_boxes(rows = 1, columns = 5)
+    assert bvh.raycast(Coordinate(-10, 15), Vector2d(1, 0)) == []
+    assert bvh.raycast(Coordinate(-10, 5), Vector2d(-1, 0)) == []
+
+  def test_sweep(self) -> None:
+    bvh = grid_of_boxes(rows = 1, columns = 3)
+    # A 4x4 box centered at (-10, 5) moving 40 units to the right.
+    hits = bvh.sweep(Bounds2d(-12, 3, -8, 7), Vector2d(40, 0))
+    assert [hit.item for hit in hits] == [0, 1]
+    assert isclose(hits[0].time, 8/40)
+    assert isclose(hits[1].time, 28/40)
+
+  def test_sweep_starting_in_contact(self) -> None:
+    bvh = grid_of_boxes(rows = 1, columns = 3)
+    hits = bvh.sweep(Bounds2d(8, 3, 12, 7), Vector2d(0, 100))
+    assert [hit.item for hit in hits] == [0]
+    assert hits[0].time == 0
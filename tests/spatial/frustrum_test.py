@@ -1,9 +1,12 @@
+import random
+
 from pytest_mock import MockFixture
 from agents_playground.core.types import Size
 from agents_playground.spatial.aabbox import AABBox, AABBox2d
 
 from agents_playground.spatial.frustum import Frustum, Frustum2d
 from agents_playground.spatial.polygon import Polygon
+from agents_playground.spatial.polygon2d import is_separated, separating_axes
 from agents_playground.spatial.types import Coordinate
 from agents_playground.spatial.vector2d import Vector2d
 from agents_playground.spatial.vertex import Vertex2d
@@ -77,4 +80,34 @@ class TestFrustum2d:
     assert not frustum.intersect(north_aabb)
     assert frustum.intersect(west_aabb)
     assert not frustum.intersect(south_aabb)
-    assert not frustum.intersect(east_aabb)
\ No newline at end of file
+    assert not frustum.intersect(east_aabb)
+
+  def test_update_reuses_vertices(self) -> None:
+    frustum: Frustum = Frustum2d()
+    cell_size = Size(w=20, h=20)
+    frustum.update(Coordinate(x=36, y=18), Vector2d(i=1,j=0), cell_size)
+    vertices = list(frustum.vertices)
+
+    frustum.update(Coordinate(x=36, y=18), Vector2d(i=0,j=1), cell_size)
+    assert all(before is after for before, after in zip(vertices, frustum.vertices))
+
+    frustum.update(Coordinate(x=36, y=18), Vector2d(i=1,j=0), cell_size)
+    assert frustum.vertices[0].coordinates == (738.6602540378444, 355.0)
+    assert frustum.vertices[3].coordinates == (1163.0127018922194, -379.99999999999966)
+
+  def test_separating_axes_match_intersect(self) -> None:
+    random.seed(11)
+    frustum = Frustum2d(near_plane_depth = 10, depth_of_field = 100, field_of_view = 120)
+    cell_size = Size(1,1)
+    for _ in range(200):
+      frustum.update(
+        Coordinate(random.uniform(0, 100), random.uniform(0, 100)), 
+        direction = Vector2d(random.uniform(-1, 1), random.uniform(-1, 1)), 
+        cell_size = cell_size
+      )
+      aabb = AABBox2d(center = Vertex2d(random.uniform(0, 100), random.uniform(0, 100)), half_height=2, half_width=2)
+      intersects = not (
+        is_separated(separating_axes(frustum), [vertex.coordinates for vertex in aabb.vertices]) or
+        is_separated(separating_axes(aabb), [vertex.coordinates for vertex in frustum.vertices])
+      )
+      assert intersects == frustum.intersect(aabb)
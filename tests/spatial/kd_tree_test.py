@@ -0,0 +1,47 @@
+from math import hypot
+import random
+
+from agents_playground.spatial.kd_tree import KDTree
+from agents_playground.spatial.types import Coordinate
+
+def random_points(count: int, seed: int):
+  rng = random.Random(seed)
+  return [(Coordinate(rng.uniform(0, 100), rng.uniform(0, 50)), index) for index in range(count)]
+
+def distance(first: Coordinate, second: Coordinate) -> float:
+  return hypot(first.x - second.x, first.y - second.y)
+
+class TestKDTree:
+  def test_nearest_matches_a_scan(self) -> None:
+    points = random_points(500, 1)
+    tree = KDTree(points)
+    rng = random.Random(2)
+    for _ in range(200):
+      query = Coordinate(rng.uniform(-10, 110), rng.uniform(-10, 60))
+      item, found_distance = tree.nearest(query)
+      assert found_distance == min(distance(location, query) for location, _ in points)
+      assert distance(points[item][0], query) == found_distance
+
+  def test_within_matches_a_scan(self) -> None:
+    points = random_points(300, 3)
+    tree = KDTree(points, max_leaf_size = 2)
+    rng = random.Random(4)
+    for _ in range(100):
+      query = Coordinate(rng.uniform(0, 100), rng.uniform(0, 50))
+      radius = rng.uniform(0, 20)
+      found = tree.within(query, radius)
+      assert set(found) == {item for location, item in points if distance(location, query) <= radius}
+      distances = [distance(points[item][0], query) for item in found]
+      assert distances == sorted(distances)
+
+  def test_filtered_and_bounded_searches(self) -> None:
+    tree = KDTree([(Coordinate(0, 0), 'a'), (Coordinate(3, 0), 'b'), (Coordinate(10, 0), 'c')])
+    assert tree.nearest(Coordinate(1, 0)) == ('a', 1)
+    assert tree.nearest(Coordinate(1, 0), accept = lambda item: item != 'a') == ('b', 2)
+    assert tree.nearest(Coordinate(20, 0), max_distance = 5) is None
+
+  def test_empty_trees(self) -> None:
+    tree: KDTree[str] = KDTree()
+    assert len(tree) == 0
+    assert tree.nearest(Coordinate(0, 0)) is None
+    assert tree.within(Coordinate(0, 0), 10) == []
@@ -0,0 +1,47 @@
+import random
+from itertools import combinations
+
+import pytest
+
+from agents_playground.spatial.bvh import Bounds2d
+from agents_playground.spatial.spatial_grid import SpatialGrid, SpatialGridError
+
+def random_bounds(rng: random.Random) -> Bounds2d:
+  x = rng.uniform(0, 200)
+  y = rng.uniform(0, 200)
+  return Bounds2d(x, y, x + rng.uniform(1, 15), y + rng.uniform(1, 15))
+
+class TestSpatialGrid:
+  def test_cells_must_have_a_size(self) -> None:
+    with pytest.raises(SpatialGridError):
+      SpatialGrid(0, 10)
+
+  def test_query(self) -> None:
+    grid: SpatialGrid[str] = SpatialGrid(10, 10)
+    grid.insert('a', Bounds2d(0, 0, 5, 5))
+    grid.insert('b', Bounds2d(8, 8, 25, 12))
+    grid.insert('c', Bounds2d(100, 100, 105, 105))
+
+    assert grid.query(Bounds2d(4, 4, 9, 9)) == {'a', 'b'}
+    assert grid.query(Bounds2d(20, 0, 30, 30)) == {'b'}
+    assert grid.query(Bounds2d(50, 50, 60, 60)) == set()
+
+    grid.clear()
+    assert len(grid) == 0
+    assert grid.query(Bounds2d(0, 0, 200, 200)) == set()
+
+  def test_candidate_pairs_match_brute_force(self) -> None:
+    rng = random.Random(11)
+    boxes = {index: random_bounds(rng) for index in range(300)}
+    grid: SpatialGrid[int] = SpatialGrid(10, 10)
+    for index, bounds in boxes.items():
+      grid.insert(index, bounds)
+
+    expected = {
+      (first, second) 
+      for first, second in combinations(boxes.keys(), 2)
+      if boxes[first].overlaps(boxes[second])
+    }
+    pairs = [tuple(sorted(pair)) for pair in grid.candidate_pairs()]
+    assert len(pairs) == len(set(pairs)), 'Each pair should only be reported once.'
+    assert set(pairs) == expected